@@ -4,6 +4,6 @@ CS_311 Extra Credit Project
 """
 
 # Import the handler for Netlify to find
-from .battleOptimizer import handler
+from .battleOptimizer import handler, parse_optimize_request, parse_matchup_request, parse_gauntlet_request
 
-__all__ = ['handler']
+__all__ = ['handler', 'parse_optimize_request', 'parse_matchup_request', 'parse_gauntlet_request']
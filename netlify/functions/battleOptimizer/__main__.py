@@ -0,0 +1,13 @@
+"""
+Command line entry point of the package: python -m battleOptimizer runs a
+JSONL batch (see batchCli.py).
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+from .batchCli import main
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,10 +1,27 @@
-"""Battle optimization algorithms package"""
-from .greedy import GreedyBattleOptimizer, run_greedy_optimizer
-from .dynamic_programming import DynamicProgrammingOptimizer, run_dp_optimizer
-from .dijkstra import DijkstraBattleOptimizer, run_dijkstra_optimizer
-
-__all__ = [
-    'GreedyBattleOptimizer', 'run_greedy_optimizer',
-    'DynamicProgrammingOptimizer', 'run_dp_optimizer',
-    'DijkstraBattleOptimizer', 'run_dijkstra_optimizer'
-]
+"""Battle optimization algorithms package
+
+Submodules are imported on first attribute access (PEP 562), so importing the
+package (or one algorithm) does not load the other algorithms.
+"""
+import importlib
+
+_EXPORTS = {
+    'GreedyBattleOptimizer': '.greedy', 'run_greedy_optimizer': '.greedy',
+    'DynamicProgrammingOptimizer': '.dynamic_programming', 'run_dp_optimizer': '.dynamic_programming',
+    'DijkstraBattleOptimizer': '.dijkstra', 'run_dijkstra_optimizer': '.dijkstra',
+    'PortfolioResult': '.portfolio', 'run_portfolio_optimizer': '.portfolio',
+    'ParallelDijkstraOptimizer': '.parallel_dijkstra', 'run_parallel_dijkstra_optimizer': '.parallel_dijkstra',
+    'ExternalBFSDijkstraOptimizer': '.external_bfs', 'run_external_bfs': '.external_bfs',
+    'ParetoBattleOptimizer': '.pareto', 'run_pareto_optimizer': '.pareto',
+    'GauntletPlanner': '.gauntlet', 'run_gauntlet_optimizer': '.gauntlet'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,413 @@
+"""
+State Abstraction Mode - Dijkstra Over Bucketed HP States
+
+Exact Dijkstra keys every vertex on exact HP values, so 6v6 battles at high
+levels have far more states than max_states and the search gets cut off
+before it reaches a victory. This mode merges states that look the same at a
+coarser granularity:
+- "buckets": each Pokemon's HP is mapped to one of N equal slices of max HP
+- "hits": the two active Pokemon are classed by how many hits they can still
+  take in the current matchup (from a damage table built once per battle);
+  benched Pokemon fall back to HP slices
+
+Fainted Pokemon always get their own class (0), so an abstract state is
+terminal exactly when its concrete states are. The turn counter is left out
+of the abstract key: Dijkstra already finds the fewest turns.
+
+The abstract graph is searched with the normal Dijkstra engine (one concrete
+representative per abstract vertex) and the plan is then refined in the
+concrete model:
+1. Replay the planned moves from the real state, turn by turn
+2. If the replay stops early (move out of PP) or the battle is not over when
+   the plan runs out, search again from the real state reached so far
+3. Repeat up to max_refinements times
+
+The battle log, damage and turn count all come from the concrete replay, and
+the result reports the abstraction granularity and the validation outcome:
+- "confirmed": the first plan replayed to the predicted winner
+- "refined": the battle finished with the predicted winner after re-planning
+- "mismatch": the concrete battle ended with a different winner
+- "unresolved": the battle was still going when refinement gave up
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import logging
+from typing import Any, Dict, Generator, List, Optional
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from algorithms.dijkstra import DijkstraBattleOptimizer, DijkstraResult
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from utils.damageCalculator import DamageCalculator
+from utils.searchCheckpoint import CheckpointMismatch
+from utils.progress import ProgressCallback
+from utils.searchBounds import SearchBounds
+
+logger = logging.getLogger()
+
+
+class StateAbstraction:
+    """
+    Maps concrete battle states to abstract (bucketed HP) keys.
+
+    Attributes:
+        mode: "buckets" or "hits"
+        hp_buckets: Number of HP slices per Pokemon ("buckets" mode, and the
+                    fallback for Pokemon the active foe cannot damage)
+    """
+
+    MODES = ("buckets", "hits")
+
+    def __init__(self, mode: str = "buckets", hp_buckets: int = 8):
+        """
+        Create an abstraction.
+
+        Args:
+            mode: "buckets" (equal HP slices) or "hits" (hits-to-KO classes)
+            hp_buckets: Number of HP slices per Pokemon
+
+        Raises:
+            ValueError: If the mode is unknown or hp_buckets < 1
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid abstraction mode: {mode}")
+        if hp_buckets < 1:
+            raise ValueError(f"hp_buckets must be at least 1, got {hp_buckets}")
+
+        self.mode = mode
+        self.hp_buckets = hp_buckets
+
+        # Damage tables for "hits" mode, indexed [player slot][opponent slot]
+        # - player_hit: strongest move of the player Pokemon vs the opponent
+        # - opponent_hit: AI reply damage of the opponent vs the player Pokemon
+        self._player_hit: List[List[int]] = []
+        self._opponent_hit: List[List[int]] = []
+        self._player_max_hp: List[int] = []
+        self._opponent_max_hp: List[int] = []
+
+    def prepare(self, initial_state: BattleState):
+        """
+        Build the damage tables needed by "hits" mode.
+
+        Args:
+            initial_state: Starting battle state (stats and moves never change)
+
+        Time Complexity: O(P * O * M) where P, O = team sizes, M = moves
+        """
+        self._player_max_hp = [p.max_hp for p in initial_state.player_team]
+        self._opponent_max_hp = [p.max_hp for p in initial_state.opponent_team]
+
+        if self.mode != "hits":
+            return
+
+        self._player_hit = []
+        self._opponent_hit = []
+        for player in initial_state.player_team:
+            player_row = []
+            opponent_row = []
+            for opponent in initial_state.opponent_team:
+                player_row.append(max(
+                    (self._damage(player, opponent, m) for m in player.moves),
+                    default=0
+                ))
+                reply = BattleState.select_opponent_move(opponent, player)
+                opponent_row.append(self._damage(opponent, player, reply) if reply else 0)
+            self._player_hit.append(player_row)
+            self._opponent_hit.append(opponent_row)
+
+    @staticmethod
+    def _damage(attacker: Pokemon, defender: Pokemon, move) -> int:
+        """Deterministic damage with the same settings as BattleState."""
+        return DamageCalculator.calculate_damage(
+            attacker, defender, move,
+            is_critical=False,
+            random_roll=236
+        )
+
+    def hp_class(self, hp: int, max_hp: int, hit: int = 0) -> int:
+        """
+        Map an HP value to its abstract class.
+
+        Args:
+            hp: Current HP
+            max_hp: Maximum HP
+            hit: Damage of one hit from the active foe ("hits" mode only)
+
+        Returns:
+            0 if fainted, otherwise a class >= 1
+        """
+        if hp <= 0:
+            return 0
+
+        if self.mode == "hits" and hit > 0:
+            return -(-hp // hit)  # ceil division: hits left to KO
+
+        # Equal slices of max HP
+        return -(-hp * self.hp_buckets // max_hp)
+
+    def key(self, state: BattleState) -> str:
+        """
+        Get the abstract key of a state.
+
+        In "hits" mode the two active Pokemon are classed by the hits they can
+        still take in the current matchup (one hit of the strongest player
+        move, or of the opponent's AI reply, always lowers the class by one).
+        Benched Pokemon are classed by HP slices.
+
+        Args:
+            state: Concrete battle state
+
+        Returns:
+            String key in the same layout as BattleState.hash_key (no turn)
+        """
+        pa = state.player_active
+        oa = state.opponent_active
+        hits = self.mode == "hits"
+
+        player_classes = [
+            str(self.hp_class(p.current_hp, p.max_hp,
+                              self._opponent_hit[i][oa] if hits and i == pa else 0))
+            for i, p in enumerate(state.player_team)
+        ]
+        opponent_classes = [
+            str(self.hp_class(p.current_hp, p.max_hp,
+                              self._player_hit[pa][j] if hits and j == oa else 0))
+            for j, p in enumerate(state.opponent_team)
+        ]
+        return (f"P:{','.join(player_classes)}|O:{','.join(opponent_classes)}"
+                f"|PA:{pa}|OA:{oa}")
+
+    def granularity(self) -> Dict[str, Any]:
+        """
+        Describe how coarse the abstraction is (for API responses).
+
+        Returns:
+            Dictionary with the mode and its class counts. For "hits" mode the
+            full-HP hits-to-KO tables are included, indexed [player][opponent].
+        """
+        info: Dict[str, Any] = {"mode": self.mode, "hpBuckets": self.hp_buckets}
+
+        if self.mode == "hits":
+            info["opponentHitsToKO"] = [
+                [self.hp_class(max_hp, max_hp, hit) for max_hp, hit in zip(self._opponent_max_hp, row)]
+                for row in self._player_hit
+            ]
+            info["playerHitsToKO"] = [
+                [self.hp_class(max_hp, max_hp, hit) for hit in row]
+                for max_hp, row in zip(self._player_max_hp, self._opponent_hit)
+            ]
+
+        return info
+
+
+class AbstractDijkstraOptimizer(DijkstraBattleOptimizer):
+    """
+    Dijkstra over abstract states, refined and validated in the concrete model.
+
+    Uses the same graph building and shortest path code as the exact
+    optimizer; only the vertex key changes (see StateAbstraction).
+    """
+
+    def __init__(
+        self,
+        max_states: int = 50000,
+        abstraction: str = "buckets",
+        hp_buckets: int = 8,
+        max_refinements: int = 3,
+        prune_dominated: bool = True,
+        macro_actions: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        build_log: bool = True,
+        bounds: Optional[SearchBounds] = None
+    ):
+        """
+        Create an abstract Dijkstra optimizer.
+
+        Args:
+            max_states: Maximum abstract states per search
+            abstraction: "buckets" or "hits" (see StateAbstraction)
+            hp_buckets: HP slices per Pokemon
+            max_refinements: Re-plans allowed after the first plan
+            prune_dominated: Skip dominated moves per matchup
+            macro_actions: Fast-forward forced repetition sequences
+            progress: Optional callback receiving progress records (once
+                      per abstract search)
+            build_log: Record the turn-by-turn battle log (False skips it)
+            bounds: Optional shared bounds / deadline (see DijkstraBattleOptimizer)
+
+        Raises:
+            ValueError: If the abstraction settings are invalid
+        """
+        super().__init__(
+            max_states=max_states,
+            prune_dominated=prune_dominated,
+            macro_actions=macro_actions,
+            progress=progress,
+            build_log=build_log,
+            bounds=bounds
+        )
+        self.abstraction = StateAbstraction(abstraction, hp_buckets)
+        self.max_refinements = max_refinements
+
+    def _state_key(self, state: BattleState) -> str:
+        """Merge states by abstract key instead of exact HP."""
+        return self.abstraction.key(state)
+
+    def _search(self, initial_state: BattleState,
+                checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, DijkstraResult]:
+        """
+        Plan on the abstract graph, then replay and repair the plan concretely
+        (a generator yielding during each abstract search; optimize() and
+        start() come from DijkstraBattleOptimizer).
+
+        Args:
+            initial_state: Starting battle state
+            checkpoint: Not supported (each refinement searches a new graph)
+
+        Returns:
+            DijkstraResult from the concrete replay, with abstraction details
+            (granularity and validation outcome) in result.abstraction
+
+        Raises:
+            CheckpointMismatch: If a checkpoint is given
+        """
+        if checkpoint is not None:
+            raise CheckpointMismatch("Abstract searches can't resume from a checkpoint")
+        self.abstraction.prepare(initial_state)
+
+        state = initial_state.copy()
+        move_sequence: List[str] = []
+        battle_log: List = []
+        states_explored = 0
+        branches_pruned = 0
+        turns_fast_forwarded = 0
+        refinements = 0
+        predicted_win: Optional[bool] = None
+        predicted_turns = 0
+
+        while True:
+            plan = yield from super()._search(state)
+            states_explored += plan.states_explored
+            branches_pruned += plan.branches_pruned
+            turns_fast_forwarded += plan.turns_fast_forwarded
+
+            if not plan.move_sequence:
+                break  # Abstract search found nothing to play
+
+            # The latest plan is the one being validated
+            predicted_win = plan.success
+            predicted_turns = len(move_sequence) + plan.turns
+
+            # Refine: play the plan in the concrete model
+            for move_name in plan.move_sequence:
+                if state.is_battle_over():
+                    break
+
+                move = state.get_active_player_pokemon().get_move(move_name)
+                if move is None or not move.is_usable():
+                    logger.info(f"[ABSTRACTION] Plan diverged at turn {len(move_sequence) + 1}")
+                    break
+
+                next_state = state._apply_move_outcome(move, state._predict_move_outcome(move))
+                move_sequence.append(move_name)
+                self._log_battle_events(state, next_state, move_name, len(move_sequence), battle_log)
+                state = next_state
+
+            if state.is_battle_over() or refinements >= self.max_refinements:
+                break
+
+            refinements += 1
+            logger.info(f"[ABSTRACTION] Re-planning from turn {len(move_sequence)} (refinement {refinements})")
+
+        if state.is_battle_over():
+            if self.build_log:
+                battle_log.append({
+                    "turn": len(move_sequence),
+                    "event": "battle_end",
+                    "winner": "player" if state.player_won() else "opponent"
+                })
+
+            if predicted_win is not None and state.player_won() != predicted_win:
+                outcome = "mismatch"
+            else:
+                outcome = "confirmed" if refinements == 0 else "refined"
+        else:
+            outcome = "unresolved"
+
+        abstraction_info = self.abstraction.granularity()
+        abstraction_info["validation"] = {
+            "outcome": outcome,
+            "refinements": refinements,
+            "predictedWin": predicted_win,
+            "predictedTurns": predicted_turns,
+            "concreteWin": state.player_won(),
+            "concreteTurns": len(move_sequence)
+        }
+
+        return DijkstraResult(
+            success=state.player_won(),
+            total_damage=state.get_total_damage_dealt_to_opponent(),
+            turns=len(move_sequence),
+            move_sequence=move_sequence,
+            final_state=state,
+            states_explored=states_explored,
+            path_cost=len(move_sequence),
+            battle_log=battle_log,
+            branches_pruned=branches_pruned,
+            turns_fast_forwarded=turns_fast_forwarded,
+            abstraction=abstraction_info
+        )
+
+
+def run_abstract_dijkstra_optimizer(
+    player_team: List[Pokemon],
+    opponent_team: List[Pokemon],
+    max_states: int = 50000,
+    abstraction: str = "buckets",
+    hp_buckets: int = 8,
+    max_refinements: int = 3,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True,
+    bounds: Optional[SearchBounds] = None
+) -> DijkstraResult:
+    """
+    Convenience function to run abstract Dijkstra on teams.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+        max_states: Maximum abstract states per search
+        abstraction: "buckets" or "hits"
+        hp_buckets: HP slices per Pokemon for "buckets" mode
+        max_refinements: Re-plans allowed after the first plan
+        progress: Optional callback receiving progress records
+        build_log: Record the turn-by-turn battle log
+        bounds: Optional shared bounds / deadline
+
+    Returns:
+        DijkstraResult (result.abstraction holds granularity and validation)
+    """
+    initial_state = BattleState(
+        player_team=player_team,
+        opponent_team=opponent_team
+    )
+
+    optimizer = AbstractDijkstraOptimizer(
+        max_states=max_states,
+        abstraction=abstraction,
+        hp_buckets=hp_buckets,
+        max_refinements=max_refinements,
+        progress=progress,
+        build_log=build_log,
+        bounds=bounds
+    )
+    return optimizer.optimize(initial_state)
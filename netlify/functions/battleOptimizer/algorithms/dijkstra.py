@@ -22,19 +22,29 @@ CS_311 Extra Credit Project
 import sys
 import os
 import logging
-from typing import List, Tuple, Optional, Dict
+from typing import Any, Generator, List, Mapping, Tuple, Optional, Dict
 
 # Configure logging for AWS Lambda
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from dataStructures.graph import Graph, Vertex, Edge
 from models.battleState import BattleState
 from models.pokemon import Pokemon
 from models.move import Move
+from utils.moveDominance import MoveDominanceFilter
+from utils.macroActions import MacroAction, MacroActionPlanner
+from utils.progress import ProgressCallback, ProgressReporter
+from utils.searchBounds import SearchBounds
+from utils.resumableSearch import ResumableSearch, make_plan
+from utils.searchCheckpoint import CHECKPOINT_VERSION, CheckpointMismatch, pack_states, unpack_states
+from utils.sharedTranspositionTable import (SharedTranspositionTable, KIND_VISITED,
+                                            battle_namespace, table_key)
 
 
 class DijkstraResult:
@@ -49,6 +59,15 @@ class DijkstraResult:
         final_state: Final battle state
         states_explored: Total states in the graph
         path_cost: Total cost of the shortest path
+        branches_pruned: Move branches removed by dominance pruning
+        turns_fast_forwarded: Intermediate turns skipped by macro actions
+        abstraction: Granularity and validation details (abstraction mode only)
+        parallel: Worker count, rounds and per-worker statistics (hash-distributed
+                  mode only, see algorithms/parallel_dijkstra.py)
+        top_plans: The top_k best distinct victory plans (fewest turns, then
+                   least damage taken), best first; empty unless top_k > 1
+        pareto_front: Pareto-optimal victory plans (multi-criteria mode only,
+                      see algorithms/pareto.py)
     """
 
     def __init__(
@@ -60,7 +79,13 @@ class DijkstraResult:
         final_state: BattleState,
         states_explored: int = 0,
         path_cost: float = 0.0,
-        battle_log: List = None
+        battle_log: List = None,
+        branches_pruned: int = 0,
+        turns_fast_forwarded: int = 0,
+        abstraction: Optional[Dict] = None,
+        parallel: Optional[Dict] = None,
+        top_plans: Optional[List[Dict[str, Any]]] = None,
+        pareto_front: Optional[List[Dict[str, Any]]] = None
     ):
         self.success = success
         self.total_damage = total_damage
@@ -70,6 +95,12 @@ class DijkstraResult:
         self.states_explored = states_explored
         self.path_cost = path_cost
         self.battle_log = battle_log or []
+        self.branches_pruned = branches_pruned
+        self.turns_fast_forwarded = turns_fast_forwarded
+        self.abstraction = abstraction
+        self.parallel = parallel
+        self.top_plans = top_plans or []
+        self.pareto_front = pareto_front
 
     def __repr__(self) -> str:
         return (f"DijkstraResult(success={self.success}, "
@@ -85,19 +116,172 @@ class DijkstraBattleOptimizer:
     Strategy: Build battle state graph and find shortest path to victory.
     """
 
-    def __init__(self, max_states: int = 100000):
+    def __init__(
+        self,
+        max_states: int = 100000,
+        prune_dominated: bool = True,
+        macro_actions: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        progress_interval: int = 1000,
+        build_log: bool = True,
+        bounds: Optional[SearchBounds] = None,
+        shared_table: Optional[SharedTranspositionTable] = None,
+        top_k: int = 1
+    ):
         """
         Create a Dijkstra optimizer.
 
         Args:
             max_states: Maximum states to explore (prevents memory issues)
                        Default: 100,000 (sufficient for most battles)
+            prune_dominated: Skip moves dominated in the current matchup
+                             (see utils/moveDominance.py)
+            macro_actions: Collapse forced repetition sequences into one
+                           edge weighted by turn count (see utils/macroActions.py)
+            progress: Optional callback receiving progress records (states
+                      expanded, best bound, elapsed time; see utils/progress.py)
+            progress_interval: States expanded between two progress records
+            build_log: Record the turn-by-turn battle log (False skips it)
+            bounds: Optional bounds shared with other searches: states at or
+                    past the best known winning turn count are not expanded,
+                    wins found are offered back (see utils/searchBounds.py)
+            shared_table: Optional visited index shared with other processes
+                          searching the same battle: a state another search
+                          already expanded is kept as a leaf here. Each
+                          search then only covers part of the graph - the
+                          fewest turns to win over all of them is the answer
+                          (see utils/sharedTranspositionTable.py)
+            top_k: Victory plans to return in top_plans (1 = only the best
+                   one in move_sequence); read from the same graph with
+                   Graph.k_shortest_paths, not searched again
         """
         self.max_states = max_states
+        self.prune_dominated = prune_dominated
+        self.macro_actions = macro_actions
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.build_log = build_log
+        self.bounds = bounds
+        self.shared_table = shared_table
+        self.top_k = top_k
+        self.reporter = ProgressReporter()
+        self.move_filter: Optional[MoveDominanceFilter] = None
+        self.macro_planner: Optional[MacroActionPlanner] = None
+
+        # Whether the last graph covers every reachable state (max_states
+        # not hit), i.e. the result is proven optimal
+        self.graph_complete = False
+        # States not expanded because of the shared turn bound, and because
+        # another process expanded them (shared table)
+        self.states_cut = 0
+        self.states_shared = 0
+
+        # Graph under construction (step-wise interface): BFS tree parents
+        # and the victory vertex with the fewest turns along that tree
+        self._graph_parts: Optional[Tuple] = None
+        self._frontier: Optional[Tuple] = None
+        self._parents: Dict[int, int] = {}
+        self._best_victory: Optional[int] = None
+        self._expanded = 0
 
     def optimize(self, initial_state: BattleState) -> DijkstraResult:
         """
-        Run Dijkstra's algorithm on a battle.
+        Run Dijkstra's algorithm on a battle (start(initial_state).run()).
+
+        Args:
+            initial_state: Starting battle state
+
+        Returns:
+            DijkstraResult with optimal strategy
+        """
+        return self.start(initial_state).run()
+
+    def start(self, initial_state: BattleState,
+              checkpoint: Optional[Dict[str, Any]] = None) -> ResumableSearch:
+        """
+        Start a step-wise run (one step expansion = one state expanded while
+        building the graph, or one terminal state's shortest path).
+
+        Args:
+            initial_state: Starting battle state
+            checkpoint: Optional checkpoint() of an earlier, unfinished run
+                        on the same battle: its graph is restored and the
+                        BFS continues from its frontier
+
+        Returns:
+            ResumableSearch (see utils/resumableSearch.py)
+
+        Raises:
+            CheckpointMismatch: (on the first step) if the checkpoint belongs
+                                to another battle or search
+        """
+        return ResumableSearch(self, self._search(initial_state, checkpoint))
+
+    @property
+    def search_complete(self) -> bool:
+        """Whether the last graph covered every reachable state (nothing to resume)."""
+        return self.graph_complete
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot of the graph built so far, for start(checkpoint=...).
+
+        Holds every discovered state (vertex order), the edges in the order
+        they were added, the BFS tree parents and the frontier, so resuming
+        continues exactly where the BFS stopped. Macro edges are stored as
+        flags and recomputed from their start state on resume.
+
+        Returns:
+            JSON-friendly checkpoint dict, or None before the search started
+        """
+        if self._graph_parts is None or self._frontier is None:
+            return None
+        vertex_to_state, move_labels, macro_edges = self._graph_parts
+        state_to_vertex, move_sets, queue = self._frontier
+        return {
+            "version": CHECKPOINT_VERSION,
+            "algorithm": "dijkstra",
+            "states": pack_states([vertex_to_state[v] for v in range(len(vertex_to_state))]),
+            "edges": [[f, t, label, list(move_sets[(f, t)]), (f, t) in macro_edges]
+                      for (f, t), label in move_labels.items()],
+            "parents": [self._parents[v] for v in range(1, len(vertex_to_state))],
+            "queue": [state_to_vertex[self._state_key(s)] for s in queue],
+            "expanded": self._expanded,
+            "counters": [self._branches_pruned(), self._turns_fast_forwarded()]
+        }
+
+    def current_plan(self) -> Optional[Dict[str, Any]]:
+        """
+        Best victory found so far while building the graph (the BFS tree
+        path to it - a valid plan, not yet proven shortest).
+
+        Returns:
+            Plan dict, or None if no victory has been reached yet
+        """
+        if self._best_victory is None or self._graph_parts is None:
+            return None
+        vertex_to_state, move_labels, macro_edges = self._graph_parts
+
+        path = [self._best_victory]
+        while path[-1] != 0:
+            path.append(self._parents[path[-1]])
+        path.reverse()
+
+        moves = self._path_moves(path, move_labels, macro_edges)
+        final_state = vertex_to_state[self._best_victory]
+        return make_plan(moves, True, final_state.get_total_damage_dealt_to_opponent(), complete=False)
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Statistics of the running search."""
+        vertices = len(self._graph_parts[0]) if self._graph_parts is not None else 0
+        return {"statesExpanded": self._expanded, "vertices": vertices,
+                "statesShared": self.states_shared}
+
+    def _search(self, initial_state: BattleState,
+                checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, DijkstraResult]:
+        """
+        Run Dijkstra's algorithm on a battle, yielding after every state
+        expanded while building the graph and before every shortest path.
 
         Algorithm:
         1. Build battle state graph using BFS
@@ -109,6 +293,7 @@ class DijkstraBattleOptimizer:
 
         Args:
             initial_state: Starting battle state
+            checkpoint: Optional checkpoint to resume (see start())
 
         Returns:
             DijkstraResult with optimal strategy
@@ -120,10 +305,11 @@ class DijkstraBattleOptimizer:
         Space Complexity: O(V + E) for the graph
         """
         logger.info(f"[DIJKSTRA] Starting optimization with max_states={self.max_states}")
+        self._prepare_search(initial_state)
 
         # Build the battle state graph
-        graph, state_to_vertex, vertex_to_state, move_labels = self._build_graph(
-            initial_state
+        graph, state_to_vertex, vertex_to_state, move_labels, move_sets, macro_edges = (
+            yield from self._build_graph(initial_state, checkpoint)
         )
 
         logger.info(f"[DIJKSTRA] Graph built with {graph.get_num_verts()} vertices")
@@ -157,6 +343,8 @@ class DijkstraBattleOptimizer:
                     defeat_count += 1
 
         logger.info(f"[DIJKSTRA] Found {len(terminal_vertices)} terminal states: {victory_count} victories, {defeat_count} defeats")
+        self.reporter.report("shortest_paths", statesExplored=graph.get_num_verts(),
+                             terminalStates=len(terminal_vertices), victoryStates=victory_count)
 
         if not terminal_vertices:
             # No terminal state found (shouldn't happen if we explored properly)
@@ -167,7 +355,9 @@ class DijkstraBattleOptimizer:
                 turns=0,
                 move_sequence=[],
                 final_state=initial_state,
-                states_explored=graph.get_num_verts()
+                states_explored=graph.get_num_verts(),
+                branches_pruned=self._branches_pruned(),
+                turns_fast_forwarded=self._turns_fast_forwarded()
             )
 
         # Run Dijkstra's algorithm to find the best terminal state
@@ -189,6 +379,7 @@ class DijkstraBattleOptimizer:
         paths_not_found = 0
 
         for terminal_vertex in terminal_vertices:
+            yield
             distance, path = graph.dijkstra(initial_vertex_id, terminal_vertex)
             if distance is not None and path:
                 paths_found += 1
@@ -246,35 +437,25 @@ class DijkstraBattleOptimizer:
                 turns=0,
                 move_sequence=[],
                 final_state=initial_state,
-                states_explored=graph.get_num_verts()
+                states_explored=graph.get_num_verts(),
+                branches_pruned=self._branches_pruned(),
+                turns_fast_forwarded=self._turns_fast_forwarded()
             )
 
         path = best_path
+        self.reporter.report("path_found", statesExplored=graph.get_num_verts(),
+                             victory=victory_path is not None,
+                             bestBound=victory_distance if victory_path else None)
 
         # Extract move sequence AND battle log by walking through the path
-        move_sequence = []
-        battle_log = []
-        for i in range(len(path) - 1):
-            from_vertex = path[i]
-            to_vertex = path[i + 1]
-            edge_key = (from_vertex, to_vertex)
-            move_name = move_labels.get(edge_key)  # Just the move name
-            if move_name:
-                move_sequence.append(move_name)
-
-                # Get states before and after this move
-                before_state = vertex_to_state.get(from_vertex)
-                after_state = vertex_to_state.get(to_vertex)
-
-                if before_state and after_state:
-                    # Extract battle events by comparing states
-                    self._log_battle_events(before_state, after_state, move_name, i + 1, battle_log)
+        move_sequence, battle_log = self._walk_path(path, vertex_to_state, move_labels,
+                                                    move_sets, macro_edges)
 
         # Get final state
         final_state = vertex_to_state.get(best_terminal_vertex, initial_state)
 
         # Add final battle result to log
-        if final_state.is_battle_over():
+        if final_state.is_battle_over() and self.build_log:
             battle_log.append({
                 "turn": len(move_sequence),
                 "event": "battle_end",
@@ -286,6 +467,11 @@ class DijkstraBattleOptimizer:
         total_damage = final_state.get_total_damage_dealt_to_opponent()
         turns = len(move_sequence)
 
+        top_plans = []
+        if success and self.top_k > 1:
+            yield
+            top_plans = self._top_plans(graph, vertex_to_state, move_labels, macro_edges)
+
         return DijkstraResult(
             success=success,
             total_damage=total_damage,
@@ -294,61 +480,297 @@ class DijkstraBattleOptimizer:
             final_state=final_state,
             states_explored=graph.get_num_verts(),
             path_cost=best_distance,
-            battle_log=battle_log
+            battle_log=battle_log,
+            branches_pruned=self._branches_pruned(),
+            turns_fast_forwarded=self._turns_fast_forwarded(),
+            top_plans=top_plans
         )
 
+    def _top_plans(
+        self,
+        graph: Graph,
+        vertex_to_state: Dict[int, BattleState],
+        move_labels: Dict[Tuple[int, int], str],
+        macro_edges: Dict[Tuple[int, int], MacroAction]
+    ) -> List[Dict[str, Any]]:
+        """
+        The top_k best distinct victory plans of a built graph.
+
+        Every victory vertex is a target, penalized by the HP the player's
+        team lost on the way; since the turn is part of each vertex, all
+        paths to one vertex take the same damage and the k shortest paths
+        come out ordered by (turns, damage taken).
+
+        Args:
+            graph: Battle state graph
+            vertex_to_state: Maps vertex ID -> BattleState
+            move_labels: Maps (from_vertex, to_vertex) -> move name
+            macro_edges: Maps (from_vertex, to_vertex) -> multi-turn edge
+
+        Returns:
+            Plan dicts (moveSequence, turns, damageTaken, totalDamage), best first
+        """
+        start_hp = sum(p.current_hp for p in vertex_to_state[0].player_team)
+        targets = {}
+        for vertex_id, state in vertex_to_state.items():
+            if state.player_won():
+                targets[vertex_id] = start_hp - sum(p.current_hp for p in state.player_team)
+
+        plans = []
+        seen = set()
+        for _, damage_taken, path in graph.k_shortest_paths(0, targets, self.top_k):
+            moves = self._path_moves(path, move_labels, macro_edges)
+            if tuple(moves) in seen:
+                continue
+            seen.add(tuple(moves))
+            plans.append({
+                "moveSequence": moves,
+                "turns": len(moves),
+                "damageTaken": damage_taken,
+                "totalDamage": vertex_to_state[path[-1]].get_total_damage_dealt_to_opponent()
+            })
+        return plans
+
+    def _walk_path(
+        self,
+        path: List[int],
+        vertex_to_state: Dict[int, BattleState],
+        move_labels: Mapping[Tuple[int, int], str],
+        move_sets: Dict[Tuple[int, int], Tuple[str, ...]],
+        macro_edges: Dict[Tuple[int, int], MacroAction]
+    ) -> Tuple[List[str], List]:
+        """
+        Move sequence and battle log of a graph path (multi-turn edges replayed
+        turn by turn when the log is built).
+
+        Args:
+            path: Vertex IDs from the initial state to a terminal state
+            vertex_to_state: Maps vertex ID -> BattleState
+            move_labels: Maps (from_vertex, to_vertex) -> move name used on the edge
+            move_sets: Maps (from_vertex, to_vertex) -> all equivalent move names
+            macro_edges: Maps (from_vertex, to_vertex) -> multi-turn edge
+
+        Returns:
+            Tuple of (move_sequence, battle_log)
+        """
+        move_sequence = []
+        battle_log = []
+        for i in range(len(path) - 1):
+            from_vertex = path[i]
+            to_vertex = path[i + 1]
+            edge_key = (from_vertex, to_vertex)
+            move_name = move_labels.get(edge_key)  # Just the move name
+            if not move_name:
+                continue
+
+            # Get states before and after this move
+            before_state = vertex_to_state.get(from_vertex)
+            after_state = vertex_to_state.get(to_vertex)
+
+            if edge_key in macro_edges and not self.build_log:
+                # No log wanted: the edge's move names are enough
+                move_sequence.extend(macro_edges[edge_key].move_names)
+                continue
+
+            if edge_key in macro_edges and before_state:
+                # Macro edge: replay its turns one by one
+                macro = macro_edges[edge_key]
+                for (turn_before, turn_after), turn_move in zip(macro.expand(before_state),
+                                                                macro.move_names):
+                    move_sequence.append(turn_move)
+                    self._log_battle_events(turn_before, turn_after, turn_move,
+                                            len(move_sequence), battle_log)
+                continue
+
+            move_sequence.append(move_name)
+
+            if before_state and after_state:
+                # Extract battle events by comparing states
+                self._log_battle_events(before_state, after_state, move_name, len(move_sequence),
+                                        battle_log, equivalent_moves=move_sets.get(edge_key, ()))
+
+        return move_sequence, battle_log
+
+    @staticmethod
+    def _path_moves(
+        path: List[int],
+        move_labels: Dict[Tuple[int, int], str],
+        macro_edges: Dict[Tuple[int, int], MacroAction]
+    ) -> List[str]:
+        """Move names along a graph path (multi-turn edges expanded)."""
+        moves: List[str] = []
+        for edge_key in zip(path, path[1:]):
+            if edge_key in macro_edges:
+                moves.extend(macro_edges[edge_key].move_names)
+            else:
+                moves.append(move_labels[edge_key])
+        return moves
+
+    def _prepare_search(self, initial_state: BattleState):
+        """Reset the per-run helpers and counters before building a graph."""
+        self.reporter = ProgressReporter(self.progress, self.progress_interval)
+        self.move_filter = MoveDominanceFilter() if self.prune_dominated else None
+        self.macro_planner = MacroActionPlanner(self.move_filter) if self.macro_actions else None
+        self.graph_complete = False
+        self.states_cut = 0
+        self.states_shared = 0
+
+    def _branches_pruned(self) -> int:
+        """Number of move branches removed by the dominance filter."""
+        return self.move_filter.branches_pruned if self.move_filter else 0
+
+    def _turns_fast_forwarded(self) -> int:
+        """Number of intermediate turns skipped by macro actions."""
+        return self.macro_planner.turns_skipped if self.macro_planner else 0
+
+    def _state_key(self, state: BattleState):
+        """
+        Key identifying a graph vertex (states with equal keys are merged).
+
+        Args:
+            state: Battle state
+
+        Returns:
+            Hashable vertex key (BattleState.hash_key() for the exact search)
+        """
+        return state.hash_key()
+
+    def _plan_macro(self, state: BattleState) -> Optional[MacroAction]:
+        """
+        Multi-turn edge out of a state, if any.
+
+        Args:
+            state: State about to be expanded
+
+        Returns:
+            MacroAction for forced repetition, else None (one edge per
+            distinct move)
+        """
+        # Forced repetition: one macro edge instead of one edge per turn
+        return self.macro_planner.plan(state) if self.macro_planner is not None else None
+
     def _build_graph(
         self,
-        initial_state: BattleState
-    ) -> Tuple[Graph, Dict[str, int], Dict[int, BattleState], Dict[Tuple[int, int], str]]:
+        initial_state: BattleState,
+        checkpoint: Optional[Dict[str, Any]] = None
+    ) -> Generator[None, None, Tuple[Graph, Dict[str, int], Dict[int, BattleState],
+                                     Dict[Tuple[int, int], str],
+                                     Dict[Tuple[int, int], Tuple[str, ...]],
+                                     Dict[Tuple[int, int], MacroAction]]]:
         """
-        Build a battle state graph using BFS exploration.
+        Build a battle state graph using BFS exploration (a generator that
+        yields after every expanded state and returns the graph).
+
+        Moves that lead to the same next state are merged into a single edge
+        (see BattleState.generate_unique_successor_states). States whose next
+        turns are forced get a single macro edge instead, weighted by the
+        number of turns it covers (see utils/macroActions.py).
 
         Args:
             initial_state: Starting battle state
+            checkpoint: Optional checkpoint whose graph and frontier the BFS
+                        continues from (see checkpoint())
 
         Returns:
             Tuple of:
             - Graph object
             - state_to_vertex: Maps state hash -> vertex ID
             - vertex_to_state: Maps vertex ID -> BattleState
-            - move_labels: Maps (from_vertex, to_vertex) -> move name
+            - move_labels: Maps (from_vertex, to_vertex) -> representative move name
+            - move_sets: Maps (from_vertex, to_vertex) -> all equivalent move names
+            - macro_edges: Maps (from_vertex, to_vertex) -> MacroAction
         """
         graph = Graph()
         state_to_vertex: Dict[str, int] = {}
         vertex_to_state: Dict[int, BattleState] = {}
         move_labels: Dict[Tuple[int, int], str] = {}
+        move_sets: Dict[Tuple[int, int], Tuple[str, ...]] = {}
+        macro_edges: Dict[Tuple[int, int], MacroAction] = {}
 
         # Queue for BFS: (state, vertex_id)
         queue = []
         visited = set()
 
-        # Add initial state
-        initial_hash = initial_state.hash_key()
-        initial_vertex_id = 0
-        graph.add_vertex(Vertex(vertex_id=initial_vertex_id, name=initial_hash))
-        state_to_vertex[initial_hash] = initial_vertex_id
-        vertex_to_state[initial_vertex_id] = initial_state.copy()
-        queue.append(initial_state.copy())
-        visited.add(initial_hash)
+        # Turns along the BFS tree to each vertex; the fewest turns to any
+        # victory found so far bounds the optimal path from above (progress
+        # records and current_plan)
+        turns_to: Dict[int, int] = {}
+        best_bound: Optional[int] = None
+        expanded = 0
+        self._graph_parts = (vertex_to_state, move_labels, macro_edges)
+        self._frontier = (state_to_vertex, move_sets, queue)
+        self._parents = {}
+        self._best_victory = None
+        self._expanded = 0
+
+        if checkpoint is None:
+            # Add initial state
+            initial_hash = self._state_key(initial_state)
+            initial_vertex_id = 0
+            graph.add_vertex(Vertex(vertex_id=initial_vertex_id, name=initial_hash))
+            state_to_vertex[initial_hash] = initial_vertex_id
+            vertex_to_state[initial_vertex_id] = initial_state.copy()
+            queue.append(initial_state.copy())
+            visited.add(initial_hash)
+            turns_to[initial_vertex_id] = 0
+        else:
+            # Continue an earlier run: same graph, same frontier
+            self._restore_graph(checkpoint, initial_state, graph, turns_to)
+            visited.update(state_to_vertex)
+            expanded = self._expanded
+            if self._best_victory is not None:
+                best_bound = turns_to[self._best_victory]
 
-        vertex_counter = 1
+        vertex_counter = len(vertex_to_state)
+        namespace = battle_namespace(initial_state) if self.shared_table is not None else None
 
         # BFS to explore states
         while queue and vertex_counter < self.max_states:
             current_state = queue.pop(0)
-            current_hash = current_state.hash_key()
+            current_hash = self._state_key(current_state)
             current_vertex_id = state_to_vertex[current_hash]
 
+            expanded += 1
+            self._expanded = expanded
+            self.reporter.tick(expanded, "graph", statesExpanded=expanded,
+                               statesQueued=len(queue), vertices=vertex_counter,
+                               bestBound=best_bound)
+
             # If this is a terminal state, don't explore further
             if current_state.is_battle_over():
+                yield
                 continue
 
-            # Generate successors
-            successors = current_state.generate_successor_states()
+            # Shared bounds: stop if another search proved the answer; a
+            # state already at the best known winning turn count can't lead
+            # to a faster win
+            if self.bounds is not None:
+                self.bounds.check()
+                limit = self.bounds.turns_to_win
+                if limit is not None and current_state.turn >= limit:
+                    self.states_cut += 1
+                    yield
+                    continue
+
+            # Shared visited index: another process expands this state
+            if (self.shared_table is not None and current_vertex_id != 0
+                    and not self.shared_table.claim(table_key(namespace, KIND_VISITED,
+                                                              current_state.compact_key()))):
+                self.states_shared += 1
+                yield
+                continue
 
-            for next_state, move, damage in successors:
-                next_hash = next_state.hash_key()
+            # Forced repetition: one multi-turn edge
+            macro = self._plan_macro(current_state)
+
+            if macro is not None:
+                successors = [(macro.next_state, macro.move, macro.total_damage, (macro.move.name,))]
+            else:
+                # Generate successors (one per distinct next state)
+                successors = current_state.generate_unique_successor_states(move_filter=self.move_filter)
+
+            for next_state, move, damage, move_names in successors:
+                next_hash = self._state_key(next_state)
 
                 # Add vertex if not seen
                 if next_hash not in state_to_vertex:
@@ -358,6 +780,17 @@ class DijkstraBattleOptimizer:
                     vertex_to_state[next_vertex_id] = next_state.copy()
                     vertex_counter += 1
 
+                    if self.bounds is not None and next_state.player_won():
+                        self.bounds.offer_win(next_state.turn)
+
+                    self._parents[next_vertex_id] = current_vertex_id
+                    turns_to[next_vertex_id] = turns_to[current_vertex_id] + (
+                        macro.turns if macro is not None else 1)
+                    if next_state.player_won() and (
+                            best_bound is None or turns_to[next_vertex_id] < best_bound):
+                        best_bound = turns_to[next_vertex_id]
+                        self._best_victory = next_vertex_id
+
                     # Add to queue if not visited
                     if next_hash not in visited:
                         queue.append(next_state.copy())
@@ -367,7 +800,7 @@ class DijkstraBattleOptimizer:
 
                 # Add edge with weight = 1 turn (we want minimum turns)
                 # Could also use: weight = 1 / (damage + 1) to prefer high damage
-                weight = 1.0  # Each move costs 1 turn
+                weight = float(macro.turns) if macro is not None else 1.0  # Each move costs 1 turn
 
                 graph.add_directed_edge(
                     v1=current_vertex_id,
@@ -377,8 +810,93 @@ class DijkstraBattleOptimizer:
 
                 # Record move label (auto-switch handles Pokemon changes)
                 move_labels[(current_vertex_id, next_vertex_id)] = move.name
+                move_sets[(current_vertex_id, next_vertex_id)] = move_names
+                if macro is not None:
+                    macro_edges[(current_vertex_id, next_vertex_id)] = macro
+
+            yield
+
+        self.graph_complete = not queue and not self.states_shared
+        self.reporter.report("graph_built", statesExpanded=expanded, statesQueued=len(queue),
+                             vertices=vertex_counter, bestBound=best_bound)
+
+        return graph, state_to_vertex, vertex_to_state, move_labels, move_sets, macro_edges
+
+    def _restore_graph(
+        self,
+        checkpoint: Dict[str, Any],
+        initial_state: BattleState,
+        graph: Graph,
+        turns_to: Dict[int, int]
+    ):
+        """
+        Rebuild the graph of a checkpoint into the (empty) structures of
+        _build_graph (graph, self._graph_parts, self._frontier).
 
-        return graph, state_to_vertex, vertex_to_state, move_labels
+        Args:
+            checkpoint: checkpoint() of an earlier run
+            initial_state: Starting battle state of this run
+            graph: Empty graph to fill
+            turns_to: Empty dict to fill with BFS tree turns per vertex
+
+        Raises:
+            CheckpointMismatch: If the checkpoint belongs to another battle
+                                or search settings
+        """
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("algorithm") != "dijkstra":
+            raise CheckpointMismatch("Not a Dijkstra checkpoint of this version")
+        vertex_to_state, move_labels, macro_edges = self._graph_parts
+        state_to_vertex, move_sets, queue = self._frontier
+
+        for vertex_id, state in enumerate(unpack_states(checkpoint["states"], initial_state)):
+            state_hash = self._state_key(state)
+            graph.add_vertex(Vertex(vertex_id=vertex_id, name=state_hash))
+            state_to_vertex[state_hash] = vertex_id
+            vertex_to_state[vertex_id] = state
+        if state_to_vertex.get(self._state_key(initial_state)) != 0:
+            raise CheckpointMismatch("Checkpoint starts from another battle state")
+
+        # Edges in their original order (equal-cost paths resolve the same
+        # way); multi-turn edges are recomputed, which also checks that the
+        # macro settings are the ones the checkpoint used
+        macros: Dict[int, Optional[MacroAction]] = {}
+        for from_vertex, to_vertex, label, names, is_macro in checkpoint["edges"]:
+            edge_key = (from_vertex, to_vertex)
+            weight = 1.0
+            if is_macro:
+                if from_vertex not in macros:
+                    macros[from_vertex] = self._plan_macro(vertex_to_state[from_vertex])
+                macro = macros[from_vertex]
+                if macro is None or state_to_vertex.get(self._state_key(macro.next_state)) != to_vertex:
+                    raise CheckpointMismatch("Checkpoint macro edge can't be reproduced")
+                macro_edges[edge_key] = macro
+                weight = float(macro.turns)
+            graph.add_directed_edge(v1=from_vertex, v2=to_vertex, weight=weight)
+            move_labels[edge_key] = label
+            move_sets[edge_key] = tuple(names)
+
+        # BFS tree (parents are always discovered before their children)
+        turns_to[0] = 0
+        best_bound = None
+        for vertex_id, parent in enumerate(checkpoint["parents"], start=1):
+            self._parents[vertex_id] = parent
+            macro = macro_edges.get((parent, vertex_id))
+            turns_to[vertex_id] = turns_to[parent] + (macro.turns if macro is not None else 1)
+            if vertex_to_state[vertex_id].player_won() and (
+                    best_bound is None or turns_to[vertex_id] < best_bound):
+                best_bound = turns_to[vertex_id]
+                self._best_victory = vertex_id
+
+        queue.extend(vertex_to_state[vertex_id].copy() for vertex_id in checkpoint["queue"])
+        self._expanded = checkpoint["expanded"]
+
+        # Statistics continue from the checkpoint (the recomputed macro
+        # edges above are not new work)
+        branches_pruned, turns_fast_forwarded = checkpoint["counters"]
+        if self.move_filter is not None:
+            self.move_filter.branches_pruned = branches_pruned
+        if self.macro_planner is not None:
+            self.macro_planner.turns_skipped = turns_fast_forwarded
 
     def _reconstruct_path(
         self,
@@ -415,12 +933,16 @@ class DijkstraBattleOptimizer:
         after_state: BattleState,
         player_move_name: str,
         turn_num: int,
-        battle_log: List
+        battle_log: List,
+        equivalent_moves: Tuple[str, ...] = ()
     ):
         """
         Extract battle events by comparing before and after states.
         (Same implementation as Greedy and DP algorithms)
         """
+        if not self.build_log:
+            return
+
         from utils.typeEffectiveness import TYPE_CHART
 
         # Get Pokemon before and after
@@ -469,6 +991,10 @@ class DijkstraBattleOptimizer:
                 "effectiveness": effectiveness
             })
 
+            # Other moves that would have produced exactly the same turn
+            if len(equivalent_moves) > 1:
+                battle_log[-1]["equivalentMoves"] = list(equivalent_moves)
+
         # If opponent changed, log faint and switch
         if opponent_changed:
             battle_log.append({
@@ -573,7 +1099,12 @@ class DijkstraBattleOptimizer:
 def run_dijkstra_optimizer(
     player_team: List[Pokemon],
     opponent_team: List[Pokemon],
-    max_states: int = 100000
+    max_states: int = 100000,
+    prune_dominated: bool = True,
+    macro_actions: bool = True,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True,
+    top_k: int = 1
 ) -> DijkstraResult:
     """
     Convenience function to run Dijkstra optimizer on teams.
@@ -582,6 +1113,11 @@ def run_dijkstra_optimizer(
         player_team: Player's Pokemon team
         opponent_team: Opponent's Pokemon team
         max_states: Maximum states to explore
+        prune_dominated: Skip dominated moves per matchup
+        macro_actions: Fast-forward forced repetition sequences
+        progress: Optional callback receiving progress records
+        build_log: Record the turn-by-turn battle log
+        top_k: Victory plans to return in top_plans (best first)
 
     Returns:
         DijkstraResult with optimal strategy
@@ -591,5 +1127,12 @@ def run_dijkstra_optimizer(
         opponent_team=opponent_team
     )
 
-    optimizer = DijkstraBattleOptimizer(max_states=max_states)
+    optimizer = DijkstraBattleOptimizer(
+        max_states=max_states,
+        prune_dominated=prune_dominated,
+        macro_actions=macro_actions,
+        progress=progress,
+        build_log=build_log,
+        top_k=top_k
+    )
     return optimizer.optimize(initial_state)
@@ -20,16 +20,26 @@ CS_311 Extra Credit Project
 
 import sys
 import os
-from typing import List, Tuple, Optional, Dict
+from typing import Any, Generator, List, Tuple, Optional, Dict
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from dataStructures.hash_table import HashTable
 from models.battleState import BattleState
 from models.pokemon import Pokemon
 from models.move import Move
 from utils.damageCalculator import DamageCalculator
+from utils.moveDominance import MoveDominanceFilter
+from utils.macroActions import MacroAction, MacroActionPlanner
+from utils.progress import ProgressCallback, ProgressReporter
+from utils.searchBounds import SearchBounds
+from utils.resumableSearch import ResumableSearch, make_plan
+from utils.searchCheckpoint import CHECKPOINT_VERSION, CheckpointMismatch
+from utils.sharedTranspositionTable import (SharedTranspositionTable, KIND_DP_VALUE, NO_MOVE,
+                                            battle_namespace, table_key)
 
 
 class DPResult:
@@ -45,6 +55,9 @@ class DPResult:
         cache_hits: Number of cache hits (for analysis)
         cache_misses: Number of cache misses
         states_explored: Total unique states explored
+        branches_pruned: Move branches removed by dominance pruning
+        turns_fast_forwarded: Intermediate turns skipped by macro actions
+        shared_hits: States read from the shared transposition table
     """
 
     def __init__(
@@ -57,7 +70,10 @@ class DPResult:
         cache_hits: int = 0,
         cache_misses: int = 0,
         states_explored: int = 0,
-        battle_log: List = None
+        battle_log: List = None,
+        branches_pruned: int = 0,
+        turns_fast_forwarded: int = 0,
+        shared_hits: int = 0
     ):
         self.success = success
         self.total_damage = total_damage
@@ -68,6 +84,9 @@ class DPResult:
         self.cache_misses = cache_misses
         self.states_explored = states_explored
         self.battle_log = battle_log or []
+        self.branches_pruned = branches_pruned
+        self.turns_fast_forwarded = turns_fast_forwarded
+        self.shared_hits = shared_hits
 
     def get_cache_hit_rate(self) -> float:
         """Calculate cache hit rate (0-1)."""
@@ -89,27 +108,155 @@ class DynamicProgrammingOptimizer:
     Caches results in HashTable to avoid recomputing the same states.
     """
 
-    def __init__(self, max_depth: int = 50):
+    def __init__(
+        self,
+        max_depth: int = 50,
+        prune_dominated: bool = True,
+        macro_actions: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        progress_interval: int = 1000,
+        build_log: bool = True,
+        bounds: Optional[SearchBounds] = None,
+        shared_table: Optional[SharedTranspositionTable] = None
+    ):
         """
         Create a DP optimizer.
 
         Args:
             max_depth: Maximum recursion depth (prevents stack overflow)
+            prune_dominated: Skip moves dominated in the current matchup
+                             (see utils/moveDominance.py)
+            macro_actions: Jump over forced repetition sequences in one step
+                           (see utils/macroActions.py)
+            progress: Optional callback receiving progress records (states
+                      explored, best bound, elapsed time; see utils/progress.py)
+            progress_interval: States explored between two progress records
+            build_log: Record the turn-by-turn battle log (False skips it)
+            bounds: Optional bounds shared with other searches: wins reached
+                    are offered, the search stops when another search proved
+                    the answer (see utils/searchBounds.py)
+            shared_table: Optional transposition table shared with other
+                          processes: consulted on memo misses, exact values
+                          are written to it (see utils/sharedTranspositionTable.py)
         """
         self.max_depth = max_depth
+        self.prune_dominated = prune_dominated
+        self.macro_actions = macro_actions
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.build_log = build_log
+        self.bounds = bounds
+        self.shared_table = shared_table
+        self._namespace: Optional[int] = None
+        self.reporter = ProgressReporter()
+
+        # Best damage total found so far for the first move, and that move
+        # (progress records and current_plan)
+        self.best_bound: Optional[float] = None
+        self._best_first_move: Optional[str] = None
+        self.move_filter: Optional[MoveDominanceFilter] = None
+        self.macro_planner: Optional[MacroActionPlanner] = None
+
+        # Macro actions used by _compute_optimal: state_hash -> MacroAction
+        self.macro_plans: Dict[str, MacroAction] = {}
 
         # HashTable from Assignment 7 for memoization!
         # Maps: state_hash -> (optimal_damage, best_move_name)
         self.memo = HashTable(size=1000)
 
+        # Memo keys whose value was cut short by max_depth somewhere below
+        # them (not valid for a deeper search), and depth cutoffs of the
+        # current run (none = the result is exact, nothing to resume)
+        self._truncated = set()
+        self._cutoffs = 0
+        self._complete = False
+
         # Statistics
         self.cache_hits = 0
         self.cache_misses = 0
         self.states_explored = 0
+        self.shared_hits = 0
 
     def optimize(self, initial_state: BattleState) -> DPResult:
         """
-        Run the DP algorithm on a battle.
+        Run the DP algorithm on a battle (start(initial_state).run()).
+
+        Args:
+            initial_state: Starting battle state
+
+        Returns:
+            DPResult with optimal strategy and statistics
+        """
+        return self.start(initial_state).run()
+
+    def start(self, initial_state: BattleState,
+              checkpoint: Optional[Dict[str, Any]] = None) -> ResumableSearch:
+        """
+        Start a step-wise run (one step expansion = one state computed, i.e.
+        one memo miss).
+
+        Args:
+            initial_state: Starting battle state
+            checkpoint: Optional checkpoint() of an earlier, unfinished run
+                        on the same battle: its memo table is restored first
+
+        Returns:
+            ResumableSearch (see utils/resumableSearch.py)
+
+        Raises:
+            CheckpointMismatch: (on the first step) if the checkpoint is not
+                                a DP checkpoint of this version
+        """
+        return ResumableSearch(self, self._search(initial_state, checkpoint))
+
+    @property
+    def search_complete(self) -> bool:
+        """Whether the last run finished without any max_depth cutoff (nothing to resume)."""
+        return self._complete
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Snapshot of the memo table, for start(checkpoint=...).
+
+        Entries of states with a multi-turn step are left out (the step
+        itself is not stored; those states are simply recomputed). Entries
+        cut short by max_depth are flagged and only reused by a run with the
+        same max_depth.
+
+        Returns:
+            JSON-friendly checkpoint dict
+        """
+        return {
+            "version": CHECKPOINT_VERSION,
+            "algorithm": "dp",
+            "maxDepth": self.max_depth,
+            "memo": [[key, value, move, key in self._truncated]
+                     for key, (value, move) in self.memo.get_all_entries()
+                     if key not in self.macro_plans]
+        }
+
+    def current_plan(self) -> Optional[Dict[str, Any]]:
+        """
+        Best first move found so far (the rest of the plan is only known once
+        the recursion finishes).
+
+        Returns:
+            Plan dict with bestBound (damage value), or None before the
+            first move has been valued
+        """
+        if self._best_first_move is None:
+            return None
+        return make_plan([self._best_first_move], False, 0, complete=False, bestBound=self.best_bound)
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Statistics of the running search."""
+        return {"statesExplored": self.states_explored, "cacheHits": self.cache_hits,
+                "sharedHits": self.shared_hits}
+
+    def _search(self, initial_state: BattleState,
+                checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, DPResult]:
+        """
+        Run the DP algorithm on a battle, yielding after every state computed.
 
         Algorithm:
         1. Define recurrence: optimalDamage(state) = max over moves of:
@@ -120,6 +267,7 @@ class DynamicProgrammingOptimizer:
 
         Args:
             initial_state: Starting battle state
+            checkpoint: Optional checkpoint to resume (see start())
 
         Returns:
             DPResult with optimal strategy and statistics
@@ -134,6 +282,23 @@ class DynamicProgrammingOptimizer:
         self.cache_hits = 0
         self.cache_misses = 0
         self.states_explored = 0
+        self.shared_hits = 0
+        self._namespace = None
+        if self.shared_table is not None:
+            # Only searches with the same settings share values
+            self._namespace = battle_namespace(initial_state, (
+                "dp", self.max_depth, self.prune_dominated, self.macro_actions
+            ))
+        self.move_filter = MoveDominanceFilter() if self.prune_dominated else None
+        self.macro_planner = MacroActionPlanner(self.move_filter) if self.macro_actions else None
+        self.macro_plans = {}
+        self.reporter = ProgressReporter(self.progress, self.progress_interval)
+        self.best_bound = None
+        self._best_first_move = None
+        self._cutoffs = 0
+        self._complete = False
+        if checkpoint is not None:
+            self._restore_memo(checkpoint)
 
         # Find optimal damage and best move sequence
         move_sequence = []
@@ -143,17 +308,37 @@ class DynamicProgrammingOptimizer:
 
         while not current_state.is_battle_over() and turns < self.max_depth:
             # Get best move for current state
-            best_move = self._get_best_move(current_state, depth=0)
+            best_move = yield from self._get_best_move(current_state, depth=0)
+            if turns == 0:
+                self.reporter.report("search_done", statesExplored=self.states_explored,
+                                     cacheHits=self.cache_hits, bestBound=self.best_bound)
 
             if best_move is None:
                 break
 
+            # Forced repetition: replay the macro's turns one by one
+            macro = self.macro_plans.get(current_state.hash_key())
+            if macro is not None and macro.move.name == best_move:
+                for (turn_before, turn_after), turn_move in zip(macro.expand(current_state),
+                                                                macro.move_names):
+                    if turns >= self.max_depth:
+                        break
+                    move_sequence.append(turn_move)
+                    self._log_battle_events(turn_before, turn_after, turn_move, turns + 1, battle_log)
+                    current_state = turn_after
+                    turns += 1
+                continue
+
             # Apply the move
-            successors = current_state.generate_successor_states()
+            successors = current_state.generate_unique_successor_states(move_filter=self.move_filter)
             next_state = None
-            for state, move, damage in successors:
-                if move.name == best_move:
+            move_names = ()
+            for state, move, damage, names in successors:
+                # (a value read from the shared table may name any of the
+                # equivalent moves)
+                if move.name == best_move or best_move in names:
                     next_state = state
+                    move_names = names
                     break
 
             # Record move (auto-switch handles Pokemon changes)
@@ -163,17 +348,20 @@ class DynamicProgrammingOptimizer:
                 break
 
             # Extract battle events by comparing current_state to next_state
-            self._log_battle_events(current_state, next_state, best_move, turns + 1, battle_log)
+            self._log_battle_events(current_state, next_state, best_move, turns + 1, battle_log,
+                                    equivalent_moves=move_names)
 
             current_state = next_state
             turns += 1
 
+        self._complete = self._cutoffs == 0
+
         # Calculate final statistics
         success = current_state.player_won()
         total_damage = current_state.get_total_damage_dealt_to_opponent()
 
         # Add final battle result to log
-        if current_state.is_battle_over():
+        if current_state.is_battle_over() and self.build_log:
             battle_log.append({
                 "turn": turns,
                 "event": "battle_end",
@@ -189,12 +377,15 @@ class DynamicProgrammingOptimizer:
             cache_hits=self.cache_hits,
             cache_misses=self.cache_misses,
             states_explored=self.states_explored,
-            battle_log=battle_log
+            battle_log=battle_log,
+            branches_pruned=self.move_filter.branches_pruned if self.move_filter else 0,
+            turns_fast_forwarded=self.macro_planner.turns_skipped if self.macro_planner else 0,
+            shared_hits=self.shared_hits
         )
 
-    def _get_best_move(self, state: BattleState, depth: int) -> Optional[str]:
+    def _get_best_move(self, state: BattleState, depth: int) -> Generator[None, None, Optional[str]]:
         """
-        Get the best move for a state using DP.
+        Get the best move for a state using DP (a generator, see _compute_optimal).
 
         Args:
             state: Current battle state
@@ -204,18 +395,22 @@ class DynamicProgrammingOptimizer:
             Name of the best move
         """
         # Get optimal damage and best move from DP
-        optimal_damage, best_move = self._compute_optimal(state, depth)
+        optimal_damage, best_move = yield from self._compute_optimal(state, depth)
+        if depth == 0:
+            self.best_bound = optimal_damage
         return best_move
 
     def _compute_optimal(
         self,
         state: BattleState,
         depth: int
-    ) -> Tuple[float, Optional[str]]:
+    ) -> Generator[None, None, Tuple[float, Optional[str]]]:
         """
         Compute optimal damage from a state using DP with memoization.
 
-        This is the core DP algorithm!
+        This is the core DP algorithm! It is a generator that yields after
+        every state computed (cache miss), so the search can be run step by
+        step; the recursive calls are `yield from`.
 
         Recurrence relation:
             optimalDamage(state) = max over all moves m of:
@@ -236,12 +431,15 @@ class DynamicProgrammingOptimizer:
         """
         # Base case: max depth reached
         if depth >= self.max_depth:
+            self._cutoffs += 1
             return (0.0, None)
 
         # Base case: battle is over
         if state.is_battle_over():
             if state.player_won():
                 # We won! Return total damage dealt
+                if self.bounds is not None:
+                    self.bounds.offer_win(state.turn)
                 return (float(state.get_total_damage_dealt_to_opponent()), None)
             else:
                 # We lost or tied
@@ -254,14 +452,44 @@ class DynamicProgrammingOptimizer:
         if cached_result is not None:
             # Cache hit! (Assignment 7 HashTable lookup = O(1))
             self.cache_hits += 1
+            if state_hash in self._truncated:
+                self._cutoffs += 1
             return cached_result
 
+        # Another process may have solved it already
+        if self.shared_table is not None:
+            shared_result = self._probe_shared(state)
+            if shared_result is not None:
+                self.shared_hits += 1
+                self.memo.insert(state_hash, shared_result)
+                return shared_result
+
         # Cache miss - need to compute
+        cutoffs_before = self._cutoffs
+        explored_before = self.states_explored
         self.cache_misses += 1
         self.states_explored += 1
-
-        # Generate all possible successor states
-        successors = state.generate_successor_states()
+        if self.bounds is not None:
+            self.bounds.check()
+        self.reporter.tick(self.states_explored, "search", statesExplored=self.states_explored,
+                           cacheHits=self.cache_hits, bestBound=self.best_bound)
+        yield
+
+        # Forced repetition: jump straight to the end of the sequence
+        macro = None
+        if self.macro_planner is not None:
+            macro = self.macro_planner.plan(state, max_turns=self.max_depth - depth)
+
+        if macro is not None:
+            self.macro_plans[state_hash] = macro
+            future_damage, _ = yield from self._compute_optimal(macro.next_state, depth + macro.turns)
+            result = (macro.total_damage + future_damage, macro.move.name)
+            self._remember(state, state_hash, result, cutoffs_before, explored_before)
+            return result
+
+        # Generate all distinct successor states (dominated moves pruned,
+        # moves leading to the same state merged)
+        successors = state.generate_unique_successor_states(move_filter=self.move_filter)
 
         if not successors:
             # No valid moves
@@ -272,9 +500,9 @@ class DynamicProgrammingOptimizer:
         best_total_damage = -1.0
         best_move_name = None
 
-        for next_state, move, immediate_damage in successors:
+        for next_state, move, immediate_damage, _ in successors:
             # Recursive call to get optimal damage from next state
-            future_damage, _ = self._compute_optimal(next_state, depth + 1)
+            future_damage, _ = yield from self._compute_optimal(next_state, depth + 1)
 
             # Total damage = immediate + future
             total_damage = immediate_damage + future_damage
@@ -282,25 +510,102 @@ class DynamicProgrammingOptimizer:
             if total_damage > best_total_damage:
                 best_total_damage = total_damage
                 best_move_name = move.name
+                if depth == 0:
+                    self.best_bound = total_damage
+                    self._best_first_move = move.name
 
         # Cache the result in HashTable (Assignment 7!)
         result = (best_total_damage, best_move_name)
-        self.memo.insert(state_hash, result)
+        self._remember(state, state_hash, result, cutoffs_before, explored_before)
 
         return result
 
+    def _remember(self, state: BattleState, state_hash: str, result: Tuple[float, Optional[str]],
+                  cutoffs_before: int, explored_before: int):
+        """
+        Memoize a computed state, flagging it if max_depth cut its subtree.
+
+        Exact values are also offered to the shared table, weighted by the
+        states computed for them (entries of states with a multi-turn step
+        are kept local, as in checkpoint()).
+
+        Args:
+            state: State computed
+            state_hash: State key
+            result: (optimal_damage, best_move_name)
+            cutoffs_before: self._cutoffs when the state's computation began
+            explored_before: self.states_explored when it began
+        """
+        self.memo.insert(state_hash, result)
+        if self._cutoffs > cutoffs_before:
+            self._truncated.add(state_hash)
+            return
+        self._truncated.discard(state_hash)
+
+        if self.shared_table is not None and state_hash not in self.macro_plans:
+            value, move_name = result
+            moves = [m.name for m in state.get_active_player_pokemon().moves]
+            move = moves.index(move_name) if move_name in moves else NO_MOVE
+            self.shared_table.store(table_key(self._namespace, KIND_DP_VALUE, state.compact_key()),
+                                    value, move=move, depth=self.states_explored - explored_before)
+
+    def _probe_shared(self, state: BattleState) -> Optional[Tuple[float, Optional[str]]]:
+        """
+        Read a state's value from the shared table.
+
+        Args:
+            state: State to look up
+
+        Returns:
+            (optimal_damage, best_move_name), or None if not stored
+        """
+        entry = self.shared_table.probe(table_key(self._namespace, KIND_DP_VALUE, state.compact_key()))
+        if entry is None:
+            return None
+        moves = state.get_active_player_pokemon().moves
+        if entry.move == NO_MOVE:
+            return (entry.value, None)
+        if entry.move >= len(moves):
+            return None
+        return (entry.value, moves[entry.move].name)
+
+    def _restore_memo(self, checkpoint: Dict[str, Any]):
+        """
+        Load the memo entries of a checkpoint.
+
+        Args:
+            checkpoint: checkpoint() of an earlier run
+
+        Raises:
+            CheckpointMismatch: If it is not a DP checkpoint of this version
+        """
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("algorithm") != "dp":
+            raise CheckpointMismatch("Not a DP checkpoint of this version")
+        same_depth = checkpoint.get("maxDepth") == self.max_depth
+        for key, value, move, truncated in checkpoint["memo"]:
+            if truncated and not same_depth:
+                # Valued with another depth limit: compute it again
+                continue
+            self.memo.insert(key, (value, move))
+            if truncated:
+                self._truncated.add(key)
+
     def _log_battle_events(
         self,
         before_state: BattleState,
         after_state: BattleState,
         player_move_name: str,
         turn_num: int,
-        battle_log: List
+        battle_log: List,
+        equivalent_moves: Tuple[str, ...] = ()
     ):
         """
         Extract battle events by comparing before and after states.
         (Same implementation as Greedy algorithm)
         """
+        if not self.build_log:
+            return
+
         from utils.typeEffectiveness import TYPE_CHART
 
         # Get Pokemon before and after
@@ -349,6 +654,10 @@ class DynamicProgrammingOptimizer:
                 "effectiveness": effectiveness
             })
 
+            # Other moves that would have produced exactly the same turn
+            if len(equivalent_moves) > 1:
+                battle_log[-1]["equivalentMoves"] = list(equivalent_moves)
+
         # If opponent changed, log faint and switch
         if opponent_changed:
             battle_log.append({
@@ -453,7 +762,12 @@ class DynamicProgrammingOptimizer:
 def run_dp_optimizer(
     player_team: List[Pokemon],
     opponent_team: List[Pokemon],
-    max_depth: int = 50
+    max_depth: int = 50,
+    prune_dominated: bool = True,
+    macro_actions: bool = True,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True,
+    shared_table: Optional[SharedTranspositionTable] = None
 ) -> DPResult:
     """
     Convenience function to run DP optimizer on teams.
@@ -462,6 +776,11 @@ def run_dp_optimizer(
         player_team: Player's Pokemon team
         opponent_team: Opponent's Pokemon team
         max_depth: Maximum recursion depth
+        prune_dominated: Skip dominated moves per matchup
+        macro_actions: Fast-forward forced repetition sequences
+        progress: Optional callback receiving progress records
+        build_log: Record the turn-by-turn battle log
+        shared_table: Optional transposition table shared with other processes
 
     Returns:
         DPResult with optimal strategy
@@ -471,5 +790,12 @@ def run_dp_optimizer(
         opponent_team=opponent_team
     )
 
-    optimizer = DynamicProgrammingOptimizer(max_depth=max_depth)
+    optimizer = DynamicProgrammingOptimizer(
+        max_depth=max_depth,
+        prune_dominated=prune_dominated,
+        macro_actions=macro_actions,
+        progress=progress,
+        build_log=build_log,
+        shared_table=shared_table
+    )
     return optimizer.optimize(initial_state)
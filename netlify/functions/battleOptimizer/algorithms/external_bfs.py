@@ -0,0 +1,514 @@
+"""
+External-Memory BFS - Enumerate Battle State Spaces Larger Than RAM
+
+DijkstraBattleOptimizer keeps every state, edge and the whole frontier in
+dicts, so a full enumeration (auditing how hard a boss is for a team) stops
+at max_states or at the machine's memory. This BFS keeps only a bounded
+buffer in memory and everything else on disk:
+
+- States are packed into the fixed-size binary records of
+  utils/battleStateCodec.py: the vertex key (turn, active slots, every HP)
+  followed by every move's PP. Keys are big-endian, so sorting the raw
+  bytes sorts by key
+- The graph is layered by turn (the turn is part of the key and every edge
+  moves it forward), so layers are expanded in turn order and two layers
+  can never hold the same state: duplicates only need removing inside a
+  layer, never against earlier ones
+- Successors are buffered per turn; a full buffer is written as sorted,
+  deduplicated runs. Before a layer is expanded its runs are k-way merged
+  into one sorted layer file (equal keys keep the smallest record, so the
+  result doesn't depend on discovery order), whose position gives the
+  vertex ID
+- Edges are streamed to one file per source layer as (source ID, target
+  key, move, equivalent moves, macro flag); target keys are resolved to IDs
+  by binary search in the memory-mapped target layer
+
+run_external_bfs() returns the enumeration summary (per-layer counts,
+fastest win, best defeat) without ever loading the graph.
+ExternalBFSDijkstraOptimizer loads the files back into the usual Graph so
+the existing shortest-path extraction, battle log and result formatting run
+unchanged - for spaces that are large to enumerate but fit once built.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import heapq
+import mmap
+import shutil
+import struct
+import logging
+import tempfile
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from algorithms.dijkstra import DijkstraBattleOptimizer
+from dataStructures.graph import Graph, Vertex
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from utils.moveDominance import MoveDominanceFilter
+from utils.macroActions import MacroActionPlanner
+from utils.progress import ProgressCallback, ProgressReporter
+from utils.searchCheckpoint import CheckpointMismatch
+from utils.battleStateCodec import BattleStateCodec
+
+logger = logging.getLogger()
+
+# Successor records kept in memory before they are written as sorted runs
+DEFAULT_RUN_RECORDS = 200000
+
+
+class _Layer:
+    """One sorted, deduplicated layer file (all states of one turn)."""
+
+    def __init__(self, path: str, turn: int, base: int, count: int, codec: BattleStateCodec):
+        self.path = path
+        self.turn = turn
+        self.base = base
+        self.count = count
+        self.codec = codec
+        self._file = None
+        self._map = None
+
+    def records(self) -> Iterator[bytes]:
+        """Records in vertex ID order."""
+        return _iter_records(self.path, self.codec.size)
+
+    def find(self, key: bytes) -> Optional[int]:
+        """Vertex ID of a key (binary search in the mapped file), None if absent."""
+        if self.count == 0:
+            return None
+        if self._map is None:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size, key_size = self.codec.size, self.codec.key_size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * size
+            if self._map[offset:offset + key_size] < key:
+                low = middle + 1
+            else:
+                high = middle
+        offset = low * size
+        if low < self.count and self._map[offset:offset + key_size] == key:
+            return self.base + low
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+
+def _iter_records(path: str, size: int) -> Iterator[bytes]:
+    """Records of a run or layer file, read through a memory map."""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in range(0, len(mapped), size):
+            yield mapped[offset:offset + size]
+
+
+def _unique(records: Iterator[bytes], key_size: int) -> Iterator[bytes]:
+    """First record of every key in a sorted stream (the smallest one)."""
+    last_key = None
+    for record in records:
+        key = record[:key_size]
+        if key != last_key:
+            last_key = key
+            yield record
+
+
+class ExternalBFS:
+    """
+    Disk-backed breadth-first enumeration of a battle's state space.
+
+    Expansion rules (dominance pruning, macro edges) are those
+    of the DijkstraBattleOptimizer it is given.
+
+    Attributes:
+        directory: Where the run, layer and edge files live
+        layers: Finalized layers in turn order
+        complete: Whether every reachable state was enumerated
+    """
+
+    def __init__(self, optimizer: DijkstraBattleOptimizer, initial_state: BattleState,
+                 directory: str, run_records: int = DEFAULT_RUN_RECORDS):
+        """
+        Prepare an enumeration (run with explore()).
+
+        Args:
+            optimizer: Optimizer whose move filter / macro planner are set
+                       up for this battle
+            initial_state: Starting battle state
+            directory: Empty working directory
+            run_records: Successor records buffered before a run is written
+        """
+        self.optimizer = optimizer
+        self.initial_state = initial_state
+        self.directory = directory
+        self.run_records = max(1, run_records)
+        self.codec = BattleStateCodec(initial_state)
+        self._edge = struct.Struct(f">I{self.codec.key_size}sBBB")
+        self.layers: List[_Layer] = []
+        self.complete = False
+
+        # Successors waiting for their layer: turn -> in-memory records and run files
+        self._buffers: Dict[int, List[bytes]] = {}
+        self._runs: Dict[int, List[str]] = {}
+        self._buffered = 0
+        self._run_counter = 0
+        self._written: List[str] = []  # Every file this enumeration created
+
+        # Summary
+        self.vertices = 0
+        self.edges = 0
+        self.expanded = 0
+        self.runs_written = 0
+        self.victories = 0
+        self.defeats = 0
+        self.best_victory: Optional[Tuple[int, int]] = None  # (turns, vertex)
+        self.best_defeat: Optional[Tuple[int, int]] = None   # (damage, vertex)
+
+    def explore(self, max_states: Optional[int] = None) -> Generator[None, None, None]:
+        """
+        Enumerate layer by layer, yielding after every state expanded.
+
+        Args:
+            max_states: Stop before expanding a layer once this many states
+                        are known (None = no limit)
+        """
+        self._add(self.codec.encode(self.initial_state))
+        reporter = self.optimizer.reporter
+        stopped = False
+
+        while self._buffers or self._runs:
+            turn = min(set(self._buffers) | set(self._runs))
+            layer = self._finalize(turn)
+            if max_states is not None and self.vertices >= max_states:
+                stopped = True
+                break
+
+            with open(self._new_file(f"edges-{turn}.bin"), "wb") as edge_file:
+                for vertex_id, record in enumerate(layer.records(), start=layer.base):
+                    state = self.codec.decode(record)
+                    self.expanded += 1
+                    reporter.tick(self.expanded, "graph", statesExpanded=self.expanded,
+                                  vertices=self.vertices, layer=turn, runsWritten=self.runs_written)
+                    if state.is_battle_over():
+                        self._count_terminal(state, vertex_id)
+                        yield
+                        continue
+                    self._expand(state, vertex_id, edge_file)
+                    yield
+
+        self.complete = not stopped
+        for layer in self.layers:
+            layer.close()
+
+    def summary(self) -> Dict[str, Any]:
+        """Enumeration summary (JSON-friendly)."""
+        return {
+            "complete": self.complete,
+            "states": self.vertices,
+            "edges": self.edges,
+            "statesExpanded": self.expanded,
+            "runsWritten": self.runs_written,
+            "layers": [[layer.turn, layer.count] for layer in self.layers],
+            "victories": self.victories,
+            "defeats": self.defeats,
+            "fewestTurnsToWin": self.best_victory[0] if self.best_victory else None,
+            "bestDefeatDamage": self.best_defeat[0] if self.best_defeat else None
+        }
+
+    def load(self, optimizer: DijkstraBattleOptimizer) -> Tuple:
+        """
+        Read the files back as the in-memory graph of _build_graph.
+
+        Args:
+            optimizer: Optimizer whose _plan_macro rebuilds the macro edges
+
+        Returns:
+            (graph, state_to_vertex, vertex_to_state, move_labels, move_sets,
+            macro_edges) as returned by DijkstraBattleOptimizer._build_graph
+        """
+        graph = Graph()
+        state_to_vertex: Dict[str, int] = {}
+        vertex_to_state: Dict[int, BattleState] = {}
+        move_labels, move_sets, macro_edges = {}, {}, {}
+
+        for layer in self.layers:
+            for vertex_id, record in enumerate(layer.records(), start=layer.base):
+                state = self.codec.decode(record)
+                state_hash = optimizer._state_key(state)
+                graph.add_vertex(Vertex(vertex_id=vertex_id, name=state_hash))
+                state_to_vertex[state_hash] = vertex_id
+                vertex_to_state[vertex_id] = state
+
+        by_turn = {layer.turn: layer for layer in self.layers}
+        for layer in self.layers:
+            path = self._path(f"edges-{layer.turn}.bin")
+            if not os.path.exists(path):
+                continue
+            for record in _iter_records(path, self._edge.size):
+                from_vertex, to_key, move_index, names_mask, is_macro = self._edge.unpack(record)
+                to_layer = by_turn.get(struct.unpack_from(">H", to_key)[0])
+                to_vertex = to_layer.find(to_key) if to_layer is not None else None
+                if to_vertex is None:
+                    continue  # Target layer not enumerated (max_states)
+                before = vertex_to_state[from_vertex]
+                moves = before.get_active_player_pokemon().moves
+                edge_key = (from_vertex, to_vertex)
+                weight = 1.0
+                if is_macro:
+                    macro = optimizer._plan_macro(before)
+                    macro_edges[edge_key] = macro
+                    weight = float(macro.turns)
+                graph.add_directed_edge(v1=from_vertex, v2=to_vertex, weight=weight)
+                move_labels[edge_key] = moves[move_index].name
+                move_sets[edge_key] = tuple(m.name for i, m in enumerate(moves) if names_mask >> i & 1)
+        for layer in self.layers:
+            layer.close()
+
+        return graph, state_to_vertex, vertex_to_state, move_labels, move_sets, macro_edges
+
+    def _expand(self, state: BattleState, vertex_id: int, edge_file):
+        """Buffer a state's successors and write its edges."""
+        macro = self.optimizer._plan_macro(state)
+        if macro is not None:
+            successors = [(macro.next_state, macro.move, macro.total_damage, (macro.move.name,))]
+        else:
+            successors = state.generate_unique_successor_states(move_filter=self.optimizer.move_filter)
+
+        moves = [m.name for m in state.get_active_player_pokemon().moves]
+        for next_state, move, _, move_names in successors:
+            self._add(self.codec.encode(next_state))
+            names_mask = 0
+            for name in move_names:
+                names_mask |= 1 << moves.index(name)
+            edge_file.write(self._edge.pack(vertex_id, self.codec.key(next_state),
+                                            moves.index(move.name), names_mask, macro is not None))
+            self.edges += 1
+
+    def _count_terminal(self, state: BattleState, vertex_id: int):
+        if state.player_won():
+            self.victories += 1
+            if self.best_victory is None:  # Layers come in turn order
+                self.best_victory = (state.turn, vertex_id)
+        else:
+            self.defeats += 1
+            damage = state.get_total_damage_dealt_to_opponent()
+            if damage > 0 and (self.best_defeat is None or damage > self.best_defeat[0]):
+                self.best_defeat = (damage, vertex_id)
+
+    def _add(self, record: bytes):
+        """Buffer a discovered state (spilling runs when the buffer is full)."""
+        turn = struct.unpack_from(">H", record)[0]
+        self._buffers.setdefault(turn, []).append(record)
+        self._buffered += 1
+        if self._buffered >= self.run_records:
+            for buffered_turn in list(self._buffers):
+                self._spill(buffered_turn)
+
+    def _spill(self, turn: int):
+        """Write a turn's buffered records as one sorted, deduplicated run."""
+        records = self._buffers.pop(turn, [])
+        self._buffered -= len(records)
+        records.sort()
+        self._run_counter += 1
+        path = self._new_file(f"run-{turn}-{self._run_counter}.bin")
+        with open(path, "wb") as f:
+            for record in _unique(iter(records), self.codec.key_size):
+                f.write(record)
+        self._runs.setdefault(turn, []).append(path)
+        self.runs_written += 1
+
+    def _finalize(self, turn: int) -> _Layer:
+        """Merge a turn's runs into its layer file and number its states."""
+        if turn in self._buffers:
+            self._spill(turn)
+        runs = self._runs.pop(turn)
+        path = self._new_file(f"layer-{turn}.bin")
+        count = 0
+        with open(path, "wb") as f:
+            merged = heapq.merge(*(_iter_records(run, self.codec.size) for run in runs))
+            for record in _unique(merged, self.codec.key_size):
+                f.write(record)
+                count += 1
+        for run in runs:
+            os.remove(run)
+        layer = _Layer(path, turn, self.vertices, count, self.codec)
+        self.layers.append(layer)
+        self.vertices += count
+        return layer
+
+    def remove_files(self):
+        """Delete the run, layer and edge files this enumeration wrote (nothing else)."""
+        for layer in self.layers:
+            layer.close()
+        for path in self._written:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._written = []
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _new_file(self, name: str) -> str:
+        """Path of a file about to be written (remembered for remove_files)."""
+        path = self._path(name)
+        self._written.append(path)
+        return path
+
+
+def _working_directory(directory: Optional[str]) -> Tuple[str, bool]:
+    """
+    Resolve the working directory.
+
+    Args:
+        directory: Caller's directory (None = a new temporary one)
+
+    Returns:
+        Tuple of (directory, whether it was created here with mkdtemp and
+        may therefore be deleted as a whole)
+    """
+    if not directory:
+        return tempfile.mkdtemp(prefix="battleBfs"), True
+    os.makedirs(directory, exist_ok=True)
+    return directory, False
+
+
+def _clean_up(bfs: ExternalBFS, created: bool):
+    """Delete an enumeration's files, and its directory only if it was a temporary one."""
+    bfs.remove_files()
+    if created:
+        shutil.rmtree(bfs.directory, ignore_errors=True)
+
+
+class ExternalBFSDijkstraOptimizer(DijkstraBattleOptimizer):
+    """
+    Dijkstra optimizer whose graph is enumerated by the external-memory BFS.
+
+    Same settings and DijkstraResult as DijkstraBattleOptimizer; the graph is
+    built on disk, then loaded for the shortest-path extraction. Shared
+    SearchBounds and checkpoints are not used.
+
+    Attributes:
+        summary: ExternalBFS.summary() of the last run
+    """
+
+    def __init__(self, directory: Optional[str] = None, run_records: int = DEFAULT_RUN_RECORDS,
+                 keep_files: bool = False, **kwargs: Any):
+        """
+        Create an external-memory Dijkstra optimizer.
+
+        Args:
+            directory: Working directory (None = a new temporary one). A
+                       caller's directory is never deleted, only the files
+                       the search wrote into it
+            run_records: Successor records buffered before a run is written
+            keep_files: Leave the layer and edge files behind
+            **kwargs: DijkstraBattleOptimizer settings (max_states, ...)
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.run_records = run_records
+        self.keep_files = keep_files
+        self.summary: Optional[Dict[str, Any]] = None
+
+    def _build_graph(self, initial_state: BattleState,
+                     checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, Tuple]:
+        """
+        Enumerate on disk, then load the graph (see DijkstraBattleOptimizer._build_graph).
+
+        Raises:
+            CheckpointMismatch: If a checkpoint is given
+        """
+        if checkpoint is not None:
+            raise CheckpointMismatch("External-memory searches can't resume from a checkpoint")
+        self._graph_parts = None
+        self._frontier = None
+        self._expanded = 0
+
+        directory, created = _working_directory(self.directory)
+        bfs = ExternalBFS(self, initial_state, directory, self.run_records)
+        try:
+            for _ in bfs.explore(self.max_states):
+                self._expanded = bfs.expanded
+                yield
+            self.summary = bfs.summary()
+            self.graph_complete = bfs.complete
+            logger.info(f"[EXTERNAL BFS] {bfs.vertices} states in {len(bfs.layers)} layers, "
+                        f"{bfs.runs_written} runs written")
+
+            # Macro edges are rebuilt while loading: not new work
+            counters = (self._branches_pruned(), self._turns_fast_forwarded())
+            parts = bfs.load(self)
+            if self.move_filter is not None:
+                self.move_filter.branches_pruned = counters[0]
+            if self.macro_planner is not None:
+                self.macro_planner.turns_skipped = counters[1]
+        finally:
+            if not self.keep_files:
+                _clean_up(bfs, created)
+
+        self.reporter.report("graph_built", statesExpanded=bfs.expanded, vertices=bfs.vertices,
+                             bestBound=self.summary["fewestTurnsToWin"])
+        return parts
+
+
+def run_external_bfs(
+    player_team: List[Pokemon],
+    opponent_team: List[Pokemon],
+    directory: Optional[str] = None,
+    max_states: Optional[int] = None,
+    run_records: int = DEFAULT_RUN_RECORDS,
+    keep_files: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Enumerate a battle's whole state space on disk (no graph in memory).
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+        directory: Working directory (None = a new temporary one). A caller's
+                   directory is never deleted, only the files written into it
+        max_states: Stop once this many states are known (None = everything)
+        run_records: Successor records buffered before a run is written
+        keep_files: Leave the layer and edge files behind
+        progress: Optional callback receiving progress records
+
+    Returns:
+        ExternalBFS.summary(): per-layer state counts, victories, defeats,
+        fewest turns to win, best defeat damage, completeness
+    """
+    initial_state = BattleState(player_team=player_team, opponent_team=opponent_team)
+
+    # The optimizer only provides the expansion rules
+    optimizer = DijkstraBattleOptimizer(progress=progress)
+    optimizer.reporter = ProgressReporter(progress, optimizer.progress_interval)
+    optimizer.move_filter = MoveDominanceFilter()
+    optimizer.macro_planner = MacroActionPlanner(optimizer.move_filter)
+
+    directory, created = _working_directory(directory)
+    bfs = ExternalBFS(optimizer, initial_state, directory, run_records)
+    try:
+        for _ in bfs.explore(max_states):
+            pass
+        return bfs.summary()
+    finally:
+        if not keep_files:
+            _clean_up(bfs, created)
@@ -0,0 +1,380 @@
+"""
+Gauntlet Mode - Back-to-Back Battles With HP and PP Carried Over
+
+In the games the Elite Four are fought one after the other without a Pokemon
+Center in between: the HP and PP left after one battle are what the next one
+starts with. Searching the whole gauntlet as one battle would multiply the
+state spaces of every stage, so it is planned stage by stage instead:
+
+    stage 1: full team       -> stage search -> end states E1
+    stage 2: each state in E1 -> stage search -> end states E2
+    ...
+    best plan: fewest total turns over the final end states (back pointers)
+
+- Stage search: ParetoBattleOptimizer on (incoming team, fresh opponent).
+  Its front is exactly the set of wins worth carrying over - no other win
+  is faster AND loses less HP AND fewer Pokemon AND spends less PP. Each
+  plan is replayed from the incoming state to get the exact end team (the
+  graph's vertex keys leave PP out)
+- Frontier: end states with the same HP and PP keep the fewest total turns;
+  a state no faster than another one, with no more HP or PP on any Pokemon,
+  is dropped; at most max_frontier states (most HP left first, then fewest
+  turns) go on to the next stage
+- Stage cache: a stage's end states depend only on the incoming team (and
+  the opponent team), so they are cached across requests (LRU, MAX_STAGE_CACHE):
+  equal incoming states are searched once, and so is the opening stage of
+  every gauntlet with the same team
+
+The work is one stage search per frontier state per stage - a sum over the
+stages, not a product. With a time limit, stage searches are stepped and
+stopped at the deadline: the plan then covers the stages finished so far
+(timed_out), and every stage search that did finish is in the stage cache,
+so sending the same gauntlet again continues where this one stopped.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from algorithms.pareto import ParetoBattleOptimizer
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+
+logger = logging.getLogger()
+
+# End states carried into the next stage (default)
+DEFAULT_MAX_FRONTIER = 8
+
+# Stage results kept across requests (least recently used evicted first)
+MAX_STAGE_CACHE = 256
+
+# Stage-search expansions between two deadline checks
+DEADLINE_STEP_SIZE = 500
+
+# (stage cache key) -> [(end team, stage plan)]
+_STAGE_CACHE: "OrderedDict[Hashable, List[Tuple[List[Pokemon], Dict[str, Any]]]]" = OrderedDict()
+
+
+class GauntletResult:
+    """
+    Result of a gauntlet plan.
+
+    Attributes:
+        success: Whether every opponent is beaten
+        total_turns: Turns of the whole plan (of the cleared stages on failure)
+        stages: One dict per cleared stage (opponent, moveSequence, turns,
+                hpLost, faints, team - HP and PP after the battle)
+        stages_cleared: Number of opponents beaten
+        final_team: Player team after the last cleared stage
+        stage_searches: Stage searches run
+        stage_cache_hits: Stage searches answered from the stage cache
+        states_explored: States in all stage graphs searched
+        frontier_sizes: End states carried out of each stage
+        timed_out: Whether the time limit stopped planning (success is then
+                   False and stages are the ones finished in time)
+    """
+
+    def __init__(
+        self,
+        success: bool,
+        total_turns: int,
+        stages: List[Dict[str, Any]],
+        final_team: List[Pokemon],
+        stage_searches: int,
+        stage_cache_hits: int,
+        states_explored: int,
+        frontier_sizes: List[int],
+        timed_out: bool = False
+    ):
+        self.success = success
+        self.total_turns = total_turns
+        self.stages = stages
+        self.stages_cleared = len(stages)
+        self.final_team = final_team
+        self.stage_searches = stage_searches
+        self.stage_cache_hits = stage_cache_hits
+        self.states_explored = states_explored
+        self.frontier_sizes = frontier_sizes
+        self.timed_out = timed_out
+
+    def __repr__(self) -> str:
+        return (f"GauntletResult(success={self.success}, stages_cleared={self.stages_cleared}, "
+                f"total_turns={self.total_turns})")
+
+
+class _CarryState:
+    """One frontier entry: the team after a stage and how it got there."""
+
+    __slots__ = ("team", "turns", "parent", "plan")
+
+    def __init__(self, team: List[Pokemon], turns: int,
+                 parent: Optional["_CarryState"], plan: Optional[Dict[str, Any]]):
+        self.team = team
+        self.turns = turns
+        self.parent = parent
+        self.plan = plan
+
+    def hp_left(self) -> int:
+        return sum(p.current_hp for p in self.team)
+
+
+class GauntletPlanner:
+    """
+    Plans a sequence of battles with HP and PP carried over (see module docs).
+
+    Attributes:
+        max_states: Graph size limit of each stage search
+        max_frontier: End states carried from one stage into the next
+        stage_searches: Stage searches run by the last plan()
+        stage_cache_hits: Stage searches answered from the stage cache
+        states_explored: States in all stage graphs of the last plan()
+        time_limit_ms: Planning time allowed per plan() (None = no limit)
+    """
+
+    def __init__(self, max_states: int = 50000, max_frontier: int = DEFAULT_MAX_FRONTIER,
+                 use_stage_cache: bool = True, time_limit_ms: Optional[float] = None):
+        """
+        Create a gauntlet planner.
+
+        Args:
+            max_states: Maximum states in each stage graph
+            max_frontier: End states carried into the next stage (1 = greedy:
+                          only the best end state of each stage)
+            use_stage_cache: Read and fill the stage cache (False searches
+                             every stage, like the first request would)
+            time_limit_ms: Planning time allowed per plan() (None = no limit)
+        """
+        self.max_states = max_states
+        self.max_frontier = max_frontier
+        self.use_stage_cache = use_stage_cache
+        self.time_limit_ms = time_limit_ms
+        self.stage_searches = 0
+        self.stage_cache_hits = 0
+        self.states_explored = 0
+        self._deadline: Optional[float] = None
+
+    def plan(self, player_team: List[Pokemon],
+             opponents: List[Tuple[str, List[Pokemon]]]) -> GauntletResult:
+        """
+        Plan the whole gauntlet.
+
+        Args:
+            player_team: Player's team at the start (not modified)
+            opponents: (name, team) of each opponent, in battle order
+
+        Returns:
+            GauntletResult (on failure or timeout, the stages cleared by the
+            furthest plan, keeping the most HP)
+        """
+        self.stage_searches = 0
+        self.stage_cache_hits = 0
+        self.states_explored = 0
+        self._deadline = (time.perf_counter() + self.time_limit_ms / 1000.0
+                          if self.time_limit_ms is not None else None)
+
+        frontier = [_CarryState([p.clone() for p in player_team], 0, None, None)]
+        frontier_sizes = []
+        for opponent_name, opponent_team in opponents:
+            next_frontier: Dict[Tuple, _CarryState] = {}
+            for carry in frontier:
+                outcomes = self._stage(carry.team, opponent_team)
+                if outcomes is None:
+                    logger.info(f"[GAUNTLET] Out of time against {opponent_name}")
+                    best = max(frontier, key=lambda c: (c.hp_left(), -c.turns))
+                    return self._result(False, best, frontier_sizes, timed_out=True)
+                for end_team, plan in outcomes:
+                    key = _team_state(end_team)
+                    turns = carry.turns + plan["turns"]
+                    known = next_frontier.get(key)
+                    if known is None or turns < known.turns:
+                        next_frontier[key] = _CarryState(end_team, turns, carry,
+                                                         dict(plan, opponent=opponent_name))
+            if not next_frontier:
+                logger.info(f"[GAUNTLET] No win against {opponent_name} from {len(frontier)} states")
+                best = max(frontier, key=lambda c: (c.hp_left(), -c.turns))
+                return self._result(False, best, frontier_sizes)
+            frontier = self._prune(list(next_frontier.values()))
+            frontier_sizes.append(len(frontier))
+
+        best = min(frontier, key=lambda c: (c.turns, -c.hp_left()))
+        return self._result(True, best, frontier_sizes)
+
+    def _stage(self, team: List[Pokemon],
+               opponent_team: List[Pokemon]) -> Optional[List[Tuple[List[Pokemon], Dict[str, Any]]]]:
+        """
+        End states of every Pareto-optimal win of one stage (cached).
+
+        Args:
+            team: Incoming player team (not modified)
+            opponent_team: Opponent team at full HP (not modified)
+
+        Returns:
+            List of (end team, plan dict), each end team a fresh copy, or
+            None if the deadline passed before the stage search finished
+        """
+        cache_key = (_team_signature(opponent_team), self.max_states, _team_signature(team))
+        cached = _STAGE_CACHE.get(cache_key) if self.use_stage_cache else None
+        if cached is not None:
+            _STAGE_CACHE.move_to_end(cache_key)
+            self.stage_cache_hits += 1
+            return [([p.clone() for p in end_team], plan) for end_team, plan in cached]
+
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return None
+        self.stage_searches += 1
+        initial_state = BattleState([p.clone() for p in team], [p.clone() for p in opponent_team],
+                                    player_active=_first_alive(team))
+        optimizer = ParetoBattleOptimizer(max_states=self.max_states, build_log=False)
+        search = optimizer.start(initial_state)
+        while not search.done:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return None  # Unfinished: nothing cached, a resend searches it again
+            search.step(DEADLINE_STEP_SIZE)
+        result = search.result
+        self.states_explored += result.states_explored
+
+        outcomes = []
+        for plan in result.pareto_front or []:
+            end_state = _replay(initial_state, plan["moveSequence"])
+            if end_state is None or not end_state.player_won():
+                continue  # Relied on PP the merged graph state didn't really have
+            outcomes.append((end_state.player_team, {
+                "moveSequence": plan["moveSequence"],
+                "turns": plan["turns"],
+                "hpLost": plan["hpLost"],
+                "faints": plan["faints"]
+            }))
+
+        if self.use_stage_cache:
+            _STAGE_CACHE[cache_key] = outcomes
+            while len(_STAGE_CACHE) > MAX_STAGE_CACHE:
+                _STAGE_CACHE.popitem(last=False)
+        return [([p.clone() for p in end_team], plan) for end_team, plan in outcomes]
+
+    def _prune(self, states: List[_CarryState]) -> List[_CarryState]:
+        """
+        Drop dominated end states, then keep the max_frontier best ones.
+
+        A state is dominated by another one that took no more turns and has
+        at least as much HP and PP on every Pokemon.
+        """
+        states.sort(key=lambda c: (c.turns, -c.hp_left()))
+        kept: List[_CarryState] = []
+        resources = []
+        for carry in states:
+            mine = _team_resources(carry.team)
+            # Sorted by turns: only earlier (no slower) states can dominate
+            if any(all(a >= b for a, b in zip(other, mine)) for other in resources):
+                continue
+            kept.append(carry)
+            resources.append(mine)
+        kept.sort(key=lambda c: (-c.hp_left(), c.turns))
+        return kept[:self.max_frontier]
+
+    def _result(self, success: bool, best: _CarryState, frontier_sizes: List[int],
+                timed_out: bool = False) -> GauntletResult:
+        """Build the result by following back pointers from the chosen end state."""
+        stages = []
+        carry = best
+        while carry.plan is not None:
+            stages.append(dict(carry.plan, team=_team_summary(carry.team)))
+            carry = carry.parent
+        stages.reverse()
+        return GauntletResult(
+            success=success,
+            total_turns=best.turns,
+            stages=stages,
+            final_team=best.team,
+            stage_searches=self.stage_searches,
+            stage_cache_hits=self.stage_cache_hits,
+            states_explored=self.states_explored,
+            frontier_sizes=frontier_sizes,
+            timed_out=timed_out
+        )
+
+
+def _first_alive(team: List[Pokemon]) -> int:
+    """Lead of the next battle: the first Pokemon still standing."""
+    return next((i for i, p in enumerate(team) if not p.is_fainted()), 0)
+
+
+def _team_state(team: List[Pokemon]) -> Tuple:
+    """What a stage changes: HP and PP of every Pokemon."""
+    return tuple((p.current_hp, tuple(m.current_pp for m in p.moves)) for p in team)
+
+
+def _team_resources(team: List[Pokemon]) -> Tuple[int, ...]:
+    """HP and PP of every Pokemon, flattened (for dominance checks)."""
+    return tuple(value for p in team for value in (p.current_hp, *(m.current_pp for m in p.moves)))
+
+
+def _team_signature(team: List[Pokemon]) -> Tuple:
+    """
+    Everything a stage search depends on: species, computed stats, moves, HP
+    and PP (request data sets base stats, so the name alone says nothing).
+    """
+    return tuple(
+        (p.name, p.level, tuple(p.types), p.max_hp, p.attack, p.defense, p.speed, p.special,
+         tuple((m.name, m.type, m.power, m.accuracy, m.pp) for m in p.moves))
+        for p in team
+    ) + _team_state(team)
+
+
+def _team_summary(team: List[Pokemon]) -> List[Dict[str, Any]]:
+    """HP and PP of each Pokemon, for the result."""
+    return [{"name": p.name, "hp": p.current_hp, "maxHp": p.max_hp,
+             "pp": {m.name: m.current_pp for m in p.moves}} for p in team]
+
+
+def _replay(state: BattleState, moves: List[str]) -> Optional[BattleState]:
+    """Apply a move sequence (None if a move can't be used at its turn)."""
+    for name in moves:
+        # Not the merged successors: those spend the PP of the first equivalent move
+        state = next((n for n, move, _ in state.generate_successor_states() if move.name == name), None)
+        if state is None:
+            return None
+    return state
+
+
+def clear_stage_cache():
+    """Forget every cached stage result."""
+    _STAGE_CACHE.clear()
+
+
+def run_gauntlet_optimizer(
+    player_team: List[Pokemon],
+    opponents: List[Tuple[str, List[Pokemon]]],
+    max_states: int = 50000,
+    max_frontier: int = DEFAULT_MAX_FRONTIER,
+    use_stage_cache: bool = True,
+    time_limit_ms: Optional[float] = None
+) -> GauntletResult:
+    """
+    Convenience function to plan a gauntlet.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponents: (name, team) of each opponent, in battle order
+        max_states: Maximum states in each stage graph
+        max_frontier: End states carried from one stage into the next
+        use_stage_cache: Read and fill the stage cache
+        time_limit_ms: Planning time allowed (None = no limit)
+
+    Returns:
+        GauntletResult
+    """
+    planner = GauntletPlanner(max_states=max_states, max_frontier=max_frontier,
+                              use_stage_cache=use_stage_cache, time_limit_ms=time_limit_ms)
+    return planner.plan(player_team, opponents)
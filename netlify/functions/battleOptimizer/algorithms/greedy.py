@@ -22,16 +22,19 @@ CS_311 Extra Credit Project
 
 import sys
 import os
-from typing import List, Tuple, Optional
+from typing import Any, Dict, Generator, List, Tuple, Optional
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from dataStructures.heap import Heap
 from models.battleState import BattleState
 from models.pokemon import Pokemon
 from models.move import Move
 from utils.damageCalculator import DamageCalculator
+from utils.resumableSearch import ResumableSearch, make_plan
 
 
 class GreedyResult:
@@ -78,18 +81,59 @@ class GreedyBattleOptimizer:
     Does not consider future states or long-term strategy.
     """
 
-    def __init__(self, max_turns: int = 100):
+    def __init__(self, max_turns: int = 100, build_log: bool = True):
         """
         Create a greedy optimizer.
 
         Args:
             max_turns: Maximum turns before giving up (prevents infinite loops)
+            build_log: Record the turn-by-turn battle log (False skips it)
         """
         self.max_turns = max_turns
+        self.build_log = build_log
+
+        # Search in progress (step-wise interface): moves and state so far
+        self._moves: List[str] = []
+        self._state: Optional[BattleState] = None
 
     def optimize(self, initial_state: BattleState) -> GreedyResult:
         """
-        Run the greedy algorithm on a battle.
+        Run the greedy algorithm on a battle (start(initial_state).run()).
+
+        Args:
+            initial_state: Starting battle state
+
+        Returns:
+            GreedyResult with outcome and statistics
+        """
+        return self.start(initial_state).run()
+
+    def start(self, initial_state: BattleState) -> ResumableSearch:
+        """
+        Start a step-wise run (one step expansion = one turn).
+
+        Args:
+            initial_state: Starting battle state
+
+        Returns:
+            ResumableSearch (see utils/resumableSearch.py)
+        """
+        return ResumableSearch(self, self._search(initial_state))
+
+    def current_plan(self) -> Optional[Dict[str, Any]]:
+        """Moves played so far by a running search."""
+        if self._state is None:
+            return None
+        return make_plan(self._moves, self._state.player_won(),
+                         self._state.get_total_damage_dealt_to_opponent(), complete=False)
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Statistics of the running search."""
+        return {"turns": len(self._moves)}
+
+    def _search(self, initial_state: BattleState) -> Generator[None, None, GreedyResult]:
+        """
+        Run the greedy algorithm on a battle, yielding after every turn.
 
         Algorithm:
         1. While battle not over and turns < max:
@@ -117,6 +161,8 @@ class GreedyBattleOptimizer:
         move_sequence = []
         battle_log = []
         turns = 0
+        self._moves = move_sequence
+        self._state = current_state
 
         while not current_state.is_battle_over() and turns < self.max_turns:
             # Get the best move using max-heap
@@ -149,13 +195,15 @@ class GreedyBattleOptimizer:
             # Move to next state
             current_state = next_state
             turns += 1
+            self._state = current_state
+            yield
 
         # Calculate final statistics
         success = current_state.player_won()
         total_damage = current_state.get_total_damage_dealt_to_opponent()
 
         # Add final battle result to log
-        if current_state.is_battle_over():
+        if current_state.is_battle_over() and self.build_log:
             battle_log.append({
                 "turn": turns,
                 "event": "battle_end",
@@ -236,6 +284,9 @@ class GreedyBattleOptimizer:
             turn_num: Current turn number
             battle_log: List to append events to
         """
+        if not self.build_log:
+            return
+
         from utils.typeEffectiveness import TYPE_CHART
 
         # Get Pokemon before and after
@@ -388,7 +439,8 @@ class GreedyBattleOptimizer:
 def run_greedy_optimizer(
     player_team: List[Pokemon],
     opponent_team: List[Pokemon],
-    max_turns: int = 100
+    max_turns: int = 100,
+    build_log: bool = True
 ) -> GreedyResult:
     """
     Convenience function to run greedy optimizer on teams.
@@ -397,6 +449,7 @@ def run_greedy_optimizer(
         player_team: Player's Pokemon team
         opponent_team: Opponent's Pokemon team
         max_turns: Maximum turns before timeout
+        build_log: Record the turn-by-turn battle log
 
     Returns:
         GreedyResult with outcome
@@ -406,5 +459,5 @@ def run_greedy_optimizer(
         opponent_team=opponent_team
     )
 
-    optimizer = GreedyBattleOptimizer(max_turns=max_turns)
+    optimizer = GreedyBattleOptimizer(max_turns=max_turns, build_log=build_log)
     return optimizer.optimize(initial_state)
@@ -0,0 +1,561 @@
+"""
+Parallel Dijkstra Battle Optimizer - Hash-Distributed Search Across Processes
+
+The Dijkstra optimizer builds its graph in one process, so a request uses one
+core however many the machine has. This optimizer spreads the same search
+over worker processes (HDA*-style hash distribution):
+
+- Every state is owned by one worker: hash(state.compact_key()) % workers.
+  The owner alone keeps the state's parent link and decides whether it is new
+  (duplicate detection needs no locks or shared tables)
+- Workers expand the states in their own open lists and send each successor
+  to its owner, batched per destination worker
+- The search runs in rounds. A state's cost is its turn count (every edge
+  costs the turns it covers and the turn is part of the state key), so round
+  g expands exactly the open states with cost g, everywhere at once. The
+  parent process relays the batches and picks the next round's g as the
+  smallest cost still open or in flight
+
+Termination detection is exact: every batch sent in a round is delivered at
+the start of the next one, so when no worker has an open state and nothing
+was sent, the search is over. With a win found in W turns the search stops
+as soon as the next round's g reaches W - every cheaper state has been
+expanded, so no faster win exists (the same answer as DijkstraBattleOptimizer,
+possibly a different move sequence of the same length). Without any win,
+every reachable state is expanded and the defeat with the most damage wins,
+as in the one-process search. The max_states limit is checked between rounds.
+
+Workers only use pipes to the parent (no multiprocessing queues or shared
+semaphores, which AWS Lambda does not provide) and are forked, so they
+inherit the loaded damage tables.
+
+Uses: BattleState.compact_key (ownership and duplicate detection) and the
+binary state records of utils/battleStateCodec.py (states on the wire)
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import pickle
+import logging
+import traceback
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from algorithms.dijkstra import DijkstraBattleOptimizer, DijkstraResult
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from utils.moveDominance import MoveDominanceFilter
+from utils.macroActions import MacroActionPlanner
+from utils.progress import ProgressCallback, ProgressReporter
+from utils.searchCheckpoint import CheckpointMismatch
+from utils.battleStateCodec import BattleStateCodec
+
+logger = logging.getLogger()
+
+# Outcome of a state on the wire
+_ONGOING, _WON, _LOST = 0, 1, 2
+
+
+def owner_of(key: Tuple, workers: int) -> int:
+    """
+    Worker owning a state (tuples of ints hash the same in every process).
+
+    Args:
+        key: BattleState.compact_key()
+        workers: Number of workers
+
+    Returns:
+        Worker index
+    """
+    return hash(key) % workers
+
+
+def _entry(codec: BattleStateCodec, state: BattleState, parent_key: Optional[Tuple],
+           move_name: Optional[str], move_names: Tuple[str, ...], is_macro: bool) -> Tuple:
+    """Wire form of a discovered state (with the edge it was reached by)."""
+    if not state.is_battle_over():
+        outcome = _ONGOING
+    else:
+        outcome = _WON if state.player_won() else _LOST
+    return (state.compact_key(), codec.encode(state), parent_key, move_name, move_names, is_macro,
+            state.turn, outcome, state.get_total_damage_dealt_to_opponent())
+
+
+class _Partition:
+    """
+    The states owned by one worker process.
+
+    Attributes:
+        seen: key -> (parent_key, move_name, move_names, is_macro, encoded state)
+        open: cost (turn) -> keys of owned states still to expand
+    """
+
+    def __init__(self, optimizer: DijkstraBattleOptimizer, worker_id: int, workers: int,
+                 initial_state: BattleState):
+        self.optimizer = optimizer
+        self.worker_id = worker_id
+        self.workers = workers
+        self.codec = BattleStateCodec(initial_state)
+        self.seen: Dict[Tuple, Tuple] = {}
+        self.open: Dict[int, List[Tuple]] = {}
+
+        # Best terminal states owned: (turns, key) / (-damage, turns, key)
+        self.best_win: Optional[Tuple[int, Tuple]] = None
+        self.best_defeat: Optional[Tuple[int, int, Tuple]] = None
+
+        # Statistics
+        self.expanded = 0
+        self.received = 0
+        self.duplicates = 0
+        self.sent = 0
+
+    def insert(self, entries: List[Tuple]):
+        """
+        Add the states delivered in one round.
+
+        A state seen in an earlier round keeps its first copy. Copies of a new
+        state (same key, e.g. other PP left or another parent) arriving in the
+        same round are resolved canonically - the largest (state, parent,
+        move) - so the search does not depend on the number of workers or on
+        the order batches arrive in.
+        """
+        fresh: Dict[Tuple, Tuple] = {}
+        for entry in entries:
+            self.received += 1
+            key = entry[0]
+            if key in self.seen:
+                self.duplicates += 1
+                continue
+            current = fresh.get(key)
+            if current is not None:
+                self.duplicates += 1
+                if entry[1:4] <= current[1:4]:
+                    continue
+            fresh[key] = entry
+
+        for key, data, parent_key, move_name, move_names, is_macro, cost, outcome, damage in fresh.values():
+            self.seen[key] = (parent_key, move_name, move_names, is_macro, data)
+            if outcome == _WON:
+                if self.best_win is None or (cost, key) < self.best_win:
+                    self.best_win = (cost, key)
+            elif outcome == _LOST:
+                # Only defeats that dealt damage count (as in the one-process
+                # search); the most damage, then the fewest turns
+                if damage > 0 and (self.best_defeat is None or (-damage, cost, key) < self.best_defeat):
+                    self.best_defeat = (-damage, cost, key)
+            else:
+                self.open.setdefault(cost, []).append(key)
+
+    def expand(self, cost: int) -> Tuple[List[List[Tuple]], Optional[int], Optional[int]]:
+        """
+        Expand every owned open state of one cost.
+
+        Returns:
+            Tuple of (batch per destination worker, smallest successor cost,
+            fewest turns of a won successor)
+        """
+        batches: List[List[Tuple]] = [[] for _ in range(self.workers)]
+        min_cost: Optional[int] = None
+        win_cost: Optional[int] = None
+
+        for key in self.open.pop(cost, []):
+            state = self.codec.decode(self.seen[key][4])
+            self.expanded += 1
+
+            macro = self.optimizer._plan_macro(state)
+            if macro is not None:
+                successors = [(macro.next_state, macro.move, macro.total_damage, (macro.move.name,))]
+            else:
+                successors = state.generate_unique_successor_states(move_filter=self.optimizer.move_filter)
+
+            for next_state, move, _, move_names in successors:
+                entry = _entry(self.codec, next_state, key, move.name, move_names, macro is not None)
+                destination = owner_of(entry[0], self.workers)
+                batches[destination].append(entry)
+                if destination != self.worker_id:
+                    self.sent += 1
+                if min_cost is None or next_state.turn < min_cost:
+                    min_cost = next_state.turn
+                if next_state.player_won() and (win_cost is None or next_state.turn < win_cost):
+                    win_cost = next_state.turn
+
+        return batches, min_cost, win_cost
+
+    def report(self) -> Dict[str, Any]:
+        """Per-round status for the parent."""
+        return {
+            "minOpen": min(self.open) if self.open else None,
+            "vertices": len(self.seen),
+            "expanded": self.expanded,
+            "winTurns": self.best_win[0] if self.best_win else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Final statistics of this worker."""
+        optimizer = self.optimizer
+        return {
+            "worker": self.worker_id,
+            "expanded": self.expanded,
+            "vertices": len(self.seen),
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "sent": self.sent,
+            "branchesPruned": optimizer._branches_pruned(),
+            "turnsFastForwarded": optimizer._turns_fast_forwarded()
+        }
+
+    def serve(self, conn: Connection):
+        """Answer the parent's commands until told to stop."""
+        while True:
+            command = conn.recv()
+            kind = command[0]
+            if kind == "step":
+                _, cost, batches = command
+                self.insert([entry for batch in batches for entry in pickle.loads(batch)])
+                out, min_cost, win_cost = [None] * self.workers, None, None
+                if cost is not None:
+                    entries, min_cost, win_cost = self.expand(cost)
+                    out = [pickle.dumps(batch, pickle.HIGHEST_PROTOCOL) if batch else None
+                           for batch in entries]
+                report = self.report()
+                report["minSent"] = min_cost
+                report["winSent"] = win_cost
+                conn.send(("ok", out, report))
+            elif kind == "finish":
+                conn.send(("ok", self.best_win, self.best_defeat, self.stats()))
+            elif kind == "trace":
+                conn.send(("ok", self.seen[command[1]]))
+            else:  # stop
+                return
+
+
+def _worker_main(optimizer: DijkstraBattleOptimizer, worker_id: int, workers: int,
+                 initial_state: BattleState, conn: Connection):
+    """Entry point of a worker process."""
+    try:
+        _Partition(optimizer, worker_id, workers, initial_state).serve(conn)
+    except Exception:  # Reported to the parent, which raises it
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class ParallelDijkstraOptimizer(DijkstraBattleOptimizer):
+    """
+    Dijkstra optimizer expanding states in several worker processes.
+
+    Same settings and DijkstraResult as DijkstraBattleOptimizer; the result
+    also carries result.parallel (workers, rounds, per-worker statistics).
+    Shared SearchBounds are not used (the workers bound themselves).
+    """
+
+    def __init__(self, workers: int = 2, **kwargs: Any):
+        """
+        Create a parallel Dijkstra optimizer.
+
+        Args:
+            workers: Number of worker processes (at least 1)
+            **kwargs: DijkstraBattleOptimizer settings (max_states,
+                      prune_dominated, macro_actions, progress, ...)
+        """
+        super().__init__(**kwargs)
+        self.workers = max(1, workers)
+        self.rounds = 0
+        self._vertices = 0
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Statistics of the running search."""
+        return {"statesExpanded": self._expanded, "vertices": self._vertices, "rounds": self.rounds}
+
+    def _search(self, initial_state: BattleState,
+                checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, DijkstraResult]:
+        """
+        Run the hash-distributed search, yielding after every round.
+
+        Args:
+            initial_state: Starting battle state
+            checkpoint: Not supported (the graph lives in the workers)
+
+        Returns:
+            DijkstraResult with an optimal strategy and result.parallel
+
+        Raises:
+            CheckpointMismatch: If a checkpoint is given
+            RuntimeError: If a worker failed
+        """
+        if checkpoint is not None:
+            raise CheckpointMismatch("Parallel searches can't resume from a checkpoint")
+        logger.info(f"[PARALLEL DIJKSTRA] Starting with {self.workers} workers, max_states={self.max_states}")
+
+        # Same per-search helpers as the one-process search; the forked
+        # workers get their own copies, this one replays the final path
+        self.reporter = ProgressReporter(self.progress, self.progress_interval)
+        self.move_filter = MoveDominanceFilter() if self.prune_dominated else None
+        self.macro_planner = MacroActionPlanner(self.move_filter) if self.macro_actions else None
+        self.graph_complete = False
+        self.rounds = 0
+        self._expanded = 0
+        self._vertices = 0
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        connections: List[Connection] = []
+        processes = []
+        try:
+            for worker_id in range(self.workers):
+                parent_end, child_end = context.Pipe()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(self, worker_id, self.workers, initial_state, child_end),
+                    name=f"dijkstra-worker-{worker_id}",
+                    daemon=True
+                )
+                process.start()
+                child_end.close()
+                connections.append(parent_end)
+                processes.append(process)
+
+            # Round 0 delivers the initial state to its owner
+            root = _entry(BattleStateCodec(initial_state), initial_state, None, None, (), False)
+            inboxes: List[List[bytes]] = [[] for _ in range(self.workers)]
+            inboxes[owner_of(root[0], self.workers)].append(pickle.dumps([root]))
+            cost: Optional[int] = None
+            incumbent: Optional[int] = None
+
+            while True:
+                replies = self._exchange(connections, [("step", cost, inboxes[i])
+                                                       for i in range(self.workers)])
+                inboxes = [[] for _ in range(self.workers)]
+                next_cost: Optional[int] = None
+                for _, batches, report in replies:
+                    for destination, batch in enumerate(batches):
+                        if batch is not None:
+                            inboxes[destination].append(batch)
+                    for candidate in (report["minOpen"], report["minSent"]):
+                        if candidate is not None and (next_cost is None or candidate < next_cost):
+                            next_cost = candidate
+                    for win in (report["winTurns"], report["winSent"]):
+                        if win is not None and (incumbent is None or win < incumbent):
+                            incumbent = win
+
+                self.rounds += 1
+                self._expanded = sum(report["expanded"] for _, _, report in replies)
+                self._vertices = sum(report["vertices"] for _, _, report in replies)
+                self.reporter.report("round", round=self.rounds, cost=cost, statesExpanded=self._expanded,
+                                     vertices=self._vertices, bestBound=incumbent)
+                yield
+
+                if next_cost is None:
+                    # Nothing open anywhere and nothing in flight
+                    self.graph_complete = True
+                    break
+                if incumbent is not None and incumbent <= next_cost:
+                    # Every state cheaper than the best win has been expanded
+                    self.graph_complete = True
+                    break
+                if self._vertices >= self.max_states:
+                    break
+                cost = next_cost
+
+            # Deliver the states still in flight, then collect the answers
+            replies = self._exchange(connections, [("step", None, inboxes[i])
+                                                   for i in range(self.workers)])
+            self._vertices = sum(report["vertices"] for _, _, report in replies)
+            finals = self._exchange(connections, [("finish",)] * self.workers)
+
+            # Ties between workers go to the smallest state key (as inside a worker)
+            wins = [win for _, win, _, _ in finals if win is not None]
+            defeats = [defeat for _, _, defeat, _ in finals if defeat is not None]
+            worker_stats = [stats for _, _, _, stats in finals]
+
+            goal = min(wins)[-1] if wins else (min(defeats)[-1] if defeats else None)
+            path = self._trace(connections, goal) if goal is not None else []
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(("stop",))
+                except (OSError, ValueError):
+                    pass
+                conn.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        self.reporter.report("graph_built", statesExpanded=self._expanded, vertices=self._vertices,
+                             rounds=self.rounds, bestBound=incumbent)
+        logger.info(f"[PARALLEL DIJKSTRA] {self._vertices} states in {self.rounds} rounds, "
+                    f"best win: {incumbent}")
+
+        parallel_info = {"workers": self.workers, "rounds": self.rounds, "perWorker": worker_stats}
+        totals = {name: sum(stats[name] for stats in worker_stats)
+                  for name in ("branchesPruned", "turnsFastForwarded")}
+        return self._replay(initial_state, path, parallel_info, totals)
+
+    def _exchange(self, connections: List[Connection], commands: List[Tuple]) -> List[Tuple]:
+        """
+        Send one command to every worker and wait for all the replies.
+
+        Returns:
+            Replies in worker order
+
+        Raises:
+            RuntimeError: If a worker failed
+        """
+        for conn, command in zip(connections, commands):
+            conn.send(command)
+        replies: List[Optional[Tuple]] = [None] * len(connections)
+        pending = set(range(len(connections)))
+        while pending:
+            for conn in wait([connections[i] for i in pending]):
+                index = connections.index(conn)
+                try:
+                    reply = conn.recv()
+                except EOFError:
+                    raise RuntimeError(f"Search worker {index} exited unexpectedly")
+                if reply[0] == "error":
+                    raise RuntimeError(f"Search worker {index} failed:\n{reply[1]}")
+                replies[index] = reply
+                pending.discard(index)
+        return replies
+
+    def _trace(self, connections: List[Connection], goal: Tuple) -> List[Tuple]:
+        """
+        Follow parent links from a goal state back to the initial state.
+
+        Returns:
+            Path of (encoded state, move_name, move_names, is_macro) from the
+            initial state (whose move fields are None) to the goal
+        """
+        path = []
+        key = goal
+        while key is not None:
+            connection = connections[owner_of(key, self.workers)]
+            connection.send(("trace", key))
+            reply = connection.recv()
+            if reply[0] == "error":
+                raise RuntimeError(f"Search worker failed:\n{reply[1]}")
+            parent_key, move_name, move_names, is_macro, data = reply[1]
+            path.append((data, move_name, move_names, is_macro))
+            key = parent_key
+        path.reverse()
+        return path
+
+    def _replay(self, initial_state: BattleState, path: List[Tuple],
+                parallel_info: Dict[str, Any], totals: Dict[str, int]) -> DijkstraResult:
+        """
+        Turn a traced path into the move sequence and battle log.
+
+        Args:
+            initial_state: Starting battle state
+            path: Result of _trace (empty if no terminal state was reached)
+            parallel_info: result.parallel
+            totals: Summed worker statistics
+
+        Returns:
+            DijkstraResult
+        """
+        if not path:
+            return DijkstraResult(
+                success=False,
+                total_damage=0,
+                turns=0,
+                move_sequence=[],
+                final_state=initial_state,
+                states_explored=self._vertices,
+                branches_pruned=totals["branchesPruned"],
+                turns_fast_forwarded=totals["turnsFastForwarded"],
+                parallel=parallel_info
+            )
+
+        codec = BattleStateCodec(initial_state)
+        states = [codec.decode(data) for data, _, _, _ in path]
+        move_sequence: List[str] = []
+        battle_log: List = []
+        for before_state, after_state, (_, move_name, move_names, is_macro) in zip(states, states[1:], path[1:]):
+            if is_macro:
+                # Multi-turn edge: recomputed here (deterministic) and replayed
+                macro = self._plan_macro(before_state)
+                if macro is None or macro.next_state.compact_key() != after_state.compact_key():
+                    raise RuntimeError("Parallel search path does not replay")
+                if not self.build_log:
+                    move_sequence.extend(macro.move_names)
+                    continue
+                for (turn_before, turn_after), turn_move in zip(macro.expand(before_state), macro.move_names):
+                    move_sequence.append(turn_move)
+                    self._log_battle_events(turn_before, turn_after, turn_move,
+                                            len(move_sequence), battle_log)
+                continue
+
+            move_sequence.append(move_name)
+            self._log_battle_events(before_state, after_state, move_name, len(move_sequence),
+                                    battle_log, equivalent_moves=move_names)
+
+        final_state = states[-1]
+        if final_state.is_battle_over() and self.build_log:
+            battle_log.append({
+                "turn": len(move_sequence),
+                "event": "battle_end",
+                "winner": "player" if final_state.player_won() else "opponent"
+            })
+
+        success = final_state.player_won()
+        return DijkstraResult(
+            success=success,
+            total_damage=final_state.get_total_damage_dealt_to_opponent(),
+            turns=len(move_sequence),
+            move_sequence=move_sequence,
+            final_state=final_state,
+            states_explored=self._vertices,
+            path_cost=float(final_state.turn - initial_state.turn) if success else 0,
+            battle_log=battle_log,
+            branches_pruned=totals["branchesPruned"],
+            turns_fast_forwarded=totals["turnsFastForwarded"],
+            parallel=parallel_info
+        )
+
+
+def run_parallel_dijkstra_optimizer(
+    player_team: List[Pokemon],
+    opponent_team: List[Pokemon],
+    workers: int = 2,
+    max_states: int = 100000,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True
+) -> DijkstraResult:
+    """
+    Convenience function to run the parallel Dijkstra optimizer on teams.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+        workers: Number of worker processes
+        max_states: Maximum states to explore (all workers together)
+        progress: Optional callback receiving progress records (one per round)
+        build_log: Record the turn-by-turn battle log
+
+    Returns:
+        DijkstraResult (result.parallel holds the per-worker statistics)
+    """
+    initial_state = BattleState(
+        player_team=player_team,
+        opponent_team=opponent_team
+    )
+
+    optimizer = ParallelDijkstraOptimizer(
+        workers=workers,
+        max_states=max_states,
+        progress=progress,
+        build_log=build_log
+    )
+    return optimizer.optimize(initial_state)
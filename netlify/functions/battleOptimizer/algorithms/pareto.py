@@ -0,0 +1,370 @@
+"""
+Pareto Search - Multi-Objective Plans (Turns vs HP Lost vs Faints vs PP)
+
+Dijkstra weights every edge by turns only, so among equally fast wins it
+returns whichever it reaches first, even when another one loses no Pokemon.
+This mode labels every path with a cost vector and keeps all plans no other
+plan beats on every objective (the Pareto front), in one search:
+
+    (turns, player HP lost, player Pokemon fainted, PP spent)
+
+PP spent weighs each use by the share of the move's full PP it consumes (a
+Thunder use costs 1/10, a Quick Attack use 1/30), so plans that burn scarce
+moves rank worse - every turn spends exactly one PP, so a raw count would
+just repeat the turn count. Weights are kept as exact integers (units of
+1 / lcm of the team's move PP) so equal costs compare equal.
+
+The graph is the one DijkstraBattleOptimizer builds. It is then searched
+with a multi-criteria label-setting algorithm (Martins):
+1. Labels (cost vector, vertex, path) are popped from a heap in
+   lexicographic order, so a popped label can't be improved by a later one
+2. Each vertex keeps the nondominated labels settled there; a label
+   dominated (or equalled) by one of them is dropped
+3. Every objective only grows along a path, so a label dominated by a
+   victory already on the front is dropped as well (target pruning)
+
+Dominance sets (ParetoFront) are kept in lexicographic order: a label can
+only be dominated by labels sorted before it, and only dominate labels
+sorted after it, so each check scans one side of a binary search.
+
+HP, faints and turn count are part of a vertex, so labels at one vertex
+only differ in PP spent and vertex sets stay tiny; the front itself spans
+the victory vertices.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import heapq
+import logging
+from bisect import bisect_left, bisect_right
+from collections import ChainMap
+from math import lcm
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from algorithms.dijkstra import DijkstraBattleOptimizer, DijkstraResult
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from utils.progress import ProgressCallback
+from utils.searchCheckpoint import CheckpointMismatch
+
+logger = logging.getLogger()
+
+# (turns, HP lost, Pokemon fainted, PP spent in units)
+Label = Tuple[int, int, int, int]
+
+
+class ParetoFront:
+    """
+    Pareto-nondominated cost vectors (all objectives minimized), each with
+    a payload, kept in lexicographic order.
+
+    Attributes:
+        labels: Nondominated vectors, sorted
+        items: Payload of each vector (same order)
+    """
+
+    def __init__(self):
+        self.labels: List[Tuple] = []
+        self.items: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def dominated(self, label: Tuple) -> bool:
+        """
+        Whether a stored vector is at most `label` in every objective.
+
+        Args:
+            label: Cost vector
+
+        Returns:
+            True if `label` is dominated or equalled
+        """
+        labels = self.labels
+        # Only vectors sorted before `label` can be <= it everywhere
+        for index in range(bisect_right(labels, label)):
+            if all(a <= b for a, b in zip(labels[index], label)):
+                return True
+        return False
+
+    def insert(self, label: Tuple, item: Any = None) -> bool:
+        """
+        Add a vector unless it is dominated; drop the vectors it dominates.
+
+        Args:
+            label: Cost vector
+            item: Payload kept with it
+
+        Returns:
+            True if the vector was added
+        """
+        if self.dominated(label):
+            return False
+        position = bisect_left(self.labels, label)
+        # Only vectors sorted after `label` can be >= it everywhere
+        keep = [index for index in range(position, len(self.labels))
+                if not all(a <= b for a, b in zip(label, self.labels[index]))]
+        self.labels[position:] = [label] + [self.labels[i] for i in keep]
+        self.items[position:] = [item] + [self.items[i] for i in keep]
+        return True
+
+    def entries(self) -> List[Tuple[Tuple, Any]]:
+        """(vector, payload) pairs, lexicographically smallest first."""
+        return list(zip(self.labels, self.items))
+
+
+class ParetoBattleOptimizer(DijkstraBattleOptimizer):
+    """
+    Multi-objective battle optimizer over the Dijkstra state graph.
+
+    Same settings as DijkstraBattleOptimizer (checkpoints, shared bounds and
+    top_k are not used). The result's move sequence and battle log are the
+    lexicographically best plan (fewest turns, then least HP lost, fewest
+    faints, least PP); result.pareto_front holds the whole front.
+
+    Attributes:
+        labels_settled: Labels settled by the last search
+    """
+
+    def __init__(self, **kwargs: Any):
+        """
+        Create a Pareto optimizer.
+
+        Args:
+            **kwargs: DijkstraBattleOptimizer settings (max_states, ...)
+        """
+        super().__init__(**kwargs)
+        self.labels_settled = 0
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Statistics of the running search."""
+        stats = super().search_stats()
+        stats["labelsSettled"] = self.labels_settled
+        return stats
+
+    def _search(self, initial_state: BattleState,
+                checkpoint: Optional[Dict[str, Any]] = None) -> Generator[None, None, DijkstraResult]:
+        """
+        Build the graph, then settle labels until the front is complete
+        (yields after every state expanded and every label settled).
+
+        Args:
+            initial_state: Starting battle state
+            checkpoint: Not supported
+
+        Returns:
+            DijkstraResult with pareto_front
+
+        Raises:
+            CheckpointMismatch: If a checkpoint is given
+        """
+        if checkpoint is not None:
+            raise CheckpointMismatch("Pareto searches can't resume from a checkpoint")
+        logger.info(f"[PARETO] Starting optimization with max_states={self.max_states}")
+        self._prepare_search(initial_state)
+        self.labels_settled = 0
+
+        graph, _, vertex_to_state, move_labels, move_sets, macro_edges = (
+            yield from self._build_graph(initial_state)
+        )
+
+        start_hp = sum(p.current_hp for p in initial_state.player_team)
+        unit = lcm(*(max(m.pp, 1) for p in initial_state.player_team for m in p.moves))
+        vertex_costs: Dict[int, Tuple[int, int]] = {}
+        edge_costs: Dict[Tuple[int, int], Tuple[int, Optional[str]]] = {}
+
+        def vertex_cost(vertex: int) -> Tuple[int, int]:
+            if vertex not in vertex_costs:
+                team = vertex_to_state[vertex].player_team
+                vertex_costs[vertex] = (start_hp - sum(p.current_hp for p in team),
+                                        sum(1 for p in team if p.is_fainted()))
+            return vertex_costs[vertex]
+
+        def edge_cost(edge_key: Tuple[int, int]) -> Tuple[int, Optional[str]]:
+            if edge_key not in edge_costs:
+                edge_costs[edge_key] = self._edge_pp(edge_key, vertex_to_state, move_sets,
+                                                     macro_edges, unit)
+            return edge_costs[edge_key]
+
+        front = ParetoFront()
+        settled: Dict[int, ParetoFront] = {}
+        best_defeat = None
+        counter = 0
+        heap = [((0, 0, 0, 0), counter, 0, None)]
+
+        while heap:
+            label, _, vertex, parent = heapq.heappop(heap)
+            at_vertex = settled.setdefault(vertex, ParetoFront())
+            if front.dominated(label) or not at_vertex.insert(label):
+                continue
+            self.labels_settled += 1
+            yield
+
+            path = (vertex, parent)
+            state = vertex_to_state[vertex]
+            if state.is_battle_over():
+                if state.player_won():
+                    front.insert(label, path)
+                else:
+                    rank = (-state.get_total_damage_dealt_to_opponent(), label)
+                    if best_defeat is None or rank < best_defeat[0]:
+                        best_defeat = (rank, path)
+                continue
+
+            for edge in graph.adj_list[vertex]:
+                target = edge.to_vertex
+                pp, _ = edge_cost((vertex, target))
+                next_label = (label[0] + int(edge.weight), *vertex_cost(target), label[3] + pp)
+                if front.dominated(next_label):
+                    continue
+                if target in settled and settled[target].dominated(next_label):
+                    continue
+                counter += 1
+                heapq.heappush(heap, (next_label, counter, target, path))
+
+        logger.info(f"[PARETO] {len(front)} plans on the front, {self.labels_settled} labels settled")
+        self.reporter.report("path_found", statesExplored=graph.get_num_verts(),
+                             victory=len(front) > 0,
+                             bestBound=front.labels[0][0] if len(front) else None)
+
+        # Chosen (cheapest PP) move of every plain edge used
+        labels = ChainMap({key: name for key, (_, name) in edge_costs.items() if name}, move_labels)
+        plans = []
+        for label, path in front.entries():
+            vertices = self._unlink(path)
+            plans.append({
+                "moveSequence": self._path_moves(vertices, labels, macro_edges),
+                "turns": label[0],
+                "hpLost": label[1],
+                "faints": label[2],
+                "ppSpent": round(label[3] / unit, 3),
+                "totalDamage": vertex_to_state[vertices[-1]].get_total_damage_dealt_to_opponent()
+            })
+
+        if plans:
+            best_path = self._unlink(front.items[0])
+            path_cost = front.labels[0][0]
+        elif best_defeat is not None:
+            best_path = self._unlink(best_defeat[1])
+            path_cost = 0
+        else:
+            return DijkstraResult(success=False, total_damage=0, turns=0, move_sequence=[],
+                                  final_state=initial_state, states_explored=graph.get_num_verts(),
+                                  pareto_front=[])
+
+        move_sequence, battle_log = self._walk_path(best_path, vertex_to_state, labels,
+                                                    move_sets, macro_edges)
+        final_state = vertex_to_state[best_path[-1]]
+        if self.build_log:
+            battle_log.append({
+                "turn": len(move_sequence),
+                "event": "battle_end",
+                "winner": "player" if final_state.player_won() else "opponent"
+            })
+
+        return DijkstraResult(
+            success=final_state.player_won(),
+            total_damage=final_state.get_total_damage_dealt_to_opponent(),
+            turns=len(move_sequence),
+            move_sequence=move_sequence,
+            final_state=final_state,
+            states_explored=graph.get_num_verts(),
+            path_cost=path_cost,
+            battle_log=battle_log,
+            branches_pruned=self._branches_pruned(),
+            turns_fast_forwarded=self._turns_fast_forwarded(),
+            pareto_front=plans
+        )
+
+    @staticmethod
+    def _edge_pp(
+        edge_key: Tuple[int, int],
+        vertex_to_state: Dict[int, BattleState],
+        move_sets: Dict[Tuple[int, int], Tuple[str, ...]],
+        macro_edges: Dict,
+        unit: int
+    ) -> Tuple[int, Optional[str]]:
+        """
+        PP cost of an edge, in units of 1 / unit of a move's full PP.
+
+        Args:
+            edge_key: (from_vertex, to_vertex)
+            vertex_to_state: Maps vertex ID -> BattleState
+            move_sets: Maps edge -> equivalent move names (any of them may be used)
+            macro_edges: Maps edge -> multi-turn edge (its moves are fixed)
+            unit: lcm of the team's move PP
+
+        Returns:
+            Tuple of (cost, move to use - the cheapest equivalent one, None
+            for multi-turn edges)
+        """
+        state = vertex_to_state[edge_key[0]]
+        if edge_key in macro_edges:
+            macro = macro_edges[edge_key]
+            cost = 0
+            for (before, _), name in zip(macro.expand(state), macro.move_names):
+                move = before.get_active_player_pokemon().get_move(name)
+                cost += unit // max(move.pp, 1) if move else 0
+            return cost, None
+
+        active = state.get_active_player_pokemon()
+        best = None
+        for name in move_sets.get(edge_key, ()):
+            move = active.get_move(name)
+            if move is not None:
+                option = (unit // max(move.pp, 1), name)
+                if best is None or option < best:
+                    best = option
+        return best if best is not None else (0, None)
+
+    @staticmethod
+    def _unlink(path: Tuple) -> List[int]:
+        """Vertex list of a linked (vertex, parent) path, initial vertex first."""
+        vertices = []
+        while path is not None:
+            vertices.append(path[0])
+            path = path[1]
+        vertices.reverse()
+        return vertices
+
+
+def run_pareto_optimizer(
+    player_team: List[Pokemon],
+    opponent_team: List[Pokemon],
+    max_states: int = 100000,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True
+) -> DijkstraResult:
+    """
+    Convenience function to run the Pareto search on teams.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+        max_states: Maximum states in the graph
+        progress: Optional callback receiving progress records
+        build_log: Record the turn-by-turn battle log of the best plan
+
+    Returns:
+        DijkstraResult (result.pareto_front holds every Pareto-optimal plan)
+    """
+    initial_state = BattleState(
+        player_team=player_team,
+        opponent_team=opponent_team
+    )
+
+    optimizer = ParetoBattleOptimizer(
+        max_states=max_states,
+        progress=progress,
+        build_log=build_log
+    )
+    return optimizer.optimize(initial_state)
@@ -0,0 +1,216 @@
+"""
+Portfolio Battle Optimizer - Greedy, DP and Dijkstra Sharing Bounds
+
+The three optimizers used to run independently. The portfolio runs them as
+a team on one battle, answering the Dijkstra question (fewest turns to a
+win, else the most damage):
+
+1. Greedy runs first (cheap). A greedy win in T turns is an upper bound on
+   turns-to-win; if T equals the lower bound (stateSpaceEstimator's
+   turns_to_win_lower_bound), greedy is proven optimal and nothing else runs.
+2. Dijkstra and DP then run with shared SearchBounds (utils/searchBounds.py),
+   concurrently or one after the other:
+   - Dijkstra does not expand states at or past the best known winning turn
+     count - they cannot lead to a faster win
+   - DP offers every win it reaches as a tighter bound for Dijkstra
+   - Dijkstra proves the answer when its graph is complete; DP proves it when
+     it wins in lower-bound turns. The prover stops the other search.
+
+Concurrent runs use threads: they interleave (the GIL keeps the total CPU
+time the same, so the default is sequential), and either search stops the
+other as soon as it proves the answer.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from algorithms.greedy import run_greedy_optimizer
+from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+from algorithms.dijkstra import DijkstraBattleOptimizer
+from utils.progress import ProgressCallback
+from utils.searchBounds import SearchBounds, SearchStopped
+from utils.stateSpaceEstimator import turns_to_win_lower_bound
+
+# Run order (also the tie-break order between equally good answers)
+ALGORITHMS = ("greedy", "dijkstra", "dp")
+
+
+class PortfolioResult:
+    """
+    Result from the portfolio optimizer.
+
+    Attributes:
+        best: Result object of the best answer (GreedyResult, DPResult or DijkstraResult)
+        best_algorithm: Algorithm that produced it
+        proved_by: Algorithm that proved it optimal (None if none could)
+        lower_bound: Lower bound on turns to win (None if no win is possible)
+        turn_bound: Best winning turn count known at the end (None if no win)
+        runs: Per-algorithm summary: status ("done", "stopped", "skipped"),
+              result fields and elapsedMs
+        results: Per-algorithm result objects of the runs that finished
+    """
+
+    def __init__(self, best, best_algorithm: str, proved_by: Optional[str],
+                 lower_bound: Optional[int], turn_bound: Optional[int],
+                 runs: Dict[str, Dict[str, Any]], results: Dict[str, Any]):
+        self.best = best
+        self.best_algorithm = best_algorithm
+        self.proved_by = proved_by
+        self.lower_bound = lower_bound
+        self.turn_bound = turn_bound
+        self.runs = runs
+        self.results = results
+
+    def __repr__(self) -> str:
+        return (f"PortfolioResult(best={self.best_algorithm}, proved_by={self.proved_by}, "
+                f"turns={self.best.turns}, success={self.best.success})")
+
+
+def _score(result) -> tuple:
+    """Sort key of an answer: wins first (fewest turns), else most damage."""
+    if result.success:
+        return (1, -result.turns)
+    return (0, result.total_damage)
+
+
+def _summary(result, elapsed_ms: float) -> Dict[str, Any]:
+    """JSON summary of one algorithm's result."""
+    summary = {
+        "status": "done",
+        "success": result.success,
+        "totalDamage": result.total_damage,
+        "turns": result.turns,
+        "moveSequence": result.move_sequence,
+        "elapsedMs": round(elapsed_ms, 2)
+    }
+    if hasattr(result, "states_explored"):
+        summary["statesExplored"] = result.states_explored
+    return summary
+
+
+def run_portfolio_optimizer(
+    player_team: List[Pokemon],
+    opponent_team: List[Pokemon],
+    max_turns: int = 100,
+    max_depth: int = 50,
+    max_states: int = 100000,
+    concurrent: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    build_log: bool = True
+) -> PortfolioResult:
+    """
+    Run greedy, then Dijkstra and DP with shared bounds, on one battle.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+        max_turns: Max turns for greedy
+        max_depth: Max depth for DP
+        max_states: Max states for Dijkstra
+        concurrent: Run Dijkstra and DP at the same time (else Dijkstra
+                    first, DP only if Dijkstra could not prove the answer)
+        progress: Optional callback receiving progress records (each with
+                  an "algorithm" field)
+        build_log: Record the turn-by-turn battle log
+
+    Returns:
+        PortfolioResult
+    """
+    lower_bound = turns_to_win_lower_bound(player_team, opponent_team)
+    runs: Dict[str, Dict[str, Any]] = {}
+    results: Dict[str, Any] = {}
+
+    def new_state() -> BattleState:
+        # Every run gets its own copy of the teams
+        return BattleState([p.clone() for p in player_team], [p.clone() for p in opponent_team])
+
+    def reporter_for(name: str) -> Optional[ProgressCallback]:
+        if progress is None:
+            return None
+        return lambda record: progress(dict(record, algorithm=name))
+
+    # 1. Greedy: a cheap first answer and turn bound
+    start = time.perf_counter()
+    greedy = run_greedy_optimizer([p.clone() for p in player_team], [p.clone() for p in opponent_team],
+                                  max_turns=max_turns, build_log=build_log)
+    runs["greedy"] = _summary(greedy, (time.perf_counter() - start) * 1000)
+    results["greedy"] = greedy
+
+    bounds = SearchBounds(greedy.turns if greedy.success else None)
+    if greedy.success and lower_bound is not None and greedy.turns <= lower_bound:
+        bounds.stop("greedy")
+
+    # 2. Exact searches sharing the bounds
+    def run_dijkstra():
+        optimizer = DijkstraBattleOptimizer(max_states=max_states, progress=reporter_for("dijkstra"),
+                                            build_log=build_log, bounds=bounds)
+        result = optimizer.optimize(new_state())
+        # A complete graph (within the shared turn bound) is a proof
+        return result, optimizer.graph_complete, {"statesCut": optimizer.states_cut}
+
+    def run_dp():
+        optimizer = DynamicProgrammingOptimizer(max_depth=max_depth, progress=reporter_for("dp"),
+                                                build_log=build_log, bounds=bounds)
+        result = optimizer.optimize(new_state())
+        # A win in lower-bound turns can't be beaten
+        proved = result.success and lower_bound is not None and result.turns <= lower_bound
+        return result, proved, {}
+
+    searches: Dict[str, Callable] = {"dijkstra": run_dijkstra, "dp": run_dp}
+
+    def run_search(name: str):
+        if bounds.stopped:
+            runs[name] = {"status": "skipped"}
+            return
+        start = time.perf_counter()
+        try:
+            result, proved, extra = searches[name]()
+        except SearchStopped:
+            runs[name] = {"status": "stopped",
+                          "elapsedMs": round((time.perf_counter() - start) * 1000, 2)}
+            return
+        runs[name] = _summary(result, (time.perf_counter() - start) * 1000)
+        runs[name].update(extra)
+        results[name] = result
+        if proved:
+            bounds.stop(name)
+
+    if concurrent and not bounds.stopped:
+        threads = [threading.Thread(target=run_search, args=(name,), name=f"portfolio-{name}")
+                   for name in searches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        for name in searches:
+            run_search(name)
+
+    # Best answer among the finished runs (the prover wins ties)
+    order = [bounds.proved_by] + [name for name in ALGORITHMS if name != bounds.proved_by]
+    finished = [name for name in order if name in results]
+    best_algorithm = max(finished, key=lambda name: (_score(results[name]), -finished.index(name)))
+
+    return PortfolioResult(
+        best=results[best_algorithm],
+        best_algorithm=best_algorithm,
+        proved_by=bounds.proved_by,
+        lower_bound=lower_bound,
+        turn_bound=bounds.turns_to_win,
+        runs={name: runs[name] for name in ALGORITHMS},
+        results=results
+    )
@@ -0,0 +1,253 @@
+"""
+Offline Batch Runner for the Battle Optimizer (JSONL In, JSONL Out)
+
+For analysis runs over thousands of generated teams: every input line is
+one request body, exactly as POSTed to the handler (an optimization, a
+"playerTeams" matchup matrix or a "gauntlet"), and every output line its
+result.
+
+    python batchCli.py requests.jsonl -o results.jsonl --workers 8
+    generate_teams | python batchCli.py --progress run.progress > results.jsonl
+    python -m battleOptimizer requests.jsonl -o results.jsonl   (same CLI)
+
+- Records are read lazily and at most --max-in-flight of them are pending
+  at once, so memory stays flat however long the input is
+- They run in a pool of worker processes forked after the optimizer is
+  loaded (battleServer.warm_worker); results are written as they complete,
+  one JSON line each: {"line", "id" (if the record had one), "success",
+  "result" or "error", "timeMs"}
+- A bad record (invalid JSON, missing team, ...) becomes an error line, not
+  a failed run
+- With --progress, the input line number of every written result is
+  appended to that file; running the same command again skips those lines
+  and appends the rest to the output, so an interrupted run resumes where it
+  stopped (a result written right before the interruption may appear twice)
+- Throughput statistics are printed to stderr at the end
+
+Records without "logFormat" get --log-format ("none" by default: battle logs
+are the bulk of a result and rarely needed in bulk analysis).
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import json
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, IO, Iterator, Optional, Set, Tuple
+
+# Add current directory to path for imports (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+
+def read_records(stream: IO[str], skip: Set[int]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, text) of the input records still to run.
+
+    Args:
+        stream: JSONL input
+        skip: Line numbers already done (from the progress file)
+
+    Yields:
+        1-based line number and raw text of each non-blank line not in skip
+    """
+    for line_number, line in enumerate(stream, 1):
+        if line.strip() and line_number not in skip:
+            yield line_number, line
+
+
+def load_progress(path: Optional[str]) -> Set[int]:
+    """Line numbers recorded as done in a progress file (empty if none yet)."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {int(line) for line in f if line.strip().isdigit()}
+
+
+def run_record(line_number: int, text: str, log_format: str) -> Dict[str, Any]:
+    """
+    Run one request record (in a worker process).
+
+    Args:
+        line_number: Input line of the record
+        text: Record JSON (a handler POST body)
+        log_format: Battle log format of records that don't choose one
+
+    Returns:
+        Output record: "line", "id" (if given), "success", "result" or
+        "error", and "timeMs"
+    """
+    from battleOptimizer import parse_optimize_request, parse_matchup_request, parse_gauntlet_request
+    from services.battleOptimizerService import BattleOptimizerService
+
+    start = time.perf_counter()
+    output: Dict[str, Any] = {"line": line_number}
+    try:
+        body = json.loads(text)
+        if not isinstance(body, dict):
+            raise ValueError("Record must be a JSON object")
+        if "id" in body:
+            output["id"] = body["id"]
+        body.setdefault("logFormat", log_format)
+        if "gauntlet" in body:
+            result = BattleOptimizerService.optimize_gauntlet(**parse_gauntlet_request(body))
+        elif "playerTeams" in body:
+            result = BattleOptimizerService.optimize_matchups(**parse_matchup_request(body))
+        else:
+            result = BattleOptimizerService.optimize_battle(**parse_optimize_request(body))
+        output.update(success=True, result=result)
+    except json.JSONDecodeError as e:
+        output.update(success=False, error=f"Invalid JSON: {e}")
+    except Exception as e:  # One bad record must not stop the batch
+        output.update(success=False, error=f"{type(e).__name__}: {e}")
+    output["timeMs"] = round((time.perf_counter() - start) * 1000, 2)
+    return output
+
+
+def run_batch(
+    input_stream: IO[str],
+    output_stream: IO[str],
+    progress_path: Optional[str] = None,
+    workers: int = 1,
+    max_in_flight: Optional[int] = None,
+    log_format: str = "none"
+) -> Dict[str, Any]:
+    """
+    Run every record of a JSONL stream and write the results as they complete.
+
+    Args:
+        input_stream: JSONL request records
+        output_stream: Where result lines are written (flushed per line)
+        progress_path: Optional progress file (resume: lines in it are skipped)
+        workers: Worker processes (1 = run in this process)
+        max_in_flight: Most records pending at once (default 2 x workers)
+        log_format: Battle log format of records that don't choose one
+
+    Returns:
+        Throughput statistics: records run / skipped / failed, elapsed
+        seconds, records per second, mean / max record time
+
+    Raises:
+        ValueError: If workers or max_in_flight is below 1
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    max_in_flight = max_in_flight or 2 * workers
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    done = load_progress(progress_path)
+    progress = open(progress_path, "a", encoding="utf-8") if progress_path else None
+    stats = {"records": 0, "skipped": len(done), "failed": 0, "recordMs": 0.0, "maxRecordMs": 0.0}
+    start = time.perf_counter()
+
+    def write(output: Dict[str, Any]):
+        output_stream.write(json.dumps(output) + "\n")
+        output_stream.flush()
+        if progress is not None:  # After the result: a crash in between repeats it, never loses it
+            progress.write(f"{output['line']}\n")
+            progress.flush()
+        stats["records"] += 1
+        stats["failed"] += not output["success"]
+        stats["recordMs"] += output["timeMs"]
+        stats["maxRecordMs"] = max(stats["maxRecordMs"], output["timeMs"])
+
+    records = read_records(input_stream, done)
+    try:
+        if workers == 1:
+            for line_number, text in records:
+                write(run_record(line_number, text, log_format))
+        else:
+            _run_pool(records, write, workers, max_in_flight, log_format)
+    finally:
+        if progress is not None:
+            progress.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "records": stats["records"],
+        "skipped": stats["skipped"],
+        "failed": stats["failed"],
+        "elapsedSeconds": round(elapsed, 3),
+        "recordsPerSecond": round(stats["records"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "meanRecordMs": round(stats["recordMs"] / stats["records"], 2) if stats["records"] else 0.0,
+        "maxRecordMs": stats["maxRecordMs"],
+        "workers": workers
+    }
+
+
+def _run_pool(records: Iterator[Tuple[int, str]], write: Callable[[Dict[str, Any]], None], workers: int,
+              max_in_flight: int, log_format: str):
+    """Run records over a warm process pool, at most max_in_flight pending."""
+    from battleServer import warm_worker
+
+    warm_worker()  # Loaded once here, inherited by every forked worker
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=warm_worker)
+    pending: Set[Future] = set()
+    try:
+        for line_number, text in records:
+            if len(pending) >= max_in_flight:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+            pending.add(pool.submit(run_record, line_number, text, log_format))
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                write(future.result())
+    finally:
+        pool.shutdown(wait=not pending, cancel_futures=True)
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """One-line throughput summary."""
+    return (f"{stats['records']} records ({stats['failed']} failed, {stats['skipped']} skipped as done) "
+            f"in {stats['elapsedSeconds']} s with {stats['workers']} workers: "
+            f"{stats['recordsPerSecond']} records/s, mean {stats['meanRecordMs']} ms, "
+            f"max {stats['maxRecordMs']} ms")
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point: run a JSONL batch, print statistics."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run battle optimizer requests from a JSONL file")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL requests (default: stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL results, appended to (default: stdout)")
+    parser.add_argument("--progress", help="progress file - rerun with it to resume an interrupted run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="records pending at once (default: 2 x workers)")
+    parser.add_argument("--log-format", default="none", choices=["full", "compact", "none"],
+                        help="battle log format of records without logFormat (default none)")
+    args = parser.parse_args(argv)
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    try:
+        stats = run_batch(input_stream, output_stream, args.progress, args.workers,
+                          args.max_in_flight, args.log_format)
+    except KeyboardInterrupt:
+        print("Interrupted - rerun with the same --progress file to resume", file=sys.stderr)
+        return 130
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(format_stats(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -19,11 +19,12 @@ Date: December 2025
 import json
 import sys
 import os
-import traceback
 from typing import Dict, Any
 
-# Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add current directory to path for imports (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 # Try to import with error handling
 try:
@@ -31,10 +32,15 @@ try:
     IMPORT_SUCCESS = True
     IMPORT_ERROR = None
 except Exception as e:
+    import traceback
     IMPORT_SUCCESS = False
     IMPORT_ERROR = f"Failed to import BattleOptimizerService: {str(e)}\n{traceback.format_exc()}"
     print(f"[CRITICAL] Import error: {IMPORT_ERROR}")
 
+# Time kept back from the function's remaining time to build and send the
+# response of a time-limited (matrix / gauntlet) request
+RESPONSE_MARGIN_MS = 1000.0
+
 
 def handler(event, context):
     """
@@ -52,8 +58,67 @@ def handler(event, context):
             }
         ],
         "opponentTeam": [...] OR "bossTrainer": "blue" | "giovanni" | "lance",
-        "algorithm": "greedy" | "dp" | "dijkstra" (default: "dijkstra"),
-        "playerLevel": 50 (optional)
+        "algorithm": "greedy" | "dp" | "dijkstra" | "portfolio" | "pareto" | "auto"
+                     (default: "dijkstra"; "pareto" adds "paretoFront", every plan
+                     no other beats on turns, HP lost, faints and PP spent),
+        "timeBudgetMs": 3000 (optional, "auto" only - search time allowed: the
+                       exact dijkstra search gets half, then an abstract search
+                       or greedy answers; see utils/stateSpaceEstimator.py),
+        "concurrent": true (optional, "portfolio" only - DP and Dijkstra at once),
+        "maxDepth": 50 / "maxStates": 50000 (optional, dp / dijkstra search budget),
+        "checkpoint": true (optional, dp and exact dijkstra - continue an earlier
+                      unfinished identical request, save this one if it can't
+                      finish; see services/checkpointStore.py),
+        "timeLimitMs": 2500 (optional, checkpoint only - pause and save after this),
+        "workers": 4 (optional, exact dijkstra only - spread the search over worker
+                   processes, see algorithms/parallel_dijkstra.py),
+        "topK": 5 (optional, exact dijkstra only - also return the 5 best distinct
+                victory plans in "topPlans", fewest turns then least damage taken),
+        "playerLevel": 50 (optional),
+        "abstraction": "buckets" | "hits" (optional, dijkstra only - for huge battles),
+        "hpBuckets": 8 (optional, HP slices per Pokemon for the abstraction),
+        "logFormat": "full" | "compact" | "none" (optional, battle log encoding -
+                     see utils/battleLogCodec.py; "none" skips the log),
+        "stream": true (optional, NDJSON records instead of one JSON body -
+                  see services/battleStream.py),
+        "async": true (optional, returns {"jobId": ...} at once - poll with
+                 GET ?job=<jobId>, see services/jobManager.py. The job runs on
+                 a thread of this process after the 202 is sent: fine under
+                 the local server. On Lambda the container is frozen after
+                 responding and /tmp is not shared, so async gets a 400 there
+                 unless JOB_STORE_PATH (shared store) or JOB_WORKERS=0
+                 (external worker) is configured; battleServer.py refuses it)
+    }
+
+    Matchup matrix POST body (every team against every opponent at once,
+    see services/matchupMatrix.py):
+    {
+        "playerTeams": [[...], [...]],
+        "opponents": ["blue", "lance", [...custom team...]] (optional, default:
+                     every boss trainer),
+        "workers": 4 (optional, worker processes - default one per CPU),
+        "timeLimitMs": 8000 (optional, time allowed for the whole matrix: pairs
+                       not solved by then come back as {"pending": true}, and
+                       sending the request again reads the solved ones from
+                       the cache; never more than the function has left),
+        "algorithm", "playerLevel", "maxDepth", "maxStates", "timeBudgetMs",
+        "abstraction", "hpBuckets", "logFormat" (default "none"): as above
+        (not "stream" / "async": a matrix is always answered synchronously)
+    }
+
+    Gauntlet POST body (back-to-back battles, HP and PP carried over - see
+    algorithms/gauntlet.py):
+    {
+        "playerTeam": [...],
+        "gauntlet": ["lance", "blue"] (boss trainer IDs and / or custom teams,
+                    in battle order),
+        "maxFrontier": 8 (optional, end states carried into the next battle, at
+                      most 16; "maxStates" at most 100000 per battle),
+        "timeLimitMs": 8000 (optional, planning time - out of time, the stages
+                       finished so far come back with "timedOut" and sending
+                       the request again continues; never more than the
+                       function has left),
+        "playerLevel", "maxStates": as above (not "stream" / "async")
     }
 
     Returns:
@@ -66,6 +131,12 @@ def handler(event, context):
             "moveSequence": ["Thunderbolt", "Thunder", ...],
             "algorithm": "dijkstra",
             "opponent": "Champion Blue",
+            "cached": false,  (true if an identical request was answered before)
+            "probe": {"expansions": 454, "probeMs": 180.2, "complete": true, ...},
+                        ("auto" only - the exact search within its share of the
+                        budget; null if its result was cached)
+            "autoSelection": {"algorithm": "dijkstra", "exact": true, ...},  ("auto" only;
+                        exact only if the exact search finished)
             ...
         }
     }
@@ -93,6 +164,11 @@ def handler(event, context):
             'body': ''
         }
 
+    # Handle GET request for a job's status (?job=<jobId>)
+    job_id = (event.get('queryStringParameters') or {}).get('job')
+    if http_method == 'GET' and job_id:
+        return job_status_response(job_id)
+
     # Handle GET request for boss trainer list
     if http_method == 'GET':
         try:
@@ -106,28 +182,32 @@ def handler(event, context):
         # Parse request body
         body = json.loads(event.get('body', '{}'))
 
-        player_team_data = body.get('playerTeam', [])
-        opponent_team_data = body.get('opponentTeam')
-        boss_trainer_id = body.get('bossTrainer')
-        algorithm = body.get('algorithm', 'dijkstra').lower()
-        player_level = body.get('playerLevel', 50)
+        # Gauntlet: one team against several opponents in a row
+        if 'gauntlet' in body:
+            from services.battleOptimizerService import GAUNTLET_TIME_LIMIT_MS
+            options = parse_gauntlet_request(body)
+            options['time_limit_ms'] = platform_time_limit(options['time_limit_ms'], GAUNTLET_TIME_LIMIT_MS, context)
+            return success_response(BattleOptimizerService.optimize_gauntlet(**options))
+
+        # Matchup matrix: many player teams against many opponents
+        if 'playerTeams' in body:
+            from services.matchupMatrix import MATCHUP_TIME_LIMIT_MS
+            options = parse_matchup_request(body)
+            options['time_limit_ms'] = platform_time_limit(options['time_limit_ms'], MATCHUP_TIME_LIMIT_MS, context)
+            return success_response(BattleOptimizerService.optimize_matchups(**options))
 
-        # Validate player team
-        if not player_team_data:
-            return error_response('Missing player team data', 400)
+        options = parse_optimize_request(body)
 
-        # Validate opponent
-        if not opponent_team_data and not boss_trainer_id:
-            return error_response('Must provide either opponentTeam or bossTrainer', 400)
+        # Streaming mode: NDJSON records (progress, result, log turn by turn)
+        if body.get('stream'):
+            return stream_response(options)
+
+        # Job mode: answer with a job ID now, poll GET ?job=<jobId> later
+        if body.get('async'):
+            return submit_job_response(options)
 
         # Use the facade service to optimize the battle!
-        result = BattleOptimizerService.optimize_battle(
-            player_team_data=player_team_data,
-            opponent_team_data=opponent_team_data,
-            boss_trainer_id=boss_trainer_id,
-            algorithm=algorithm,
-            player_level=player_level
-        )
+        result = BattleOptimizerService.optimize_battle(**options)
 
         return success_response(result)
 
@@ -141,6 +221,219 @@ def handler(event, context):
         return error_response(f'Internal server error: {str(e)}', 500)
 
 
+def parse_optimize_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a POST body into BattleOptimizerService.optimize_battle arguments.
+
+    Args:
+        body: Parsed request body
+
+    Returns:
+        Keyword arguments for optimize_battle
+
+    Raises:
+        ValueError: If the player team or the opponent is missing
+    """
+    player_team_data = body.get('playerTeam', [])
+    opponent_team_data = body.get('opponentTeam')
+    boss_trainer_id = body.get('bossTrainer')
+
+    # Validate player team
+    if not player_team_data:
+        raise ValueError('Missing player team data')
+
+    # Validate opponent
+    if not opponent_team_data and not boss_trainer_id:
+        raise ValueError('Must provide either opponentTeam or bossTrainer')
+
+    return {
+        'player_team_data': player_team_data,
+        'opponent_team_data': opponent_team_data,
+        'boss_trainer_id': boss_trainer_id,
+        'algorithm': body.get('algorithm', 'dijkstra').lower(),
+        'player_level': body.get('playerLevel', 50),
+        'abstraction': body.get('abstraction'),  # Optional: "buckets" or "hits"
+        'hp_buckets': int(body.get('hpBuckets', 8)),
+        'log_format': body.get('logFormat', 'full'),  # "full", "compact" or "none"
+        'time_budget_ms': float(body.get('timeBudgetMs', 3000)),  # Used by "auto"
+        'concurrent': bool(body.get('concurrent', False)),  # Used by "portfolio"
+        'max_depth': int(body.get('maxDepth', 50)),  # DP
+        'max_states': int(body.get('maxStates', 50000)),  # Dijkstra / Pareto
+        'checkpoint': bool(body.get('checkpoint', False)),  # Resume / save unfinished dp or dijkstra
+        'time_limit_ms': float(body['timeLimitMs']) if body.get('timeLimitMs') is not None else None,
+        'workers': int(body.get('workers', 1)),  # Dijkstra: parallel worker processes
+        'top_k': int(body.get('topK', 1))  # Dijkstra: alternative victory plans
+    }
+
+
+def parse_matchup_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a matchup matrix POST body into BattleOptimizerService.optimize_matchups arguments.
+
+    Args:
+        body: Parsed request body
+
+    Returns:
+        Keyword arguments for optimize_matchups
+
+    Raises:
+        ValueError: If the player teams are missing or malformed, or the
+                    request asks for stream / async mode
+    """
+    player_teams_data = body.get('playerTeams')
+    if not isinstance(player_teams_data, list) or not player_teams_data:
+        raise ValueError('playerTeams must be a non-empty list of teams')
+    if not all(isinstance(team, list) and team for team in player_teams_data):
+        raise ValueError('Each player team must be a non-empty list of Pokemon')
+    for mode in ('stream', 'async'):
+        if body.get(mode):
+            raise ValueError(f'Matchup matrices do not support "{mode}" (use timeLimitMs '
+                             'and resend the request for pending pairs)')
+
+    return {
+        'player_teams_data': player_teams_data,
+        'opponents': body.get('opponents'),  # None: every boss trainer
+        'algorithm': body.get('algorithm', 'dijkstra').lower(),
+        'player_level': body.get('playerLevel', 50),
+        'abstraction': body.get('abstraction'),
+        'hp_buckets': int(body.get('hpBuckets', 8)),
+        'log_format': body.get('logFormat', 'none'),
+        'time_budget_ms': float(body.get('timeBudgetMs', 3000)),
+        'max_depth': int(body.get('maxDepth', 50)),
+        'max_states': int(body.get('maxStates', 50000)),
+        'workers': int(body['workers']) if body.get('workers') is not None else None,
+        'time_limit_ms': float(body['timeLimitMs']) if body.get('timeLimitMs') is not None else None
+    }
+
+
+def parse_gauntlet_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a gauntlet POST body into BattleOptimizerService.optimize_gauntlet arguments.
+
+    Args:
+        body: Parsed request body
+
+    Returns:
+        Keyword arguments for optimize_gauntlet
+
+    Raises:
+        ValueError: If the player team or the opponent list is missing, or
+                    the request asks for stream / async mode
+    """
+    player_team_data = body.get('playerTeam', [])
+    opponents = body.get('gauntlet')
+
+    if not player_team_data:
+        raise ValueError('Missing player team data')
+    if not isinstance(opponents, list) or not opponents:
+        raise ValueError('gauntlet must be a non-empty list of opponents')
+    for mode in ('stream', 'async'):
+        if body.get(mode):
+            raise ValueError(f'Gauntlets do not support "{mode}"')
+
+    return {
+        'player_team_data': player_team_data,
+        'opponents': opponents,
+        'player_level': body.get('playerLevel', 50),
+        'max_states': int(body.get('maxStates', 50000)),
+        'max_frontier': int(body.get('maxFrontier', 8)),
+        'time_limit_ms': float(body['timeLimitMs']) if body.get('timeLimitMs') is not None else None
+    }
+
+
+def platform_time_limit(requested: Any, default: float, context: Any) -> float:
+    """
+    Time limit of a matrix / gauntlet request, within the function timeout.
+
+    Args:
+        requested: timeLimitMs of the request (None = default)
+        default: The service's default limit
+        context: Lambda context (its get_remaining_time_in_millis, if any,
+                 caps the limit; None off Lambda)
+
+    Returns:
+        Limit in milliseconds (a non-positive request is left for the
+        service to reject)
+    """
+    limit = default if requested is None else requested
+    remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if remaining is not None and limit > 0:
+        limit = min(limit, max(1.0, remaining() - RESPONSE_MARGIN_MS))
+    return limit
+
+
+def stream_response(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer with the NDJSON stream of an optimization.
+
+    The Python Lambda runtime cannot stream a response, so here the records
+    are sent together once the run is done; localServer.py sends each one as
+    soon as it is produced (chunked transfer encoding).
+
+    Args:
+        options: optimize_battle arguments (from parse_optimize_request)
+
+    Returns:
+        Lambda response whose body holds one JSON record per line
+    """
+    from services.battleStream import stream_battle, ndjson_line, NDJSON_CONTENT_TYPE
+
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': NDJSON_CONTENT_TYPE,
+        },
+        'body': ''.join(ndjson_line(record) for record in stream_battle(**options))
+    }
+
+
+def submit_job_response(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Start an optimization job.
+
+    Args:
+        options: optimize_battle arguments (from parse_optimize_request)
+
+    Returns:
+        202 response with the job ID ("deduplicated" if an identical job
+        was already submitted)
+
+    Raises:
+        ValueError: If async jobs can't run here (e.g. plain AWS Lambda)
+    """
+    from services.jobManager import default_job_manager, check_async_supported
+
+    check_async_supported()
+    job, created = default_job_manager().submit(options)
+    response = success_response({
+        "jobId": job["jobId"],
+        "status": job["status"],
+        "deduplicated": not created
+    })
+    response['statusCode'] = 202
+    return response
+
+
+def job_status_response(job_id: str) -> Dict[str, Any]:
+    """
+    Report a job's status, progress and (when done) result.
+
+    Args:
+        job_id: Job ID from submit_job_response
+
+    Returns:
+        200 response with the job, or 404 if unknown
+    """
+    from services.jobManager import default_job_manager
+
+    job = default_job_manager().get(job_id)
+    if job is None:
+        return error_response(f'Unknown job: {job_id}', 404)
+    job = dict(job)
+    job.pop("request", None)  # The caller already has it
+    return success_response({"job": job})
+
+
 def success_response(data: Dict[str, Any]) -> Dict[str, Any]:
     """Helper function to return success responses."""
     return {
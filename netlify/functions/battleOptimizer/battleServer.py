@@ -0,0 +1,494 @@
+"""
+Self-Hosted Battle Optimizer Server (asyncio + Warm Worker Processes)
+
+battleOptimizer.handler is written for Lambda: one event, one process. This
+server runs the same handler on our own machines:
+
+- An asyncio front end parses HTTP/1.1 (keep-alive) and translates each
+  request into the Lambda Function URL event the handler already understands
+- POST optimizations are CPU-bound, so they run in a pool of worker
+  processes forked at startup, after the server process has loaded type
+  charts, moves, boss templates and the algorithms (warm_worker) - no
+  request pays a cold start
+- A worker process runs one request at a time. --worker-concurrency is the
+  number of requests handed to the pool per worker (default 1): above 1,
+  the extra ones wait in the pool's own queue so a worker never idles
+  between two requests, but nothing runs concurrently inside a worker. Up
+  to --max-queue more wait for a free slot, anything beyond that gets
+  429 Too Many Requests with Retry-After (backpressure instead of an
+  unbounded backlog). GET /health reports running requests and both queues
+  separately
+- Work that would escape the slots is refused with 400: "async" jobs
+  (they run on a background thread after the response), matchup matrices
+  and "workers" > 1 (they fork process pools inside a worker and
+  oversubscribe the CPUs). Send those to the Lambda handler, or run a
+  matrix as several single requests
+- GET / OPTIONS (boss list, job polling, CORS) are cheap and answered by
+  the server process; GET /health reports the pool state
+- With --shared-table-slots, DP searches in every worker share one memo
+  (utils/sharedTranspositionTable.py): a state solved for one request is
+  read, not recomputed, by the next one on the same battle with the same
+  maxDepth in any worker (other settings use their own namespace, so a
+  result never depends on what other requests stored)
+
+    python battleServer.py --port 8080 --workers 4 --max-queue 16
+    curl -X POST localhost:8080 -d '{"playerTeam": [...], "bossTrainer": "blue"}'
+
+Streaming requests ("stream": true) are answered with the buffered NDJSON
+body, as on Lambda; localServer.py streams chunk by chunk for development.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import json
+import signal
+import asyncio
+import multiprocessing
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+# Add current directory to path for imports (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+# Largest request body accepted (teams are a few KB)
+MAX_BODY_BYTES = 1024 * 1024
+
+# Most header lines per request
+MAX_HEADERS = 100
+
+# Seconds a client is told to wait after a 429
+RETRY_AFTER_SECONDS = 1
+
+
+def warm_worker(shared_table_name: Optional[str] = None) -> int:
+    """
+    Load everything a request needs (run before forking and in each worker).
+
+    Args:
+        shared_table_name: Shared transposition table to attach to (spawned
+                           workers; forked ones inherit the server's)
+
+    Returns:
+        Process ID
+    """
+    import battleOptimizer  # noqa: F401  (handler, service, data conversion)
+    import algorithms.greedy  # noqa: F401
+    import algorithms.dynamic_programming  # noqa: F401
+    import algorithms.dijkstra  # noqa: F401
+    import algorithms.abstraction  # noqa: F401
+    import utils.stateSpaceEstimator  # noqa: F401
+    from data.bossTrainers import BOSS_TRAINERS
+    from data.bossTemplates import get_boss_template
+
+    for trainer_id in BOSS_TRAINERS:
+        get_boss_template(trainer_id)
+
+    from services.battleOptimizerService import BattleOptimizerService
+    if shared_table_name and BattleOptimizerService._shared_table is None:
+        from utils.sharedTranspositionTable import SharedTranspositionTable
+        BattleOptimizerService.use_shared_table(SharedTranspositionTable.attach(shared_table_name))
+    return os.getpid()
+
+
+def run_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the Lambda handler on one event (in a worker process).
+
+    Args:
+        event: Lambda Function URL event
+
+    Returns:
+        Lambda response {statusCode, headers, body}
+    """
+    from battleOptimizer import handler
+    return handler(event, None)
+
+
+def unsupported_request(body: Optional[str]) -> Optional[str]:
+    """
+    Why a POST can't run in a pool slot (None = it can).
+
+    Args:
+        body: Request body text
+
+    Returns:
+        Error message for a 400, or None (malformed bodies are left to
+        the handler's own errors)
+    """
+    try:
+        request = json.loads(body or "{}")
+    except ValueError:
+        return None
+    if not isinstance(request, dict):
+        return None
+    if request.get("async"):
+        return 'This server does not run "async" jobs (they would run outside its worker slots)'
+    if "playerTeams" in request:
+        return "This server does not run matchup matrices (send one request per pair)"
+    try:
+        workers = int(request.get("workers", 1))
+    except (TypeError, ValueError):
+        return None
+    if workers > 1:
+        return 'This server runs each request in one process ("workers" must be 1)'
+    return None
+
+
+def build_event(method: str, target: str, headers: Dict[str, str], body: str,
+                source_ip: str = "") -> Dict[str, Any]:
+    """
+    Translate an HTTP request into a Lambda Function URL event.
+
+    Args:
+        method: HTTP method
+        target: Request target (path and query string)
+        headers: Request headers (lower-case names)
+        body: Request body text
+        source_ip: Client address
+
+    Returns:
+        Event with both the Function URL (requestContext.http) and the API
+        Gateway (httpMethod) fields the handler reads
+    """
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query))
+    return {
+        "httpMethod": method,
+        "rawPath": url.path,
+        "path": url.path,
+        "rawQueryString": url.query,
+        "queryStringParameters": query or None,
+        "headers": headers,
+        "body": body,
+        "isBase64Encoded": False,
+        "requestContext": {"http": {"method": method, "path": url.path, "sourceIp": source_ip}}
+    }
+
+
+def json_response(status_code: int, payload: Dict[str, Any],
+                  headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Lambda-style JSON response produced by the server itself."""
+    response_headers = {"Content-Type": "application/json"}
+    response_headers.update(headers or {})
+    return {"statusCode": status_code, "headers": response_headers, "body": json.dumps(payload)}
+
+
+class BattleServer:
+    """
+    asyncio HTTP server dispatching optimizations to warm worker processes.
+
+    Attributes:
+        workers: Worker processes (each runs one request at a time)
+        worker_concurrency: Requests handed to the pool per worker (the
+                            ones beyond `workers` wait in the pool's queue)
+        max_queue: Requests allowed to wait for a free slot (beyond: 429)
+        in_flight: Requests handed to the pool (running or in its queue)
+        queued: Requests waiting for a slot
+        rejected: Requests answered with 429 so far
+        shared_table_slots: Slots of the DP memo shared by the workers (0 = none)
+    """
+
+    def __init__(self, workers: int = 2, worker_concurrency: int = 1, max_queue: int = 8,
+                 shared_table_slots: int = 0):
+        """
+        Create a server (the pool starts in start()).
+
+        Args:
+            workers: Worker processes
+            worker_concurrency: Requests handed to the pool per worker
+            max_queue: Requests allowed to wait for a free slot
+            shared_table_slots: Slots of a shared transposition table for the
+                                workers' DP searches (0 = each keeps its own memo)
+        """
+        if workers < 1 or worker_concurrency < 1 or max_queue < 0:
+            raise ValueError("workers and worker_concurrency must be >= 1, max_queue >= 0")
+        self.workers = workers
+        self.worker_concurrency = worker_concurrency
+        self.max_queue = max_queue
+        self.shared_table_slots = shared_table_slots
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker_pids = []
+        self._shared_table = None
+
+    @property
+    def capacity(self) -> int:
+        """Requests handed to the pool at once (running or in its queue)."""
+        return self.workers * self.worker_concurrency
+
+    @property
+    def running(self) -> int:
+        """Requests a worker is running now (one per worker at most)."""
+        return min(self.in_flight, self.workers)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> Tuple[str, int]:
+        """
+        Warm up, fork the workers and start listening.
+
+        Args:
+            host: Interface to bind
+            port: Port to listen on (0 = any free port)
+
+        Returns:
+            (host, port) actually bound
+        """
+        # Load once here so forked workers inherit it; spawned ones (no
+        # fork on this platform) warm up in the initializer instead
+        warm_worker()
+        table_name = None
+        if self.shared_table_slots > 0:
+            from services.battleOptimizerService import BattleOptimizerService
+            from utils.sharedTranspositionTable import SharedTranspositionTable
+            self._shared_table = SharedTranspositionTable.create(self.shared_table_slots)
+            BattleOptimizerService.use_shared_table(self._shared_table)
+            table_name = self._shared_table.name
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                         initializer=warm_worker, initargs=(table_name,))
+
+        # Start every worker now, not on the first request (the first task
+        # makes the pool fork all of them)
+        await asyncio.get_running_loop().run_in_executor(self._pool, warm_worker)
+        self._worker_pids = sorted(self._pool._processes)
+
+        self._slots = asyncio.Semaphore(self.capacity)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """Serve until the server is closed."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections, finish running requests, stop the workers."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+            self._pool = None
+        if self._shared_table is not None:
+            from services.battleOptimizerService import BattleOptimizerService
+            BattleOptimizerService.use_shared_table(None)
+            self._shared_table.close()
+            self._shared_table = None
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Pool state for GET /health.
+
+        "running" requests are being solved, "poolQueued" ones were handed to
+        the pool but wait for a worker (worker_concurrency > 1), "queued"
+        ones wait for a slot; "inFlight" = running + poolQueued.
+        """
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "workerPids": self._worker_pids,
+            "workerConcurrency": self.worker_concurrency,
+            "capacity": self.capacity,
+            "inFlight": self.in_flight,
+            "running": self.running,
+            "poolQueued": self.in_flight - self.running,
+            "queued": self.queued,
+            "maxQueue": self.max_queue,
+            "rejected": self.rejected,
+            "sharedTableSlots": self._shared_table.slots if self._shared_table is not None else 0
+        }
+
+    async def dispatch(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer one event: POST in a worker process, the rest in this process.
+
+        Args:
+            event: Lambda Function URL event
+
+        Returns:
+            Lambda response
+        """
+        loop = asyncio.get_running_loop()
+        method = event["httpMethod"]
+
+        if method == "GET" and event["path"] == "/health":
+            return json_response(200, self.health())
+        if method != "POST":
+            return await loop.run_in_executor(None, run_event, event)
+        reason = unsupported_request(event["body"])
+        if reason is not None:
+            return json_response(400, {"success": False, "error": reason})
+
+        # Backpressure: every slot busy and the wait queue full
+        if self.in_flight >= self.capacity and self.queued >= self.max_queue:
+            self.rejected += 1
+            return json_response(
+                429,
+                {"success": False, "error": "Server busy, retry later"},
+                {"Retry-After": str(RETRY_AFTER_SECONDS)}
+            )
+
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._pool, run_event, event)
+        except Exception as e:  # Worker crashed or pool shut down
+            return json_response(500, {"success": False, "error": f"Worker failed: {e}"})
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve the requests of one connection (HTTP/1.1 keep-alive)."""
+        peer = writer.get_extra_info("peername")
+        source_ip = peer[0] if peer else ""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                if isinstance(request, dict):
+                    # Malformed request: answer and drop the connection
+                    await self._write_response(writer, request, keep_alive=False)
+                    break
+
+                method, target, headers, body, keep_alive = request
+                response = await self.dispatch(build_event(method, target, headers, body, source_ip))
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        """
+        Read one request.
+
+        Returns:
+            (method, target, headers, body, keep_alive), an error response
+            dict if the request is malformed, or None at end of connection
+        """
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            return json_response(400, {"success": False, "error": "Malformed request line"})
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                return json_response(431, {"success": False, "error": "Too many headers"})
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            return json_response(411, {"success": False, "error": "Content-Length required"})
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return json_response(400, {"success": False, "error": "Invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            return json_response(413, {"success": False, "error": "Request body too large"})
+        body = (await reader.readexactly(length)).decode("utf-8", "replace") if length else ""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, headers, body, keep_alive
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, response: Dict[str, Any], keep_alive: bool):
+        """Send a Lambda-style {statusCode, headers, body} response."""
+        status = response["statusCode"]
+        body = (response.get("body") or "").encode("utf-8")
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        for name, value in (response.get("headers") or {}).items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, workers: int, worker_concurrency: int, max_queue: int,
+                shared_table_slots: int = 0):
+    """Run a BattleServer until SIGINT / SIGTERM."""
+    server = BattleServer(workers, worker_concurrency, max_queue, shared_table_slots)
+    bound_host, bound_port = await server.start(host, port)
+    print(f"Battle optimizer listening on http://{bound_host}:{bound_port} "
+          f"({workers} workers, {worker_concurrency} handed to each, queue {max_queue})")
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    serving = asyncio.ensure_future(server.serve_forever())
+    await stop.wait()
+    serving.cancel()
+    await server.close()
+
+
+def main() -> int:
+    """Command line entry point: serve until interrupted."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the battle optimizer with a worker pool")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default 8080)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--worker-concurrency", type=int, default=1,
+                        help="requests handed to the pool per worker; a worker runs one at a "
+                             "time, the rest wait in the pool's queue (default 1)")
+    parser.add_argument("--max-queue", type=int, default=8,
+                        help="requests waiting for a worker before 429 (default 8)")
+    parser.add_argument("--shared-table-slots", type=int, default=0,
+                        help="slots of a DP memo shared by all workers (default 0 = none)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.worker_concurrency, args.max_queue,
+                          args.shared_table_slots))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,4 +1,6 @@
 """Boss trainer data package"""
 from .bossTrainers import get_boss_trainer, BOSS_TRAINERS, create_champion_blue, create_giovanni, create_lance
+from .bossTemplates import BossTemplate, get_boss_template
 
-__all__ = ['get_boss_trainer', 'BOSS_TRAINERS', 'create_champion_blue', 'create_giovanni', 'create_lance']
+__all__ = ['get_boss_trainer', 'BOSS_TRAINERS', 'create_champion_blue', 'create_giovanni', 'create_lance',
+           'BossTemplate', 'get_boss_template']
@@ -0,0 +1,176 @@
+"""
+Boss Trainer Templates - Boss Teams Compiled Once Per Process
+
+Boss teams never change, yet every request used to rebuild them from scratch
+(new Pokemon and Move objects, stat formulas run again). A BossTemplate is
+compiled the first time a boss is requested and kept for the life of the
+process (warm Lambda containers reuse it). It holds:
+- The built Pokemon (stats computed once; damage is calculated from
+  their clones)
+- Trainer AI priority rows: the priority of every move against each
+  defending type combination, so the AI reply is a table lookup
+
+A request only calls instantiate(), which clones the compiled Pokemon into a
+per-battle HP/PP state. Templates are never handed out directly, so nothing
+a battle does can change them.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.pokemon import Pokemon
+from models.battleState import BattleState
+from data.bossTrainers import BOSS_TRAINERS
+
+# All 15 Gen 1 types, in type ID order
+GEN1_TYPES = (
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison",
+    "Ground", "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon"
+)
+TYPE_IDS: Dict[str, int] = {name: i for i, name in enumerate(GEN1_TYPES)}
+
+
+class AIPriorityTable:
+    """
+    Trainer AI priorities of one Pokemon's moves against every defender typing.
+
+    Immutable and shared by every copy of the Pokemon (deep copies included).
+
+    Attributes:
+        rows: Flat tuple indexed by type1_id * 15 + type2_id (type2 = type1
+              for single-type defenders), each a tuple of move priorities
+    """
+
+    def __init__(self, pokemon: Pokemon):
+        """
+        Compute the rows for a Pokemon's moveset.
+
+        Args:
+            pokemon: Pokemon whose moves are rated
+        """
+        rows = []
+        for type1 in GEN1_TYPES:
+            for type2 in GEN1_TYPES:
+                defender_types = [type1] if type1 == type2 else [type1, type2]
+                rows.append(tuple(
+                    BattleState.opponent_move_priority(m, _TypedDefender(defender_types))
+                    for m in pokemon.moves
+                ))
+        self.rows: Tuple[Tuple[int, ...], ...] = tuple(rows)
+
+    def row(self, defender_types: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Get the move priorities against a defender.
+
+        Args:
+            defender_types: Defender's 1-2 types
+
+        Returns:
+            Tuple of priorities, one per move (lower is preferred), or None
+            if a type is not a Gen 1 type (Steel, Dark, Fairy - the caller
+            rates the moves directly, the type chart treats them as neutral)
+        """
+        type1 = TYPE_IDS.get(defender_types[0])
+        type2 = TYPE_IDS.get(defender_types[1]) if len(defender_types) > 1 else type1
+        if type1 is None or type2 is None:
+            return None
+        return self.rows[type1 * len(GEN1_TYPES) + type2]
+
+    def __copy__(self) -> 'AIPriorityTable':
+        return self
+
+    def __deepcopy__(self, memo) -> 'AIPriorityTable':
+        return self
+
+
+class _TypedDefender:
+    """Stand-in defender for opponent_move_priority (only types are read)."""
+
+    def __init__(self, types: List[str]):
+        self.types = types
+
+
+class BossTemplate:
+    """
+    A boss trainer's team, compiled once.
+
+    Attributes:
+        trainer_id: Boss ID ("blue", "giovanni", "lance")
+        name, title, description: Display metadata
+        ai_priorities: AIPriorityTable per Pokemon
+    """
+
+    def __init__(self, trainer_id: str):
+        """
+        Compile a boss team.
+
+        Args:
+            trainer_id: Boss ID
+
+        Raises:
+            ValueError: If the boss is unknown
+        """
+        if trainer_id not in BOSS_TRAINERS:
+            raise ValueError(f"Unknown trainer: {trainer_id}")
+
+        info = BOSS_TRAINERS[trainer_id]
+        self.trainer_id = trainer_id
+        self.name = info["name"]
+        self.title = info["title"]
+        self.description = info["description"]
+
+        # Compiled Pokemon (private: only clones leave the template)
+        self._team: Tuple[Pokemon, ...] = tuple(info["team"]())
+
+        self.ai_priorities = tuple(AIPriorityTable(p) for p in self._team)
+
+        for pokemon, table in zip(self._team, self.ai_priorities):
+            pokemon.ai_priorities = table
+
+    def instantiate(self) -> List[Pokemon]:
+        """
+        Create the per-battle team (full HP and PP).
+
+        Returns:
+            New list of Pokemon sharing the precomputed data
+
+        Time Complexity: O(n * m) copies, no stat or type computations
+        """
+        return [p.clone() for p in self._team]
+
+    def __len__(self) -> int:
+        return len(self._team)
+
+
+# Compiled templates: trainer_id -> BossTemplate (filled on first use)
+_TEMPLATES: Dict[str, BossTemplate] = {}
+
+
+def get_boss_template(trainer_id: str) -> BossTemplate:
+    """
+    Get a boss template, compiling it on first use.
+
+    Args:
+        trainer_id: Boss ID ("blue", "giovanni", "lance")
+
+    Returns:
+        BossTemplate shared by the whole process
+
+    Raises:
+        ValueError: If the boss is unknown
+    """
+    template = _TEMPLATES.get(trainer_id)
+    if template is None:
+        template = BossTemplate(trainer_id)
+        _TEMPLATES[trainer_id] = template
+    return template
@@ -16,8 +16,10 @@ CS_311 Extra Credit Project
 import sys
 import os
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from models.pokemon import Pokemon
 from models.move import Move
@@ -413,11 +415,15 @@ def get_boss_trainer(trainer_id: str) -> dict:
         trainer_id: ID of the trainer ("blue", "giovanni", "lance")
 
     Returns:
-        Dictionary with trainer info and team
+        Dictionary with trainer info and team (a fresh per-battle copy of the
+        team compiled once per process, see data/bossTemplates.py)
     """
+    # Import here to avoid circular dependency
+    from data.bossTemplates import get_boss_template
+
     if trainer_id not in BOSS_TRAINERS:
         raise ValueError(f"Unknown trainer: {trainer_id}")
 
     trainer_data = BOSS_TRAINERS[trainer_id].copy()
-    trainer_data["team"] = trainer_data["team"]()  # Call function to get team
+    trainer_data["team"] = get_boss_template(trainer_id).instantiate()
     return trainer_data
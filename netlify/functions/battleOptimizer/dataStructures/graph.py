@@ -6,6 +6,7 @@ This module implements a directed/undirected graph with support for:
 - DFS (Depth-First Search) - Assignment 8
 - Dijkstra's Shortest Path Algorithm - Assignment 9
 - Cycle Detection - Assignment 8
+- K Shortest Paths (alternative plans; extends Assignment 9)
 
 Original C++ implementation from:
 - CS_311 Programming Assignment 8 (Graph Traversal)
@@ -16,7 +17,7 @@ Author: Josh C.
 Date: December 2025
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from collections import deque
 import heapq
 import sys
@@ -320,6 +321,97 @@ class Graph:
 
         return dist[dest], path
 
+    def k_shortest_paths(
+        self,
+        source: int,
+        targets: Dict[int, float],
+        k: int
+    ) -> List[Tuple[int, float, List[int]]]:
+        """
+        Find the k shortest paths from source to any of several targets.
+
+        Eppstein-style enumeration: one reverse Dijkstra from all targets
+        gives every vertex its exact (distance, penalty) to the nearest
+        target; path prefixes are then popped from a heap ordered by
+        (prefix cost + remaining distance, penalty), so complete paths come
+        out in order and every prefix popped extends to a target. The cost
+        is one reverse Dijkstra plus O(k * path length * out-degree) heap
+        operations - no search is repeated per path.
+
+        Paths are walks: on a graph with cycles the same vertex can repeat.
+        On an acyclic graph (e.g. a battle state graph, where every edge
+        advances the turn) all paths are simple.
+
+        Args:
+            source: Index of the starting vertex
+            targets: Maps target vertex index -> penalty, the tiebreaker
+                     between paths of equal distance (lower first)
+            k: Number of paths wanted
+
+        Returns:
+            Up to k tuples of (distance, penalty, path), best first; path
+            is the list of vertex indices from source to a target
+
+        Complexity: O((V + E) log V + k * L * D * log(k * L * D)), L = path
+                    length, D = out-degree
+        """
+        if k <= 0 or not targets:
+            return []
+        INF = (sys.maxsize, float("inf"))
+
+        # Reverse Dijkstra from all targets: best (distance, penalty) to finish
+        reverse: List[List[Tuple[int, int]]] = [[] for _ in range(self.num_verts)]
+        for edges in self.adj_list:
+            for edge in edges:
+                reverse[edge.to_vertex].append((edge.from_vertex, int(edge.weight)))
+        to_go = [INF] * self.num_verts
+        pq = []
+        for target, penalty in targets.items():
+            to_go[target] = min(to_go[target], (0, penalty))
+            heapq.heappush(pq, (to_go[target], target))
+        while pq:
+            cost, v = heapq.heappop(pq)
+            if cost > to_go[v]:
+                continue
+            for u, weight in reverse[v]:
+                candidate = (cost[0] + weight, cost[1])
+                if candidate < to_go[u]:
+                    to_go[u] = candidate
+                    heapq.heappush(pq, (candidate, u))
+
+        if to_go[source] == INF:
+            return []
+
+        # Best-first over prefixes: (estimate, penalty, counter, g, vertex,
+        # prefix, done). A prefix is a linked tuple (vertex, parent prefix).
+        counter = 0
+        heap = [(to_go[source][0], to_go[source][1], counter, 0, source, (source, None), False)]
+        results = []
+        while heap and len(results) < k:
+            _, penalty, _, g, v, prefix, done = heapq.heappop(heap)
+            if done:
+                path = []
+                while prefix is not None:
+                    path.append(prefix[0])
+                    prefix = prefix[1]
+                path.reverse()
+                results.append((g, penalty, path))
+                continue
+
+            if v in targets:
+                # A path ending here competes with its longer extensions
+                counter += 1
+                heapq.heappush(heap, (g, targets[v], counter, g, v, prefix, True))
+            for edge in self.adj_list[v]:
+                w = edge.to_vertex
+                if to_go[w] == INF:
+                    continue
+                cost = g + int(edge.weight)
+                counter += 1
+                heapq.heappush(heap, (cost + to_go[w][0], to_go[w][1], counter,
+                                      cost, w, (w, prefix), False))
+        return results
+
     def print_graph(self):
         """
         Print the graph structure (for debugging).
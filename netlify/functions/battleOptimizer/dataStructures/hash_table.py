@@ -394,6 +394,20 @@ class HashTable:
         """
         return self.num_entries / self.table_size if self.table_size > 0 else 0
 
+    def get_all_entries(self) -> List[Tuple[Any, Any]]:
+        """
+        Get all key-value pairs in the table (bucket order).
+
+        Returns:
+            List of (key, value) tuples
+
+        Complexity: O(n + b) for n entries in b buckets
+        """
+        entries: List[Tuple[Any, Any]] = []
+        for bucket in self.table:
+            entries.extend(bucket.get_all_entries())
+        return entries
+
     def rehash(self, new_size: int):
         """
         Rehash the table to a new size.
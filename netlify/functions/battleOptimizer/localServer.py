@@ -0,0 +1,111 @@
+"""
+Local Development Server for the Battle Optimizer
+
+Serves battleOptimizer.handler over plain HTTP for local development, plus
+real streaming: a POST with "stream": true gets its NDJSON records (see
+services/battleStream.py) one chunk at a time, as the search produces them.
+
+    python localServer.py --port 8787
+    curl -N -X POST localhost:8787 -d '{"playerTeam": [...], "bossTrainer": "blue", "stream": true}'
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import json
+from urllib.parse import urlparse, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# Add current directory to path for imports (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from battleOptimizer import handler, parse_optimize_request
+
+
+class BattleOptimizerRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for the Lambda handler (chunked NDJSON when streaming)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = dict(parse_qsl(urlparse(self.path).query))
+        self._send_lambda_response(handler({"httpMethod": "GET", "queryStringParameters": query}, None))
+
+    def do_OPTIONS(self):
+        self._send_lambda_response(handler({"httpMethod": "OPTIONS"}, None))
+
+    def do_POST(self):
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+
+        options = self._streaming_options(raw_body)
+        if options is None:
+            # Regular request, or invalid one (the handler reports the error)
+            self._send_lambda_response(handler({"httpMethod": "POST", "body": raw_body}, None))
+            return
+
+        from services.battleStream import stream_battle, ndjson_line, NDJSON_CONTENT_TYPE
+
+        self.send_response(200)
+        self.send_header("Content-Type", NDJSON_CONTENT_TYPE)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for record in stream_battle(**options):
+            self._write_chunk(ndjson_line(record).encode("utf-8"))
+        self._write_chunk(b"")
+
+    @staticmethod
+    def _streaming_options(raw_body: str) -> Optional[Dict[str, Any]]:
+        """optimize_battle arguments of a valid streaming request, else None."""
+        try:
+            body = json.loads(raw_body or "{}")
+            if not isinstance(body, dict) or not body.get("stream"):
+                return None
+            return parse_optimize_request(body)
+        except ValueError:
+            return None
+
+    def _write_chunk(self, data: bytes):
+        """Send one chunk (an empty chunk ends the response)."""
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_lambda_response(self, response: Dict[str, Any]):
+        """Send a Lambda-style {statusCode, headers, body} response."""
+        body = response.get("body", "").encode("utf-8")
+        self.send_response(response["statusCode"])
+        for name, value in response.get("headers", {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main() -> int:
+    """Command line entry point: serve until interrupted."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the battle optimizer locally")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8787, help="port to listen on (default 8787)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), BattleOptimizerRequestHandler)
+    print(f"Battle optimizer listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
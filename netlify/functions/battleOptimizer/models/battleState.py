@@ -24,10 +24,11 @@ from typing import List, Optional, Tuple
 import copy
 import sys
 import os
-import random
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from models.pokemon import Pokemon
 from models.move import Move
@@ -151,6 +152,21 @@ class BattleState:
 
         return key
 
+    def compact_key(self) -> Tuple:
+        """
+        Generate a compact tuple key for this state.
+
+        Holds exactly the same information as hash_key() (HP of every
+        Pokemon, active indices, turn) but skips the string formatting, so
+        it is cheaper to build and compare during search.
+
+        Returns:
+            Tuple of (player_hps, opponent_hps, player_active, opponent_active, turn)
+        """
+        return (tuple(p.current_hp for p in self.player_team),
+                tuple(p.current_hp for p in self.opponent_team),
+                self.player_active, self.opponent_active, self.turn)
+
     def __hash__(self) -> int:
         """Python hash function (for use in sets/dicts)."""
         return hash(self.hash_key())
@@ -184,7 +200,8 @@ class BattleState:
 
     def generate_successor_states(
         self,
-        include_switches: bool = False
+        include_switches: bool = False,
+        move_filter=None
     ) -> List[Tuple['BattleState', Move, int]]:
         """
         Generate all possible successor states from this state.
@@ -196,6 +213,8 @@ class BattleState:
 
         Args:
             include_switches: Whether to include Pokemon switches as actions
+            move_filter: Optional MoveDominanceFilter - only the moves it keeps
+                         are expanded (None = expand every usable move)
 
         Returns:
             List of tuples: (successor_state, move_used, damage_dealt)
@@ -208,109 +227,308 @@ class BattleState:
         if self.is_battle_over():
             return successors  # No successors if battle is over
 
-        active_player = self.get_active_player_pokemon()
-        active_opponent = self.get_active_opponent_pokemon()
+        for move in self._candidate_moves(move_filter):
+            outcome = self._predict_move_outcome(move)
+            next_state = self._apply_move_outcome(move, outcome)
+
+            # Add to successors (auto-switch handles Pokemon changes)
+            successors.append((next_state, move, outcome[0]))
+
+        # TODO: Add switch actions if include_switches=True
+        # For now, we focus on attack actions only
+
+        return successors
+
+    def generate_unique_successor_states(
+        self,
+        move_filter=None
+    ) -> List[Tuple['BattleState', Move, int, Tuple[str, ...]]]:
+        """
+        Generate successor states, merging moves that lead to the same state.
 
-        # Generate successors for each usable move
-        for move in active_player.moves:
-            if not move.is_usable():
-                continue  # Skip moves with 0 PP
+        Two moves often produce exactly the same next state (same damage, or
+        both overkill a low-HP defender, and the same opponent reply). The
+        outcome of every move is predicted first and only one state is copied
+        per distinct state key, so the graph gets no parallel edges and DP
+        never evaluates the same child twice.
+
+        Args:
+            move_filter: Optional MoveDominanceFilter (see generate_successor_states)
 
-            # Create a copy of the state
-            next_state = self.copy()
+        Returns:
+            List of tuples: (successor_state, representative_move, damage_dealt,
+            equivalent_move_names). The representative is the first move (in
+            moveset order) reaching that state, and equivalent_move_names holds
+            every move that reaches it, representative first.
+
+        Time Complexity: O(m) where m is number of moves (usually 4)
+        """
+        if self.is_battle_over():
+            return []
 
-            # Get the Pokemon in the new state
-            attacker = next_state.get_active_player_pokemon()
-            defender = next_state.get_active_opponent_pokemon()
+        # Group moves by the state key they would produce (insertion ordered)
+        groups = {}
+        for move in self._candidate_moves(move_filter):
+            outcome = self._predict_move_outcome(move)
+            key = self._outcome_key(outcome)
 
-            # Import here to avoid circular dependency
-            from utils.damageCalculator import DamageCalculator
+            if key in groups:
+                groups[key][2].append(move.name)
+            else:
+                groups[key] = (move, outcome, [move.name])
 
-            # Calculate damage (DETERMINISTIC: no crits, average damage roll)
-            # This ensures algorithm execution and replay produce identical results
-            damage = DamageCalculator.calculate_damage(
-                attacker, defender, move,
-                is_critical=False,  # No critical hits for consistency
-                random_roll=236  # Average of 217-255 for deterministic damage
-            )
+        # Only now copy one state per distinct outcome
+        successors = []
+        for move, outcome, move_names in groups.values():
+            next_state = self._apply_move_outcome(move, outcome)
+            successors.append((next_state, move, outcome[0], tuple(move_names)))
 
-            # OPTIMIZATION: Skip immune moves (0 damage) to reduce graph size
-            # DISABLED: This was causing Dijkstra to miss victory paths!
-            # if damage == 0:
-            #     continue  # Don't explore this branch
+        return successors
 
-            # Apply damage
-            defender.take_damage(damage)
+    def _candidate_moves(self, move_filter=None) -> List[Move]:
+        """
+        Get the usable moves of the active player Pokemon worth expanding.
 
-            # Use the move (decrement PP)
-            next_state.get_active_player_pokemon().get_move(move.name).use()
+        Args:
+            move_filter: Optional MoveDominanceFilter (dominated moves are
+                         pruned before any state is copied)
 
-            # If opponent Pokemon fainted, switch to next available
-            if defender.is_fainted():
-                next_state._auto_switch_opponent()
+        Returns:
+            List of usable moves
+        """
+        if move_filter is not None:
+            return move_filter.filter_moves(self)
+
+        return [m for m in self.get_active_player_pokemon().moves if m.is_usable()]
+
+    def _predict_move_outcome(self, move: Move) -> Tuple[int, int, int, Optional[int], int, int, int]:
+        """
+        Work out what one turn with this move does, without copying the state.
+
+        Turn order (Gen 1, player moves first):
+        1. Player attacks with the move
+        2. If the defender fainted, the opponent auto-switches (no counter)
+        3. Otherwise the opponent counterattacks with its AI move choice
+        4. If the player Pokemon fainted, the player auto-switches
+
+        Args:
+            move: Usable move of the active player Pokemon
+
+        Returns:
+            Tuple of (damage, defender_hp_after, opponent_active_after,
+            reply_move_index, counter_damage, attacker_hp_after,
+            player_active_after). reply_move_index is None if the opponent
+            did not counterattack.
+        """
+        # Import here to avoid circular dependency
+        from utils.damageCalculator import DamageCalculator
+
+        attacker = self.get_active_player_pokemon()
+        defender = self.get_active_opponent_pokemon()
+
+        # Calculate damage (DETERMINISTIC: no crits, average damage roll)
+        # This ensures algorithm execution and replay produce identical results
+        damage = DamageCalculator.calculate_damage(
+            attacker, defender, move,
+            is_critical=False,  # No critical hits for consistency
+            random_roll=236  # Average of 217-255 for deterministic damage
+        )
+
+        # OPTIMIZATION: Skip immune moves (0 damage) to reduce graph size
+        # DISABLED: This was causing Dijkstra to miss victory paths!
+        # if damage == 0:
+        #     continue  # Don't explore this branch
+
+        defender_hp = defender.current_hp - min(damage, defender.current_hp)
+        opponent_active = self.opponent_active
+        reply_index = None
+        counter_damage = 0
+        attacker_hp = attacker.current_hp
+        player_active = self.player_active
 
+        if defender_hp <= 0:
+            # If opponent Pokemon fainted, switch to next available
+            opponent_active = self._next_alive_index(self.opponent_team, self.opponent_active)
+        else:
             # OPPONENT COUNTERATTACK (Gen 1: both attack in same turn based on Speed)
-            # Only counter if battle isn't over and opponent is still alive
-            elif not next_state.is_battle_over():
-                opponent_attacker = next_state.get_active_opponent_pokemon()
-                player_defender = next_state.get_active_player_pokemon()
-
-                # Gen 1 Trainer AI: Priority-based move selection with type effectiveness
-                if opponent_attacker.moves:
-                    usable_moves = [m for m in opponent_attacker.moves if m.is_usable()]
-                    if usable_moves:
-                        # Calculate priority for each move (Gen 1 AI algorithm)
-                        from utils.typeEffectiveness import TYPE_CHART
-
-                        move_priorities = []
-                        for m in usable_moves:
-                            priority = 10  # Base priority
-
-                            # Check type effectiveness
-                            effectiveness = TYPE_CHART.get_multiplier_dual_type(
-                                m.type,
-                                player_defender.types[0],
-                                player_defender.types[1] if len(player_defender.types) > 1 else player_defender.types[0]
-                            )
-
-                            # Adjust priority based on effectiveness
-                            if effectiveness > 1.0:  # Super effective
-                                priority -= 1  # Favor this move
-                            elif effectiveness < 1.0:  # Not very effective
-                                priority += 1  # Avoid this move
-
-                            move_priorities.append((m, priority))
-
-                        # Find minimum priority (best moves)
-                        min_priority = min(p for _, p in move_priorities)
-                        best_moves = [m for m, p in move_priorities if p == min_priority]
-
-                        # DETERMINISTIC selection for graph exploration (prevents state explosion)
-                        # Pick highest power move among best moves for consistent state graph
-                        best_move = max(best_moves, key=lambda m: m.power)
-
-                        counter_damage = DamageCalculator.calculate_damage(
-                            opponent_attacker, player_defender, best_move,
-                            is_critical=False,  # No critical hits for consistency
-                            random_roll=236  # Average of 217-255 for deterministic damage
-                        )
-                        player_defender.take_damage(counter_damage)
-                        best_move.use()
-
-                        # If player Pokemon fainted, switch to next available
-                        if player_defender.is_fainted():
-                            next_state._auto_switch_player()
-
-            # Increment turn
-            next_state.turn += 1
+            reply_move = BattleState.select_opponent_move(defender, attacker)
 
-            # Add to successors (auto-switch handles Pokemon changes)
-            successors.append((next_state, move, damage))
+            if reply_move is not None:
+                reply_index = defender.moves.index(reply_move)
+                counter_damage = DamageCalculator.calculate_damage(
+                    defender, attacker, reply_move,
+                    is_critical=False,  # No critical hits for consistency
+                    random_roll=236  # Average of 217-255 for deterministic damage
+                )
+                attacker_hp -= min(counter_damage, attacker_hp)
 
-        # TODO: Add switch actions if include_switches=True
-        # For now, we focus on attack actions only
+                # If player Pokemon fainted, switch to next available
+                if attacker_hp <= 0:
+                    player_active = self._next_alive_index(self.player_team, self.player_active)
 
-        return successors
+        return (damage, defender_hp, opponent_active, reply_index,
+                counter_damage, attacker_hp, player_active)
+
+    def _outcome_key(self, outcome: Tuple) -> Tuple:
+        """
+        Get the compact_key() the state would have after a predicted turn.
+
+        Args:
+            outcome: Tuple from _predict_move_outcome
+
+        Returns:
+            Compact state key tuple
+        """
+        _, defender_hp, opponent_active, _, _, attacker_hp, player_active = outcome
+
+        player_hps = [p.current_hp for p in self.player_team]
+        player_hps[self.player_active] = attacker_hp
+        opponent_hps = [p.current_hp for p in self.opponent_team]
+        opponent_hps[self.opponent_active] = defender_hp
+
+        return (tuple(player_hps), tuple(opponent_hps),
+                player_active, opponent_active, self.turn + 1)
+
+    def _apply_move_outcome(self, move: Move, outcome: Tuple) -> 'BattleState':
+        """
+        Build the successor state for a predicted turn.
+
+        Args:
+            move: Move used by the active player Pokemon
+            outcome: Tuple from _predict_move_outcome for that move
+
+        Returns:
+            New BattleState (this state is not modified)
+        """
+        damage, _, opponent_active, reply_index, counter_damage, _, player_active = outcome
+
+        # Create a copy of the state
+        next_state = self.copy()
+
+        # Apply damage and use the move (decrement PP)
+        next_state.get_active_opponent_pokemon().take_damage(damage)
+        next_state.get_active_player_pokemon().get_move(move.name).use()
+
+        if reply_index is not None:
+            opponent_attacker = next_state.get_active_opponent_pokemon()
+            opponent_attacker.moves[reply_index].use()
+            next_state.get_active_player_pokemon().take_damage(counter_damage)
+
+        # Auto-switches (already worked out by the prediction)
+        next_state.opponent_active = opponent_active
+        next_state.player_active = player_active
+
+        # Increment turn
+        next_state.turn += 1
+
+        return next_state
+
+    @staticmethod
+    def select_opponent_move(opponent_attacker: Pokemon, player_defender: Pokemon) -> Optional[Move]:
+        """
+        Pick the opponent's counterattack using the Gen 1 Trainer AI.
+
+        Gen 1 Trainer AI: Priority-based move selection with type effectiveness.
+        DETERMINISTIC selection for graph exploration (prevents state explosion):
+        the highest power move among the best-priority moves is used.
+
+        Args:
+            opponent_attacker: Active opponent Pokemon
+            player_defender: Active player Pokemon
+
+        Returns:
+            Move the opponent uses, or None if it has no usable moves
+        """
+        usable_moves = [m for m in opponent_attacker.moves if m.is_usable()]
+        if not usable_moves:
+            return None
+
+        # Calculate priority for each move (Gen 1 AI algorithm)
+        priorities = BattleState.opponent_move_priorities(opponent_attacker, player_defender)
+        move_priorities = [
+            (m, priority)
+            for m, priority in zip(opponent_attacker.moves, priorities)
+            if m.is_usable()
+        ]
+
+        # Find minimum priority (best moves)
+        min_priority = min(p for _, p in move_priorities)
+        best_moves = [m for m, p in move_priorities if p == min_priority]
+
+        # Pick highest power move among best moves for consistent state graph
+        return max(best_moves, key=lambda m: m.power)
+
+    @staticmethod
+    def opponent_move_priorities(opponent_attacker: Pokemon, player_defender: Pokemon) -> Tuple[int, ...]:
+        """
+        Gen 1 Trainer AI priority of every opponent move (moveset order).
+
+        Boss Pokemon carry a precomputed table (see data/bossTemplates.py),
+        so this is a single lookup for them (defenders with a type the Gen 1
+        table doesn't know are rated move by move).
+
+        Args:
+            opponent_attacker: Opponent Pokemon
+            player_defender: Active player Pokemon
+
+        Returns:
+            Tuple of priorities, one per move (lower is preferred)
+        """
+        if opponent_attacker.ai_priorities is not None:
+            row = opponent_attacker.ai_priorities.row(player_defender.types)
+            if row is not None:
+                return row
+
+        return tuple(BattleState.opponent_move_priority(m, player_defender)
+                     for m in opponent_attacker.moves)
+
+    @staticmethod
+    def opponent_move_priority(move: Move, player_defender: Pokemon) -> int:
+        """
+        Gen 1 Trainer AI priority of one opponent move (lower is preferred).
+
+        Args:
+            move: Opponent move
+            player_defender: Active player Pokemon
+
+        Returns:
+            9 if super effective, 11 if not very effective, otherwise 10
+        """
+        from utils.typeEffectiveness import TYPE_CHART
+
+        priority = 10  # Base priority
+
+        # Check type effectiveness
+        effectiveness = TYPE_CHART.get_multiplier_dual_type(
+            move.type,
+            player_defender.types[0],
+            player_defender.types[1] if len(player_defender.types) > 1 else player_defender.types[0]
+        )
+
+        # Adjust priority based on effectiveness
+        if effectiveness > 1.0:  # Super effective
+            priority -= 1  # Favor this move
+        elif effectiveness < 1.0:  # Not very effective
+            priority += 1  # Avoid this move
+
+        return priority
+
+    @staticmethod
+    def _next_alive_index(team: List[Pokemon], fainted_index: int) -> int:
+        """
+        Index the auto-switch would pick after team[fainted_index] faints.
+
+        Args:
+            team: Team whose active Pokemon is fainting
+            fainted_index: Index of the fainting Pokemon
+
+        Returns:
+            First other alive index, or fainted_index if none is left
+        """
+        for i, pokemon in enumerate(team):
+            if not pokemon.is_fainted() and i != fainted_index:
+                return i
+        return fainted_index
 
     def _auto_switch_opponent(self):
         """
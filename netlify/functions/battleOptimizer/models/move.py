@@ -78,6 +78,12 @@ class Move:
         # Determine if physical or special based on type
         self.is_physical = move_type in Move.PHYSICAL_TYPES
 
+    def clone(self) -> 'Move':
+        """Copy this move (same data, its own PP counter)."""
+        clone = Move.__new__(Move)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
     def use(self) -> bool:
         """
         Use this move (decrement PP).
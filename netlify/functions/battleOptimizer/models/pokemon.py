@@ -38,6 +38,8 @@ class Pokemon:
         defense: Defense stat (calculated)
         speed: Speed stat (calculated)
         special: Special stat (calculated) - used for both Sp.Atk and Sp.Def in Gen 1
+        ai_priorities: Optional precomputed Trainer AI priority table for this
+                       Pokemon's moves (set on boss Pokemon, see data/bossTemplates.py)
     """
 
     def __init__(
@@ -110,6 +112,9 @@ class Pokemon:
             raise ValueError("Pokemon can have at most 4 moves")
         self.moves = moves
 
+        # Precomputed AI priority rows (boss Pokemon only)
+        self.ai_priorities = None
+
     def _calculate_hp(self) -> int:
         """
         Calculate max HP using Gen 1 formula.
@@ -147,6 +152,23 @@ class Pokemon:
         stat = int(((base + dv) * 2 + 63) * level / 100) + 5
         return stat
 
+    def clone(self) -> 'Pokemon':
+        """
+        Copy this Pokemon with its own HP and PP, reusing the computed stats.
+
+        Cheaper than building a new Pokemon (no stat formulas, no validation).
+
+        Returns:
+            New Pokemon in the same HP/PP state
+        """
+        clone = Pokemon.__new__(Pokemon)
+        clone.__dict__.update(self.__dict__)
+        clone.types = list(self.types)
+        clone.base_stats = dict(self.base_stats)
+        clone.dvs = dict(self.dvs)
+        clone.moves = [m.clone() for m in self.moves]
+        return clone
+
     def take_damage(self, damage: int) -> int:
         """
         Take damage and update current HP.
@@ -20,18 +20,49 @@ CS_311 Extra Credit Project
 
 import sys
 import os
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple, TYPE_CHECKING
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from services.pokemonDataService import PokemonDataService
 from data.bossTrainers import get_boss_trainer
-from algorithms.greedy import run_greedy_optimizer, GreedyResult
-from algorithms.dynamic_programming import run_dp_optimizer, DPResult
-from algorithms.dijkstra import run_dijkstra_optimizer, DijkstraResult
+from services.resultCache import ResultCache, default_result_cache, request_fingerprint
+from utils.battleLogCodec import LOG_FORMATS, encode_battle_log
 from models.pokemon import Pokemon
 
+# Most worker processes one parallel Dijkstra request may ask for (the
+# count actually used is also capped at the CPU count, see _usable_workers)
+MAX_SEARCH_WORKERS = 32
+
+# Most alternative victory plans one Dijkstra request may ask for
+MAX_TOP_K = 20
+
+# Most opponents one gauntlet request may chain
+MAX_GAUNTLET_STAGES = 8
+
+# Gauntlet work is up to stages x frontier Pareto searches in one call:
+# most end states carried between stages, and most states per stage graph
+MAX_GAUNTLET_FRONTIER = 16
+MAX_GAUNTLET_STATES = 100000
+
+# Default planning time of one gauntlet request (below the 10 s function
+# timeout; stages finished in time are cached, so a resend continues)
+GAUNTLET_TIME_LIMIT_MS = 8000.0
+
+# Algorithms are imported by optimize_battle when first requested, so a cold
+# start only pays for the one the request uses (see startupBenchmark.py)
+if TYPE_CHECKING:
+    from algorithms.greedy import GreedyResult
+    from algorithms.dynamic_programming import DPResult
+    from algorithms.dijkstra import DijkstraResult
+    from algorithms.portfolio import PortfolioResult
+    from utils.sharedTranspositionTable import SharedTranspositionTable
+    from utils.searchBounds import SearchBounds
+
 
 class BattleOptimizerService:
     """
@@ -41,8 +72,28 @@ class BattleOptimizerService:
     1. Converting MongoDB Pokemon data to battle-ready Pokemon
     2. Running optimization algorithms
     3. Formatting results for API responses
+
+    Results of identical requests are reused from a process-wide ResultCache
+    (warm containers answer repeats without searching again). DP searches can
+    also share their memo with other processes through a shared
+    transposition table (use_shared_table; battleServer.py sets one up for
+    its worker pool).
     """
 
+    _result_cache: ResultCache = default_result_cache()
+    _shared_table: Optional['SharedTranspositionTable'] = None
+
+    @staticmethod
+    def use_shared_table(table: Optional['SharedTranspositionTable']):
+        """
+        Share DP memo values with other processes through `table`.
+
+        Args:
+            table: SharedTranspositionTable (see utils/sharedTranspositionTable.py),
+                   or None to stop sharing
+        """
+        BattleOptimizerService._shared_table = table
+
     @staticmethod
     def optimize_battle(
         player_team_data: List[Dict[str, Any]],
@@ -52,7 +103,18 @@ class BattleOptimizerService:
         player_level: int = 50,
         max_turns: int = 100,  # Allow full battles to complete
         max_depth: int = 50,  # DP: Allow deeper exploration with memoization
-        max_states: int = 50000  # Dijkstra: Increased for complete victory paths
+        max_states: int = 50000,  # Dijkstra: Increased for complete victory paths
+        abstraction: Optional[str] = None,  # Dijkstra: "buckets" or "hits" for huge battles
+        hp_buckets: int = 8,
+        use_cache: bool = True,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        log_format: str = "full",
+        time_budget_ms: float = 3000.0,  # "auto": search time allowed
+        concurrent: bool = False,  # "portfolio": run DP and Dijkstra at once
+        checkpoint: bool = False,  # dp / dijkstra: resume and save unfinished work
+        time_limit_ms: Optional[float] = None,  # checkpoint: pause the search after this
+        workers: int = 1,  # dijkstra: hash-distributed search over this many processes
+        top_k: int = 1  # dijkstra: also return the K best victory plans
     ) -> Dict[str, Any]:
         """
         Optimize a Pokemon battle using the specified algorithm.
@@ -63,62 +125,474 @@ class BattleOptimizerService:
             player_team_data: List of MongoDB Pokemon data for player's team
             opponent_team_data: Optional list of MongoDB Pokemon data for opponent
             boss_trainer_id: Optional boss trainer ID ("blue", "giovanni", "lance")
-            algorithm: Which algorithm to use ("greedy", "dp", "dijkstra")
+            algorithm: Which algorithm to use ("greedy", "dp", "dijkstra"),
+                       "portfolio" (all three sharing bounds, see
+                       algorithms/portfolio.py), "pareto" (every plan no
+                       other beats on turns, HP lost, faints and PP spent,
+                       see algorithms/pareto.py), or "auto" to probe the
+                       exact dijkstra search and fall back within
+                       time_budget_ms
             player_level: Level for player's Pokemon (default 50)
             max_turns: Max turns for greedy algorithm (default 100)
             max_depth: Max depth for DP algorithm (default 50)
-            max_states: Max states for Dijkstra algorithm (default 100,000)
+            max_states: Max states for Dijkstra / Pareto graphs (default 100,000)
+            abstraction: Optional Dijkstra state abstraction ("buckets" or "hits")
+                         for battles too large for the exact search
+            hp_buckets: HP slices per Pokemon for the abstraction (default 8)
+            use_cache: Reuse the result of an identical earlier request
+            progress: Optional callback receiving search progress records
+                      (DP and Dijkstra; see utils/progress.py)
+            log_format: "full" (list of event dicts), "compact" (columnar, see
+                        utils/battleLogCodec.py) or "none" (log not built)
+            time_budget_ms: "auto" only - time allowed for the whole
+                            search: the exact search gets half of it, then
+                            an abstract search or greedy answers (see
+                            utils/stateSpaceEstimator.py)
+            concurrent: "portfolio" only - run DP and Dijkstra concurrently,
+                        the first to prove the answer stops the other
+            checkpoint: "dp" and exact "dijkstra" only - continue the
+                        checkpoint of an earlier unfinished identical request
+                        (any budget) and checkpoint this one if it can't
+                        finish (see services/checkpointStore.py)
+            time_limit_ms: checkpoint only - search time allowed; a search
+                           still running then is saved and answered with a
+                           partial result ("complete": False, "progress"
+                           holds the best plan so far)
+            workers: exact "dijkstra" only - with more than 1, the search is
+                     spread over that many worker processes (see
+                     algorithms/parallel_dijkstra.py; "parallel" in the
+                     result holds per-worker statistics)
+            top_k: exact single-process "dijkstra" only - with more than 1,
+                   "topPlans" holds up to that many distinct victory plans,
+                   fewest turns first, then least damage taken (read from
+                   the same state graph, see Graph.k_shortest_paths)
 
         Returns:
-            Dictionary with optimization results
+            Dictionary with optimization results ("cached" tells whether it
+            came from the result cache, "cacheTier" from which tier,
+            for "auto", "probe" what the exact search measured (None if its
+            result was cached) and "autoSelection" what answered and why
+            ("exact" only if the exact search finished within the budget)
+            and, in checkpoint mode,
+            "checkpoint" whether it resumed / saved a checkpoint)
 
         Raises:
             ValueError: If invalid algorithm or missing opponent data
         """
 
-        # Validate algorithm
-        if algorithm not in ["greedy", "dp", "dijkstra"]:
-            raise ValueError(f"Invalid algorithm: {algorithm}")
-
-        # Convert player team from MongoDB format
-        player_team = PokemonDataService.from_mongodb_list(
-            player_team_data,
-            level=player_level
+        player_team, opponent_team, opponent_name = BattleOptimizerService._prepare_teams(
+            player_team_data, opponent_team_data, boss_trainer_id, algorithm,
+            player_level, abstraction, log_format
         )
+        build_log = log_format != "none"
 
-        # Get opponent team (either custom or boss trainer)
-        if boss_trainer_id:
-            boss_data = get_boss_trainer(boss_trainer_id)
-            opponent_team = boss_data['team']
-            opponent_name = boss_data['name']
-        elif opponent_team_data:
-            opponent_team = PokemonDataService.from_mongodb_list(
-                opponent_team_data,
-                level=player_level
+        if checkpoint and (algorithm not in ("dp", "dijkstra") or abstraction is not None):
+            raise ValueError("Checkpoints are only supported by dp and exact dijkstra")
+        if time_limit_ms is not None and not checkpoint:
+            raise ValueError("timeLimitMs requires checkpoint mode (the work would be lost)")
+        BattleOptimizerService._check_workers(workers, algorithm, abstraction, checkpoint)
+        BattleOptimizerService._check_top_k(top_k, algorithm, abstraction, workers)
+        workers = BattleOptimizerService._usable_workers(workers)
+
+        # Identical request already answered? (key built from the converted
+        # teams, so input formatting and omitted defaults don't matter; an
+        # exact "auto" answer is the explicit dijkstra one)
+        cache_key = None
+        if use_cache:
+            cache_key = BattleOptimizerService._fingerprint(
+                player_team, opponent_team, boss_trainer_id,
+                "dijkstra" if algorithm == "auto" else algorithm,
+                max_turns, max_depth, max_states, abstraction, hp_buckets, log_format, workers, top_k
             )
-            opponent_name = "Custom Opponent"
-        else:
-            raise ValueError("Must provide either opponent_team_data or boss_trainer_id")
+            cached = BattleOptimizerService._result_cache.get(cache_key)
+            if cached is not None and (algorithm != "auto" or cached[0].get("searchComplete")):
+                cached_result, tier = cached
+                cached_result["cached"] = True
+                cached_result["cacheTier"] = tier
+                if algorithm == "auto":
+                    BattleOptimizerService._auto_cache_hit(cached_result, max_states)
+                return cached_result
 
         # Create initial battle state for replay
         from models.battleState import BattleState
         initial_state = BattleState(player_team, opponent_team)
 
         # Run the selected algorithm
+        checkpoint_info = None
+        selection = probe = None
+        partial = False
+        if checkpoint:
+            formatted_result, checkpoint_info = BattleOptimizerService._run_checkpointed(
+                player_team, opponent_team, boss_trainer_id, algorithm, initial_state,
+                max_depth, max_states, time_limit_ms, progress, build_log, top_k
+            )
+            partial = not formatted_result["complete"]
+        elif algorithm == "auto":
+            formatted_result, selection, probe = BattleOptimizerService._run_auto(
+                player_team, opponent_team, initial_state, max_turns, max_states, hp_buckets,
+                time_budget_ms, progress, build_log
+            )
+            algorithm = selection["algorithm"]
+            partial = not selection["exact"]  # The fallbacks depend on the timing: not cached
+        else:
+            formatted_result = BattleOptimizerService._run_algorithm(
+                algorithm, player_team, opponent_team, initial_state, max_turns, max_depth,
+                max_states, abstraction, hp_buckets, concurrent, workers, top_k, progress, build_log
+            )
+
+        BattleOptimizerService._finish_result(formatted_result, algorithm, opponent_name,
+                                              opponent_team, len(player_team), log_format)
+
+        if cache_key is not None and not partial:
+            BattleOptimizerService._result_cache.put(cache_key, formatted_result)
+        formatted_result["cached"] = False
+        if selection is not None:
+            formatted_result["probe"] = probe.to_dict()
+            formatted_result["autoSelection"] = selection
+        if checkpoint_info is not None:
+            formatted_result["checkpoint"] = checkpoint_info
+
+        return formatted_result
+
+    @staticmethod
+    def optimize_matchups(
+        player_teams_data: List[List[Dict[str, Any]]],
+        opponents: Optional[List[Any]] = None,
+        algorithm: str = "dijkstra",
+        player_level: int = 50,
+        max_turns: int = 100,
+        max_depth: int = 50,
+        max_states: int = 50000,
+        abstraction: Optional[str] = None,
+        hp_buckets: int = 8,
+        log_format: str = "none",
+        time_budget_ms: float = 3000.0,
+        use_cache: bool = True,
+        workers: Optional[int] = None,
+        time_limit_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Optimize every player team against every opponent (matchup matrix).
+
+        Teams are converted and their damage precomputed once for all pairs,
+        then the pairs are searched over a pool of worker processes (see
+        services/matchupMatrix.py).
+
+        Args:
+            player_teams_data: List of player teams (MongoDB Pokemon data lists)
+            opponents: Boss trainer IDs and / or custom opponent teams
+                       (None = every boss trainer)
+            algorithm: Algorithm of every pair (not "portfolio"; "auto"
+                       picks one per pair)
+            workers: Worker processes (None = one per CPU, at most one per pair)
+            time_limit_ms: Time allowed for the whole matrix (None = 8 s);
+                           pairs not solved by then are {"pending": True}
+            Others: Same as optimize_battle (the battle log is left out by default)
+
+        Returns:
+            Dictionary with "players", "opponents", "matrix" (one
+            optimize_battle result per pair, plus "timeMs") and "summary"
+
+        Raises:
+            ValueError: If the request is invalid
+        """
+        from services.matchupMatrix import run_matchup_matrix, MATCHUP_TIME_LIMIT_MS
+        return run_matchup_matrix(
+            player_teams_data, opponents, algorithm, player_level, max_turns, max_depth,
+            max_states, abstraction, hp_buckets, log_format, time_budget_ms, use_cache, workers,
+            MATCHUP_TIME_LIMIT_MS if time_limit_ms is None else time_limit_ms
+        )
+
+    @staticmethod
+    def optimize_gauntlet(
+        player_team_data: List[Dict[str, Any]],
+        opponents: List[Any],
+        player_level: int = 50,
+        max_states: int = 50000,
+        max_frontier: int = 8,
+        use_cache: bool = True,
+        time_limit_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Plan back-to-back battles against a list of opponents, with HP and PP
+        carried over from one battle to the next (no healing in between).
+
+        Each stage is a Pareto search started from every end state the
+        previous stage kept; stage results are cached by incoming team (see
+        algorithms/gauntlet.py).
+
+        Args:
+            player_team_data: List of MongoDB Pokemon data for player's team
+            opponents: Boss trainer IDs and / or custom teams, in battle order
+            player_level: Level for player's (and custom opponent) Pokemon
+            max_states: Max states of each stage graph (at most MAX_GAUNTLET_STATES)
+            max_frontier: End states carried from one stage into the next
+                          (at most MAX_GAUNTLET_FRONTIER)
+            use_cache: Reuse the result of an identical earlier request, and
+                       stage results of earlier gauntlets
+            time_limit_ms: Planning time allowed (None = GAUNTLET_TIME_LIMIT_MS).
+                           Out of time, the stages finished so far come back
+                           with "timedOut" and "pendingStage"; the same
+                           request again continues from the stage cache
+
+        Returns:
+            Dictionary with "victory", "totalTurns", "stagesCleared",
+            "stages" (per battle: opponent, moveSequence, turns, hpLost,
+            faints, team HP and PP after it), "finalTeam", "failedAt",
+            "timedOut", "pendingStage" and "searchStats"
+
+        Raises:
+            ValueError: If the team or the opponent list is invalid
+        """
+        from algorithms.gauntlet import run_gauntlet_optimizer
+        from services.resultCache import team_fingerprint_data
+
+        if not player_team_data:
+            raise ValueError("Missing player team data")
+        if not opponents:
+            raise ValueError("A gauntlet needs at least one opponent")
+        if len(opponents) > MAX_GAUNTLET_STAGES:
+            raise ValueError(f"A gauntlet has at most {MAX_GAUNTLET_STAGES} opponents")
+        if not 1 <= max_frontier <= MAX_GAUNTLET_FRONTIER:
+            raise ValueError(f"maxFrontier must be between 1 and {MAX_GAUNTLET_FRONTIER}")
+        if not 1 <= max_states <= MAX_GAUNTLET_STATES:
+            raise ValueError(f"maxStates must be between 1 and {MAX_GAUNTLET_STATES} for a gauntlet")
+        if time_limit_ms is None:
+            time_limit_ms = GAUNTLET_TIME_LIMIT_MS
+        if time_limit_ms <= 0:
+            raise ValueError("timeLimitMs must be positive")
+
+        player_team = PokemonDataService.from_mongodb_list(player_team_data, level=player_level)
+        stages = [BattleOptimizerService._load_opponent_entry(opponent, player_level)
+                  for opponent in opponents]
+
+        cache_key = None
+        if use_cache:
+            cache_key = request_fingerprint(player_team, "gauntlet", options={
+                "opponents": [boss_id or team_fingerprint_data(team) for boss_id, _, team in stages],
+                "maxStates": max_states,
+                "maxFrontier": max_frontier
+            })
+            cached = BattleOptimizerService._result_cache.get(cache_key)
+            if cached is not None:
+                cached_result, tier = cached
+                cached_result["cached"] = True
+                cached_result["cacheTier"] = tier
+                return cached_result
+
+        result = run_gauntlet_optimizer(player_team, [(name, team) for _, name, team in stages],
+                                        max_states=max_states, max_frontier=max_frontier,
+                                        use_stage_cache=use_cache, time_limit_ms=time_limit_ms)
+        stopped_at = None if result.success else stages[result.stages_cleared][1]
+        formatted_result = {
+            "success": result.success,
+            "victory": result.success,
+            "algorithm": "gauntlet",
+            "opponents": [name for _, name, _ in stages],
+            "totalTurns": result.total_turns,
+            "stagesCleared": result.stages_cleared,
+            "stages": result.stages,
+            "finalTeam": [{"name": p.name, "hp": p.current_hp, "maxHp": p.max_hp,
+                           "pp": {m.name: m.current_pp for m in p.moves}} for p in result.final_team],
+            "failedAt": None if result.timed_out else stopped_at,
+            "timedOut": result.timed_out,
+            "pendingStage": stopped_at if result.timed_out else None,
+            "searchStats": {
+                "stageSearches": result.stage_searches,
+                "stageCacheHits": result.stage_cache_hits,
+                "statesExplored": result.states_explored,
+                "frontierSizes": result.frontier_sizes
+            }
+        }
+
+        if cache_key is not None and not result.timed_out:
+            BattleOptimizerService._result_cache.put(cache_key, formatted_result)
+        formatted_result["cached"] = False
+        return formatted_result
+
+    @staticmethod
+    def _run_auto(
+        player_team: List[Pokemon],
+        opponent_team: List[Pokemon],
+        initial_state,
+        max_turns: int,
+        max_states: int,
+        hp_buckets: int,
+        time_budget_ms: float,
+        progress: Optional[Callable[[Dict[str, Any]], None]],
+        build_log: bool,
+        deadline: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Any]:
+        """
+        Answer an "auto" request within time_budget_ms.
+
+        The exact dijkstra search is probed first; if it doesn't finish in
+        its share of the budget, an abstract search sized from the measured
+        cost (stopped at the end of the budget) or greedy answers instead
+        (see utils/stateSpaceEstimator.py).
+
+        Args:
+            deadline: Optional time.perf_counter() value of the caller (e.g.
+                      a matchup matrix) that no search may run past
+
+        Returns:
+            Tuple of (formatted result as _run_algorithm, selection, SearchProbe)
+
+        Raises:
+            SearchStopped: If `deadline` passed before any answer
+        """
+        from algorithms.dijkstra import DijkstraBattleOptimizer
+        from utils.searchBounds import SearchBounds, SearchStopped
+        from utils.stateSpaceEstimator import probe_exact_search, select_algorithm, greedy_selection
+
+        optimizer = DijkstraBattleOptimizer(max_states=max_states, progress=progress, build_log=build_log)
+        result, probe = probe_exact_search(optimizer, initial_state, time_budget_ms, deadline)
+        selection = select_algorithm(probe, time_budget_ms, max_states)
+        if selection["exact"]:
+            formatted_result = BattleOptimizerService._format_dijkstra_result(result, initial_state)
+            formatted_result["searchComplete"] = True
+            return formatted_result, selection, probe
+
+        budget_end = probe.started + time_budget_ms / 1000
+        if deadline is not None:
+            if time.perf_counter() >= deadline:
+                raise SearchStopped("Stopped: out of time")
+            budget_end = min(budget_end, deadline)
+
+        if selection["algorithm"] == "dijkstra":
+            try:
+                formatted_result = BattleOptimizerService._run_algorithm(
+                    "dijkstra", player_team, opponent_team, initial_state, max_turns, 0,
+                    selection["options"]["max_states"], "hits", hp_buckets, False, 1, 1,
+                    progress, build_log, SearchBounds(deadline=budget_end)
+                )
+                return formatted_result, selection, probe
+            except SearchStopped:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    raise
+                selection = greedy_selection(f"{selection['reason']}; out of time: greedy answered")
+
+        formatted_result = BattleOptimizerService._run_algorithm(
+            "greedy", player_team, opponent_team, initial_state, max_turns, 0, max_states,
+            None, hp_buckets, False, 1, 1, progress, build_log
+        )
+        return formatted_result, selection, probe
+
+    @staticmethod
+    def _auto_cache_hit(cached_result: Dict[str, Any], max_states: int):
+        """Report a cached exact dijkstra result as the answer of an "auto" request (in place)."""
+        cached_result["probe"] = None
+        cached_result["autoSelection"] = {
+            "algorithm": "dijkstra",
+            "options": {"max_states": max_states},
+            "exact": True,
+            "reason": "exact search result cached"
+        }
+
+    @staticmethod
+    def _run_algorithm(
+        algorithm: str,
+        player_team: List[Pokemon],
+        opponent_team: List[Pokemon],
+        initial_state,
+        max_turns: int,
+        max_depth: int,
+        max_states: int,
+        abstraction: Optional[str],
+        hp_buckets: int,
+        concurrent: bool,
+        workers: int,
+        top_k: int,
+        progress: Optional[Callable[[Dict[str, Any]], None]],
+        build_log: bool,
+        bounds: Optional['SearchBounds'] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one (non-"auto", non-checkpointed) algorithm on converted teams.
+
+        bounds (e.g. a deadline) stop dp, dijkstra and abstract dijkstra
+        between two states with SearchStopped; greedy, portfolio, pareto and
+        parallel dijkstra don't read them.
+
+        Returns:
+            Formatted result (battle log not yet encoded, no metadata); dp
+            and exact single-process dijkstra add "searchComplete" (False if
+            max_depth / max_states cut the search short)
+        """
         if algorithm == "greedy":
-            result = run_greedy_optimizer(player_team, opponent_team, max_turns=max_turns)
+            from algorithms.greedy import run_greedy_optimizer
+            result = run_greedy_optimizer(player_team, opponent_team, max_turns=max_turns,
+                                          build_log=build_log)
             formatted_result = BattleOptimizerService._format_greedy_result(result, initial_state)
         elif algorithm == "dp":
-            result = run_dp_optimizer(player_team, opponent_team, max_depth=max_depth)
+            from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+            optimizer = DynamicProgrammingOptimizer(max_depth=max_depth, progress=progress,
+                                                    build_log=build_log, bounds=bounds,
+                                                    shared_table=BattleOptimizerService._shared_table)
+            result = optimizer.optimize(initial_state)
             formatted_result = BattleOptimizerService._format_dp_result(result, initial_state)
+            formatted_result["searchComplete"] = optimizer.search_complete
+        elif algorithm == "portfolio":
+            from algorithms.portfolio import run_portfolio_optimizer
+            result = run_portfolio_optimizer(player_team, opponent_team, max_turns=max_turns,
+                                             max_depth=max_depth, max_states=max_states,
+                                             concurrent=concurrent, progress=progress,
+                                             build_log=build_log)
+            formatted_result = BattleOptimizerService._format_portfolio_result(result, initial_state)
+        elif algorithm == "pareto":
+            from algorithms.pareto import run_pareto_optimizer
+            result = run_pareto_optimizer(player_team, opponent_team, max_states=max_states,
+                                          progress=progress, build_log=build_log)
+            formatted_result = BattleOptimizerService._format_dijkstra_result(result, initial_state)
+            formatted_result["paretoFront"] = result.pareto_front
+        elif abstraction is not None:
+            from algorithms.abstraction import run_abstract_dijkstra_optimizer
+            result = run_abstract_dijkstra_optimizer(
+                player_team, opponent_team,
+                max_states=max_states,
+                abstraction=abstraction,
+                hp_buckets=hp_buckets,
+                progress=progress,
+                build_log=build_log,
+                bounds=bounds
+            )
+            formatted_result = BattleOptimizerService._format_dijkstra_result(result, initial_state)
+        elif workers > 1:
+            from algorithms.parallel_dijkstra import run_parallel_dijkstra_optimizer
+            result = run_parallel_dijkstra_optimizer(player_team, opponent_team, workers=workers,
+                                                     max_states=max_states, progress=progress,
+                                                     build_log=build_log)
+            formatted_result = BattleOptimizerService._format_dijkstra_result(result, initial_state)
         else:  # dijkstra
-            result = run_dijkstra_optimizer(player_team, opponent_team, max_states=max_states)
+            from algorithms.dijkstra import DijkstraBattleOptimizer
+            optimizer = DijkstraBattleOptimizer(max_states=max_states, progress=progress,
+                                                build_log=build_log, top_k=top_k, bounds=bounds)
+            result = optimizer.optimize(initial_state)
             formatted_result = BattleOptimizerService._format_dijkstra_result(result, initial_state)
+            formatted_result["searchComplete"] = optimizer.search_complete
+        return formatted_result
+
+    @staticmethod
+    def _finish_result(
+        formatted_result: Dict[str, Any],
+        algorithm: str,
+        opponent_name: str,
+        opponent_team: List[Pokemon],
+        player_team_size: int,
+        log_format: str
+    ):
+        """Encode the battle log and add the request metadata to a formatted result (in place)."""
+        # Battle log in the requested format
+        if log_format == "compact":
+            formatted_result["battleLog"] = encode_battle_log(formatted_result["battleLog"])
+        elif log_format == "none":
+            formatted_result["battleLog"] = None
+        formatted_result["logFormat"] = log_format
 
         # Add metadata
         formatted_result["algorithm"] = algorithm
         formatted_result["opponent"] = opponent_name
-        formatted_result["playerTeamSize"] = len(player_team)
+        formatted_result["playerTeamSize"] = player_team_size
         formatted_result["opponentTeamSize"] = len(opponent_team)
 
         # Add opponent team details for display
@@ -132,10 +606,287 @@ class BattleOptimizerService:
             for p in opponent_team
         ]
 
-        return formatted_result
+    @staticmethod
+    def _run_checkpointed(
+        player_team: List[Pokemon],
+        opponent_team: List[Pokemon],
+        boss_trainer_id: Optional[str],
+        algorithm: str,
+        initial_state,
+        max_depth: int,
+        max_states: int,
+        time_limit_ms: Optional[float],
+        progress: Optional[Callable[[Dict[str, Any]], None]],
+        build_log: bool,
+        top_k: int = 1
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run dp or exact dijkstra through the checkpoint store.
+
+        Returns:
+            Tuple of (formatted result with "complete", checkpoint info)
+        """
+        from services.checkpointStore import run_checkpointed
+
+        if algorithm == "dp":
+            from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+            optimizer = DynamicProgrammingOptimizer(max_depth=max_depth, progress=progress,
+                                                    build_log=build_log,
+                                                    shared_table=BattleOptimizerService._shared_table)
+            formatter = BattleOptimizerService._format_dp_result
+        else:
+            from algorithms.dijkstra import DijkstraBattleOptimizer
+            optimizer = DijkstraBattleOptimizer(max_states=max_states, progress=progress,
+                                                build_log=build_log, top_k=top_k)
+            formatter = BattleOptimizerService._format_dijkstra_result
+
+        # Same key for every budget: a bigger one continues a smaller one
+        key = request_fingerprint(player_team, algorithm, boss_trainer_id=boss_trainer_id,
+                                  opponent_team=opponent_team)
+        search, info = run_checkpointed(optimizer, initial_state, key, time_limit_ms=time_limit_ms)
+
+        if search.done:
+            formatted = formatter(search.result, initial_state)
+            formatted["complete"] = True
+            return formatted, info
+
+        # Paused at the time limit: nothing final to show yet
+        return {
+            "success": False,
+            "complete": False,
+            "totalDamage": 0,
+            "turns": 0,
+            "moveSequence": [],
+            "victory": False,
+            "progress": search.status(),
+            "battleLog": []
+        }, info
+
+    @staticmethod
+    def request_key(
+        player_team_data: List[Dict[str, Any]],
+        opponent_team_data: Optional[List[Dict[str, Any]]] = None,
+        boss_trainer_id: Optional[str] = None,
+        algorithm: str = "dijkstra",
+        player_level: int = 50,
+        max_turns: int = 100,
+        max_depth: int = 50,
+        max_states: int = 50000,
+        abstraction: Optional[str] = None,
+        hp_buckets: int = 8,
+        log_format: str = "full",
+        time_budget_ms: float = 3000.0,
+        concurrent: bool = False,
+        checkpoint: bool = False,
+        time_limit_ms: Optional[float] = None,
+        workers: int = 1,
+        top_k: int = 1
+    ) -> str:
+        """
+        Fingerprint of an optimize_battle request (the result cache key).
+
+        Requests that differ only in formatting (key order, name case,
+        omitted defaults) get the same key.
+
+        Args:
+            Same as optimize_battle
+
+        Returns:
+            Hex SHA-256 request fingerprint
+
+        Raises:
+            ValueError: If the request is invalid (same checks as optimize_battle)
+        """
+        player_team, opponent_team, _ = BattleOptimizerService._prepare_teams(
+            player_team_data, opponent_team_data, boss_trainer_id, algorithm,
+            player_level, abstraction, log_format
+        )
+        if algorithm == "auto":
+            # Only exact answers are cached, under the explicit dijkstra key
+            algorithm = "dijkstra"
+        workers = BattleOptimizerService._usable_workers(workers)
+        return BattleOptimizerService._fingerprint(
+            player_team, opponent_team, boss_trainer_id, algorithm,
+            max_turns, max_depth, max_states, abstraction, hp_buckets, log_format, workers, top_k
+        )
+
+    @staticmethod
+    def _check_workers(workers: int, algorithm: str, abstraction: Optional[str], checkpoint: bool):
+        """Validate a worker count (more than 1 only for plain exact dijkstra)."""
+        if not 1 <= workers <= MAX_SEARCH_WORKERS:
+            raise ValueError(f"workers must be between 1 and {MAX_SEARCH_WORKERS}")
+        if workers > 1 and (algorithm != "dijkstra" or abstraction is not None or checkpoint):
+            raise ValueError("Parallel search is only supported by exact dijkstra without checkpoints")
+
+    @staticmethod
+    def _usable_workers(workers: int) -> int:
+        """Worker processes a request actually gets (never more than the CPUs)."""
+        return max(1, min(workers, os.cpu_count() or 1))
+
+    @staticmethod
+    def _check_top_k(top_k: int, algorithm: str, abstraction: Optional[str], workers: int):
+        """Validate a plan count (more than 1 only for single-process exact dijkstra)."""
+        if not 1 <= top_k <= MAX_TOP_K:
+            raise ValueError(f"topK must be between 1 and {MAX_TOP_K}")
+        if top_k > 1 and (algorithm != "dijkstra" or abstraction is not None or workers > 1):
+            raise ValueError("topK is only supported by exact single-process dijkstra")
+
+    @staticmethod
+    def _prepare_teams(
+        player_team_data: List[Dict[str, Any]],
+        opponent_team_data: Optional[List[Dict[str, Any]]],
+        boss_trainer_id: Optional[str],
+        algorithm: str,
+        player_level: int,
+        abstraction: Optional[str],
+        log_format: str
+    ) -> Tuple[List[Pokemon], List[Pokemon], str]:
+        """Validate a request and convert its teams (player, opponent, opponent name)."""
+        BattleOptimizerService._validate_options(algorithm, abstraction, log_format)
+
+        # Convert player team from MongoDB format
+        player_team = PokemonDataService.from_mongodb_list(
+            player_team_data,
+            level=player_level
+        )
+        opponent_team, opponent_name = BattleOptimizerService._load_opponent(
+            opponent_team_data, boss_trainer_id, player_level
+        )
+        return player_team, opponent_team, opponent_name
+
+    @staticmethod
+    def _validate_options(algorithm: str, abstraction: Optional[str], log_format: str):
+        """Validate the algorithm, abstraction mode and log format of a request."""
+        # Validate algorithm
+        if algorithm not in ["greedy", "dp", "dijkstra", "portfolio", "pareto", "auto"]:
+            raise ValueError(f"Invalid algorithm: {algorithm}")
+
+        # Validate log format
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Invalid log format: {log_format}")
+
+        # Validate abstraction (only the Dijkstra graph search supports it)
+        if abstraction is not None:
+            if algorithm != "dijkstra":
+                raise ValueError("Abstraction mode is only supported by the dijkstra algorithm")
+            from algorithms.abstraction import StateAbstraction
+            if abstraction not in StateAbstraction.MODES:
+                raise ValueError(f"Invalid abstraction mode: {abstraction}")
+
+    @staticmethod
+    def _load_opponent(
+        opponent_team_data: Optional[List[Dict[str, Any]]],
+        boss_trainer_id: Optional[str],
+        player_level: int
+    ) -> Tuple[List[Pokemon], str]:
+        """Opponent team (boss trainer or converted custom team) and its display name."""
+        # Get opponent team (either custom or boss trainer)
+        if boss_trainer_id:
+            boss_data = get_boss_trainer(boss_trainer_id)
+            opponent_team = boss_data['team']
+            opponent_name = boss_data['name']
+        elif opponent_team_data:
+            opponent_team = PokemonDataService.from_mongodb_list(
+                opponent_team_data,
+                level=player_level
+            )
+            opponent_name = "Custom Opponent"
+        else:
+            raise ValueError("Must provide either opponent_team_data or boss_trainer_id")
+
+        return opponent_team, opponent_name
+
+    @staticmethod
+    def _load_opponent_entry(
+        opponent: Any,
+        player_level: int
+    ) -> Tuple[Optional[str], str, List[Pokemon]]:
+        """
+        One entry of an opponent list (matchup matrix, gauntlet).
+
+        Args:
+            opponent: Boss trainer ID, or custom team (MongoDB Pokemon data list)
+            player_level: Level of custom opponent Pokemon
+
+        Returns:
+            Tuple of (boss trainer ID or None, display name, team)
+
+        Raises:
+            ValueError: If the entry is neither
+        """
+        if isinstance(opponent, str):
+            boss_id = opponent.lower()
+            team, name = BattleOptimizerService._load_opponent(None, boss_id, player_level)
+            return boss_id, name, team
+        if isinstance(opponent, list) and opponent:
+            team, name = BattleOptimizerService._load_opponent(opponent, None, player_level)
+            return None, name, team
+        raise ValueError("Each opponent must be a boss trainer ID or a non-empty team")
+
+    @staticmethod
+    def _fingerprint(
+        player_team: List[Pokemon],
+        opponent_team: List[Pokemon],
+        boss_trainer_id: Optional[str],
+        algorithm: str,
+        max_turns: int,
+        max_depth: int,
+        max_states: int,
+        abstraction: Optional[str],
+        hp_buckets: int,
+        log_format: str,
+        workers: int = 1,
+        top_k: int = 1
+    ) -> str:
+        """Result cache key of converted teams and settings."""
+        return request_fingerprint(
+            player_team,
+            algorithm,
+            boss_trainer_id=boss_trainer_id,
+            opponent_team=opponent_team,
+            options=BattleOptimizerService._cache_options(
+                algorithm, max_turns, max_depth, max_states, abstraction, hp_buckets, log_format,
+                workers, top_k
+            )
+        )
 
     @staticmethod
-    def _format_greedy_result(result: GreedyResult, initial_state=None) -> Dict[str, Any]:
+    def _cache_options(
+        algorithm: str,
+        max_turns: int,
+        max_depth: int,
+        max_states: int,
+        abstraction: Optional[str],
+        hp_buckets: int,
+        log_format: str = "full",
+        workers: int = 1,
+        top_k: int = 1
+    ) -> Dict[str, Any]:
+        """Settings that change the result of the chosen algorithm (cache key part)."""
+        if algorithm == "greedy":
+            options = {"maxTurns": max_turns}
+        elif algorithm == "dp":
+            options = {"maxDepth": max_depth}
+        elif algorithm == "portfolio":
+            options = {"maxTurns": max_turns, "maxDepth": max_depth, "maxStates": max_states}
+        elif algorithm == "pareto":
+            options = {"maxStates": max_states}
+        else:
+            options = {"maxStates": max_states, "abstraction": abstraction}
+            if abstraction is not None:
+                options["hpBuckets"] = hp_buckets
+            if workers > 1:
+                # Same answer for any worker count, maybe not the same moves
+                # as the one-process search
+                options["parallel"] = True
+            if top_k > 1:
+                options["topK"] = top_k
+        if log_format != "full":
+            options["logFormat"] = log_format
+        return options
+
+    @staticmethod
+    def _format_greedy_result(result: 'GreedyResult', initial_state=None) -> Dict[str, Any]:
         """Format Greedy algorithm result for API response."""
         # Use battle log from algorithm execution (no replay needed!)
         return {
@@ -148,7 +899,7 @@ class BattleOptimizerService:
         }
 
     @staticmethod
-    def _format_dp_result(result: DPResult, initial_state=None) -> Dict[str, Any]:
+    def _format_dp_result(result: 'DPResult', initial_state=None) -> Dict[str, Any]:
         """Format DP algorithm result for API response."""
         # Use battle log from algorithm execution (no replay needed!)
         return {
@@ -161,11 +912,14 @@ class BattleOptimizerService:
             "cacheMisses": result.cache_misses,
             "cacheHitRate": result.get_cache_hit_rate(),
             "statesExplored": result.states_explored,
+            "branchesPruned": result.branches_pruned,
+            "turnsFastForwarded": result.turns_fast_forwarded,
+            "sharedHits": result.shared_hits,
             "battleLog": result.battle_log
         }
 
     @staticmethod
-    def _format_dijkstra_result(result: DijkstraResult, initial_state=None) -> Dict[str, Any]:
+    def _format_dijkstra_result(result: 'DijkstraResult', initial_state=None) -> Dict[str, Any]:
         """Format Dijkstra algorithm result for API response."""
         # Use battle log from algorithm execution (no replay needed!)
         return {
@@ -176,9 +930,32 @@ class BattleOptimizerService:
             "victory": result.success,
             "statesExplored": result.states_explored,
             "pathCost": result.path_cost,
+            "branchesPruned": result.branches_pruned,
+            "turnsFastForwarded": result.turns_fast_forwarded,
+            "abstraction": result.abstraction,
+            "parallel": result.parallel,
+            "topPlans": result.top_plans,
             "battleLog": result.battle_log
         }
 
+    @staticmethod
+    def _format_portfolio_result(result: 'PortfolioResult', initial_state=None) -> Dict[str, Any]:
+        """Format Portfolio result for API response (best answer + every run)."""
+        formatters = {
+            "greedy": BattleOptimizerService._format_greedy_result,
+            "dp": BattleOptimizerService._format_dp_result,
+            "dijkstra": BattleOptimizerService._format_dijkstra_result
+        }
+        formatted = formatters[result.best_algorithm](result.best, initial_state)
+        formatted["portfolio"] = {
+            "bestAlgorithm": result.best_algorithm,
+            "provedBy": result.proved_by,
+            "lowerBound": result.lower_bound,
+            "turnBound": result.turn_bound,
+            "runs": result.runs
+        }
+        return formatted
+
     @staticmethod
     def get_boss_trainers() -> Dict[str, Any]:
         """
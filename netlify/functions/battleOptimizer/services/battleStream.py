@@ -0,0 +1,136 @@
+"""
+Battle Stream - NDJSON Progress and Results for Long Optimizations
+
+A large Dijkstra run returns nothing until graph construction, shortest
+paths and log generation are all done, so the client sits on a spinner (and
+sometimes times out). stream_battle runs the same optimization as
+BattleOptimizerService.optimize_battle and yields records as they happen:
+
+    {"type": "start", "algorithm": "dijkstra", ...}
+    {"type": "progress", "phase": "graph", "statesExpanded": 1000, "bestBound": 7, "elapsedMs": ...}
+    {"type": "progress", "phase": "path_found", ...}
+    {"type": "result", "moveSequence": [...], "totalDamage": ..., "battleLogTurns": 9, ...}
+    {"type": "turn", "turn": 1, "events": [...]}         (one per turn, "full" log only)
+    {"type": "end", "success": true, "elapsedMs": ...}
+
+or {"type": "error", "error": "...", "statusCode": 400} if the request fails.
+Each record is one NDJSON line (ndjson_line).
+
+The search runs in a worker thread that hands progress records to the
+generator through a queue, so records reach the client while it searches.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import json
+import time
+import queue
+import threading
+from typing import Any, Dict, Iterator
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from services.battleOptimizerService import BattleOptimizerService
+
+# Content type of a streamed response
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# Queue marker: the worker thread has finished
+_DONE = object()
+
+
+def stream_battle(**optimize_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Optimize a battle, yielding progress, the result and the log turn by turn.
+
+    Args:
+        **optimize_kwargs: Arguments of BattleOptimizerService.optimize_battle
+                           (except progress)
+
+    Yields:
+        Stream records (see module docstring)
+    """
+    start = time.perf_counter()
+    records: 'queue.Queue' = queue.Queue()
+    outcome: Dict[str, Any] = {}
+
+    def run():
+        try:
+            outcome["result"] = BattleOptimizerService.optimize_battle(
+                progress=records.put, **optimize_kwargs
+            )
+        except Exception as e:  # Reported as an error record
+            outcome["error"] = e
+        finally:
+            records.put(_DONE)
+
+    worker = threading.Thread(target=run, name="battle-stream", daemon=True)
+    worker.start()
+
+    yield {"type": "start", "algorithm": optimize_kwargs.get("algorithm", "dijkstra")}
+
+    while True:
+        record = records.get()
+        if record is _DONE:
+            break
+        yield record
+
+    worker.join()
+
+    error = outcome.get("error")
+    if error is not None:
+        yield {
+            "type": "error",
+            "error": str(error),
+            "statusCode": 400 if isinstance(error, ValueError) else 500
+        }
+        return
+
+    result = outcome["result"]
+    battle_log = result.pop("battleLog", None)
+    if not isinstance(battle_log, list):
+        # Compact or omitted log: sent as is with the result
+        result["battleLog"] = battle_log
+        battle_log = []
+
+    # Final move sequence and statistics first, then the log turn by turn
+    turns = []
+    for entry in battle_log:
+        if turns and turns[-1]["turn"] == entry.get("turn"):
+            turns[-1]["events"].append(entry)
+        else:
+            turns.append({"type": "turn", "turn": entry.get("turn"), "events": [entry]})
+
+    summary = {"type": "result"}
+    summary.update(result)
+    summary["battleLogTurns"] = len(turns)
+    yield summary
+
+    for turn in turns:
+        yield turn
+
+    yield {
+        "type": "end",
+        "success": result.get("success", False),
+        "elapsedMs": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+def ndjson_line(record: Dict[str, Any]) -> str:
+    """
+    Serialize one record as an NDJSON line.
+
+    Args:
+        record: Stream record
+
+    Returns:
+        Compact JSON followed by a newline
+    """
+    return json.dumps(record, separators=(",", ":")) + "\n"
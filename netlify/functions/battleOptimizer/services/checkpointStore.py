@@ -0,0 +1,174 @@
+"""
+Checkpoint Store - Resume Long Searches Across Invocations
+
+A Dijkstra or DP search that runs out of time or max_states keeps its work as
+a checkpoint (see utils/searchCheckpoint.py) instead of throwing it away. The
+next identical request - typically with a larger budget - continues from it:
+
+    search, info = run_checkpointed(optimizer, initial_state, key,
+                                    time_limit_ms=2500)
+    if search.done:
+        result = search.result           # info["resumed"]: continued earlier work
+    else:
+        status = search.status()         # paused at the deadline, saved
+
+Checkpoints are keyed by the request fingerprint without its budget options
+(max_states, max_depth), so a bigger budget finds the smaller run's work.
+One gzip'd JSON file per key, written atomically; a checkpoint is deleted
+once its search finishes with nothing left to resume.
+
+CheckpointStore errors are not ignored the way result cache errors are: a
+caller asking for checkpoints wants to know they are not being kept.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import gzip
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from utils.resumableSearch import ResumableSearch
+from utils.searchCheckpoint import CheckpointMismatch
+
+# Expansions between two deadline checks
+CHECKPOINT_STEP_SIZE = 500
+
+
+class CheckpointStore:
+    """
+    Directory of search checkpoints, one file per request key.
+
+    Attributes:
+        directory: Where checkpoint files live (created on demand)
+    """
+
+    def __init__(self, directory: str):
+        """
+        Create a store.
+
+        Args:
+            directory: Checkpoint directory
+        """
+        self.directory = directory
+
+    def save(self, key: str, checkpoint: Dict[str, Any]):
+        """
+        Write a checkpoint atomically (replacing an older one).
+
+        Args:
+            key: Request key (hex fingerprint)
+            checkpoint: Optimizer checkpoint() dict
+        """
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump({"savedAt": time.time(), "checkpoint": checkpoint}, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a checkpoint.
+
+        Args:
+            key: Request key
+
+        Returns:
+            Checkpoint dict, or None if there is none (or it is unreadable)
+        """
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)["checkpoint"]
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+    def delete(self, key: str):
+        """
+        Remove a checkpoint (no error if there is none).
+
+        Args:
+            key: Request key
+        """
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, key: str) -> str:
+        if not key or any(c not in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid checkpoint key: {key!r}")
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+
+def default_checkpoint_store() -> CheckpointStore:
+    """Store in SEARCH_CHECKPOINT_DIR (default /tmp/battleOptimizerCheckpoints)."""
+    return CheckpointStore(os.environ.get("SEARCH_CHECKPOINT_DIR", "/tmp/battleOptimizerCheckpoints"))
+
+
+def run_checkpointed(
+    optimizer,
+    initial_state: BattleState,
+    key: str,
+    store: Optional[CheckpointStore] = None,
+    time_limit_ms: Optional[float] = None,
+    step_size: int = CHECKPOINT_STEP_SIZE
+) -> Tuple[ResumableSearch, Dict[str, Any]]:
+    """
+    Run a Dijkstra or DP search, resuming and saving checkpoints.
+
+    A stored checkpoint for `key` is restored first (one that doesn't fit
+    the search is discarded). The search then runs until it finishes or the
+    time limit passes. Afterwards:
+    - Finished and complete (search_complete): the checkpoint is deleted
+    - Otherwise (paused at the deadline, or cut by max_states / max_depth):
+      the search is checkpointed for the next request with this key
+
+    Args:
+        optimizer: DijkstraBattleOptimizer or DynamicProgrammingOptimizer
+        initial_state: Starting battle state
+        key: Request key (request fingerprint without budget options)
+        store: Checkpoint store (default_checkpoint_store() if None)
+        time_limit_ms: Search time allowed (None = run to the end)
+        step_size: Expansions between two deadline checks
+
+    Returns:
+        Tuple of (search - done, or paused at the deadline; info dict with
+        key, resumed, saved and complete)
+    """
+    store = store or default_checkpoint_store()
+    deadline = time.perf_counter() + time_limit_ms / 1000.0 if time_limit_ms is not None else None
+
+    checkpoint = store.load(key)
+    search = optimizer.start(initial_state, checkpoint=checkpoint)
+    resumed = checkpoint is not None
+    try:
+        # The checkpoint is restored by the first expansion
+        search.step(1)
+    except CheckpointMismatch:
+        # Stale or foreign checkpoint: start over
+        store.delete(key)
+        search = optimizer.start(initial_state)
+        resumed = False
+        search.step(1)
+    del checkpoint
+
+    while not search.done and (deadline is None or time.perf_counter() < deadline):
+        search.step(step_size)
+
+    complete = search.done and optimizer.search_complete
+    if complete:
+        store.delete(key)
+    else:
+        store.save(key, optimizer.checkpoint())
+    return search, {"key": key, "resumed": resumed, "saved": not complete, "complete": complete}
@@ -0,0 +1,281 @@
+"""
+Job Manager - Submit / Poll Optimizations as Asynchronous Jobs
+
+    POST {..., "async": true}  ->  202 {"jobId": "...", "status": "queued"}
+    GET  ?job=<jobId>          ->  200 {"job": {"status": ..., "progress": ..., "result": ...}}
+
+submit() validates the request, stores it as a job (see services/jobStore.py)
+and starts it on a worker thread of this process. Identical requests (same
+BattleOptimizerService.request_key fingerprint) share one job, so concurrent
+identical submissions run one computation.
+
+Jobs can also be run by a separate worker process polling the same store:
+
+    python services/jobManager.py --store sqlite --path /tmp/jobs.db
+
+The worker threads need a process that keeps running after the 202 is sent:
+battleServer.py, the local dev server, or a separate worker on a shared
+store. On AWS Lambda / Netlify Functions the container is frozen once the
+response is returned and /tmp is per container, so a job may stall and a
+poll served by another container answers 404; a stalled job's lease runs
+out and it reads as failed (see services/jobStore.py). So on Lambda
+(AWS_LAMBDA_FUNCTION_NAME set) "async" requests are refused with a 400
+unless a shared store (JOB_STORE_PATH) or an external worker (JOB_WORKERS=0)
+is configured - see check_async_supported().
+
+Configuration (default_job_manager):
+- JOB_STORE: "file" (default) or "sqlite"
+- JOB_STORE_PATH: directory (file) or database file (sqlite),
+  default /tmp/battleOptimizerJobs[.db]
+- JOB_WORKERS: worker threads per process (default 2; 0 = only queue jobs,
+  a separate worker process runs them)
+- JOB_LEASE_SECONDS: how long a running job survives without a heartbeat
+  from its worker (default 60)
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from services.battleOptimizerService import BattleOptimizerService
+from services.jobStore import (
+    JobStore, FileJobStore, SQLiteJobStore, DONE, FAILED, DEFAULT_LEASE_SECONDS
+)
+
+
+class JobManager:
+    """
+    Runs optimization jobs from a JobStore on worker threads.
+
+    Attributes:
+        store: Job store shared with pollers (and other workers)
+        progress_interval: Minimum seconds between two progress writes per job
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, progress_interval: float = 0.5):
+        """
+        Create a job manager.
+
+        Args:
+            store: Job store
+            max_workers: Worker threads (0 = only queue jobs for an external worker)
+            progress_interval: Minimum seconds between two progress writes
+        """
+        self.store = store
+        self.progress_interval = progress_interval
+        self._executor = (ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="battle-job")
+                          if max_workers > 0 else None)
+
+    def submit(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Submit an optimization.
+
+        Args:
+            request: optimize_battle arguments (JSON-serializable)
+
+        Returns:
+            Tuple of (job, created) - created is False if an identical job
+            (queued, running or recently done) was shared instead
+
+        Raises:
+            ValueError: If the request is invalid
+        """
+        fingerprint = BattleOptimizerService.request_key(**request)
+        job, created = self.store.submit(fingerprint, request)
+        if created and self._executor is not None:
+            self._executor.submit(self._run_claimed, job["jobId"])
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status, progress and (when done) result.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job dict, or None if unknown
+        """
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, timeout: float = 60.0, poll_interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """
+        Poll until a job is done or failed (used by tests and the CLI).
+
+        Args:
+            job_id: Job ID
+            timeout: Seconds to wait at most
+            poll_interval: Seconds between two reads
+
+        Returns:
+            Last job state read (None if unknown)
+        """
+        deadline = time.time() + timeout
+        while True:
+            job = self.store.get(job_id)
+            if job is None or job["status"] in (DONE, FAILED) or time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def _run_claimed(self, job_id: str):
+        """Run a job if no other worker took it first."""
+        if self.store.claim(job_id):
+            run_job(self.store, self.store.get(job_id), self.progress_interval)
+
+
+def run_job(store: JobStore, job: Dict[str, Any], progress_interval: float = 0.5):
+    """
+    Run a claimed job and store its progress and outcome.
+
+    A heartbeat thread renews the job's lease while the search runs, so
+    pollers can tell a long search from a dead worker.
+
+    Args:
+        store: Job store
+        job: Job dict (already claimed, status running)
+        progress_interval: Minimum seconds between two progress writes
+    """
+    job_id = job["jobId"]
+    last_write = [0.0]
+
+    def progress(record: Dict[str, Any]):
+        now = time.time()
+        if now - last_write[0] >= progress_interval:
+            last_write[0] = now
+            store.update(job_id, progress=record)
+
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(store.lease_seconds / 4):
+            store.heartbeat(job_id)
+
+    threading.Thread(target=heartbeat, name="battle-job-heartbeat", daemon=True).start()
+    try:
+        result = BattleOptimizerService.optimize_battle(progress=progress, **job["request"])
+    except Exception as e:  # Stored for the poller
+        stop.set()
+        store.update(job_id, status=FAILED, error=str(e))
+        return
+    stop.set()
+    store.update(job_id, status=DONE, result=result)
+
+
+def run_worker(store: JobStore, poll_interval: float = 1.0, max_jobs: Optional[int] = None) -> int:
+    """
+    Process queued jobs from a store until interrupted.
+
+    Args:
+        store: Job store
+        poll_interval: Seconds to sleep when nothing is queued
+        max_jobs: Stop after this many jobs (None = run forever)
+
+    Returns:
+        Number of jobs run
+    """
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = store.claim_next()
+        if job is None:
+            if max_jobs is not None:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(store, job)
+        count += 1
+    return count
+
+
+def store_from_config(kind: Optional[str] = None, path: Optional[str] = None) -> JobStore:
+    """
+    Create the configured job store.
+
+    Args:
+        kind: "file" or "sqlite" (default: JOB_STORE env var, else "file")
+        path: Store location (default: JOB_STORE_PATH env var, else /tmp)
+
+    Returns:
+        JobStore
+
+    Raises:
+        ValueError: If the store kind is unknown
+    """
+    kind = kind or os.environ.get("JOB_STORE", "file")
+    path = path or os.environ.get("JOB_STORE_PATH")
+    lease_seconds = float(os.environ.get("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS))
+    if kind == "file":
+        return FileJobStore(path or "/tmp/battleOptimizerJobs", lease_seconds=lease_seconds)
+    if kind == "sqlite":
+        return SQLiteJobStore(path or "/tmp/battleOptimizerJobs.db", lease_seconds=lease_seconds)
+    raise ValueError(f"Unknown job store: {kind}")
+
+
+def check_async_supported():
+    """
+    Refuse job mode where nothing could finish or report the job.
+
+    On AWS Lambda (AWS_LAMBDA_FUNCTION_NAME set) the container freezes after
+    the 202 and /tmp is per container, so a job needs a shared store
+    (JOB_STORE_PATH) or an external worker (JOB_WORKERS=0).
+
+    Raises:
+        ValueError: If async jobs can't run in this deployment
+    """
+    if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        return
+    if os.environ.get("JOB_STORE_PATH") or os.environ.get("JOB_WORKERS") == "0":
+        return
+    raise ValueError('"async" is not supported on this deployment (no shared JOB_STORE_PATH '
+                     'or external worker configured); send the request without it')
+
+
+# Process-wide manager (created on the first job request)
+_DEFAULT_MANAGER: Optional[JobManager] = None
+
+
+def default_job_manager() -> JobManager:
+    """Get the process-wide job manager, configured from the environment."""
+    global _DEFAULT_MANAGER
+    if _DEFAULT_MANAGER is None:
+        _DEFAULT_MANAGER = JobManager(
+            store_from_config(),
+            max_workers=int(os.environ.get("JOB_WORKERS", 2))
+        )
+    return _DEFAULT_MANAGER
+
+
+def main() -> int:
+    """Command line entry point: run queued jobs from a store."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run queued battle optimization jobs")
+    parser.add_argument("--store", choices=["file", "sqlite"], default=None, help="job store kind")
+    parser.add_argument("--path", default=None, help="store directory or database file")
+    parser.add_argument("--once", action="store_true", help="run the queued jobs, then exit")
+    args = parser.parse_args()
+
+    store = store_from_config(args.store, args.path)
+    count = run_worker(store, max_jobs=None if not args.once else sys.maxsize)
+    print(f"Ran {count} job(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
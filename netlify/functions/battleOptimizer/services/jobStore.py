@@ -0,0 +1,502 @@
+"""
+Job Store - Persistent State of Asynchronous Optimization Jobs
+
+Large custom teams or generous max_states can take longer than a synchronous
+HTTP request should. In job mode the handler stores the request as a job and
+returns its ID at once; a worker (see services/jobManager.py) runs it and
+writes progress and the result back to the store, where GET ?job=<id> reads
+them.
+
+A job is a JSON-friendly dict:
+    {
+        "jobId": "...", "fingerprint": "...",
+        "status": "queued" | "running" | "done" | "failed",
+        "request": {...optimize_battle arguments...},
+        "progress": {...latest progress record...} or None,
+        "result": {...formatted result...} or None,
+        "error": "..." or None,
+        "createdAt": 1733700000.0, "updatedAt": 1733700001.5
+    }
+
+Stores are pluggable (JobStore interface). Two implementations work offline:
+- FileJobStore: one JSON file per job, exclusive-create lock files
+- SQLiteJobStore: one table, transactions for the atomic steps
+
+Both deduplicate submissions: a job whose request fingerprint matches a
+queued, running or recently finished job returns that job instead, so
+concurrent identical submissions share one computation.
+
+Workers can die with a job half done (a killed process, a frozen Lambda
+container), so a running job holds a lease: its worker renews it with
+heartbeat() (refreshing "updatedAt"), and a running job not renewed for
+lease_seconds - or a job still queued after queue_timeout_seconds - reads as
+failed and is no longer shared: the next identical submission starts over.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Fields a worker may update
+_UPDATABLE = ("status", "progress", "result", "error")
+
+# A running job without a heartbeat for this long has lost its worker, and a
+# job still queued after this long was never picked up
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 900.0
+
+
+def new_job(fingerprint: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a queued job record.
+
+    Args:
+        fingerprint: Request fingerprint (BattleOptimizerService.request_key)
+        request: optimize_battle arguments
+
+    Returns:
+        Job dict
+    """
+    now = time.time()
+    return {
+        "jobId": uuid.uuid4().hex,
+        "fingerprint": fingerprint,
+        "status": QUEUED,
+        "request": request,
+        "progress": None,
+        "result": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+class JobStore:
+    """
+    Interface of job stores.
+
+    Attributes:
+        ttl_seconds: How long a finished job can be shared by a new submission
+        lease_seconds: How long a running job stays alive without a heartbeat
+        queue_timeout_seconds: How long a job may wait for a worker
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 queue_timeout_seconds: float = DEFAULT_QUEUE_TIMEOUT_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.queue_timeout_seconds = queue_timeout_seconds
+
+    def submit(self, fingerprint: str, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Store a new job, unless an identical one can be shared.
+
+        Args:
+            fingerprint: Request fingerprint
+            request: optimize_battle arguments
+
+        Returns:
+            Tuple of (job, created) - created is False for a shared job
+        """
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job dict (failed if its lease or queue time expired), or None if
+            unknown
+        """
+        raise NotImplementedError
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Atomically move a queued job to running (one worker wins).
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if this caller now owns the job
+        """
+        raise NotImplementedError
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest queued job.
+
+        Returns:
+            The claimed job (status running), or None if nothing is queued
+        """
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields: Any):
+        """
+        Update a job's status, progress, result or error.
+
+        Args:
+            job_id: Job ID
+            **fields: Fields to set (see _UPDATABLE)
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str):
+        """
+        Renew the lease of a running job (refresh its updatedAt).
+
+        Args:
+            job_id: Job ID
+        """
+        raise NotImplementedError
+
+    def _expire(self, job: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The job as read by pollers: failed if its worker is gone or never came."""
+        if job is None:
+            return None
+        age = time.time() - job["updatedAt"]
+        if job["status"] == RUNNING and age > self.lease_seconds:
+            reason = f"no heartbeat from its worker for {self.lease_seconds:.0f}s"
+        elif job["status"] == QUEUED and age > self.queue_timeout_seconds:
+            reason = f"no worker picked it up within {self.queue_timeout_seconds:.0f}s"
+        else:
+            return job
+        return dict(job, status=FAILED, error=f"Job expired: {reason}")
+
+    def _shareable(self, job: Optional[Dict[str, Any]]) -> bool:
+        """Whether a new submission may reuse this job."""
+        job = self._expire(job)
+        if job is None or job["status"] == FAILED:
+            return False
+        if job["status"] == DONE:
+            return time.time() - job["updatedAt"] < self.ttl_seconds
+        return True
+
+
+class FileJobStore(JobStore):
+    """
+    Job store in a directory (works on any local or /tmp filesystem).
+
+    Layout:
+        jobs/<jobId>.json            job records (written atomically)
+        fingerprints/<fingerprint>   ID of the latest job for a request
+        claims/<jobId>               exists once a worker claimed the job;
+                                     its mtime is the last heartbeat
+
+    Attributes:
+        directory: Root directory
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = 3600.0, **lease: float):
+        """
+        Create (or open) a file job store.
+
+        Args:
+            directory: Root directory (created if missing)
+            ttl_seconds: How long a finished job can be shared
+            **lease: lease_seconds / queue_timeout_seconds (see JobStore)
+        """
+        super().__init__(ttl_seconds, **lease)
+        self.directory = directory
+        for sub in ("jobs", "fingerprints", "claims"):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+
+    def submit(self, fingerprint: str, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        index_path = os.path.join(self.directory, "fingerprints", fingerprint)
+        while True:
+            # The index file is created exclusively: of two identical
+            # submissions, exactly one creates the job
+            try:
+                fd = os.open(index_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                existing = self._read_index(index_path)
+                if existing is None:
+                    # Being written by another submitter (or left empty by
+                    # one that died: drop it after a few seconds)
+                    if self._age(index_path) > 5.0:
+                        self._remove(index_path)
+                    time.sleep(0.01)
+                    continue
+                if self._shareable(existing):
+                    return existing, False
+                self._remove(index_path)  # Failed or expired: start over
+                continue
+
+            job = new_job(fingerprint, request)
+            self._write_job(job)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(job["jobId"])
+            return job, True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._expire(self._read_job(job_id))
+
+    def claim(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            return False
+        try:
+            os.close(os.open(os.path.join(self.directory, "claims", job_id),
+                             os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        self.update(job_id, status=RUNNING)
+        return True
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        jobs = []
+        for name in os.listdir(os.path.join(self.directory, "jobs")):
+            if name.endswith(".json"):
+                job = self.get(name[:-len(".json")])
+                if job is not None and job["status"] == QUEUED:
+                    jobs.append(job)
+
+        for job in sorted(jobs, key=lambda j: j["createdAt"]):
+            if self.claim(job["jobId"]):
+                return self.get(job["jobId"])
+        return None
+
+    def update(self, job_id: str, **fields: Any):
+        job = self._read_job(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        job.update({k: v for k, v in fields.items() if k in _UPDATABLE})
+        job["updatedAt"] = time.time()
+        self._write_job(job)
+
+    def heartbeat(self, job_id: str):
+        # Touches the claim file only: never races the worker's own writes
+        try:
+            os.utime(os.path.join(self.directory, "claims", job_id))
+        except OSError:
+            pass
+
+    def _read_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record as stored (updatedAt includes the last heartbeat)."""
+        try:
+            with open(self._job_path(job_id), "r", encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if job["status"] == RUNNING:
+            try:
+                beat = os.path.getmtime(os.path.join(self.directory, "claims", job_id))
+                job["updatedAt"] = max(job["updatedAt"], beat)
+            except OSError:
+                pass
+        return job
+
+    def _job_path(self, job_id: str) -> str:
+        # Job IDs are hex (uuid4): anything else can't name a job file
+        if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+            return os.path.join(self.directory, "jobs", "invalid")
+        return os.path.join(self.directory, "jobs", f"{job_id}.json")
+
+    def _write_job(self, job: Dict[str, Any]):
+        """Write a job record atomically."""
+        path = self._job_path(job["jobId"])
+        temp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def _read_index(self, index_path: str) -> Optional[Dict[str, Any]]:
+        """Job named by a fingerprint index file (None if not readable yet)."""
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                job_id = f.read().strip()
+        except OSError:
+            return None
+        return self.get(job_id) if job_id else None
+
+    @staticmethod
+    def _age(path: str) -> float:
+        """Seconds since a file was last modified (0 if it is gone)."""
+        try:
+            return time.time() - os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Job store in an SQLite database file.
+
+    Attributes:
+        path: Database file
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            status TEXT NOT NULL,
+            request TEXT NOT NULL,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint, created_at);
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+    """
+
+    _COLUMNS = "job_id, fingerprint, status, request, progress, result, error, created_at, updated_at"
+
+    def __init__(self, path: str, ttl_seconds: float = 3600.0, **lease: float):
+        """
+        Create (or open) an SQLite job store.
+
+        Args:
+            path: Database file (created if missing)
+            ttl_seconds: How long a finished job can be shared
+            **lease: lease_seconds / queue_timeout_seconds (see JobStore)
+        """
+        super().__init__(ttl_seconds, **lease)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(self._SCHEMA)
+
+    def submit(self, fingerprint: str, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        with self._connect() as connection:
+            # BEGIN IMMEDIATE takes the write lock before reading, so two
+            # identical submissions can't both miss each other
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE fingerprint = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (fingerprint,)
+            ).fetchone()
+            existing = self._to_job(row)
+            if self._shareable(existing):
+                connection.execute("COMMIT")
+                return existing, False
+
+            job = new_job(fingerprint, request)
+            connection.execute(
+                f"INSERT INTO jobs ({self._COLUMNS}) VALUES (?, ?, ?, ?, NULL, NULL, NULL, ?, ?)",
+                (job["jobId"], fingerprint, QUEUED, json.dumps(request),
+                 job["createdAt"], job["updatedAt"])
+            )
+            connection.execute("COMMIT")
+            return job, True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._expire(self._to_job(row))
+
+    def claim(self, job_id: str) -> bool:
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND updated_at >= ?",
+                (RUNNING, now, job_id, QUEUED, now - self.queue_timeout_seconds)
+            )
+            return cursor.rowcount == 1
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT job_id FROM jobs WHERE status = ? AND updated_at >= ? "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, time.time() - self.queue_timeout_seconds)
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                (RUNNING, time.time(), row[0])
+            )
+            connection.execute("COMMIT")
+        return self.get(row[0])
+
+    def update(self, job_id: str, **fields: Any):
+        columns = []
+        values = []
+        for name in _UPDATABLE:
+            if name in fields:
+                value = fields[name]
+                columns.append(f"{name} = ?")
+                values.append(value if name in ("status", "error") or value is None else json.dumps(value))
+        columns.append("updated_at = ?")
+        values.extend([time.time(), job_id])
+
+        with self._connect() as connection:
+            cursor = connection.execute(f"UPDATE jobs SET {', '.join(columns)} WHERE job_id = ?", values)
+            if cursor.rowcount != 1:
+                raise KeyError(f"Unknown job: {job_id}")
+
+    def heartbeat(self, job_id: str):
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ? AND status = ?",
+                               (time.time(), job_id, RUNNING))
+
+    def _connect(self) -> sqlite3.Connection:
+        """New connection per operation (safe across worker threads)."""
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        return _ClosingConnection(connection)
+
+    @staticmethod
+    def _to_job(row) -> Optional[Dict[str, Any]]:
+        """Convert a jobs row to a job dict."""
+        if row is None:
+            return None
+        job_id, fingerprint, status, request, progress, result, error, created_at, updated_at = row
+        return {
+            "jobId": job_id,
+            "fingerprint": fingerprint,
+            "status": status,
+            "request": json.loads(request),
+            "progress": json.loads(progress) if progress else None,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "createdAt": created_at,
+            "updatedAt": updated_at
+        }
+
+
+class _ClosingConnection:
+    """Context manager closing an autocommit connection (sqlite3's own doesn't close)."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+        self.connection.close()
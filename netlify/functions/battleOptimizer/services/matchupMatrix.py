@@ -0,0 +1,351 @@
+"""
+Matchup Matrix - Many Player Teams Against Many Opponents in One Request
+
+Seeing how a team fares against Blue, Giovanni and Lance, or comparing
+candidate teams, used to take one optimize_battle call per pair (3 x N x M
+Lambda invocations, each converting the same teams again). A matrix request
+runs every pair at once:
+
+    matrix = run_matchup_matrix([team_a, team_b], ["blue", "giovanni", "lance"])
+    matrix["matrix"][0][2]     # team_a vs Lance: the usual result + "timeMs"
+
+Work shared by all pairs is done once, before any search:
+- Species and moves: each player team and each opponent is converted once
+- Damage: every move of every player Pokemon against every opponent Pokemon
+  (and back) is put in the DamageCalculator memo; forked workers inherit it
+- Pairs already answered are read from the result cache - with the same key
+  as the equivalent single optimize_battle request, so either fills it for
+  the other
+
+The remaining pairs are handed out one at a time to forked worker processes
+over pipes (no multiprocessing queues or semaphores, which AWS Lambda does
+not provide), so a slow pair never holds up the others; without fork they
+run one after the other in this process.
+
+The whole matrix runs within time_limit_ms (default below the 10 s function
+timeout): no pair is started after it, every search is given the deadline
+and abandons its pair once it passes (workers still searching are also
+stopped), and the pairs left are returned as {"pending": true} cells ("summary" counts them). Finished pairs are in
+the result cache, so sending the same request again picks up where this one
+stopped.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import time
+import traceback
+import multiprocessing
+from collections import namedtuple
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from services.battleOptimizerService import BattleOptimizerService, MAX_SEARCH_WORKERS
+from services.pokemonDataService import PokemonDataService
+from data.bossTrainers import BOSS_TRAINERS
+from models.battleState import BattleState
+from utils.damageCalculator import DamageCalculator
+from utils.searchBounds import SearchBounds, SearchStopped
+
+# Most pairs (player teams x opponents) one matrix request may hold
+MAX_MATCHUP_CELLS = 60
+
+# Default time allowed for a whole matrix (pairs not done by then are
+# pending), below Netlify's default 10 s function timeout
+MATCHUP_TIME_LIMIT_MS = 8000.0
+
+# One pair to search, with its settings (time_budget_ms: "auto" only)
+_Cell = namedtuple("_Cell", ["row", "column", "player_team", "opponent_team", "opponent_name",
+                             "algorithm", "max_turns", "max_depth", "max_states", "abstraction",
+                             "time_budget_ms", "cache_key"])
+
+
+def run_matchup_matrix(
+    player_teams_data: List[List[Dict[str, Any]]],
+    opponents: Optional[List[Union[str, List[Dict[str, Any]]]]] = None,
+    algorithm: str = "dijkstra",
+    player_level: int = 50,
+    max_turns: int = 100,
+    max_depth: int = 50,
+    max_states: int = 50000,
+    abstraction: Optional[str] = None,
+    hp_buckets: int = 8,
+    log_format: str = "none",
+    time_budget_ms: float = 3000.0,
+    use_cache: bool = True,
+    workers: Optional[int] = None,
+    time_limit_ms: float = MATCHUP_TIME_LIMIT_MS
+) -> Dict[str, Any]:
+    """
+    Optimize every player team against every opponent.
+
+    Args:
+        player_teams_data: List of player teams (MongoDB Pokemon data lists)
+        opponents: Boss trainer IDs and / or custom teams (MongoDB Pokemon
+                   data lists); None = every boss trainer
+        algorithm: Algorithm of every pair ("auto" picks one per pair)
+        player_level: Level of the player (and custom opponent) Pokemon
+        max_turns, max_depth, max_states, abstraction, hp_buckets,
+        log_format, time_budget_ms: Same as optimize_battle (the battle log
+                   is left out by default)
+        use_cache: Reuse (and fill) the result cache per pair
+        workers: Worker processes (None = one per CPU, at most one per pair)
+        time_limit_ms: Time allowed for the whole matrix; pairs not solved
+                   by then are returned as {"pending": True}
+
+    Returns:
+        Dictionary with "players" and "opponents" (names, wins), "matrix"
+        (one row per player team, one optimize_battle result per opponent,
+        plus "timeMs" of its search) and "summary" (pairs, wins, cache
+        hits, pending pairs, workers, precompute / search / elapsed time)
+
+    Raises:
+        ValueError: If the request is invalid
+    """
+    start = time.perf_counter()
+    BattleOptimizerService._validate_options(algorithm, abstraction, log_format)
+    if algorithm == "portfolio":
+        raise ValueError("Matchup matrices run one algorithm per pair (not portfolio)")
+    if not player_teams_data:
+        raise ValueError("Must provide at least one player team")
+    if opponents is None:
+        opponents = list(BOSS_TRAINERS)
+    if not opponents:
+        raise ValueError("Must provide at least one opponent")
+    pairs = len(player_teams_data) * len(opponents)
+    if pairs > MAX_MATCHUP_CELLS:
+        raise ValueError(f"A matchup matrix holds at most {MAX_MATCHUP_CELLS} pairs (got {pairs})")
+    if workers is None:
+        workers = min(os.cpu_count() or 1, pairs, MAX_SEARCH_WORKERS)
+    elif not 1 <= workers <= MAX_SEARCH_WORKERS:
+        raise ValueError(f"workers must be between 1 and {MAX_SEARCH_WORKERS}")
+    else:
+        workers = BattleOptimizerService._usable_workers(workers)
+    if time_limit_ms <= 0:
+        raise ValueError("time_limit_ms must be positive")
+    deadline = start + time_limit_ms / 1000
+
+    # Species and moves: every team converted once
+    player_teams = [PokemonDataService.from_mongodb_list(team, level=player_level)
+                    for team in player_teams_data]
+    sides = [BattleOptimizerService._load_opponent_entry(opponent, player_level) for opponent in opponents]
+
+    # Damage: every player Pokemon against every opponent Pokemon, once
+    memo_entries = DamageCalculator.precompute_damage(
+        [p for team in player_teams for p in team],
+        [p for _, _, team in sides for p in team]
+    )
+    precompute_ms = (time.perf_counter() - start) * 1000
+
+    matrix: List[List[Optional[Dict[str, Any]]]] = [[None] * len(sides) for _ in player_teams]
+    cells: List[_Cell] = []
+    for row, player_team in enumerate(player_teams):
+        for column, (boss_id, name, opponent_team) in enumerate(sides):
+            cache_key = None
+            if use_cache:
+                cache_key = BattleOptimizerService._fingerprint(
+                    player_team, opponent_team, boss_id, "dijkstra" if algorithm == "auto" else algorithm,
+                    max_turns, max_depth, max_states, abstraction, hp_buckets, log_format
+                )
+                cached = BattleOptimizerService._result_cache.get(cache_key)
+                if cached is not None and (algorithm != "auto" or cached[0].get("searchComplete")):
+                    result, tier = cached
+                    result.update(cached=True, cacheTier=tier, timeMs=0.0)
+                    if algorithm == "auto":
+                        BattleOptimizerService._auto_cache_hit(result, max_states)
+                    matrix[row][column] = result
+                    continue
+            cells.append(_Cell(row, column, player_team, opponent_team, name, algorithm,
+                               max_turns, max_depth, max_states, abstraction, time_budget_ms, cache_key))
+
+    # Search the rest, collecting results in completion order
+    used_workers = min(workers, len(cells)) if cells else 0
+    for index, result in _run_cells(cells, hp_buckets, log_format, used_workers, deadline):
+        cell = cells[index]
+        exact = result.get("autoSelection", {}).get("exact", True)  # "auto" fallbacks are not cached
+        if cell.cache_key is not None and "error" not in result and exact:
+            cached_copy = {k: v for k, v in result.items() if k not in ("timeMs", "probe", "autoSelection")}
+            BattleOptimizerService._result_cache.put(cell.cache_key, cached_copy)
+        result["cached"] = False
+        matrix[cell.row][cell.column] = result
+
+    # Out of time: the rest is pending
+    pending = 0
+    for cell in cells:
+        if matrix[cell.row][cell.column] is None:
+            matrix[cell.row][cell.column] = {"success": False, "victory": False, "pending": True,
+                                             "opponent": cell.opponent_name}
+            pending += 1
+
+    wins = [[bool(cell.get("victory")) for cell in row] for row in matrix]
+    return {
+        "players": [{"team": [p.name for p in team], "wins": sum(wins[row])}
+                    for row, team in enumerate(player_teams)],
+        "opponents": [{"name": name, "bossTrainer": boss_id,
+                       "playerWins": sum(row[column] for row in wins)}
+                      for column, (boss_id, name, _) in enumerate(sides)],
+        "matrix": matrix,
+        "summary": {
+            "pairs": pairs,
+            "wins": sum(map(sum, wins)),
+            "cachedPairs": pairs - len(cells),
+            "pendingPairs": pending,
+            "workers": used_workers,
+            "damageMemoEntries": memo_entries,
+            "precomputeMs": round(precompute_ms, 2),
+            "searchMs": round(sum(row[c].get("timeMs", 0.0) for row in matrix for c in range(len(sides))), 2),
+            "elapsedMs": round((time.perf_counter() - start) * 1000, 2)
+        }
+    }
+
+
+def _solve(cell: _Cell, hp_buckets: int, log_format: str,
+           deadline: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Search one pair (same result as the single optimize_battle request, plus timeMs).
+
+    Returns:
+        The result, or None if the search was still running at the deadline
+        (dp and dijkstra searches check it between two states)
+    """
+    start = time.perf_counter()
+    bounds = SearchBounds(deadline=deadline) if deadline is not None else None
+    try:
+        # Searches get their own Pokemon (HP and PP change during a battle)
+        player_team = [p.clone() for p in cell.player_team]
+        opponent_team = [p.clone() for p in cell.opponent_team]
+        initial_state = BattleState(player_team, opponent_team)
+
+        if cell.algorithm == "auto":
+            result, selection, probe = BattleOptimizerService._run_auto(
+                player_team, opponent_team, initial_state, cell.max_turns, cell.max_states,
+                hp_buckets, cell.time_budget_ms, None, log_format != "none", deadline
+            )
+            algorithm = selection["algorithm"]
+        else:
+            result = BattleOptimizerService._run_algorithm(
+                cell.algorithm, player_team, opponent_team, initial_state, cell.max_turns,
+                cell.max_depth, cell.max_states, cell.abstraction, hp_buckets,
+                False, 1, 1, None, log_format != "none", bounds
+            )
+            algorithm, selection = cell.algorithm, None
+        BattleOptimizerService._finish_result(result, algorithm, cell.opponent_name,
+                                              opponent_team, len(player_team), log_format)
+        if selection is not None:
+            result["probe"] = probe.to_dict()
+            result["autoSelection"] = selection
+    except SearchStopped:
+        return None
+    except Exception as e:
+        result = {"success": False, "victory": False, "error": f"{type(e).__name__}: {e}"}
+    result["timeMs"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def _worker_main(cells: List[_Cell], hp_buckets: int, log_format: str, deadline: float,
+                 conn: Connection):
+    """Entry point of a worker process: solve cell indices until told to stop (None)."""
+    try:
+        while True:
+            index = conn.recv()
+            if index is None:
+                break
+            conn.send(("done", index, _solve(cells[index], hp_buckets, log_format, deadline)))
+    except Exception:  # Reported to the parent, which raises it
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _run_cells(cells: List[_Cell], hp_buckets: int, log_format: str, workers: int,
+               deadline: float) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Solve cells over `workers` forked processes until the deadline.
+
+    No cell is started after the deadline, and every search is stopped at
+    it (workers still busy then are also terminated).
+
+    Args:
+        deadline: time.perf_counter() value to stop at
+
+    Yields:
+        (cell index, result) in completion order - cells never yielded are
+        the ones left when time ran out
+
+    Raises:
+        RuntimeError: If a worker failed
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if workers <= 1 or "fork" not in methods:
+        for index, cell in enumerate(cells):
+            if time.perf_counter() >= deadline:
+                return
+            result = _solve(cell, hp_buckets, log_format, deadline)
+            if result is None:
+                return
+            yield index, result
+        return
+
+    context = multiprocessing.get_context("fork")
+    connections: List[Connection] = []
+    processes = []
+    busy = set()
+    try:
+        for worker_id in range(workers):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker_main,
+                                      args=(cells, hp_buckets, log_format, deadline, child_end),
+                                      name=f"matchup-worker-{worker_id}", daemon=True)
+            process.start()
+            child_end.close()
+            connections.append(parent_end)
+            processes.append(process)
+
+        # One cell per worker at a time: the next goes to whoever is free
+        next_cell = 0
+        for conn in connections:
+            if next_cell < len(cells) and time.perf_counter() < deadline:
+                conn.send(next_cell)
+                busy.add(conn)
+                next_cell += 1
+        while busy:
+            remaining = deadline - time.perf_counter()
+            ready = wait(list(busy), timeout=max(0.0, remaining))
+            if not ready and remaining <= 0:
+                break  # Out of time: the busy workers are stopped below
+            for conn in ready:
+                try:
+                    reply = conn.recv()
+                except EOFError:
+                    raise RuntimeError("Matchup worker exited unexpectedly")
+                if reply[0] == "error":
+                    raise RuntimeError(f"Matchup worker failed:\n{reply[1]}")
+                _, index, result = reply
+                if result is not None and next_cell < len(cells) and time.perf_counter() < deadline:
+                    conn.send(next_cell)
+                    next_cell += 1
+                else:
+                    busy.discard(conn)
+                if result is not None:  # None: stopped at the deadline, left pending
+                    yield index, result
+    finally:
+        for conn, process in zip(connections, processes):
+            if conn in busy:
+                process.terminate()  # Still searching: its result is not waited for
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            conn.close()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
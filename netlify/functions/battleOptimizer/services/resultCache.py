@@ -0,0 +1,282 @@
+"""
+Result Cache - Reuse Results of Identical Optimization Requests
+
+Users often re-run the Results page with exactly the same team and boss, and
+every request used to repeat the whole search. This cache stores formatted
+results keyed by a canonical fingerprint of the request:
+- The player team AFTER conversion by PokemonDataService (names capitalized,
+  DVs, levels and moves filled in exactly as from_mongodb fills them), so
+  key order, name case and omitted defaults do not change the key
+- The boss ID, or the converted custom opponent team
+- The algorithm and only the limits that algorithm actually uses
+
+Two tiers:
+- Memory: LRU with a TTL, lives as long as the (warm) Lambda container
+- Disk (optional): one JSON file per key, e.g. under /tmp, so a container
+  keeps its results across handler module reloads. Every write deletes
+  expired files and the oldest files beyond max_disk_entries, so the tier
+  cannot fill /tmp (which checkpoints also need)
+
+Both tiers are best effort: disk errors are ignored and a miss just runs the
+search as before.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import copy
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.pokemon import Pokemon
+
+
+def team_fingerprint_data(team: List[Pokemon]) -> List[Dict[str, Any]]:
+    """
+    Canonical description of a converted team (everything battles depend on).
+
+    Args:
+        team: Battle-ready Pokemon (from PokemonDataService)
+
+    Returns:
+        JSON-friendly list, one dict per Pokemon in team order
+    """
+    return [
+        {
+            "name": p.name,
+            "types": p.types,
+            "level": p.level,
+            "baseStats": p.base_stats,
+            "dvs": p.dvs,
+            "moves": [[m.name, m.type, m.power, m.accuracy, m.pp] for m in p.moves]
+        }
+        for p in team
+    ]
+
+
+def request_fingerprint(
+    player_team: List[Pokemon],
+    algorithm: str,
+    boss_trainer_id: Optional[str] = None,
+    opponent_team: Optional[List[Pokemon]] = None,
+    options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Hash a normalized optimization request.
+
+    Args:
+        player_team: Converted player team
+        algorithm: Algorithm name
+        boss_trainer_id: Boss ID (takes precedence, like optimize_battle)
+        opponent_team: Converted custom opponent team
+        options: Algorithm settings that change the result
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON (sorted keys)
+    """
+    request = {
+        "player": team_fingerprint_data(player_team),
+        "algorithm": algorithm,
+        "options": options or {}
+    }
+    if boss_trainer_id:
+        request["boss"] = boss_trainer_id
+    else:
+        request["opponent"] = team_fingerprint_data(opponent_team or [])
+
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU + TTL cache of formatted optimization results, with a disk tier.
+
+    Attributes:
+        max_entries: Memory tier capacity (least recently used evicted first)
+        ttl_seconds: Age after which an entry is ignored (both tiers)
+        disk_dir: Directory for the disk tier (None = memory only)
+        max_disk_entries: Disk tier capacity (oldest files deleted first)
+        hits: Lookups answered from either tier
+        misses: Lookups that found nothing usable
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 900.0, disk_dir: Optional[str] = None,
+                 max_disk_entries: int = 256):
+        """
+        Create a cache.
+
+        Args:
+            max_entries: Memory tier capacity
+            ttl_seconds: Entry lifetime in seconds
+            disk_dir: Optional directory for the disk tier (created on demand)
+            max_disk_entries: Disk tier capacity
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+
+        # Maps key -> (stored_at, result), oldest use first
+        self._memory: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Look up a result.
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            Tuple of (copy of the result, tier "memory" or "disk"), or None
+        """
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, result = entry
+            if now - stored_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result), "memory"
+            del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            stored_at, result = entry
+            if now - stored_at < self.ttl_seconds:
+                self._remember(key, stored_at, result)
+                self.hits += 1
+                return copy.deepcopy(result), "disk"
+            self._remove_disk(key)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result in both tiers.
+
+        Args:
+            key: Request fingerprint
+            result: JSON-serializable formatted result
+        """
+        stored_at = time.time()
+        result = copy.deepcopy(result)
+        self._remember(key, stored_at, result)
+        self._write_disk(key, stored_at, result)
+
+    def clear(self):
+        """Drop the memory tier (the disk tier expires on its own)."""
+        self._memory.clear()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, stored_at: float, result: Dict[str, Any]):
+        """Insert into the memory tier, evicting the least recently used."""
+        self._memory[key] = (stored_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read a disk entry (None if disabled, missing or unreadable)."""
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["storedAt"], data["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, stored_at: float, result: Dict[str, Any]):
+        """Write a disk entry atomically (errors are ignored)."""
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            temp_path = f"{self._disk_path(key)}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"storedAt": stored_at, "result": result}, f, separators=(",", ":"))
+            os.replace(temp_path, self._disk_path(key))
+        except (OSError, TypeError, ValueError):
+            pass
+        self._prune_disk()
+
+    def _remove_disk(self, key: str):
+        """Delete a disk entry (errors are ignored)."""
+        if not self.disk_dir:
+            return
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        """
+        Delete expired disk files (including stale temp files), then the
+        oldest entries until at most max_disk_entries remain.
+        """
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return
+
+        now = time.time()
+        entries = []  # (mtime, path) of live entries
+        for name in names:
+            if not (name.endswith(".json") or name.endswith(".tmp")):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                modified = os.path.getmtime(path)
+                if now - modified >= self.ttl_seconds:
+                    os.remove(path)
+                elif name.endswith(".json"):
+                    entries.append((modified, path))
+            except OSError:
+                continue
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def default_result_cache() -> ResultCache:
+    """
+    Build the process-wide cache from the environment.
+
+    RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_DIR and
+    RESULT_CACHE_DISK_SIZE override the defaults. The disk tier defaults to /tmp on AWS Lambda and is off
+    elsewhere (RESULT_CACHE_DIR="" turns it off everywhere).
+    """
+    default_dir = "/tmp/battleOptimizerCache" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else ""
+    return ResultCache(
+        max_entries=int(os.environ.get("RESULT_CACHE_SIZE", 128)),
+        ttl_seconds=float(os.environ.get("RESULT_CACHE_TTL", 900)),
+        disk_dir=os.environ.get("RESULT_CACHE_DIR", default_dir) or None,
+        max_disk_entries=int(os.environ.get("RESULT_CACHE_DISK_SIZE", 256))
+    )
@@ -16,14 +16,23 @@ CS_311 Extra Credit Project
 import sys
 import os
 import time
+from unittest import mock
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add current directory to path (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from models.pokemon import create_pikachu, create_charizard, create_blastoise
 from algorithms.greedy import run_greedy_optimizer
 from algorithms.dynamic_programming import run_dp_optimizer
 from algorithms.dijkstra import run_dijkstra_optimizer
+from algorithms.abstraction import run_abstract_dijkstra_optimizer
+from algorithms.dijkstra import DijkstraBattleOptimizer
+from models.battleState import BattleState
+from data.bossTrainers import get_boss_trainer
+from services.battleOptimizerService import BattleOptimizerService
+from services.resultCache import ResultCache
 
 
 def print_separator(title: str = ""):
@@ -36,6 +45,34 @@ def print_separator(title: str = ""):
         print('=' * 60)
 
 
+def duel_state() -> BattleState:
+    """Pikachu + Charizard (L50) vs Blastoise + Charizard (L55): the search tests' battle."""
+    return BattleState([create_pikachu(level=50), create_charizard(level=50)],
+                       [create_blastoise(level=55), create_charizard(level=55)])
+
+
+# MongoDB Pokemon data for the service / handler tests (never modified)
+PIKACHU_DATA = {
+    "name": "pikachu",
+    "types": ["electric"],
+    "base_stats": {"hp": 35, "attack": 55, "defense": 40, "special": 50, "speed": 90},
+    "moves": ["thunderbolt", "quick-attack"]
+}
+PIKACHU_THUNDER_DATA = dict(PIKACHU_DATA, moves=["thunderbolt", "quick-attack", "thunder"])
+CHARIZARD_DATA = {
+    "name": "charizard",
+    "types": ["fire", "flying"],
+    "base_stats": {"hp": 78, "attack": 84, "defense": 78, "special": 85, "speed": 100},
+    "moves": ["flamethrower", "slash"]
+}
+SQUIRTLE_DATA = {
+    "name": "squirtle",
+    "types": ["water"],
+    "base_stats": {"hp": 44, "attack": 48, "defense": 65, "special": 50, "speed": 43},
+    "moves": ["tackle", "water-gun"]
+}
+
+
 def test_greedy_algorithm():
     """Test the Greedy algorithm (Heap - Assignment 6)."""
     print_separator("TEST 1: Greedy Algorithm (Heap)")
@@ -215,6 +252,1401 @@ def test_complex_battle():
     print("\n✅ Complex battle test passed!\n")
 
 
+def test_move_dominance_pruning():
+    """Dominance pruning must not change the optimal result."""
+    print_separator("TEST 6: Move Dominance Pruning")
+
+    # 1v1 battle: the player's only Pokemon is the last one standing,
+    # so weaker moves and 0-power status moves can be pruned
+    player_team = [create_pikachu(level=50)]
+    opponent_team = [create_charizard(level=50)]
+
+    print("Battle: Pikachu vs Charizard")
+    print("Running Dijkstra with and without dominance pruning...\n")
+
+    full = run_dijkstra_optimizer(player_team, opponent_team, max_states=5000,
+                                  prune_dominated=False)
+    pruned = run_dijkstra_optimizer(player_team, opponent_team, max_states=5000,
+                                    prune_dominated=True)
+
+    print(f"Unpruned: turns={full.turns}, states={full.states_explored}")
+    print(f"Pruned:   turns={pruned.turns}, states={pruned.states_explored}, "
+          f"branches pruned={pruned.branches_pruned}")
+
+    assert pruned.success == full.success
+    assert pruned.turns == full.turns
+    assert pruned.branches_pruned > 0
+    assert pruned.states_explored <= full.states_explored
+
+    dp_pruned = run_dp_optimizer(player_team, opponent_team, max_depth=20)
+    print(f"DP pruned: turns={dp_pruned.turns}, branches pruned={dp_pruned.branches_pruned}")
+    assert dp_pruned.branches_pruned > 0
+
+    print("\n✅ Move dominance pruning test passed!\n")
+
+
+def test_macro_actions():
+    """Fast-forwarding forced repetition must not change the result."""
+    print_separator("TEST 7: Macro Actions (Forced Repetition)")
+
+    def quick_attack_only_team():
+        # Only Quick Attack has PP left, so every turn is forced
+        pikachu = create_pikachu(level=50)
+        for move in pikachu.moves:
+            if move.name != "Quick Attack":
+                move.current_pp = 0
+        return [pikachu]
+
+    opponent_team = [create_charizard(level=20), create_blastoise(level=20)]
+
+    print("Battle: Pikachu (Quick Attack only) vs Charizard + Blastoise")
+    print("Running Dijkstra with and without macro actions...\n")
+
+    stepwise = run_dijkstra_optimizer(quick_attack_only_team(), opponent_team,
+                                      max_states=5000, macro_actions=False)
+    macro = run_dijkstra_optimizer(quick_attack_only_team(), opponent_team,
+                                   max_states=5000, macro_actions=True)
+
+    print(f"Per-turn: turns={stepwise.turns}, states={stepwise.states_explored}")
+    print(f"Macro:    turns={macro.turns}, states={macro.states_explored}, "
+          f"turns fast-forwarded={macro.turns_fast_forwarded}")
+
+    assert macro.success == stepwise.success
+    assert macro.turns == stepwise.turns
+    assert macro.path_cost == stepwise.path_cost
+    assert macro.turns_fast_forwarded > 0
+    assert macro.states_explored < stepwise.states_explored
+
+    # Move sequence and battle log still have one entry per turn
+    assert macro.move_sequence == stepwise.move_sequence
+    assert macro.battle_log == stepwise.battle_log
+
+    dp_macro = run_dp_optimizer(quick_attack_only_team(), opponent_team, max_depth=20)
+    print(f"DP macro: turns={dp_macro.turns}, turns fast-forwarded={dp_macro.turns_fast_forwarded}")
+    assert dp_macro.turns == stepwise.turns
+    assert dp_macro.turns_fast_forwarded > 0
+
+    print("\n✅ Macro action test passed!\n")
+
+
+def test_state_abstraction():
+    """Abstract search must produce a plan that holds up in the real battle."""
+    print_separator("TEST 8: State Abstraction (HP Buckets / Hits-to-KO)")
+
+    def player_team():
+        return [create_pikachu(level=50), create_charizard(level=50)]
+
+    def opponent_team():
+        return [create_blastoise(level=55), create_charizard(level=55)]
+
+    exact = run_dijkstra_optimizer(player_team(), opponent_team(), max_states=5000)
+    print(f"Exact:   success={exact.success}, turns={exact.turns}, states={exact.states_explored}")
+
+    for mode in ("buckets", "hits"):
+        result = run_abstract_dijkstra_optimizer(player_team(), opponent_team(),
+                                                 abstraction=mode, hp_buckets=4)
+        validation = result.abstraction["validation"]
+        print(f"{mode:8} success={result.success}, turns={result.turns}, "
+              f"states={result.states_explored}, validation={validation['outcome']}")
+
+        assert result.abstraction["mode"] == mode
+        assert validation["outcome"] in ("confirmed", "refined")
+        assert validation["concreteWin"] == result.success
+        assert result.success == exact.success
+        assert result.turns >= exact.turns  # Abstraction can't beat the exact optimum
+        assert result.states_explored <= exact.states_explored
+
+        # The battle log comes from the concrete replay
+        assert len(result.move_sequence) == result.turns
+        assert result.battle_log[-1]["event"] == "battle_end"
+
+    # Through the handler: numeric strings are accepted, anything else is a 400
+    import json
+    import battleOptimizer
+    for buckets, status in (("4", 200), ("four", 400)):
+        response = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps({
+            "playerTeam": [{"name": "pikachu", "types": ["electric"], "moves": ["thunderbolt"],
+                            "base_stats": {"hp": 35, "attack": 55, "defense": 40, "special": 50,
+                                           "speed": 90}}],
+            "bossTrainer": "giovanni", "abstraction": "hits", "hpBuckets": buckets
+        })}, None)
+        assert response["statusCode"] == status
+
+    print("\n✅ State abstraction test passed!\n")
+
+
+def test_result_cache():
+    """Identical requests (however they are formatted) reuse the first result."""
+    print_separator("TEST 10: Result Cache (Repeat Requests)")
+    import tempfile
+
+    pikachu = PIKACHU_DATA
+    # Same Pokemon: other key order, other name case, defaults spelled out
+    pikachu_again = {
+        "moves": ["thunderbolt", "quick-attack"],
+        "dvs": {"HP": 15, "Attack": 15, "Defense": 15, "Speed": 15, "Special": 15},
+        "base_stats": {"speed": 90, "special": 50, "defense": 40, "attack": 55, "hp": 35},
+        "types": ["Electric"],
+        "name": "Pikachu",
+        "level": 50
+    }
+
+    original_cache = BattleOptimizerService._result_cache
+    with tempfile.TemporaryDirectory() as cache_dir:
+        BattleOptimizerService._result_cache = ResultCache(max_entries=4, disk_dir=cache_dir)
+        try:
+            start = time.time()
+            first = BattleOptimizerService.optimize_battle([pikachu], boss_trainer_id="giovanni", algorithm="dp")
+            first_ms = (time.time() - start) * 1000
+            start = time.time()
+            second = BattleOptimizerService.optimize_battle([pikachu_again], boss_trainer_id="giovanni", algorithm="dp")
+            second_ms = (time.time() - start) * 1000
+            other = BattleOptimizerService.optimize_battle([pikachu], boss_trainer_id="giovanni", algorithm="greedy")
+        finally:
+            BattleOptimizerService._result_cache = original_cache
+
+        print(f"First:  cached={first['cached']}, {first_ms:.2f}ms")
+        print(f"Repeat: cached={second['cached']} ({second['cacheTier']}), {second_ms:.2f}ms")
+
+        assert first["cached"] is False
+        assert second["cached"] is True and second["cacheTier"] == "memory"
+        assert other["cached"] is False  # Different algorithm, different key
+        assert second["moveSequence"] == first["moveSequence"]
+        assert second["battleLog"] == first["battleLog"]
+
+        # A fresh process (empty memory tier) still finds it on disk
+        cold = ResultCache(disk_dir=cache_dir)
+        keys = [name[:-len(".json")] for name in os.listdir(cache_dir)]
+        assert len(keys) == 2
+        assert all(cold.get(key)[1] == "disk" for key in keys)
+
+        # Expired entries are ignored and deleted
+        expired = ResultCache(ttl_seconds=0, disk_dir=cache_dir)
+        assert expired.get(keys[0]) is None
+        assert not os.path.exists(os.path.join(cache_dir, f"{keys[0]}.json"))
+
+        # Writes keep the disk tier within max_disk_entries (oldest go first)
+        bounded_dir = os.path.join(cache_dir, "bounded")
+        bounded = ResultCache(disk_dir=bounded_dir, max_disk_entries=3)
+        for i in range(5):
+            bounded.put(f"entry{i}", {"i": i})
+            os.utime(os.path.join(bounded_dir, f"entry{i}.json"), (1000.0 + i, time.time() - 100 + i))
+        bounded.put("entry5", {"i": 5})
+        assert sorted(os.listdir(bounded_dir)) == ["entry3.json", "entry4.json", "entry5.json"]
+
+    print("\n✅ Result cache test passed!\n")
+
+
+def test_cold_start_imports():
+    """Importing the handler loads no algorithm until a request needs one."""
+    print_separator("TEST 11: Cold Start (Lazy Algorithm Imports)")
+    from utils.startupBenchmark import measure_imports, measure_first_request, COLD_START_BUDGET_MS
+
+    imports = measure_imports(runs=1)
+    loaded = [name for name in imports if name.startswith("algorithms")]
+    print(f"Modules imported by battleOptimizer: {len(imports)}")
+    print(f"  battleOptimizer cumulative: {imports['battleOptimizer'][1]:.2f}ms")
+
+    assert "services.battleOptimizerService" in imports
+    assert loaded == [], f"Algorithms imported at startup: {loaded}"
+
+    timing = measure_first_request("greedy", runs=1)
+    print(f"  Cold greedy request: {timing['totalMs']:.2f}ms (budget {COLD_START_BUDGET_MS:.0f}ms)")
+    assert timing["requestMs"] > 0
+
+    # Each module adds the function root to sys.path at most once
+    assert sys.path.count(_ROOT) == 1
+
+    print("\n✅ Cold start test passed!\n")
+
+
+def test_streaming_progress():
+    """Streamed runs report progress, then the result, then the log per turn."""
+    print_separator("TEST 12: Streaming NDJSON Progress and Results")
+    import json
+    import threading
+    import http.client
+    from http.server import ThreadingHTTPServer
+    from services.battleStream import stream_battle, ndjson_line
+    from localServer import BattleOptimizerRequestHandler
+
+    # Progress records straight from the optimizer
+    records = []
+    optimizer = DijkstraBattleOptimizer(max_states=2000, macro_actions=False,
+                                        prune_dominated=False,
+                                        progress=records.append, progress_interval=20)
+    state = BattleState([create_pikachu(level=50), create_charizard(level=50)],
+                        [create_blastoise(level=50), create_charizard(level=50)])
+    result = optimizer.optimize(state)
+
+    graph_records = [r for r in records if r["phase"] == "graph"]
+    phases = [r["phase"] for r in records]
+    print(f"Progress records: {len(records)} ({len(graph_records)} during graph build)")
+    assert graph_records, "Expected periodic records while building the graph"
+    assert [r["statesExpanded"] for r in graph_records] == sorted(r["statesExpanded"] for r in graph_records)
+    assert phases[-3:] == ["graph_built", "shortest_paths", "path_found"]
+    assert result.success and records[-1]["bestBound"] == result.path_cost
+    # The bound is the turn count of a real victory, so never below the optimum
+    assert all(r.get("bestBound") is None or r["bestBound"] >= result.path_cost for r in records)
+
+    # Full stream through the service
+    pikachu = PIKACHU_DATA
+    request = dict(player_team_data=[pikachu], boss_trainer_id="giovanni", algorithm="dijkstra",
+                   use_cache=False)
+    expected = BattleOptimizerService.optimize_battle(**request)
+    stream = list(stream_battle(**request))
+    types = [r["type"] for r in stream]
+    print(f"Stream: {len(stream)} records, {types.count('turn')} turns")
+
+    assert types[0] == "start" and types[-1] == "end"
+    assert types.index("result") < types.index("turn")
+    assert all(t == "progress" for t in types[1:types.index("result")])
+    summary = stream[types.index("result")]
+    assert summary["moveSequence"] == expected["moveSequence"]
+    assert "battleLog" not in summary and summary["battleLogTurns"] == types.count("turn")
+    streamed_log = [event for r in stream if r["type"] == "turn" for event in r["events"]]
+    assert streamed_log == expected["battleLog"]
+    assert all(json.loads(ndjson_line(r)) == r for r in stream)
+
+    errors = list(stream_battle(player_team_data=[pikachu], boss_trainer_id="giovanni",
+                                algorithm="bogus"))
+    assert errors[-1]["type"] == "error" and errors[-1]["statusCode"] == 400
+
+    # Local server sends the same records as chunked NDJSON
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BattleOptimizerRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+        connection.request("POST", "/", body=json.dumps({
+            "playerTeam": [pikachu], "bossTrainer": "giovanni", "algorithm": "dijkstra", "stream": True
+        }))
+        response = connection.getresponse()
+        lines = [json.loads(line) for line in response.read().decode("utf-8").splitlines()]
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert lines[0]["type"] == "start" and lines[-1]["type"] == "end"
+    assert [r for r in lines if r["type"] == "result"][0]["moveSequence"] == expected["moveSequence"]
+
+    print("\n✅ Streaming test passed!\n")
+
+
+def test_log_formats():
+    """Compact logs decode to the full log; "none" skips the log only."""
+    print_separator("TEST 13: Battle Log Formats (full / compact / none)")
+    import json
+    from utils.battleLogCodec import encode_battle_log, decode_battle_log
+
+    team = [
+        {
+            "name": "pikachu",
+            "types": ["electric"],
+            "base_stats": {"hp": 35, "attack": 55, "defense": 40, "special": 50, "speed": 90},
+            "moves": ["thunderbolt", "quick-attack", "thunder"]
+        },
+        {
+            "name": "charizard",
+            "types": ["fire", "flying"],
+            "base_stats": {"hp": 78, "attack": 84, "defense": 78, "special": 85, "speed": 100},
+            "moves": ["flamethrower", "slash", "earthquake"]
+        }
+    ]
+
+    for algorithm in ["greedy", "dp", "dijkstra"]:
+        results = {
+            log_format: BattleOptimizerService.optimize_battle(
+                team, boss_trainer_id="blue", algorithm=algorithm, player_level=60,
+                use_cache=False, log_format=log_format
+            )
+            for log_format in ["full", "compact", "none"]
+        }
+        full, compact, none = results["full"], results["compact"], results["none"]
+        full_size = len(json.dumps(full["battleLog"]))
+        compact_size = len(json.dumps(compact["battleLog"], separators=(",", ":")))
+        print(f"{algorithm:<9} {len(full['battleLog'])} events: full {full_size} bytes, "
+              f"compact {compact_size} bytes")
+
+        assert compact["logFormat"] == "compact"
+        assert decode_battle_log(compact["battleLog"]) == full["battleLog"]
+        assert decode_battle_log(json.loads(json.dumps(compact["battleLog"]))) == full["battleLog"]
+        assert compact_size < full_size
+        assert none["battleLog"] is None and none["logFormat"] == "none"
+        for key in ["moveSequence", "totalDamage", "turns", "success"]:
+            assert compact[key] == full[key] == none[key]
+
+    # Merged moves survive the round trip
+    merged = [{
+        "turn": 1, "event": "player_attack",
+        "attacker": {"name": "Pikachu", "hp": 141, "maxHp": 141},
+        "defender": {"name": "Onix", "hpBefore": 140, "hpAfter": 100, "maxHp": 140},
+        "move": "Thunderbolt", "damage": 40, "effectiveness": 0.0,
+        "equivalentMoves": ["Thunderbolt", "Thunder Shock"]
+    }]
+    assert decode_battle_log(encode_battle_log(merged)) == merged
+
+    try:
+        BattleOptimizerService.optimize_battle(team, boss_trainer_id="blue", log_format="tiny")
+        assert False, "Expected ValueError for an unknown log format"
+    except ValueError:
+        pass
+
+    print("\n✅ Log format test passed!\n")
+
+
+def test_async_jobs():
+    """Submitted jobs run in the background; identical submissions share one job."""
+    print_separator("TEST 14: Asynchronous Jobs (File and SQLite Stores)")
+    import json
+    import tempfile
+    import threading
+    import services.jobManager as job_manager
+    import battleOptimizer
+    from services.jobStore import FileJobStore, SQLiteJobStore, QUEUED
+    from services.jobManager import JobManager, run_worker
+
+    charizard = CHARIZARD_DATA
+    request = {"player_team_data": [charizard], "boss_trainer_id": "giovanni", "algorithm": "dijkstra"}
+    expected = BattleOptimizerService.optimize_battle(use_cache=False, **request)
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = [FileJobStore(os.path.join(directory, "files")),
+                  SQLiteJobStore(os.path.join(directory, "jobs.db"))]
+        for store in stores:
+            manager = JobManager(store, max_workers=2)
+            submissions = []
+            threads = [threading.Thread(target=lambda: submissions.append(manager.submit(request)))
+                       for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            job_ids = {job["jobId"] for job, _ in submissions}
+            created = sum(1 for _, was_created in submissions if was_created)
+            job = manager.wait(job_ids.pop())
+            manager.shutdown()
+            print(f"{type(store).__name__}: 6 submissions -> {created} job, status {job['status']}")
+
+            assert not job_ids and created == 1
+            assert job["status"] == "done" and job["error"] is None
+            assert job["result"]["moveSequence"] == expected["moveSequence"]
+
+            # Separate worker process style: claim queued jobs from the store
+            queued, _ = store.submit("other-request", dict(request, algorithm="greedy"))
+            assert store.get(queued["jobId"])["status"] == QUEUED
+            assert run_worker(store, max_jobs=5) == 1
+            assert store.get(queued["jobId"])["status"] == "done"
+            assert store.claim(queued["jobId"]) is False
+
+        # Leases: a running job whose worker stops sending heartbeats reads as
+        # failed and is no longer shared; a job nobody claims times out too
+        stores = [FileJobStore(os.path.join(directory, "lease-files"), lease_seconds=0.2,
+                               queue_timeout_seconds=0.2),
+                  SQLiteJobStore(os.path.join(directory, "lease.db"), lease_seconds=0.2,
+                                 queue_timeout_seconds=0.2)]
+        for store in stores:
+            job, _ = store.submit("orphan", request)
+            assert store.claim(job["jobId"])
+            for _ in range(3):
+                time.sleep(0.1)
+                store.heartbeat(job["jobId"])
+            assert store.get(job["jobId"])["status"] == "running"
+            time.sleep(0.3)
+            lost = store.get(job["jobId"])
+            assert lost["status"] == "failed" and "heartbeat" in lost["error"]
+            retry, created = store.submit("orphan", request)
+            assert created and retry["jobId"] != job["jobId"]
+
+            time.sleep(0.3)
+            assert store.get(retry["jobId"])["status"] == "failed"
+            assert store.claim(retry["jobId"]) is False and store.claim_next() is None
+
+        # Through the handler: 202 with a job ID, then GET ?job=
+        original = job_manager._DEFAULT_MANAGER
+        job_manager._DEFAULT_MANAGER = JobManager(FileJobStore(os.path.join(directory, "handler")))
+        try:
+            submitted = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps({
+                "playerTeam": [charizard], "bossTrainer": "giovanni", "async": True
+            })}, None)
+            assert submitted["statusCode"] == 202
+            job_id = json.loads(submitted["body"])["jobId"]
+            job_manager._DEFAULT_MANAGER.wait(job_id)
+
+            polled = battleOptimizer.handler(
+                {"httpMethod": "GET", "queryStringParameters": {"job": job_id}}, None)
+            body = json.loads(polled["body"])
+            assert polled["statusCode"] == 200 and body["job"]["status"] == "done"
+            assert body["job"]["result"]["moveSequence"] == expected["moveSequence"]
+
+            missing = battleOptimizer.handler(
+                {"httpMethod": "GET", "queryStringParameters": {"job": "../../etc/passwd"}}, None)
+            assert missing["statusCode"] == 404
+
+            # Plain Lambda: the container freezes after the 202, so async is refused
+            async_body = json.dumps({"playerTeam": [charizard], "bossTrainer": "giovanni", "async": True})
+            with mock.patch.dict(os.environ, {"AWS_LAMBDA_FUNCTION_NAME": "battleOptimizer"}):
+                os.environ.pop("JOB_STORE_PATH", None)
+                os.environ.pop("JOB_WORKERS", None)
+                refused = battleOptimizer.handler({"httpMethod": "POST", "body": async_body}, None)
+                assert refused["statusCode"] == 400 and "async" in json.loads(refused["body"])["error"]
+                os.environ["JOB_WORKERS"] = "0"  # An external worker runs the queue
+                assert battleOptimizer.handler({"httpMethod": "POST", "body": async_body},
+                                               None)["statusCode"] == 202
+        finally:
+            job_manager._DEFAULT_MANAGER.shutdown()
+            job_manager._DEFAULT_MANAGER = original
+
+    print("\n✅ Async job test passed!\n")
+
+
+def test_state_space_estimator():
+    """"auto" probes the exact search and stays within its time budget."""
+    print_separator("TEST 15: Search Probe and Auto Algorithm")
+    import json
+    import time
+    import battleOptimizer
+
+    # Small battles: the probe is the exact search, same answer as dijkstra
+    charizard = CHARIZARD_DATA
+    request = {"player_team_data": [charizard], "boss_trainer_id": "giovanni"}
+    explicit = BattleOptimizerService.optimize_battle(algorithm="dijkstra", use_cache=False, **request)
+    auto = BattleOptimizerService.optimize_battle(algorithm="auto", use_cache=False, **request)
+    print(f"auto -> {auto['autoSelection']['algorithm']} ({auto['autoSelection']['reason']})")
+
+    assert auto["autoSelection"]["exact"] and auto["algorithm"] == "dijkstra"
+    assert auto["probe"]["complete"] and auto["searchComplete"]
+    assert auto["moveSequence"] == explicit["moveSequence"]
+    assert "probe" not in explicit and "autoSelection" not in explicit
+
+    pair = BattleOptimizerService.optimize_battle(
+        [PIKACHU_DATA, charizard], boss_trainer_id="giovanni", algorithm="auto", use_cache=False
+    )
+    assert pair["autoSelection"]["exact"] and pair["algorithm"] == "dijkstra"
+
+    # A search too large for the budget falls back and still answers in time
+    def mon(name, types, stats, moves):
+        hp, attack, defense, special, speed = stats
+        return {"name": name, "types": types, "moves": moves, "base_stats": {
+            "hp": hp, "attack": attack, "defense": defense, "special": special, "speed": speed}}
+    team = [mon("pikachu", ["electric"], (35, 55, 30, 50, 90),
+                ["thunderbolt", "quick-attack", "thunder", "thunder-shock"]),
+            mon("charizard", ["fire", "flying"], (78, 84, 78, 85, 100),
+                ["flamethrower", "slash", "fire-blast", "ember"]),
+            mon("venusaur", ["grass", "poison"], (80, 82, 83, 100, 80),
+                ["razor-leaf", "body-slam", "solar-beam", "vine-whip"])]
+    start = time.perf_counter()
+    slow = BattleOptimizerService.optimize_battle(team, boss_trainer_id="blue", algorithm="auto",
+                                                  time_budget_ms=1000, use_cache=False, log_format="none")
+    elapsed = time.perf_counter() - start
+    print(f"Blue: {slow['autoSelection']['reason']} in {elapsed * 1000:.0f}ms")
+    assert not slow["autoSelection"]["exact"] and not slow["probe"]["finished"]
+    assert elapsed < 1.5
+
+    # An exact search cut short by max_states is not exact either
+    capped = BattleOptimizerService.optimize_battle(algorithm="auto", max_states=50, use_cache=False,
+                                                    **request)
+    assert capped["probe"]["finished"] and not capped["probe"]["complete"]
+    assert not capped["autoSelection"]["exact"]
+
+    # Exact answers share the explicit dijkstra cache entry
+    assert (BattleOptimizerService.request_key(algorithm="auto", **request)
+            == BattleOptimizerService.request_key(algorithm="dijkstra", **request))
+    BattleOptimizerService.optimize_battle(algorithm="auto", **request)
+    cached = BattleOptimizerService.optimize_battle(algorithm="dijkstra", **request)
+    assert cached["cached"] and "probe" not in cached and "autoSelection" not in cached
+    again = BattleOptimizerService.optimize_battle(algorithm="auto", **request)
+    assert again["cached"] and again["probe"] is None and again["autoSelection"]["exact"]
+
+    response = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps({
+        "playerTeam": team, "bossTrainer": "blue", "algorithm": "auto", "timeBudgetMs": 1
+    })}, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert body["algorithm"] == "greedy" and not body["autoSelection"]["exact"]
+
+    print("\n✅ Search probe test passed!\n")
+
+
+def test_battle_server():
+    """Worker-pool server answers like the handler and sheds load with 429."""
+    print_separator("TEST 16: Self-Hosted Server (Worker Pool, Backpressure)")
+    import json
+    import asyncio
+    import threading
+    import http.client
+    from battleServer import BattleServer
+
+    charizard = CHARIZARD_DATA
+    quick = {"playerTeam": [charizard], "bossTrainer": "giovanni", "algorithm": "greedy"}
+    pikachu = PIKACHU_THUNDER_DATA
+    slow = {"playerTeam": [pikachu, charizard], "bossTrainer": "blue", "algorithm": "dijkstra"}
+
+    loop = asyncio.new_event_loop()
+    server = BattleServer(workers=1, worker_concurrency=1, max_queue=0)
+    host, port = loop.run_until_complete(server.start("127.0.0.1", 0))
+    serving = loop.create_task(server.serve_forever())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def request(method, path="/", body=None, connection=None):
+        connection = connection or http.client.HTTPConnection(host, port, timeout=60)
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read() or b"{}")
+
+    try:
+        health = request("GET", "/health")[2]
+        assert health["workers"] == 1 and len(health["workerPids"]) == 1
+        assert health["workerPids"][0] != os.getpid()
+
+        # Same answer as the Lambda handler, over one keep-alive connection
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        status, _, body = request("POST", body=quick, connection=connection)
+        expected = BattleOptimizerService.optimize_battle(
+            [charizard], boss_trainer_id="giovanni", algorithm="greedy")
+        assert status == 200 and body["moveSequence"] == expected["moveSequence"]
+        status, _, body = request("GET", "/", connection=connection)
+        assert status == 200 and "bossTrainers" in body
+        connection.close()
+
+        # Slot busy and no queue: the next POST is rejected at once
+        outcome = {}
+        worker = threading.Thread(target=lambda: outcome.update(slow=request("POST", body=slow)))
+        worker.start()
+        while request("GET", "/health")[2]["inFlight"] == 0 and worker.is_alive():
+            time.sleep(0.005)
+        busy = request("GET", "/health")[2]
+        status, headers, body = request("POST", body=quick)
+        worker.join()
+        print(f"Busy server: {status} {body.get('error')}; slow request -> {outcome['slow'][0]}")
+
+        assert outcome["slow"][0] == 200
+        assert status == 429 and headers["Retry-After"] == "1"
+        assert busy["running"] == 1 and busy["poolQueued"] == 0 and busy["queued"] == 0
+        assert request("GET", "/health")[2]["rejected"] == 1
+
+        # Invalid requests keep the handler's error responses
+        assert request("POST", body={"bossTrainer": "blue"})[0] == 400
+
+        # Work that would run outside the slots (threads, forked pools) is refused
+        for extra in ({"async": True}, {"workers": 2}):
+            status, _, body = request("POST", body=dict(quick, **extra))
+            assert status == 400 and not body["success"]
+        matrix = {"playerTeams": [[charizard]], "opponents": ["giovanni"]}
+        assert request("POST", body=matrix)[0] == 400
+        assert request("GET", "/health")[2]["inFlight"] == 0
+
+        # Requests handed to a worker beyond the first wait in the pool's queue
+        fed = BattleServer(workers=2, worker_concurrency=3)
+        fed.in_flight = 5
+        assert fed.capacity == 6 and (fed.health()["running"], fed.health()["poolQueued"]) == (2, 3)
+    finally:
+        serving.cancel()
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=60)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    print("\n✅ Battle server test passed!\n")
+
+
+def test_portfolio():
+    """Portfolio answers like Dijkstra and says which algorithm proved it."""
+    print_separator("TEST 17: Portfolio (Greedy / DP / Dijkstra Sharing Bounds)")
+    from algorithms.portfolio import run_portfolio_optimizer
+    from utils.searchBounds import SearchBounds, SearchStopped
+
+    def player_team():
+        return [create_pikachu(level=50), create_charizard(level=50)]
+
+    def opponent_team():
+        return [create_blastoise(level=55), create_charizard(level=55)]
+
+    exact = run_dijkstra_optimizer(player_team(), opponent_team(), build_log=False)
+    for concurrent in (False, True):
+        result = run_portfolio_optimizer(player_team(), opponent_team(), concurrent=concurrent)
+        print(f"concurrent={concurrent}: best={result.best_algorithm}, proved by {result.proved_by}, "
+              f"turns={result.best.turns}, lower bound={result.lower_bound}, "
+              f"runs={ {name: run['status'] for name, run in result.runs.items()} }")
+
+        assert result.proved_by == "dijkstra"
+        assert (result.best.success, result.best.turns) == (exact.success, exact.turns)
+        assert result.lower_bound <= exact.turns <= result.turn_bound
+        assert result.runs["greedy"]["status"] == "done"
+        # The greedy win bounds the graph: fewer states than a plain search
+        assert result.runs["dijkstra"]["statesCut"] > 0
+        assert result.runs["dijkstra"]["statesExplored"] <= exact.states_explored
+        assert result.runs["dp"]["status"] in (("done", "stopped") if concurrent else ("skipped",))
+        assert result.best.battle_log[-1]["event"] == "battle_end"
+
+    # A proof stops the other searches at their next state
+    bounds = SearchBounds(turns_to_win=7)
+    assert not bounds.offer_win(9) and bounds.offer_win(5) and bounds.turns_to_win == 5
+    bounds.stop("greedy")
+    bounds.stop("dp")
+    assert bounds.proved_by == "greedy"
+    try:
+        DijkstraBattleOptimizer(bounds=bounds).optimize(BattleState(player_team(), opponent_team()))
+        assert False, "search should have stopped"
+    except SearchStopped:
+        pass
+
+    # Through the service: best answer plus every run
+    charizard = CHARIZARD_DATA
+    response = BattleOptimizerService.optimize_battle(
+        [charizard], boss_trainer_id="giovanni", algorithm="portfolio", use_cache=False)
+    explicit = BattleOptimizerService.optimize_battle(
+        [charizard], boss_trainer_id="giovanni", algorithm="dijkstra", use_cache=False)
+    assert response["algorithm"] == "portfolio"
+    assert set(response["portfolio"]["runs"]) == {"greedy", "dp", "dijkstra"}
+    assert response["portfolio"]["provedBy"] in ("greedy", "dijkstra", "dp")
+    assert (response["success"], response["totalDamage"]) == (explicit["success"], explicit["totalDamage"])
+
+    print("\n✅ Portfolio test passed!\n")
+
+
+def test_resumable_search():
+    """Step-wise searches give the optimize() answers and can be interleaved."""
+    print_separator("TEST 18: Resumable Step-Wise Searches")
+    from algorithms.greedy import GreedyBattleOptimizer
+    from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+    from utils.resumableSearch import interleave
+
+    optimizers = {
+        "greedy": lambda: GreedyBattleOptimizer(),
+        "dp": lambda: DynamicProgrammingOptimizer(),
+        "dijkstra": lambda: DijkstraBattleOptimizer(macro_actions=False, prune_dominated=False)
+    }
+    expected = {name: make().optimize(duel_state()) for name, make in optimizers.items()}
+
+    # One expansion at a time: every status is inspectable, same final answer
+    for name, make in optimizers.items():
+        search = make().start(duel_state())
+        statuses = []
+        while not search.done:
+            statuses.append(search.step(1))
+        result = search.result
+        plans = [s["bestPlan"] for s in statuses if s["bestPlan"] and not s["bestPlan"]["complete"]]
+        print(f"{name:8} {search.expansions} expansions, {len(plans)} partial plans, "
+              f"final turns={result.turns} success={result.success}")
+
+        assert result.move_sequence == expected[name].move_sequence
+        assert result.battle_log == expected[name].battle_log
+        assert statuses[-1]["done"] and statuses[-1]["bestPlan"]["complete"]
+        assert statuses[-1]["bestPlan"]["moveSequence"] == result.move_sequence
+        assert [s["expansions"] for s in statuses] == sorted(s["expansions"] for s in statuses)
+        assert plans, "a running search reports its best plan so far"
+
+    # A Dijkstra partial plan is a real win, never shorter than the optimum
+    search = optimizers["dijkstra"]().start(duel_state())
+    while not search.done and search.status()["bestPlan"] is None:
+        search.step(1)
+    partial = search.status()["bestPlan"]
+    assert partial["success"] and partial["turns"] >= expected["dijkstra"].turns
+    search.close()
+    assert search.done and search.result is None
+
+    # Round-robin on one core: all finish, answers unchanged
+    searches = {name: make().start(duel_state()) for name, make in optimizers.items()}
+    interleave(list(searches.values()), n_expansions=5)
+    for name, search in searches.items():
+        assert search.done and search.result.move_sequence == expected[name].move_sequence
+        assert search.steps >= 1
+
+    print("\n✅ Resumable search test passed!\n")
+
+
+def test_search_checkpoints():
+    """An unfinished search resumes from its checkpoint with the fresh answer."""
+    print_separator("TEST 19: Search Checkpoints (Resume With a Bigger Budget)")
+    import tempfile
+    from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+    from services.checkpointStore import CheckpointStore, run_checkpointed
+
+    fresh = {
+        "dijkstra": DijkstraBattleOptimizer().optimize(duel_state()),
+        "dp": DynamicProgrammingOptimizer().optimize(duel_state())
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckpointStore(directory)
+
+        # Dijkstra: cut by max_states, then continued with a bigger budget
+        small = DijkstraBattleOptimizer(max_states=12)
+        search, info = run_checkpointed(small, duel_state(), "d1", store)
+        assert search.done and info["saved"] and not info["complete"]
+
+        bigger = DijkstraBattleOptimizer()
+        search, info = run_checkpointed(bigger, duel_state(), "d1", store)
+        result = search.result
+        print(f"dijkstra: resumed={info['resumed']}, {small.search_stats()['statesExpanded']} + "
+              f"{bigger.search_stats()['statesExpanded'] - small.search_stats()['statesExpanded']} "
+              f"expansions, turns={result.turns}")
+        assert info["resumed"] and info["complete"] and not os.listdir(directory)
+        assert result.move_sequence == fresh["dijkstra"].move_sequence
+        assert result.battle_log == fresh["dijkstra"].battle_log
+        assert result.states_explored == fresh["dijkstra"].states_explored
+
+        # DP: checkpointed after its first 15 states, then continued
+        paused = DynamicProgrammingOptimizer()
+        search = paused.start(duel_state())
+        search.step(15)
+        assert not search.done
+        store.save("d2", paused.checkpoint())
+
+        deep = DynamicProgrammingOptimizer()
+        search, info = run_checkpointed(deep, duel_state(), "d2", store)
+        print(f"dp: resumed={info['resumed']}, {deep.states_explored} states computed "
+              f"(fresh run: {fresh['dp'].states_explored})")
+        assert info["resumed"] and info["complete"]
+        assert search.result.move_sequence == fresh["dp"].move_sequence
+        assert search.result.total_damage == fresh["dp"].total_damage
+        assert deep.states_explored < fresh["dp"].states_explored
+
+        # A checkpoint of the wrong kind is discarded, not trusted
+        store.save("d3", {"version": 0, "algorithm": "dp", "memo": []})
+        search, info = run_checkpointed(DijkstraBattleOptimizer(), duel_state(), "d3", store)
+        assert not info["resumed"] and search.result.move_sequence == fresh["dijkstra"].move_sequence
+
+    # Through the service: a paused request saves its work, the repeat finishes it
+    pikachu = PIKACHU_DATA
+    charizard = CHARIZARD_DATA
+    request = dict(player_team_data=[pikachu, charizard], boss_trainer_id="giovanni",
+                   algorithm="dp", use_cache=False, checkpoint=True)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["SEARCH_CHECKPOINT_DIR"] = directory
+        try:
+            paused = BattleOptimizerService.optimize_battle(time_limit_ms=0, **request)
+            finished = BattleOptimizerService.optimize_battle(**request)
+        finally:
+            del os.environ["SEARCH_CHECKPOINT_DIR"]
+    expected = BattleOptimizerService.optimize_battle(
+        [pikachu, charizard], boss_trainer_id="giovanni", algorithm="dp", use_cache=False)
+    assert paused["complete"] is False and paused["checkpoint"]["saved"]
+    assert paused["progress"]["expansions"] > 0
+    assert finished["complete"] and finished["checkpoint"]["resumed"]
+    assert finished["moveSequence"] == expected["moveSequence"]
+
+    try:
+        BattleOptimizerService.optimize_battle([pikachu], boss_trainer_id="giovanni",
+                                               algorithm="greedy", checkpoint=True)
+        assert False, "greedy has nothing to checkpoint"
+    except ValueError:
+        pass
+
+    print("\n✅ Search checkpoint test passed!\n")
+
+
+def test_parallel_dijkstra():
+    """Hash-distributed Dijkstra gives the one-process answer for any worker count."""
+    print_separator("TEST 20: Parallel Dijkstra (Hash-Distributed Workers)")
+    from algorithms.parallel_dijkstra import ParallelDijkstraOptimizer, owner_of
+
+    exact = DijkstraBattleOptimizer().optimize(duel_state())
+    results = {}
+    for workers in (1, 2, 3):
+        optimizer = ParallelDijkstraOptimizer(workers=workers)
+        result = optimizer.optimize(duel_state())
+        results[workers] = result
+        per_worker = [stats["expanded"] for stats in result.parallel["perWorker"]]
+        print(f"workers={workers}: turns={result.turns}, success={result.success}, "
+              f"{result.states_explored} states in {result.parallel['rounds']} rounds, "
+              f"expanded per worker={per_worker}")
+
+        assert (result.success, result.turns) == (exact.success, exact.turns)
+        assert result.path_cost == exact.path_cost
+        assert len(result.parallel["perWorker"]) == workers
+        assert sum(per_worker) == optimizer.search_stats()["statesExpanded"]
+        assert result.battle_log[-1]["event"] == "battle_end"
+        assert optimizer.graph_complete
+
+    # Duplicates are resolved canonically: same plan whatever the worker count
+    assert results[1].move_sequence == results[2].move_sequence == results[3].move_sequence
+    assert results[1].states_explored == results[3].states_explored
+
+    # Ownership only depends on the state
+    key = duel_state().compact_key()
+    assert owner_of(key, 3) == owner_of(duel_state().compact_key(), 3)
+
+    # Through the service (only exact dijkstra can run in parallel)
+    charizard = CHARIZARD_DATA
+    with mock.patch("os.cpu_count", return_value=4):
+        response = BattleOptimizerService.optimize_battle(
+            [charizard], boss_trainer_id="giovanni", algorithm="dijkstra", workers=2, use_cache=False)
+    single = BattleOptimizerService.optimize_battle(
+        [charizard], boss_trainer_id="giovanni", algorithm="dijkstra", use_cache=False)
+    assert response["parallel"]["workers"] == 2 and single["parallel"] is None
+    # Never more processes than CPUs: one CPU means the one-process search
+    with mock.patch("os.cpu_count", return_value=1):
+        capped = BattleOptimizerService.optimize_battle(
+            [charizard], boss_trainer_id="giovanni", algorithm="dijkstra", workers=32, use_cache=False)
+    assert capped["parallel"] is None and capped["turns"] == single["turns"]
+    assert (response["success"], response["turns"]) == (single["success"], single["turns"])
+    try:
+        BattleOptimizerService.optimize_battle([charizard], boss_trainer_id="giovanni",
+                                               algorithm="dp", workers=2)
+        assert False, "dp has no parallel mode"
+    except ValueError:
+        pass
+
+    print("\n✅ Parallel Dijkstra test passed!\n")
+
+
+def test_shared_transposition_table():
+    """Processes sharing a transposition table reuse each other's work."""
+    print_separator("TEST 21: Shared Transposition Table (Multi-Process)")
+    import multiprocessing
+    from algorithms.dynamic_programming import DynamicProgrammingOptimizer
+    from utils.sharedTranspositionTable import (SharedTranspositionTable, BUCKET_SLOTS,
+                                                KIND_DP_VALUE, battle_namespace, table_key)
+
+    # One bucket: the entry with the least work is evicted first
+    with SharedTranspositionTable.create(slots=BUCKET_SLOTS) as table:
+        for key in range(1, BUCKET_SLOTS + 1):
+            assert table.store(key, key * 1.5, move=key % 4, depth=10 + key)
+        assert table.store(99, 7.0, depth=50)
+        assert table.probe(1) is None
+        assert table.probe(99).value == 7.0 and table.probe(2).move == 2
+        assert not table.store(99, 8.0, depth=1)  # Shallower than the stored entry
+        assert table.claim(1000) and not table.claim(1000)
+
+        # A torn slot (check no longer matches) reads as a miss
+        table._buf[0:8] = bytes(8)
+        table._buf[8:16] = b"\xff" * 8
+        assert table.probe(99) is None and table.probe(3) is not None
+
+    # Keys only depend on the battle and the state
+    state = duel_state()
+    namespace = battle_namespace(state)
+    assert namespace == battle_namespace(duel_state())
+    assert namespace != battle_namespace(BattleState([create_pikachu(level=50)],
+                                                     [create_blastoise(level=55)]))
+    assert table_key(namespace, KIND_DP_VALUE, state.compact_key()) == \
+        table_key(battle_namespace(duel_state()), KIND_DP_VALUE, duel_state().compact_key())
+
+    solo = DynamicProgrammingOptimizer().optimize(duel_state())
+    context = multiprocessing.get_context("fork")
+
+    with SharedTranspositionTable.create(slots=1 << 14) as table:
+        # DP: a second process solves the battle, this one reads its values
+        def solve_dp():
+            DynamicProgrammingOptimizer(shared_table=table).optimize(duel_state())
+
+        child = context.Process(target=solve_dp)
+        child.start()
+        child.join()
+        assert child.exitcode == 0
+
+        shared = DynamicProgrammingOptimizer(shared_table=table).optimize(duel_state())
+        print(f"DP alone: {solo.states_explored} states; after another process: "
+              f"{shared.states_explored} states, {shared.shared_hits} shared hits")
+        assert shared.shared_hits > 0 and shared.states_explored < solo.states_explored
+        assert (shared.total_damage, shared.turns) == (solo.total_damage, solo.turns)
+        assert shared.move_sequence == solo.move_sequence
+
+        # Values of another max_depth (or other pruning flags) are not read
+        assert battle_namespace(state, ("dp", 50)) != battle_namespace(state, ("dp", 60))
+        deeper = DynamicProgrammingOptimizer(max_depth=60, shared_table=table).optimize(duel_state())
+        unpruned = DynamicProgrammingOptimizer(prune_dominated=False, shared_table=table).optimize(duel_state())
+        assert deeper.shared_hits == 0 and unpruned.shared_hits == 0
+
+        # Dijkstra: the visited index splits the expansions between two
+        # processes; the fewest turns over both is the one-process answer
+        exact = DijkstraBattleOptimizer().optimize(duel_state())
+
+        def search(conn):
+            optimizer = DijkstraBattleOptimizer(shared_table=table)
+            result = optimizer.optimize(duel_state())
+            conn.send((result.success, result.turns, optimizer.search_stats()["statesExpanded"],
+                       optimizer.states_shared))
+            conn.close()
+
+        pipes = [context.Pipe(duplex=False) for _ in range(2)]
+        processes = [context.Process(target=search, args=(writer,)) for _, writer in pipes]
+        for process in processes:
+            process.start()
+        answers = [reader.recv() for reader, _ in pipes]
+        for process in processes:
+            process.join()
+        print(f"Dijkstra alone: {exact.turns} turns; sharing: {answers}")
+        assert min(turns for won, turns, _, _ in answers if won) == exact.turns
+        assert sum(shared_states for _, _, _, shared_states in answers) > 0
+
+    print("\n✅ Shared transposition table test passed!\n")
+
+
+def test_external_bfs():
+    """The disk-backed BFS enumerates the same graph as the in-memory one."""
+    print_separator("TEST 22: External-Memory BFS (Graph Spilled to Disk)")
+    import tempfile
+    from algorithms.external_bfs import ExternalBFSDijkstraOptimizer, run_external_bfs
+
+    exact = DijkstraBattleOptimizer().optimize(duel_state())
+    directory = tempfile.mkdtemp(prefix="battleBfsTest")
+    with open(os.path.join(directory, "notes.txt"), "w") as f:
+        f.write("not the search's")
+    # A tiny buffer: every layer is merged from several runs
+    optimizer = ExternalBFSDijkstraOptimizer(directory=directory, run_records=3)
+    result = optimizer.optimize(duel_state())
+    summary = optimizer.summary
+    print(f"In memory: {exact.states_explored} states, {exact.turns} turns; "
+          f"on disk: {summary['states']} states in {len(summary['layers'])} layers, "
+          f"{summary['runsWritten']} runs, {result.turns} turns")
+
+    assert (result.success, result.turns, result.path_cost) == (exact.success, exact.turns, exact.path_cost)
+    assert result.states_explored == exact.states_explored == summary["states"]
+    assert result.turns_fast_forwarded == exact.turns_fast_forwarded
+    assert summary["complete"] and optimizer.graph_complete
+    assert summary["fewestTurnsToWin"] == exact.turns
+    assert summary["runsWritten"] > len(summary["layers"])
+    assert result.battle_log[-1]["event"] == "battle_end"
+    # Only the search's own files are removed: the caller's directory stays
+    assert os.listdir(directory) == ["notes.txt"]
+    os.remove(os.path.join(directory, "notes.txt"))
+    os.rmdir(directory)
+
+    # Summary only (nothing loaded), independent of the buffer size
+    teams = ([create_pikachu(level=50), create_charizard(level=50)],
+             [create_blastoise(level=55), create_charizard(level=55)])
+    assert run_external_bfs(*teams, run_records=100000)["layers"] == summary["layers"]
+
+    # Cut short by max_states
+    partial = run_external_bfs(*teams, max_states=10)
+    assert not partial["complete"] and partial["states"] < summary["states"]
+
+    print("\n✅ External-memory BFS test passed!\n")
+
+
+def test_state_wire_format():
+    """Binary state records round-trip and beat the dict format on size and speed."""
+    print_separator("TEST 23: Compact Binary Wire Format (States and Teams)")
+    from models.move import Move
+    from utils.battleStateCodec import (BattleStateCodec, WireFormatError, WIRE_VERSION,
+                                        encode_states, decode_states, encode_teams, decode_teams)
+
+    player = [create_pikachu(level=50), create_charizard(level=50)]
+    player[0].moves[2] = Move("Swift", "Normal", 60, None, 20)  # Never misses
+    state = BattleState(player, get_boss_trainer("giovanni")["team"])
+    states = [state] + [s for s, _, _, _ in state.generate_unique_successor_states()]
+
+    # Round trip: same HP, PP, actives, turn and teams
+    blob = encode_states(states)
+    decoded = decode_states(blob)
+    for original, copy in zip(states, decoded):
+        assert copy.hash_key() == original.hash_key()
+        for before, after in zip(original.player_team + original.opponent_team,
+                                 copy.player_team + copy.opponent_team):
+            assert after.to_dict() == before.to_dict()
+    assert decoded[0].player_team[0].moves[2].accuracy is None
+
+    player_team, opponent_team, end = decode_teams(encode_teams(state.player_team, state.opponent_team))
+    assert [p.name for p in opponent_team] == [p.name for p in state.opponent_team]
+    assert end == len(encode_teams(state.player_team, state.opponent_team))
+
+    # Records decode in place from any buffer, at any offset
+    codec = BattleStateCodec(state)
+    buffer = bytearray(3 + codec.size * len(states))
+    for index, s in enumerate(states):
+        codec.encode_into(buffer, 3 + index * codec.size, s)
+    view = memoryview(buffer)
+    assert [s.hash_key() for s in codec.iter_decode(view, 3)] == [s.hash_key() for s in states]
+    assert codec.encode(states[1])[:codec.key_size] == codec.key(states[1])
+
+    # Other versions and corrupt data are rejected
+    for bad in (b"JUNK" + blob[4:], blob[:4] + bytes([WIRE_VERSION + 1]) + blob[5:], blob[:40], blob[:-1]):
+        try:
+            decode_states(bad)
+            assert False, "corrupt data decoded"
+        except WireFormatError:
+            pass
+
+    # Throughput and size against to_dict / from_dict
+    import json
+    batch = states * 50
+    timings = {}
+    for name, encode, decode in (
+            ("binary", encode_states, decode_states),
+            ("dicts", lambda items: [s.to_dict() for s in items],
+             lambda dicts: [BattleState.from_dict(d) for d in dicts])):
+        best = (float("inf"), float("inf"))
+        for _ in range(3):  # Best of three (less noise)
+            start = time.perf_counter()
+            encoded = encode(batch)
+            middle = time.perf_counter()
+            decode(encoded)
+            best = min(best[0], (middle - start) * 1000), min(best[1], (time.perf_counter() - middle) * 1000)
+        timings[name] = best
+    blob = encode_states(batch)
+    dict_bytes = len(json.dumps([s.to_dict() for s in batch]))
+    print(f"{len(batch)} states - binary: {len(blob)} bytes, encode {timings['binary'][0]:.1f} ms, "
+          f"decode {timings['binary'][1]:.1f} ms; dicts: {dict_bytes} bytes (JSON), "
+          f"encode {timings['dicts'][0]:.1f} ms, decode {timings['dicts'][1]:.1f} ms")
+    assert len(blob) * 10 < dict_bytes
+    assert timings["binary"][0] < timings["dicts"][0] and timings["binary"][1] < timings["dicts"][1]
+
+    print("\n✅ Wire format test passed!\n")
+
+
+def test_top_k_plans():
+    """Top-K victory plans come from the one graph, best first and distinct."""
+    print_separator("TEST 24: Top-K Alternative Victory Plans")
+
+    def replay(state, moves):
+        for name in moves:
+            state = next(n for n, _, _, names in state.generate_unique_successor_states()
+                         if name in names)
+        return state
+
+    exact = DijkstraBattleOptimizer().optimize(duel_state())
+    optimizer = DijkstraBattleOptimizer(top_k=5)
+    result = optimizer.optimize(duel_state())
+    plans = result.top_plans
+    for plan in plans:
+        print(f"{plan['turns']} turns, {plan['damageTaken']} HP lost: {' -> '.join(plan['moveSequence'])}")
+
+    assert exact.top_plans == []
+    assert 2 <= len(plans) <= 5
+    assert (result.turns, result.move_sequence) == (exact.turns, exact.move_sequence)
+    assert plans[0]["turns"] == exact.turns
+    assert [(p["turns"], p["damageTaken"]) for p in plans] == \
+        sorted((p["turns"], p["damageTaken"]) for p in plans)
+    assert len({tuple(p["moveSequence"]) for p in plans}) == len(plans)
+    start_hp = sum(p.current_hp for p in duel_state().player_team)
+    for plan in plans:
+        final = replay(duel_state(), plan["moveSequence"])
+        assert final.player_won() and final.turn == plan["turns"]
+        assert start_hp - sum(p.current_hp for p in final.player_team) == plan["damageTaken"]
+    # Read from the same graph: no more states than the single-plan search
+    assert result.states_explored == exact.states_explored
+
+    # Through the service
+    pikachu = PIKACHU_THUNDER_DATA
+    squirtle = SQUIRTLE_DATA
+    request = dict(player_team_data=[pikachu], opponent_team_data=[squirtle, squirtle])
+    response = BattleOptimizerService.optimize_battle(use_cache=False, top_k=3, **request)
+    assert response["victory"] and 1 <= len(response["topPlans"]) <= 3
+    assert response["topPlans"][0]["turns"] == response["turns"]
+    assert BattleOptimizerService.request_key(top_k=3, **request) != \
+        BattleOptimizerService.request_key(**request)
+    for bad in [dict(top_k=0), dict(top_k=3, algorithm="dp"), dict(top_k=3, workers=2)]:
+        try:
+            BattleOptimizerService.optimize_battle(**request, **bad)
+            assert False, f"Expected ValueError for {bad}"
+        except ValueError:
+            pass
+
+    print("\n✅ Top-K plans test passed!\n")
+
+
+def test_pareto_search():
+    """The Pareto front holds every nondominated plan, from one search."""
+    print_separator("TEST 25: Pareto Search (Turns vs HP Lost vs Faints vs PP)")
+    from algorithms.pareto import ParetoBattleOptimizer, ParetoFront
+
+    # Dominance set: dominated and equal vectors rejected, dominated ones evicted
+    front = ParetoFront()
+    assert front.insert((5, 10)) and front.insert((3, 20)) and front.insert((7, 5))
+    assert not front.insert((6, 10)) and not front.insert((3, 20))
+    assert front.insert((4, 10))  # Evicts (5, 10)
+    assert front.labels == [(3, 20), (4, 10), (7, 5)]
+
+    def new_state():
+        return BattleState([create_pikachu(level=55), create_charizard(level=55)],
+                           [create_charizard(level=50), create_pikachu(level=50)])
+
+    def replay(state, moves):
+        for name in moves:
+            state = next(n for n, _, _, names in state.generate_unique_successor_states()
+                         if name in names)
+        return state
+
+    exact = DijkstraBattleOptimizer().optimize(new_state())
+    optimizer = ParetoBattleOptimizer()
+    result = optimizer.optimize(new_state())
+    plans = result.pareto_front
+    for plan in plans:
+        print(f"{plan['turns']} turns, {plan['hpLost']} HP lost, {plan['faints']} fainted, "
+              f"{plan['ppSpent']} PP: {' -> '.join(plan['moveSequence'])}")
+    print(f"{optimizer.labels_settled} labels settled over {result.states_explored} states")
+
+    assert exact.pareto_front is None
+    assert len(plans) >= 2
+    vectors = [(p["turns"], p["hpLost"], p["faints"], p["ppSpent"]) for p in plans]
+    assert vectors == sorted(vectors)
+    for a in vectors:
+        for b in vectors:
+            assert a == b or not all(x <= y for x, y in zip(a, b)), f"{a} dominates {b}"
+    # Fastest plan first, as fast as plain Dijkstra; a slower one loses no Pokemon
+    assert (result.success, result.turns) == (True, exact.turns) and plans[0]["turns"] == exact.turns
+    assert result.move_sequence == plans[0]["moveSequence"]
+    assert any(p["faints"] < plans[0]["faints"] for p in plans[1:])
+    start_hp = sum(p.current_hp for p in new_state().player_team)
+    for plan in plans:
+        final = replay(new_state(), plan["moveSequence"])
+        assert final.player_won() and final.turn == plan["turns"]
+        assert start_hp - sum(p.current_hp for p in final.player_team) == plan["hpLost"]
+        assert sum(p.is_fainted() for p in final.player_team) == plan["faints"]
+    assert optimizer.labels_settled <= 2 * result.states_explored
+
+    # Through the service
+    response = BattleOptimizerService.optimize_battle(
+        [{"name": "pikachu", "types": ["electric"],
+          "base_stats": {"hp": 35, "attack": 55, "defense": 40, "special": 50, "speed": 90},
+          "moves": ["thunderbolt", "quick-attack", "thunder"]}],
+        boss_trainer_id="lance", player_level=100, algorithm="pareto", use_cache=False
+    )
+    assert response["algorithm"] == "pareto" and response["paretoFront"]
+    assert response["paretoFront"][0]["moveSequence"] == response["moveSequence"]
+
+    print("\n✅ Pareto search test passed!\n")
+
+
+def test_matchup_matrix():
+    """A matchup matrix holds the single-request result of every pair."""
+    print_separator("TEST 26: Matchup Matrix (Many Teams vs Many Opponents)")
+    pikachu = PIKACHU_THUNDER_DATA
+    squirtle = SQUIRTLE_DATA
+    teams = [[pikachu], [squirtle]]
+    opponents = ["lance", "giovanni", [squirtle, squirtle]]
+
+    BattleOptimizerService._result_cache.clear()
+    matrix = BattleOptimizerService.optimize_matchups(teams, opponents, workers=1)
+    for player, row in zip(matrix["players"], matrix["matrix"]):
+        print(f"{player['team']}: " + ", ".join(
+            f"{cell['opponent']} {'won' if cell['victory'] else 'lost'} in {cell['turns']} "
+            f"({cell['timeMs']} ms)" for cell in row))
+    print(f"Summary: {matrix['summary']}")
+
+    summary = matrix["summary"]
+    assert len(matrix["matrix"]) == 2 and all(len(row) == 3 for row in matrix["matrix"])
+    assert summary["pairs"] == 6 and summary["cachedPairs"] == 0 and summary["workers"] == 1
+    assert summary["damageMemoEntries"] > 0
+    assert [o["bossTrainer"] for o in matrix["opponents"]] == ["lance", "giovanni", None]
+    assert summary["wins"] == sum(p["wins"] for p in matrix["players"]) == \
+        sum(o["playerWins"] for o in matrix["opponents"])
+
+    # Every cell is the answer of the equivalent single request
+    for row, team in enumerate(teams):
+        for column, opponent in enumerate(opponents):
+            cell = matrix["matrix"][row][column]
+            single = BattleOptimizerService.optimize_battle(
+                team, opponent_team_data=None if isinstance(opponent, str) else opponent,
+                boss_trainer_id=opponent if isinstance(opponent, str) else None,
+                log_format="none", use_cache=False
+            )
+            assert "timeMs" in cell and not cell["cached"]
+            assert (cell["victory"], cell["turns"], cell["moveSequence"]) == \
+                (single["victory"], single["turns"], single["moveSequence"])
+
+    # Repeat: every pair from the cache (shared with single requests)
+    again = BattleOptimizerService.optimize_matchups(teams, opponents)
+    assert again["summary"]["cachedPairs"] == 6 and again["summary"]["workers"] == 0
+    assert all(cell["cached"] for row in again["matrix"] for cell in row)
+    assert BattleOptimizerService.optimize_battle([pikachu], boss_trainer_id="lance", log_format="none")["cached"]
+
+    # Worker pool: same matrix
+    with mock.patch("os.cpu_count", return_value=4):
+        pooled = BattleOptimizerService.optimize_matchups(teams, opponents, workers=2, use_cache=False)
+    assert pooled["summary"]["workers"] == 2
+    assert [[(c["victory"], c["turns"], c["moveSequence"]) for c in row] for row in pooled["matrix"]] == \
+        [[(c["victory"], c["turns"], c["moveSequence"]) for c in row] for row in matrix["matrix"]]
+
+    # Out of time: unsolved pairs come back pending (workers stopped), and
+    # the same request again fills them in
+    for workers in (1, 2):
+        with mock.patch("os.cpu_count", return_value=4):
+            late = BattleOptimizerService.optimize_matchups(teams, opponents, workers=workers,
+                                                            use_cache=False, time_limit_ms=0.001)
+        assert late["summary"]["pendingPairs"] == 6 and late["summary"]["wins"] == 0
+        assert all(cell["pending"] and not cell["victory"] for row in late["matrix"] for cell in row)
+    assert BattleOptimizerService.optimize_matchups(teams, opponents)["summary"]["pendingPairs"] == 0
+
+    # A search still running at the deadline is stopped, in this process too
+    slow = [[pikachu, CHARIZARD_DATA]]
+    start = time.perf_counter()
+    cut = BattleOptimizerService.optimize_matchups(slow, ["blue"], workers=1, use_cache=False, time_limit_ms=50)
+    assert cut["summary"]["pendingPairs"] == 1 and time.perf_counter() - start < 0.4
+
+    # On Lambda the limit never exceeds what the function has left
+    class Context:
+        def get_remaining_time_in_millis(self):
+            return 0  # Nothing left beyond the response margin
+    import json
+    import battleOptimizer
+    late = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps(
+        {"playerTeams": slow, "opponents": ["blue"], "workers": 1, "timeLimitMs": 60000})}, Context())
+    assert json.loads(late["body"])["summary"]["pendingPairs"] == 1
+
+    # Matrices are synchronous only: stream / async are refused, not ignored
+    import json
+    import battleOptimizer
+    for mode in ("stream", "async"):
+        response = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps(
+            {"playerTeams": [[pikachu]], "opponents": ["lance"], mode: True})}, None)
+        assert response["statusCode"] == 400 and mode in json.loads(response["body"])["error"]
+
+    for bad in [dict(player_teams_data=[]), dict(player_teams_data=teams, opponents=[]),
+                dict(player_teams_data=teams, opponents=["nobody"]),
+                dict(player_teams_data=teams, algorithm="portfolio"),
+                dict(player_teams_data=teams, workers=0),
+                dict(player_teams_data=teams, time_limit_ms=0),
+                dict(player_teams_data=[[pikachu]] * 21)]:
+        try:
+            BattleOptimizerService.optimize_matchups(**bad)
+            assert False, f"Expected ValueError for {bad}"
+        except ValueError:
+            pass
+
+    print("\n✅ Matchup matrix test passed!\n")
+
+
+def test_batch_cli():
+    """The batch runner writes one result per record and resumes from its progress file."""
+    print_separator("TEST 27: Offline Batch CLI (JSONL, Resumable)")
+    import io
+    import json
+    import tempfile
+    from batchCli import run_batch, format_stats
+
+    pikachu = PIKACHU_THUNDER_DATA
+    squirtle = SQUIRTLE_DATA
+    lines = [json.dumps({"id": i, "playerTeam": [pikachu], "opponentTeam": [squirtle] * (1 + i % 2),
+                         "playerLevel": 45 + i}) for i in range(5)]
+    lines += ["not json", "", json.dumps({"playerTeam": [pikachu]})]
+    text = "\n".join(lines) + "\n"
+
+    with tempfile.TemporaryDirectory() as directory:
+        progress = os.path.join(directory, "run.progress")
+
+        # "Interrupted" run: records 1 and 3 already written
+        with open(progress, "w") as f:
+            f.write("1\n3\n")
+        output = io.StringIO()
+        stats = run_batch(io.StringIO(text), output, progress, workers=2, max_in_flight=2)
+        print(format_stats(stats))
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert stats["records"] == 5 and stats["skipped"] == 2 and stats["failed"] == 2
+        assert sorted(r["line"] for r in results) == [2, 4, 5, 6, 8]
+        assert all("timeMs" in r for r in results)
+        assert {r["line"] for r in results if not r["success"]} == {6, 8}
+
+        # Same answers as the handler path, in this process
+        serial = io.StringIO()
+        run_batch(io.StringIO(text), serial, workers=1)
+        by_line = {json.loads(line)["line"]: json.loads(line) for line in serial.getvalue().splitlines()}
+        assert sorted(by_line) == [1, 2, 3, 4, 5, 6, 8]
+        for r in results:
+            if r["success"]:
+                assert r["id"] == by_line[r["line"]]["id"]
+                assert r["result"]["moveSequence"] == by_line[r["line"]]["result"]["moveSequence"]
+                assert "battleLog" not in r["result"] or not r["result"]["battleLog"]
+
+        # Rerun: everything is done
+        again = run_batch(io.StringIO(text), io.StringIO(), progress, workers=2)
+        assert again["records"] == 0 and again["skipped"] == 7
+
+    print("\n✅ Batch CLI test passed!\n")
+
+
+def test_gauntlet():
+    """Gauntlet stages start from the HP and PP the previous battle left."""
+    print_separator("TEST 28: Gauntlet Mode (HP/PP Carried Over)")
+    from algorithms.gauntlet import GauntletPlanner, clear_stage_cache
+
+    def new_team():
+        return [create_charizard(level=100), create_blastoise(level=100), create_pikachu(level=100)]
+
+    opponents = [(get_boss_trainer(boss)["name"], get_boss_trainer(boss)["team"]) for boss in ("lance", "blue")]
+    clear_stage_cache()
+    planner = GauntletPlanner(max_frontier=4)
+    result = planner.plan(new_team(), opponents)
+    for stage in result.stages:
+        print(f"{stage['opponent']}: {stage['turns']} turns, {stage['hpLost']} HP lost -> "
+              f"{[(p['name'], p['hp']) for p in stage['team']]}")
+    print(f"{result}: {planner.stage_searches} stage searches, frontiers {result.frontier_sizes}")
+
+    assert result.success and result.stages_cleared == 2
+    assert result.total_turns == sum(stage["turns"] for stage in result.stages)
+    assert all(size <= 4 for size in result.frontier_sizes)
+    # Replaying the plan battle by battle, without healing, ends as reported
+    team = new_team()
+    for stage, (_, opponent_team) in zip(result.stages, opponents):
+        state = BattleState(team, [p.clone() for p in opponent_team],
+                            player_active=next(i for i, p in enumerate(team) if not p.is_fainted()))
+        hp_before = sum(p.current_hp for p in team)
+        for name in stage["moveSequence"]:
+            state = next(n for n, move, _ in state.generate_successor_states() if move.name == name)
+        assert state.player_won() and state.turn == stage["turns"]
+        team = state.player_team
+        assert hp_before - sum(p.current_hp for p in team) == stage["hpLost"]
+        assert [(p.current_hp, {m.name: m.current_pp for m in p.moves}) for p in team] == \
+            [(p["hp"], p["pp"]) for p in stage["team"]]
+    # The second battle starts hurt: it can't be the fresh-team result
+    assert any(p.current_hp < p.max_hp for p in team)
+
+    # Same gauntlet again: every stage from the stage cache
+    again = planner.plan(new_team(), opponents)
+    assert planner.stage_searches == 0 and planner.stage_cache_hits > 0
+    assert again.total_turns == result.total_turns
+
+    # Out of time: the stages finished so far come back; a resend continues
+    # from the stage cache (the first stage, finished by a one-stage plan)
+    clear_stage_cache()
+    cut = GauntletPlanner(max_frontier=4, time_limit_ms=0.001).plan(new_team(), opponents)
+    assert cut.timed_out and not cut.success and cut.stages_cleared == 0
+    GauntletPlanner(max_frontier=4).plan(new_team(), opponents[:1])
+    resumed = GauntletPlanner(max_frontier=4, time_limit_ms=0.001).plan(new_team(), opponents)
+    assert resumed.timed_out and resumed.stages_cleared == 1
+    assert resumed.stages[0]["opponent"] == result.stages[0]["opponent"]
+
+    # Through the service
+    pikachu = PIKACHU_THUNDER_DATA
+    squirtle = SQUIRTLE_DATA
+    late = BattleOptimizerService.optimize_gauntlet([pikachu], ["lance"], time_limit_ms=0.001, use_cache=False)
+    assert late["timedOut"] and late["pendingStage"] == "Lance" and late["failedAt"] is None
+    response = BattleOptimizerService.optimize_gauntlet([pikachu], [[squirtle], [squirtle], "lance"])
+    assert not response["victory"] and response["failedAt"] == "Lance"
+    assert response["stagesCleared"] == 2 and not response["cached"]
+    assert response["stages"][1]["team"][0]["hp"] < response["stages"][0]["team"][0]["hp"]
+    assert BattleOptimizerService.optimize_gauntlet([pikachu], [[squirtle], [squirtle], "lance"])["cached"]
+    # Same species name, different stats: no shared stage results
+    strong = dict(pikachu, base_stats=dict(pikachu["base_stats"], attack=200, special=200))
+    weak = dict(pikachu, base_stats=dict(pikachu["base_stats"], attack=20, special=20))
+    request = dict(opponents=[[squirtle], [squirtle, squirtle]], player_level=40)
+    fresh = BattleOptimizerService.optimize_gauntlet([strong], use_cache=False, **request)
+    assert fresh["searchStats"]["stageCacheHits"] == 0
+    clear_stage_cache()
+    BattleOptimizerService.optimize_gauntlet([weak], **request)
+    after_weak = BattleOptimizerService.optimize_gauntlet([strong], **request)
+    assert after_weak["searchStats"]["stageSearches"] > 0
+    assert (after_weak["totalTurns"], after_weak["stages"]) == (fresh["totalTurns"], fresh["stages"])
+    # use_cache=False skips the stage cache too
+    again = BattleOptimizerService.optimize_gauntlet([strong], use_cache=False, **request)
+    assert again["searchStats"]["stageCacheHits"] == 0
+
+    for bad in [dict(opponents=[]), dict(opponents=["nobody"]), dict(opponents=[[squirtle]], max_frontier=0),
+                dict(opponents=[[squirtle]], time_limit_ms=0),
+                dict(opponents=[[squirtle]], max_frontier=10 ** 6), dict(opponents=[[squirtle]], max_states=10 ** 9)]:
+        try:
+            BattleOptimizerService.optimize_gauntlet([pikachu], **bad)
+            assert False, f"Expected ValueError for {bad}"
+        except ValueError:
+            pass
+
+    import json
+    import battleOptimizer
+    for mode in ("stream", "async"):
+        response = battleOptimizer.handler({"httpMethod": "POST", "body": json.dumps(
+            {"playerTeam": [pikachu], "gauntlet": ["lance"], mode: True})}, None)
+        assert response["statusCode"] == 400
+
+    print("\n✅ Gauntlet test passed!\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 60)
@@ -233,6 +1665,30 @@ def main():
         # Test complex scenario
         test_complex_battle()
 
+        # Test search-space reductions
+        test_move_dominance_pruning()
+        test_macro_actions()
+        test_state_abstraction()
+        test_result_cache()
+        test_cold_start_imports()
+        test_streaming_progress()
+        test_log_formats()
+        test_async_jobs()
+        test_state_space_estimator()
+        test_battle_server()
+        test_portfolio()
+        test_resumable_search()
+        test_search_checkpoints()
+        test_parallel_dijkstra()
+        test_shared_transposition_table()
+        test_external_bfs()
+        test_state_wire_format()
+        test_top_k_plans()
+        test_pareto_search()
+        test_matchup_matrix()
+        test_batch_cli()
+        test_gauntlet()
+
         # Final summary
         print_separator("SUMMARY")
         print("All algorithms implemented and tested successfully!")
@@ -17,14 +17,18 @@ CS_311 Extra Credit Project
 import sys
 import os
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add current directory to path (once)
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from models.pokemon import Pokemon, create_pikachu, create_charizard, create_blastoise
 from models.move import Move, COMMON_MOVES
 from models.battleState import BattleState
 from utils.typeEffectiveness import TYPE_CHART
 from utils.damageCalculator import DamageCalculator
+from data.bossTrainers import BOSS_TRAINERS, get_boss_trainer
+from data.bossTemplates import GEN1_TYPES, get_boss_template
 
 
 def test_pokemon_creation():
@@ -269,6 +273,100 @@ def test_full_battle_simulation():
     print("✅ Full battle simulation test passed!\n")
 
 
+def test_unique_successor_states():
+    """Test that moves leading to the same state are merged."""
+    print("=" * 60)
+    print("TEST 7: Unique Successor States")
+    print("=" * 60)
+
+    # Charizard at 1 HP: every damaging Pikachu move KOs it
+    pikachu = create_pikachu(level=50)
+    charizard = create_charizard(level=50)
+    charizard.current_hp = 1
+
+    state = BattleState(
+        player_team=[pikachu],
+        opponent_team=[charizard, create_blastoise(level=50)]
+    )
+
+    all_successors = state.generate_successor_states()
+    unique_successors = state.generate_unique_successor_states()
+
+    print(f"All successors: {len(all_successors)}")
+    for next_state, move, damage, move_names in unique_successors:
+        print(f"  {move.name} -> {next_state.hash_key()} (equivalent: {list(move_names)})")
+
+    # Thunderbolt, Quick Attack and Thunder all KO; Thunder Wave does nothing
+    assert len(all_successors) == 4
+    assert len(unique_successors) == 2
+    assert unique_successors[0][3] == ("Thunderbolt", "Quick Attack", "Thunder")
+
+    # Every unique successor matches the state built the old way
+    keys = {s.hash_key() for s, _, _ in all_successors}
+    assert keys == {s.hash_key() for s, _, _, _ in unique_successors}
+
+    print("✅ Unique successor states test passed!\n")
+
+
+def test_boss_templates():
+    """Test that compiled boss teams match freshly built ones."""
+    print("=" * 60)
+    print("TEST 8: Boss Templates")
+    print("=" * 60)
+
+    for trainer_id, info in BOSS_TRAINERS.items():
+        template = get_boss_template(trainer_id)
+        assert get_boss_template(trainer_id) is template  # Compiled once
+
+        fresh = info["team"]()
+        team = get_boss_trainer(trainer_id)["team"]
+        assert [p.to_dict() for p in team] == [p.to_dict() for p in fresh]
+        assert len(template) == len(fresh)
+
+        # Precomputed AI rows pick the same reply as the full computation
+        for type1 in GEN1_TYPES:
+            for type2 in GEN1_TYPES:
+                defender = create_pikachu(level=50)
+                defender.types = [type1] if type1 == type2 else [type1, type2]
+                for compiled, built in zip(team, fresh):
+                    assert (BattleState.select_opponent_move(compiled, defender).name ==
+                            BattleState.select_opponent_move(built, defender).name)
+
+        # Types the Gen 1 table doesn't know are rated move by move (neutral)
+        for types in (["Steel"], ["Electric", "Steel"], ["Dark", "Fairy"]):
+            defender = create_pikachu(level=50)
+            defender.types = types
+            for compiled, built in zip(team, fresh):
+                assert (BattleState.select_opponent_move(compiled, defender).name ==
+                        BattleState.select_opponent_move(built, defender).name)
+
+        print(f"{template.name}: {len(template)} Pokemon compiled")
+
+    # Battles never touch the template or each other
+    first = get_boss_trainer("lance")["team"]
+    first[0].take_damage(50)
+    first[0].moves[0].use()
+    second = get_boss_trainer("lance")["team"]
+    assert second[0].current_hp == second[0].max_hp
+    assert second[0].moves[0].current_pp == second[0].moves[0].pp
+    assert BattleState(first, second).copy().opponent_team[0].ai_priorities is second[0].ai_priorities
+
+    # A later-generation typing against a boss is optimized, not an error
+    from services.battleOptimizerService import BattleOptimizerService
+    magnemite = {
+        "name": "magnemite",
+        "types": ["electric", "steel"],
+        "base_stats": {"hp": 25, "attack": 35, "defense": 70, "special": 95, "speed": 45},
+        "moves": ["thunderbolt", "tackle"]
+    }
+    for trainer_id in BOSS_TRAINERS:
+        result = BattleOptimizerService.optimize_battle([magnemite], boss_trainer_id=trainer_id,
+                                                        log_format="none", use_cache=False)
+        assert result["turns"] > 0 and "error" not in result
+
+    print("✅ Boss templates test passed!\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 60)
@@ -282,6 +380,8 @@ def main():
         test_battle_state()
         test_successor_states()
         test_full_battle_simulation()
+        test_unique_successor_states()
+        test_boss_templates()
 
         print("=" * 60)
         print("ALL TESTS PASSED! ✅✅✅")
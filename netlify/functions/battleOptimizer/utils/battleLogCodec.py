@@ -0,0 +1,198 @@
+"""
+Battle Log Codec - Compact Columnar Battle Logs
+
+The full battle log is a list of nested dicts per event, repeating Pokemon
+names, max HP and effectiveness on every line; for long battles it is most
+of the JSON response. The compact format ("logFormat": "compact") stores the
+same information in columns:
+
+    {
+        "format": "compact-v1",
+        "events": ["player_attack", "opponent_attack", "faint", "switch", "battle_end"],
+        "pokemon": [["Pikachu", 141], ["Onix", 143], ...],  # [name, maxHp]
+        "moves": ["Thunderbolt", "Counter", ...],
+        "turn":   [1, 0, 1, ...],      # delta from the previous event
+        "event":  [0, 1, 0, ...],      # index into events
+        "side":   [0, 1, 0, ...],      # 0 = player, 1 = opponent (winner for battle_end)
+        "actor":  [0, 1, 0, ...],      # attacker / fainted / switched-in Pokemon (-1 = none)
+        "target": [1, 0, 1, ...],      # defender (-1 = none)
+        "move":   [0, 1, 0, ...],      # index into moves (-1 = none)
+        "hp":     [141, 143, ...],     # attacker HP, or HP of the switched-in Pokemon
+        "hpAfter": [...],              # defender HP after the hit
+        "damage": [...],               # hpBefore = hpAfter + damage
+        "effectiveness": [...],
+        "equivalentMoves": {"0": [0, 2]}  # event index -> move indices (sparse)
+    }
+
+decode_battle_log turns it back into exactly the full log.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+from typing import Any, Dict, List, Tuple
+
+COMPACT_FORMAT = "compact-v1"
+
+# Event codes (index = code)
+EVENT_TYPES = ("player_attack", "opponent_attack", "faint", "switch", "battle_end")
+
+# Battle log formats accepted by the service ("full" is the list of dicts)
+LOG_FORMATS = ("full", "compact", "none")
+
+_SIDES = ("player", "opponent")
+_COLUMNS = ("turn", "event", "side", "actor", "target", "move", "hp", "hpAfter", "damage", "effectiveness")
+
+
+class _Table:
+    """Values in first-seen order, each mapped to its index."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._index: Dict[Any, int] = {}
+
+    def add(self, value) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self._index[value] = index
+            self.values.append(value)
+        return index
+
+
+def encode_battle_log(battle_log: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode a full battle log in the compact columnar format.
+
+    Args:
+        battle_log: Full log (as built by the optimizers)
+
+    Returns:
+        Compact log (JSON-serializable)
+
+    Time Complexity: O(n) for n events
+    """
+    pokemon = _Table()
+    moves = _Table()
+    columns: Dict[str, List] = {name: [] for name in _COLUMNS}
+    equivalent: Dict[str, List[int]] = {}
+    last_turn = 0
+
+    for i, entry in enumerate(battle_log):
+        event = entry["event"]
+        row = dict(side=0, actor=-1, target=-1, move=-1, hp=0, hpAfter=0, damage=0, effectiveness=0)
+
+        if event in ("player_attack", "opponent_attack"):
+            attacker, defender = entry["attacker"], entry["defender"]
+            row.update(
+                side=0 if event == "player_attack" else 1,
+                actor=pokemon.add((attacker["name"], attacker["maxHp"])),
+                target=pokemon.add((defender["name"], defender["maxHp"])),
+                move=moves.add(entry["move"]),
+                hp=attacker["hp"],
+                hpAfter=defender["hpAfter"],
+                damage=entry["damage"],
+                effectiveness=entry["effectiveness"]
+            )
+            if "equivalentMoves" in entry:
+                equivalent[str(i)] = [moves.add(name) for name in entry["equivalentMoves"]]
+        elif event == "faint":
+            # The log does not carry max HP for fainted Pokemon: reuse the
+            # entry seen earlier (every fainted Pokemon was attacked first)
+            row.update(side=_SIDES.index(entry["pokemon"]["team"]),
+                       actor=_pokemon_index(pokemon, entry["pokemon"]["name"]))
+        elif event == "switch":
+            switched = entry["pokemon"]
+            row.update(side=_SIDES.index(switched["team"]),
+                       actor=pokemon.add((switched["name"], switched["maxHp"])),
+                       hp=switched["hp"])
+        else:  # battle_end
+            row.update(side=_SIDES.index(entry["winner"]))
+
+        columns["turn"].append(entry["turn"] - last_turn)
+        last_turn = entry["turn"]
+        columns["event"].append(EVENT_TYPES.index(event))
+        for name in _COLUMNS[2:]:
+            columns[name].append(row[name])
+
+    compact = {
+        "format": COMPACT_FORMAT,
+        "events": list(EVENT_TYPES),
+        "pokemon": [list(p) for p in pokemon.values],
+        "moves": moves.values
+    }
+    compact.update(columns)
+    if equivalent:
+        compact["equivalentMoves"] = equivalent
+    return compact
+
+
+def _pokemon_index(pokemon: _Table, name: str) -> int:
+    """Index of a Pokemon already in the table by name (added with max HP 0 if unseen)."""
+    for index, (seen_name, _) in enumerate(pokemon.values):
+        if seen_name == name:
+            return index
+    return pokemon.add((name, 0))
+
+
+def decode_battle_log(compact: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rebuild the full battle log from the compact format.
+
+    Args:
+        compact: Output of encode_battle_log
+
+    Returns:
+        Full log (list of event dicts)
+
+    Raises:
+        ValueError: If the format is not recognized
+    """
+    if compact.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unknown battle log format: {compact.get('format')}")
+
+    pokemon: List[Tuple[str, int]] = [tuple(p) for p in compact["pokemon"]]
+    moves = compact["moves"]
+    events = compact["events"]
+    equivalent = compact.get("equivalentMoves", {})
+
+    battle_log = []
+    turn = 0
+    for i in range(len(compact["event"])):
+        turn += compact["turn"][i]
+        event = events[compact["event"][i]]
+        side = _SIDES[compact["side"][i]]
+        entry: Dict[str, Any] = {"turn": turn, "event": event}
+
+        if event in ("player_attack", "opponent_attack"):
+            attacker = pokemon[compact["actor"][i]]
+            defender = pokemon[compact["target"][i]]
+            hp_after = compact["hpAfter"][i]
+            damage = compact["damage"][i]
+            entry.update({
+                "attacker": {"name": attacker[0], "hp": compact["hp"][i], "maxHp": attacker[1]},
+                "defender": {
+                    "name": defender[0],
+                    "hpBefore": hp_after + damage,
+                    "hpAfter": hp_after,
+                    "maxHp": defender[1]
+                },
+                "move": moves[compact["move"][i]],
+                "damage": damage,
+                "effectiveness": compact["effectiveness"][i]
+            })
+            if str(i) in equivalent:
+                entry["equivalentMoves"] = [moves[m] for m in equivalent[str(i)]]
+        elif event == "faint":
+            entry["pokemon"] = {"name": pokemon[compact["actor"][i]][0], "team": side}
+        elif event == "switch":
+            switched = pokemon[compact["actor"][i]]
+            entry["pokemon"] = {"name": switched[0], "hp": compact["hp"][i],
+                                "maxHp": switched[1], "team": side}
+        else:
+            entry["winner"] = side
+
+        battle_log.append(entry)
+
+    return battle_log
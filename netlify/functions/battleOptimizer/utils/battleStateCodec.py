@@ -0,0 +1,323 @@
+"""
+Battle State Codec - Compact Binary Wire Format for States and Teams
+
+BattleState.to_dict / Pokemon.to_dict repeat every species, stat and move of
+both teams in nested dicts for every state; shipping states between worker
+processes or into checkpoints that way is slow and large. This codec splits
+a battle into:
+
+- A team header, written once: species, level, types, base stats, DVs and
+  moves (name, type, power, accuracy, PP) of every Pokemon of both teams
+- Fixed-size state records, one per state: turn, active slots, the HP of
+  every Pokemon, then the PP of every move, all big-endian unsigned
+  integers. The first key_size bytes (turn, actives, HPs) are the vertex key
+  of the state (same information as BattleState.compact_key()), and sorting
+  raw records sorts them by that key
+
+    codec = BattleStateCodec(state)
+    blob = encode_states(states)          # header + count + records
+    states = decode_states(blob)          # teams rebuilt once from the header
+    record = codec.encode(state)          # 2-3 dozen bytes
+    state = codec.decode(buffer, offset)  # read in place (memoryview, no copy)
+
+Records are read with struct.unpack_from directly on the caller's buffer
+(bytes, bytearray, mmap or memoryview), so decoding copies nothing but the
+integers; a decoded state clones the header's Pokemon and sets HP and PP.
+
+Layout version WIRE_VERSION is stored in the header; decoding a header of
+another version raises WireFormatError.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import struct
+from typing import Iterable, Iterator, List, Tuple, Union
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from models.move import Move
+
+# Bumped whenever the header or record layout changes
+WIRE_VERSION = 1
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_MAGIC = b"PTBS"
+_PREAMBLE = struct.Struct(">4sBBB")   # magic, version, player / opponent team sizes
+_POKEMON = struct.Struct(">B5H5BB")   # level, base stats, DVs, move count
+_MOVE = struct.Struct(">HBB")         # power, accuracy (255 = always hits), PP
+_COUNT = struct.Struct(">I")
+_STATS = ("HP", "Attack", "Defense", "Speed", "Special")
+_NO_ACCURACY = 255
+
+
+class WireFormatError(ValueError):
+    """Raised when binary data is not a battle encoded by this codec version."""
+
+
+def encode_teams(player_team: List[Pokemon], opponent_team: List[Pokemon]) -> bytes:
+    """
+    Team header of a battle.
+
+    Args:
+        player_team: Player's Pokemon team
+        opponent_team: Opponent's Pokemon team
+
+    Returns:
+        Header bytes (current HP and PP are not part of it)
+    """
+    parts = [_PREAMBLE.pack(_MAGIC, WIRE_VERSION, len(player_team), len(opponent_team))]
+    for pokemon in player_team + opponent_team:
+        parts.append(_string(pokemon.name))
+        parts.append(bytes([len(pokemon.types)]))
+        parts.extend(_string(t) for t in pokemon.types)
+        parts.append(_POKEMON.pack(pokemon.level, *(pokemon.base_stats[s] for s in _STATS),
+                                   *(pokemon.dvs[s] for s in _STATS), len(pokemon.moves)))
+        for move in pokemon.moves:
+            parts.append(_string(move.name))
+            parts.append(_string(move.type))
+            accuracy = _NO_ACCURACY if move.accuracy is None else move.accuracy
+            parts.append(_MOVE.pack(move.power, accuracy, move.pp))
+    return b"".join(parts)
+
+
+def decode_teams(data: Buffer, offset: int = 0) -> Tuple[List[Pokemon], List[Pokemon], int]:
+    """
+    Rebuild the teams of a header written by encode_teams.
+
+    Args:
+        data: Buffer holding the header
+        offset: Where the header starts
+
+    Returns:
+        Tuple of (player_team, opponent_team, offset just past the header),
+        every Pokemon at full HP and PP
+
+    Raises:
+        WireFormatError: If the data is not a header of this version
+    """
+    view = memoryview(data)
+    try:
+        magic, version, players, opponents = _PREAMBLE.unpack_from(view, offset)
+        if magic != _MAGIC or version != WIRE_VERSION:
+            raise WireFormatError(f"Not a battle header of wire version {WIRE_VERSION}")
+        offset += _PREAMBLE.size
+        team = []
+        for _ in range(players + opponents):
+            name, offset = _read_string(view, offset)
+            type_count = view[offset]
+            offset += 1
+            types = []
+            for _ in range(type_count):
+                type_name, offset = _read_string(view, offset)
+                types.append(type_name)
+            fields = _POKEMON.unpack_from(view, offset)
+            offset += _POKEMON.size
+            level, stats, dvs, move_count = fields[0], fields[1:6], fields[6:11], fields[11]
+            moves = []
+            for _ in range(move_count):
+                move_name, offset = _read_string(view, offset)
+                move_type, offset = _read_string(view, offset)
+                power, accuracy, pp = _MOVE.unpack_from(view, offset)
+                offset += _MOVE.size
+                moves.append(Move(move_name, move_type, power,
+                                  None if accuracy == _NO_ACCURACY else accuracy, pp))
+            team.append(Pokemon(name=name, types=types, level=level,
+                                base_stats=dict(zip(_STATS, stats)), dvs=dict(zip(_STATS, dvs)),
+                                moves=moves))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise WireFormatError(f"Truncated or corrupt battle header: {e}")
+    return team[:players], team[players:], offset
+
+
+class BattleStateCodec:
+    """
+    Fixed-size binary records of the states of one battle.
+
+    Attributes:
+        template: State providing the teams decoded states are cloned from
+        key_size: Bytes of the vertex key at the start of a record
+        size: Bytes of a whole record
+    """
+
+    def __init__(self, template: BattleState):
+        """
+        Create the codec of a battle.
+
+        Args:
+            template: Any state of the battle (provides the teams)
+        """
+        self.template = template
+        self._players = len(template.player_team)
+        self._team = template.player_team + template.opponent_team
+        self._move_counts = [len(p.moves) for p in self._team]
+        key_format = ">HBB" + "H" * len(self._team)
+        self._key = struct.Struct(key_format)
+        self._record = struct.Struct(key_format + "B" * sum(self._move_counts))
+        self.key_size = self._key.size
+        self.size = self._record.size
+
+    @classmethod
+    def from_header(cls, data: Buffer, offset: int = 0) -> Tuple["BattleStateCodec", int]:
+        """
+        Codec of the battle described by a team header.
+
+        Args:
+            data: Buffer holding the header
+            offset: Where the header starts
+
+        Returns:
+            Tuple of (codec, offset just past the header)
+
+        Raises:
+            WireFormatError: If the data is not a header of this version
+        """
+        player_team, opponent_team, offset = decode_teams(data, offset)
+        return cls(BattleState(player_team=player_team, opponent_team=opponent_team)), offset
+
+    def header(self) -> bytes:
+        """Team header of this codec's battle (encode_teams)."""
+        return encode_teams(self.template.player_team, self.template.opponent_team)
+
+    def encode(self, state: BattleState) -> bytes:
+        """Record of a state."""
+        team = state.player_team + state.opponent_team
+        return self._record.pack(state.turn, state.player_active, state.opponent_active,
+                                 *(p.current_hp for p in team),
+                                 *(m.current_pp for p in team for m in p.moves))
+
+    def encode_into(self, buffer: Union[bytearray, memoryview], offset: int, state: BattleState):
+        """Write a state's record into a writable buffer at `offset`."""
+        team = state.player_team + state.opponent_team
+        self._record.pack_into(buffer, offset, state.turn, state.player_active, state.opponent_active,
+                               *(p.current_hp for p in team),
+                               *(m.current_pp for p in team for m in p.moves))
+
+    def key(self, state: BattleState) -> bytes:
+        """Vertex key of a state (the first key_size bytes of its record)."""
+        team = state.player_team + state.opponent_team
+        return self._key.pack(state.turn, state.player_active, state.opponent_active,
+                              *(p.current_hp for p in team))
+
+    def decode(self, data: Buffer, offset: int = 0) -> BattleState:
+        """
+        State of the record at `offset` (read in place, the buffer is not copied).
+
+        Args:
+            data: Buffer holding the record
+            offset: Where the record starts
+
+        Returns:
+            New BattleState (Pokemon cloned from the template)
+
+        Raises:
+            WireFormatError: If the record does not fit the teams
+        """
+        try:
+            fields = self._record.unpack_from(data, offset)
+        except struct.error as e:
+            raise WireFormatError(f"Truncated state record: {e}")
+        hp_end = 3 + len(self._team)
+        pp_index = hp_end
+        team = []
+        for pokemon, hp, move_count in zip(self._team, fields[3:hp_end], self._move_counts):
+            if hp > pokemon.max_hp:
+                raise WireFormatError(f"HP {hp} does not fit {pokemon.name}")
+            clone = pokemon.clone()
+            clone.current_hp = hp
+            for move in clone.moves:
+                move.current_pp = fields[pp_index]
+                pp_index += 1
+            team.append(clone)
+        return BattleState(player_team=team[:self._players], opponent_team=team[self._players:],
+                           player_active=fields[1], opponent_active=fields[2], turn=fields[0])
+
+    def iter_decode(self, data: Buffer, offset: int = 0, count: int = None) -> Iterator[BattleState]:
+        """
+        Decode consecutive records.
+
+        Args:
+            data: Buffer holding the records
+            offset: Where the first record starts
+            count: Records to read (None = up to the end of the buffer)
+
+        Yields:
+            BattleState per record
+        """
+        view = memoryview(data)
+        if count is None:
+            count = (len(view) - offset) // self.size
+        for index in range(count):
+            yield self.decode(view, offset + index * self.size)
+
+
+def encode_states(states: Iterable[BattleState]) -> bytes:
+    """
+    Encode states of one battle: the team header once, then one record each.
+
+    Args:
+        states: At least one state, all of the same battle
+
+    Returns:
+        Header, record count and records
+
+    Raises:
+        ValueError: If there is no state
+    """
+    states = list(states)
+    if not states:
+        raise ValueError("encode_states needs at least one state")
+    codec = BattleStateCodec(states[0])
+    records = bytearray(codec.size * len(states))
+    for index, state in enumerate(states):
+        codec.encode_into(records, index * codec.size, state)
+    return codec.header() + _COUNT.pack(len(states)) + bytes(records)
+
+
+def decode_states(data: Buffer) -> List[BattleState]:
+    """
+    Decode the output of encode_states.
+
+    Args:
+        data: Encoded states
+
+    Returns:
+        States in their original order
+
+    Raises:
+        WireFormatError: If the data is not encoded by this codec version
+    """
+    codec, offset = BattleStateCodec.from_header(data)
+    try:
+        count = _COUNT.unpack_from(data, offset)[0]
+    except struct.error as e:
+        raise WireFormatError(f"Truncated state list: {e}")
+    offset += _COUNT.size
+    if len(data) - offset != count * codec.size:
+        raise WireFormatError("State list length does not match its record count")
+    return list(codec.iter_decode(data, offset, count))
+
+
+def _string(text: str) -> bytes:
+    """Length-prefixed UTF-8 (at most 255 bytes)."""
+    encoded = text.encode("utf-8")
+    if len(encoded) > 255:
+        raise ValueError(f"Name too long for the wire format: {text!r}")
+    return bytes([len(encoded)]) + encoded
+
+
+def _read_string(view: memoryview, offset: int) -> Tuple[str, int]:
+    length = view[offset]
+    end = offset + 1 + length
+    if end > len(view):
+        raise WireFormatError("Truncated string in battle header")
+    return str(view[offset + 1:end], "utf-8"), end
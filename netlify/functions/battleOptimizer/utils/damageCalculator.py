@@ -19,6 +19,11 @@ Modifiers:
     - Critical: 2.0 for critical hit, 1.0 otherwise
     - Random: Random variance from 217-255, divided by 255 (85-100% of damage)
 
+Deterministic calls (critical flag and random roll both given - what every
+search does) are memoized per process by the values the formula reads, so
+a search, or a batch of searches sharing Pokemon (matchup matrices), pays
+for each attacker / defender / move combination once.
+
 Gen 1 Critical Hit Mechanics:
     - Base critical rate = BaseSpeed / 512
     - High critical moves (Slash, Razor Leaf, etc.) = BaseSpeed / 64
@@ -33,15 +38,25 @@ CS_311 Extra Credit Project
 import random
 import sys
 import os
-from typing import Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from models.pokemon import Pokemon
 from models.move import Move
 from utils.typeEffectiveness import TYPE_CHART
 
+# Deterministic damage by (level, power, move type, attack stat, defense
+# stat, attacker types, defender types, critical, roll); cleared when full
+_DAMAGE_MEMO: Dict[Tuple, int] = {}
+MAX_DAMAGE_MEMO = 1 << 16
+
+# Roll every search uses (average of 217-255, see BattleState)
+SEARCH_ROLL = 236
+
 
 class DamageCalculator:
     """
@@ -91,6 +106,15 @@ class DamageCalculator:
         else:
             defense_stat = defender.special
 
+        # Same inputs, same damage: reuse deterministic results
+        memo_key = None
+        if is_critical is not None and random_roll is not None:
+            memo_key = (attacker.level, move.power, move.type, attack_stat, defense_stat,
+                        tuple(attacker.types), tuple(defender.types), is_critical, random_roll)
+            damage = _DAMAGE_MEMO.get(memo_key)
+            if damage is not None:
+                return damage
+
         # Determine if critical hit occurs
         if is_critical is None:
             is_critical = DamageCalculator._is_critical_hit(attacker, move)
@@ -117,7 +141,41 @@ class DamageCalculator:
         damage = base * stab * type_effectiveness * critical * random_multiplier
 
         # Round down and return
-        return int(damage)
+        damage = int(damage)
+        if memo_key is not None:
+            if len(_DAMAGE_MEMO) >= MAX_DAMAGE_MEMO:
+                _DAMAGE_MEMO.clear()
+            _DAMAGE_MEMO[memo_key] = damage
+        return damage
+
+    @staticmethod
+    def precompute_damage(
+        team_a: Iterable[Pokemon],
+        team_b: Iterable[Pokemon],
+        random_roll: int = SEARCH_ROLL
+    ) -> int:
+        """
+        Fill the damage memo for every move of every Pokemon of each team
+        against every Pokemon of the other (done once before forking
+        workers, which then inherit it).
+
+        Args:
+            team_a: Pokemon of one side (e.g. every candidate player team)
+            team_b: Pokemon of the other side (e.g. every opponent)
+            random_roll: Roll to precompute (the searches' by default)
+
+        Returns:
+            Number of memoized entries
+        """
+        team_a = list(team_a)
+        team_b = list(team_b)
+        for attackers, defenders in ((team_a, team_b), (team_b, team_a)):
+            for attacker in attackers:
+                for defender in defenders:
+                    for move in attacker.moves:
+                        DamageCalculator.calculate_damage(attacker, defender, move,
+                                                          is_critical=False, random_roll=random_roll)
+        return len(_DAMAGE_MEMO)
 
     @staticmethod
     def calculate_damage_range(
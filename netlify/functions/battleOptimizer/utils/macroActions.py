@@ -0,0 +1,284 @@
+"""
+Macro Actions - Fast-Forward Forced Repetition Sequences
+
+Long stretches of a boss fight are the same turn played over and over: the
+player repeats one move, the opponent answers with the same reply, and HP
+goes down by the same amounts until someone faints. Without help, every
+intermediate HP value becomes its own state in Dijkstra's graph and its own
+DP subproblem.
+
+Under the deterministic battle model (no crits, fixed damage roll, player
+moves first) the whole chain can be worked out in closed form:
+- The player's damage d and the opponent's reply (and its damage c) stay the
+  same every turn while the same two Pokemon face each other
+- The defender faints on turn ceil(hp / d)
+- The attacker faints on turn ceil(hp / c) (counters only happen on turns
+  the defender survives)
+- The chain also stops before the player's move or the opponent's reply
+  runs out of PP, since the AI choice changes after that
+
+A macro is only emitted when the repeated move is FORCED at every turn it
+covers, so the search never loses a better plan:
+- The active player Pokemon has exactly one usable move, or
+- It is the last Pokemon standing and the move strictly dominates every other
+  usable move (more damage than any of them, even after capping at the
+  defender's HP, and abundant PP - see utils/moveDominance.py)
+
+Macros cover at least 2 turns; shorter chains are left to normal expansion.
+The macro's end state is identical (HP, PP, actives, turn counter) to the one
+that playing the turns one by one would produce, and expand() replays those
+turns so move sequences and battle logs stay per-turn.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+from typing import List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from models.move import Move
+from utils.damageCalculator import DamageCalculator
+from utils.moveDominance import MoveDominanceFilter
+
+
+class MacroAction:
+    """
+    A move repeated for several turns, collapsed into one search step.
+
+    Attributes:
+        move: Player move that is repeated
+        turns: Number of turns the macro covers (edge weight for Dijkstra)
+        total_damage: Damage dealt over all turns (sum of per-turn damage)
+        next_state: Battle state after the last turn
+    """
+
+    def __init__(self, move: Move, turns: int, total_damage: int, next_state: BattleState):
+        self.move = move
+        self.turns = turns
+        self.total_damage = total_damage
+        self.next_state = next_state
+
+    @property
+    def move_names(self) -> List[str]:
+        """Player move used on each turn (the same move every time)."""
+        return [self.move.name] * self.turns
+
+    def expand(self, start_state: BattleState) -> List[Tuple[BattleState, BattleState]]:
+        """
+        Replay the macro one turn at a time.
+
+        Args:
+            start_state: State the macro was planned from
+
+        Returns:
+            List of (before_state, after_state) pairs, one per turn
+        """
+        steps = []
+        state = start_state
+
+        for _ in range(self.turns):
+            move = state.get_active_player_pokemon().get_move(self.move.name)
+            if state.is_battle_over() or move is None or not move.is_usable():
+                break  # Only possible if start_state differs from the planned state
+            next_state = state._apply_move_outcome(move, state._predict_move_outcome(move))
+            steps.append((state, next_state))
+            state = next_state
+
+        return steps
+
+    def __repr__(self) -> str:
+        return (f"MacroAction(move={self.move.name}, turns={self.turns}, "
+                f"total_damage={self.total_damage})")
+
+
+class MacroActionPlanner:
+    """
+    Detects forced repetition sequences and builds their end states.
+
+    One planner instance should be used per search (the damage cache is keyed
+    by team slot indices, like MoveDominanceFilter).
+
+    Attributes:
+        macros_built: Number of macro actions created so far
+        turns_skipped: Intermediate states never materialized (turns - 1 per macro)
+    """
+
+    def __init__(self, damage_source: Optional[MoveDominanceFilter] = None):
+        """
+        Create a planner.
+
+        Args:
+            damage_source: MoveDominanceFilter whose matchup damage cache is
+                           shared (a private one is created if None)
+        """
+        self.damage_source = damage_source or MoveDominanceFilter()
+
+        # Statistics
+        self.macros_built = 0
+        self.turns_skipped = 0
+
+    def plan(self, state: BattleState, max_turns: Optional[int] = None) -> Optional[MacroAction]:
+        """
+        Build the macro action for a state, if its next turns are forced.
+
+        Args:
+            state: Current battle state
+            max_turns: Optional cap on the turns covered (e.g. remaining depth)
+
+        Returns:
+            MacroAction covering 2+ turns, or None to expand normally
+
+        Time Complexity: O(M + K) where M = moves (max 4), K = opponents
+        """
+        if state.is_battle_over():
+            return None
+
+        attacker = state.get_active_player_pokemon()
+        defender = state.get_active_opponent_pokemon()
+        usable_moves = [m for m in attacker.moves if m.is_usable()]
+        if not usable_moves:
+            return None
+
+        forced = self._forced_move(state, usable_moves)
+        if forced is None:
+            return None
+        move, forced_turns = forced
+
+        damage = self.damage_source.get_matchup_damage(state, move)
+        if damage <= 0:
+            return None
+
+        # Turn on which the defender faints
+        ko_turn = -(-defender.current_hp // damage)  # ceil division
+        turns = min(ko_turn, forced_turns, move.current_pp)
+        if max_turns is not None:
+            turns = min(turns, max_turns)
+
+        reply = BattleState.select_opponent_move(defender, attacker)
+        counter_damage = 0
+        if reply is not None:
+            counter_damage = DamageCalculator.calculate_damage(
+                defender, attacker, reply,
+                is_critical=False,  # Same deterministic settings as BattleState
+                random_roll=236
+            )
+            if counter_damage > 0:
+                # Turn on which the attacker faints (counters are turns 1..ko_turn-1)
+                faint_turn = -(-attacker.current_hp // counter_damage)
+                if faint_turn < ko_turn:
+                    turns = min(turns, faint_turn)
+
+            # The AI reply only stays the same while it has PP
+            if min(turns, ko_turn - 1) > reply.current_pp:
+                turns = reply.current_pp
+
+        if turns < 2:
+            return None
+
+        next_state = self._fast_forward(state, move, reply, damage, counter_damage, turns, ko_turn)
+
+        self.macros_built += 1
+        self.turns_skipped += turns - 1
+
+        return MacroAction(move, turns, damage * turns, next_state)
+
+    def _forced_move(self, state: BattleState, usable_moves: List[Move]) -> Optional[Tuple[Move, float]]:
+        """
+        Find the move the player is forced to repeat, and for how long.
+
+        Args:
+            state: Current battle state
+            usable_moves: Usable moves of the active player Pokemon
+
+        Returns:
+            Tuple of (move, turns it stays forced), or None if no move is forced
+        """
+        if len(usable_moves) == 1:
+            return (usable_moves[0], float('inf'))
+
+        # With a teammate alive, stalling can be optimal (see moveDominance)
+        if state.get_alive_pokemon_count(True) != 1:
+            return None
+
+        damages = [self.damage_source.get_matchup_damage(state, m) for m in usable_moves]
+        best_index = max(range(len(usable_moves)), key=lambda i: damages[i])
+        best_damage = damages[best_index]
+        others_max = max(d for i, d in enumerate(damages) if i != best_index)
+
+        defender_hp = state.get_active_opponent_pokemon().current_hp
+        if others_max >= best_damage or others_max >= defender_hp:
+            return None
+
+        move = usable_moves[best_index]
+        if not self.damage_source.has_abundant_pp(state, move):
+            return None
+
+        # Strictly better only while the defender has more HP than the other
+        # moves deal (after that, capped damages tie); abundance holds on
+        # every turn since each hit also lowers the PP it needs by one
+        forced_turns = -(-(defender_hp - others_max) // best_damage)
+        return (move, forced_turns)
+
+    @staticmethod
+    def _fast_forward(
+        state: BattleState,
+        move: Move,
+        reply: Optional[Move],
+        damage: int,
+        counter_damage: int,
+        turns: int,
+        ko_turn: int
+    ) -> BattleState:
+        """
+        Apply several identical turns at once (one state copy).
+
+        Args:
+            state: Starting battle state
+            move: Player move repeated every turn
+            reply: Opponent reply every turn (None = no counterattack)
+            damage: Player damage per turn
+            counter_damage: Opponent damage per counterattack
+            turns: Number of turns to apply
+            ko_turn: Turn on which the defender faints
+
+        Returns:
+            New BattleState after the last turn
+        """
+        reply_index = None
+        if reply is not None:
+            reply_index = state.get_active_opponent_pokemon().moves.index(reply)
+
+        next_state = state.copy()
+        attacker = next_state.get_active_player_pokemon()
+        defender = next_state.get_active_opponent_pokemon()
+
+        defender.take_damage(damage * turns)
+        attacker.get_move(move.name).current_pp -= turns
+
+        # The opponent does not counter on the turn its Pokemon faints
+        counters = min(turns, ko_turn - 1)
+        if reply_index is not None and counters > 0:
+            defender.moves[reply_index].current_pp -= counters
+            attacker.take_damage(counter_damage * counters)
+
+        # Auto-switches after the last turn
+        if defender.is_fainted():
+            next_state.opponent_active = BattleState._next_alive_index(
+                next_state.opponent_team, next_state.opponent_active
+            )
+        elif attacker.is_fainted():
+            next_state.player_active = BattleState._next_alive_index(
+                next_state.player_team, next_state.player_active
+            )
+
+        next_state.turn += turns
+
+        return next_state
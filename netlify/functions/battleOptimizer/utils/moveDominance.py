@@ -0,0 +1,232 @@
+"""
+Move Dominance Filter - Prune Dominated Actions Per Matchup
+
+Many movesets carry moves that can never be the better choice in a given
+matchup. Under the deterministic battle model (no crits, fixed damage roll,
+no status effects) a move's only effects are:
+- The damage it deals to the active opponent
+- One PP spent from that move
+
+The opponent's reply does not depend on which player move was used, so two
+moves that leave the defender at the same HP lead to the same next state key
+(the key tracks HP and active slots, not PP). Only one of them needs a branch.
+
+Dealing MORE damage is not automatically better in this model, because
+switches are forced: sometimes the best plan deliberately stalls so the
+active Pokemon faints before the defender does and a teammate with a better
+matchup finishes the job. That trick needs a teammate, so strict damage
+dominance is only applied when the active player Pokemon is the last one
+standing. There, every extra point of damage is pure gain.
+
+PP can also make a weaker move worth keeping: spending a PP of a strong move
+on an early opponent can leave it empty for a later one. So B only dominates
+a weaker move when B's PP is "abundant" - more than it could ever need.
+
+Dominance rules for a (player active, opponent active) matchup, where damage
+is capped at the defender's remaining HP (overkill changes nothing):
+- On equal damage, the move with more PP left is kept (less PP pressure);
+  on equal PP, the earlier move in the moveset is kept
+- Last Pokemon standing only: A is dominated by B if damage(A) < damage(B)
+  and B has abundant PP. This includes 0-damage status moves and immunities.
+- The best move is never pruned, so every state keeps at least one action
+
+Damage values are cached per matchup, so each pair of Pokemon is only run
+through the damage formula once per search.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.move import Move
+from utils.damageCalculator import DamageCalculator
+
+
+class MoveDominanceFilter:
+    """
+    Removes dominated moves before successor expansion.
+
+    One filter instance should be used per search, since the damage cache is
+    keyed by team slot indices (player_active, opponent_active).
+
+    Attributes:
+        branches_pruned: Number of move branches removed so far
+        branches_kept: Number of move branches passed through so far
+    """
+
+    def __init__(self):
+        """Create an empty filter."""
+        # Maps (player_active, opponent_active) -> {move_name: damage}
+        self._damage_cache: Dict[Tuple[int, int], Dict[str, int]] = {}
+
+        # Statistics
+        self.branches_pruned = 0
+        self.branches_kept = 0
+
+    def get_matchup_damage(self, state, move: Move) -> int:
+        """
+        Get the deterministic damage of a player move in the current matchup.
+
+        Args:
+            state: Current BattleState
+            move: Player move (from the active player Pokemon)
+
+        Returns:
+            Damage dealt (same value generate_successor_states would use)
+        """
+        return self._get_damage(state, state.opponent_active, move)
+
+    def _get_damage(self, state, opponent_index: int, move: Move) -> int:
+        """
+        Look up (or compute and cache) damage against one opponent slot.
+
+        Args:
+            state: Current BattleState
+            opponent_index: Opponent team slot being attacked
+            move: Player move (from the active player Pokemon)
+
+        Returns:
+            Deterministic damage (no crit, average roll)
+        """
+        matchup = (state.player_active, opponent_index)
+        damage_row = self._damage_cache.get(matchup)
+
+        if damage_row is None:
+            damage_row = {}
+            self._damage_cache[matchup] = damage_row
+
+        damage = damage_row.get(move.name)
+        if damage is None:
+            damage = DamageCalculator.calculate_damage(
+                state.get_active_player_pokemon(),
+                state.opponent_team[opponent_index],
+                move,
+                is_critical=False,  # Same deterministic settings as BattleState
+                random_roll=236
+            )
+            damage_row[move.name] = damage
+
+        return damage
+
+    def filter_moves(self, state) -> List[Move]:
+        """
+        Get the non-dominated usable moves for the active player Pokemon.
+
+        Args:
+            state: Current BattleState
+
+        Returns:
+            List of usable moves that survive dominance pruning
+            (in original moveset order)
+
+        Time Complexity: O(M^2 + M*K) where M = moves (max 4), K = opponents
+        """
+        active_player = state.get_active_player_pokemon()
+        usable_moves = [m for m in active_player.moves if m.is_usable()]
+
+        if len(usable_moves) <= 1:
+            self.branches_kept += len(usable_moves)
+            return usable_moves
+
+        # Damage beyond the defender's remaining HP changes nothing
+        defender_hp = state.get_active_opponent_pokemon().current_hp
+        damages = [
+            min(self.get_matchup_damage(state, m), defender_hp)
+            for m in usable_moves
+        ]
+        # Strict damage dominance is only safe without a teammate to stall for
+        last_standing = state.get_alive_pokemon_count(True) == 1
+        if last_standing:
+            abundant = [self.has_abundant_pp(state, m) for m in usable_moves]
+        else:
+            abundant = None
+
+        kept = []
+        for i, move in enumerate(usable_moves):
+            if not self._is_dominated(i, usable_moves, damages, abundant):
+                kept.append(move)
+
+        self.branches_pruned += len(usable_moves) - len(kept)
+        self.branches_kept += len(kept)
+
+        return kept
+
+    def has_abundant_pp(self, state, move: Move) -> bool:
+        """
+        Check if a move can never run out of PP before the battle ends.
+
+        Each use of a damaging move brings an opponent closer to fainting, so
+        ceil(hp / damage) summed over the remaining opponents is the most PP
+        the move could ever need. Above that, spending one of its PP now costs
+        nothing later. If some remaining opponent takes 0 damage from the move,
+        it could be spent there without limit, so it is never abundant.
+
+        Args:
+            state: Current BattleState
+            move: Usable move of the active player Pokemon
+
+        Returns:
+            True if the move's remaining PP covers every possible future use
+        """
+        hits_needed = 0
+        for index, opponent in enumerate(state.opponent_team):
+            if opponent.is_fainted():
+                continue
+
+            damage = self._get_damage(state, index, move)
+            if damage == 0:
+                return False
+            hits_needed += -(-opponent.current_hp // damage)  # ceil division
+
+        return move.current_pp > hits_needed
+
+    @staticmethod
+    def _is_dominated(
+        index: int,
+        moves: List[Move],
+        damages: List[int],
+        abundant: Optional[List[bool]]
+    ) -> bool:
+        """
+        Check if the move at index is dominated by another usable move.
+
+        Args:
+            index: Index of the move being checked
+            moves: Usable moves
+            damages: Effective matchup damage for each usable move
+            abundant: Whether each move's PP can never run out
+                      (None = only equal-damage ties may be pruned)
+
+        Returns:
+            True if some other move is at least as good
+        """
+        move = moves[index]
+        damage = damages[index]
+
+        for j, other in enumerate(moves):
+            if j == index:
+                continue
+
+            other_damage = damages[j]
+            if other_damage > damage and abundant is not None:
+                # More damage only dominates if its PP can't run out
+                if abundant[j]:
+                    return True
+
+            elif other_damage == damage:
+                # Same resulting state: keep the move with less PP pressure
+                if other.current_pp > move.current_pp:
+                    return True
+                if other.current_pp == move.current_pp and j < index:
+                    return True
+
+        return False
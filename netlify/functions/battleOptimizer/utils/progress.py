@@ -0,0 +1,84 @@
+"""
+Search Progress Reporting
+
+Long searches (Dijkstra graph construction, deep DP recursions) used to say
+nothing until they finished. An optimizer given a progress callback reports
+through a ProgressReporter:
+- Periodic "progress" records while searching (every `interval` states)
+- Milestones (graph built, best path found) as they happen
+
+Records are plain dicts with camelCase keys, ready to be sent as NDJSON
+(see BattleOptimizerService.stream_battle).
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Signature of progress callbacks: called with one record per report
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class ProgressReporter:
+    """
+    Rate-limited progress records for one optimization run.
+
+    Attributes:
+        callback: Function receiving each record (None = reporting off)
+        interval: States between two periodic records
+        records_sent: Records passed to the callback so far
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None, interval: int = 1000):
+        """
+        Create a reporter.
+
+        Args:
+            callback: Function receiving each record
+            interval: States between two periodic records
+        """
+        self.callback = callback
+        self.interval = max(1, interval)
+        self.records_sent = 0
+        self._start = time.perf_counter()
+        self._next_tick = self.interval
+
+    @property
+    def enabled(self) -> bool:
+        return self.callback is not None
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the reporter was created."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def tick(self, count: int, phase: str, **fields: Any):
+        """
+        Report if `count` states have passed the next interval mark.
+
+        Args:
+            count: States processed so far in this phase
+            phase: Search phase name
+            **fields: Extra record fields (computed by the caller)
+        """
+        if self.callback is not None and count >= self._next_tick:
+            self._next_tick = count + self.interval
+            self.report(phase, **fields)
+
+    def report(self, phase: str, **fields: Any):
+        """
+        Send a record now.
+
+        Args:
+            phase: Search phase name
+            **fields: Record fields
+        """
+        if self.callback is None:
+            return
+        record = {"type": "progress", "phase": phase}
+        record.update(fields)
+        record["elapsedMs"] = round(self.elapsed_ms(), 2)
+        self.records_sent += 1
+        self.callback(record)
@@ -0,0 +1,174 @@
+"""
+Resumable Step-Wise Searches
+
+optimize() runs a search start to finish in one call. Every optimizer also
+has a step-wise interface built on the same code:
+
+    search = optimizer.start(initial_state)
+    while not search.done:
+        status = search.step(500)       # at most 500 state expansions
+        print(status["expansions"], status["bestPlan"])
+    result = search.result               # same result optimize() returns
+
+Each optimizer's search is a generator (_search) that yields after every
+state expansion (one turn for greedy), so a caller can:
+- Interleave many searches fairly on one core (round-robin step() calls)
+- Time-slice (step until a deadline, then come back later)
+- Inspect progress and the best plan found so far between steps
+
+optimize() itself is start(state).run(), so both paths give the same answer.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import time
+from typing import Any, Dict, Generator, List, Optional
+
+# Expansions run by run() per step (only affects how often it checks in)
+RUN_STEP_SIZE = 10000
+
+
+class ResumableSearch:
+    """
+    Step-wise handle on one optimizer run.
+
+    Attributes:
+        optimizer: Optimizer running the search
+        expansions: State expansions done so far
+        steps: step() calls so far
+        result: Optimizer result once done (None before)
+    """
+
+    def __init__(self, optimizer, steps: Generator[None, None, Any]):
+        """
+        Wrap an optimizer's search generator.
+
+        Args:
+            optimizer: Optimizer whose _search produced `steps` (provides
+                       current_plan() and search_stats())
+            steps: Generator yielding once per expansion, returning the result
+        """
+        self.optimizer = optimizer
+        self.expansions = 0
+        self.steps = 0
+        self.result = None
+        self._steps = steps
+        self._done = False
+        self._search_seconds = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def step(self, n_expansions: int = 1000) -> Dict[str, Any]:
+        """
+        Advance the search by up to `n_expansions` state expansions.
+
+        Args:
+            n_expansions: Expansion budget of this step
+
+        Returns:
+            Status record (see status())
+        """
+        if not self._done:
+            start = time.perf_counter()
+            try:
+                for _ in range(max(1, n_expansions)):
+                    next(self._steps)
+                    self.expansions += 1
+            except StopIteration as finished:
+                self.result = finished.value
+                self._done = True
+            self._search_seconds += time.perf_counter() - start
+            self.steps += 1
+        return self.status()
+
+    def run(self):
+        """
+        Run the search to the end.
+
+        Returns:
+            Optimizer result
+        """
+        while not self._done:
+            self.step(RUN_STEP_SIZE)
+        return self.result
+
+    def close(self):
+        """Abandon the search (frees the generator and its state)."""
+        self._steps.close()
+        self._done = True
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Progress and best plan so far.
+
+        Returns:
+            Record with done, expansions, steps, searchMs (time spent inside
+            step(), excluding pauses), bestPlan and optimizer statistics
+        """
+        record = {
+            "type": "step",
+            "done": self._done,
+            "expansions": self.expansions,
+            "steps": self.steps,
+            "searchMs": round(self._search_seconds * 1000, 2)
+        }
+        record.update(self.optimizer.search_stats())
+        record["bestPlan"] = plan_of(self.result) if self.result is not None else self.optimizer.current_plan()
+        return record
+
+
+def plan_of(result) -> Dict[str, Any]:
+    """Plan record of a finished optimizer result."""
+    return make_plan(result.move_sequence, result.success, result.total_damage, complete=True)
+
+
+def make_plan(move_sequence: List[str], success: bool, total_damage: int,
+              complete: bool, **fields: Any) -> Dict[str, Any]:
+    """
+    Plan record (as reported in bestPlan).
+
+    Args:
+        move_sequence: Moves of the plan
+        success: Whether the plan wins
+        total_damage: Damage dealt by the plan
+        complete: Whether the plan is the search's final answer
+        **fields: Extra fields
+
+    Returns:
+        Plan dict with camelCase keys
+    """
+    plan = {
+        "moveSequence": list(move_sequence),
+        "turns": len(move_sequence),
+        "success": success,
+        "totalDamage": total_damage,
+        "complete": complete
+    }
+    plan.update(fields)
+    return plan
+
+
+def interleave(searches: List[ResumableSearch], n_expansions: int = 500,
+               deadline: Optional[float] = None) -> List[ResumableSearch]:
+    """
+    Run several searches round-robin on one core.
+
+    Args:
+        searches: Searches to advance
+        n_expansions: Expansions per turn of each search
+        deadline: Optional time.perf_counter() value to stop at (searches
+                  not done by then can be resumed later)
+
+    Returns:
+        The searches (each done, or paused at the deadline)
+    """
+    pending = [s for s in searches if not s.done]
+    while pending and (deadline is None or time.perf_counter() < deadline):
+        for search in pending:
+            search.step(n_expansions)
+        pending = [s for s in pending if not s.done]
+    return searches
@@ -0,0 +1,106 @@
+"""
+Search Bounds Shared Between Optimizers
+
+Any search that reaches a won battle state proves that the battle can be won
+in that state's turn count; no faster plan can need more turns. A
+SearchBounds object lets several optimizers running on the same battle share
+that knowledge while they search:
+- offer_win(turns): a win in `turns` turns exists (keeps the smallest)
+- turns_to_win: the best such bound so far (Dijkstra stops expanding states
+  at or past it - they cannot lead to a faster win)
+- stop(name): one optimizer proved the answer; check() makes the others
+  raise SearchStopped at their next state
+- deadline: check() also raises SearchStopped once it has passed, so a
+  caller with a time limit stops a search between two states
+
+Used by the portfolio optimizer (algorithms/portfolio.py) and, for its
+deadline, by the matchup matrix (services/matchupMatrix.py). Thread-safe.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import time
+import threading
+from typing import Optional
+
+
+class SearchStopped(Exception):
+    """Raised inside a search when another optimizer already proved the answer."""
+
+
+class SearchBounds:
+    """
+    Turn bound and stop flag shared by concurrent searches.
+
+    Attributes:
+        proved_by: Name of the optimizer that stopped the others (None if running)
+        wins_offered: Number of bounds offered (progress / statistics)
+        deadline: time.perf_counter() value the searches stop at (None = none)
+    """
+
+    def __init__(self, turns_to_win: Optional[int] = None, deadline: Optional[float] = None):
+        """
+        Create shared bounds.
+
+        Args:
+            turns_to_win: Known winning turn count (e.g. from greedy), if any
+            deadline: time.perf_counter() value after which check() raises
+        """
+        self._lock = threading.Lock()
+        self._turns_to_win = turns_to_win
+        self.deadline = deadline
+        self._stopped = threading.Event()
+        self.proved_by: Optional[str] = None
+        self.wins_offered = 0
+
+    @property
+    def turns_to_win(self) -> Optional[int]:
+        """Fewest turns of any win found so far (None if no win yet)."""
+        return self._turns_to_win
+
+    def offer_win(self, turns: int) -> bool:
+        """
+        Record that a win in `turns` turns exists.
+
+        Args:
+            turns: Turn count of a won battle state
+
+        Returns:
+            True if the bound got tighter
+        """
+        with self._lock:
+            self.wins_offered += 1
+            if self._turns_to_win is None or turns < self._turns_to_win:
+                self._turns_to_win = turns
+                return True
+            return False
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def stop(self, proved_by: str):
+        """
+        Stop the other searches (the first caller wins).
+
+        Args:
+            proved_by: Name of the optimizer that proved the answer
+        """
+        with self._lock:
+            if not self._stopped.is_set():
+                self.proved_by = proved_by
+                self._stopped.set()
+
+    def check(self):
+        """
+        Raise SearchStopped if the searches were stopped or are out of time.
+
+        Raises:
+            SearchStopped: If stop() was called or the deadline has passed
+        """
+        if self._stopped.is_set():
+            raise SearchStopped(f"Stopped: answer proved by {self.proved_by}")
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchStopped("Stopped: out of time")
@@ -0,0 +1,90 @@
+"""
+Search Checkpoints - Compact Snapshots of Unfinished Searches
+
+A Dijkstra search that hits max_states (or a time limit), or a DP search cut
+short, used to throw all of its work away; asking again with a bigger budget
+started from scratch. The optimizers can now dump an unfinished search as a
+checkpoint and restore it later:
+- Dijkstra: every discovered state (vertex order), the edges between them,
+  the BFS tree parents and the frontier still to expand
+- DP: the memo table (only values that no depth cutoff touched, unless the
+  new run uses the same max_depth)
+
+Checkpoints are plain JSON-friendly dicts. Battle states are stored in the
+binary wire format of utils/battleStateCodec.py (team header once, then one
+fixed-size record of turn, active slots, HP and PP per state), base64'd.
+They are rebuilt on top of the request's own teams, and a header that
+doesn't match those teams is rejected, so a checkpoint is only valid for
+the request it was made for (the store keys it by request fingerprint, see
+services/checkpointStore.py).
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import base64
+from typing import List
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from utils.battleStateCodec import BattleStateCodec, WireFormatError, encode_states
+
+# Bumped whenever the checkpoint layout changes (old files are discarded)
+CHECKPOINT_VERSION = 3
+
+
+class CheckpointMismatch(ValueError):
+    """Raised when a checkpoint does not belong to the search restoring it."""
+
+
+def pack_states(states: List[BattleState]) -> str:
+    """
+    Encode the states of a checkpoint.
+
+    Args:
+        states: States of one battle (at least one)
+
+    Returns:
+        base64 text of utils/battleStateCodec.encode_states
+    """
+    return base64.b64encode(encode_states(states)).decode("ascii")
+
+
+def unpack_states(data: str, template: BattleState) -> List[BattleState]:
+    """
+    Rebuild states encoded by pack_states on top of a battle's teams.
+
+    Args:
+        data: Encoded states
+        template: Any state of the battle restoring them (provides the teams)
+
+    Returns:
+        States in their original order
+
+    Raises:
+        CheckpointMismatch: If the states belong to other teams or are corrupt
+    """
+    try:
+        blob = base64.b64decode(data)
+    except (ValueError, TypeError) as e:
+        raise CheckpointMismatch(f"Checkpoint states are not base64: {e}")
+    codec = BattleStateCodec(template)
+    header = codec.header()
+    if blob[:len(header)] != header:
+        raise CheckpointMismatch("Checkpoint teams differ from the battle")
+    offset = len(header)
+    count = int.from_bytes(blob[offset:offset + 4], "big")
+    offset += 4
+    if len(blob) - offset != count * codec.size:
+        raise CheckpointMismatch("Checkpoint state list is truncated")
+    try:
+        return list(codec.iter_decode(blob, offset, count))
+    except WireFormatError as e:
+        raise CheckpointMismatch(str(e))
@@ -0,0 +1,308 @@
+"""
+Shared Transposition Table - One Memo for Several Processes
+
+Every search process (hash-distributed Dijkstra workers, the server's worker
+pool, cooperating searches) used to keep its own memo and visited set, so a
+state solved in one process was solved again in the next. This table lives
+in multiprocessing.shared_memory and is read and written by all of them:
+
+    table = SharedTranspositionTable.create(slots=1 << 16)   # before forking
+    key = table_key(battle_namespace(state), KIND_DP_VALUE, state.compact_key())
+    table.store(key, value, move=2, depth=40)
+    entry = table.probe(key)          # TTEntry(value, move, depth, flags) or None
+
+Layout: fixed-size 24-byte slots grouped in buckets of BUCKET_SLOTS; a key
+picks its bucket from its low bits. Each slot holds (check, data, info):
+- data: the value (float64 bits)
+- info: move index (16 bits), depth (16 bits), flags (32 bits)
+- check: key ^ data ^ info
+
+There are no locks (multiprocessing locks need semaphores, which AWS Lambda
+does not have). A reader recomputes key = check ^ data ^ info, so a slot
+torn by two concurrent writers simply doesn't match any key and reads as a
+miss. Lost or torn writes only cost a recomputation: the table is a cache.
+
+Replacement: a key already in its bucket is overwritten only by an entry
+with at least its depth; otherwise an empty slot is used, else the slot
+with the smallest depth is evicted. "Depth" is the work an entry saves
+(the DP uses the number of states computed below it).
+
+Keys are Python hashes of int tuples, which - unlike str hashes - are the
+same in every process. The battle namespace (a digest of both teams and of
+the search settings the values depend on) keeps two battles with equal HP
+tuples apart, and so does it for two searches of one battle with different
+settings (a value found with a deeper max_depth is not what a shallower
+search would compute, so it must not leak into that search's result).
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import hashlib
+import struct
+from collections import namedtuple
+from typing import Any, Dict, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+
+# (check, data, info) - see module docstring
+_SLOT = struct.Struct("<QQQ")
+_VALUE = struct.Struct("<d")
+_BITS = struct.Struct("<Q")
+_MASK = (1 << 64) - 1
+
+BUCKET_SLOTS = 4
+NO_MOVE = -1
+MAX_DEPTH = 0xFFFF
+
+# Entry kinds (part of the key: the same state can have one of each)
+KIND_DP_VALUE = 1
+KIND_VISITED = 2
+
+TTEntry = namedtuple("TTEntry", ["value", "move", "depth", "flags"])
+
+
+def battle_namespace(state: BattleState, options: Tuple = ()) -> int:
+    """
+    64-bit identifier of a battle (both teams, not their current HP / PP).
+
+    Args:
+        state: Any state of the battle
+        options: Search settings the stored values depend on (the DP passes
+                 max_depth and its pruning / macro flags)
+
+    Returns:
+        Namespace for table_key
+    """
+    parts = [options]
+    for team in (state.player_team, state.opponent_team):
+        for p in team:
+            parts.append((p.name, p.level, tuple(p.types), p.max_hp, p.attack, p.defense,
+                          p.speed, p.special, tuple((m.name, m.power, m.pp) for m in p.moves)))
+        parts.append("|")
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def table_key(namespace: int, kind: int, compact_key: Tuple) -> int:
+    """
+    Table key of a state.
+
+    Args:
+        namespace: battle_namespace() of the battle
+        kind: KIND_DP_VALUE or KIND_VISITED
+        compact_key: BattleState.compact_key()
+
+    Returns:
+        Nonzero 64-bit key
+    """
+    return (hash((namespace, kind, compact_key)) & _MASK) or 1
+
+
+class SharedTranspositionTable:
+    """
+    Lock-free transposition table in shared memory.
+
+    Counters (probes, hits, stores, ...) are per process.
+
+    Attributes:
+        name: Shared memory block name (for attach())
+        slots: Number of slots
+    """
+
+    def __init__(self, shm, owner: bool):
+        """
+        Wrap a shared memory block (use create() or attach()).
+
+        Args:
+            shm: multiprocessing.shared_memory.SharedMemory
+            owner: Whether close() also unlinks the block
+        """
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner_pid = os.getpid() if owner else None
+        self.name = shm.name
+        self.slots = shm.size // _SLOT.size
+        self._buckets = self.slots // BUCKET_SLOTS
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.claims = 0
+
+    @classmethod
+    def create(cls, slots: int = 1 << 16) -> "SharedTranspositionTable":
+        """
+        Allocate a new, empty table.
+
+        Args:
+            slots: Wanted slot count (rounded up to a power-of-two number of buckets)
+
+        Returns:
+            Table owned by this process
+
+        Raises:
+            OSError: If shared memory is not available (no /dev/shm, e.g. AWS Lambda)
+        """
+        from multiprocessing import shared_memory
+
+        buckets = 1
+        while buckets * BUCKET_SLOTS < slots:
+            buckets *= 2
+        shm = shared_memory.SharedMemory(create=True, size=buckets * BUCKET_SLOTS * _SLOT.size)
+        shm.buf[:] = bytes(shm.size)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTranspositionTable":
+        """
+        Open a table created by another (not forked) process.
+
+        Args:
+            name: The creator's table.name
+
+        Returns:
+            Table that close() leaves in place
+        """
+        from multiprocessing import shared_memory, resource_tracker
+
+        shm = shared_memory.SharedMemory(name=name)
+        # Python < 3.13 tracks attached blocks too and would unlink this one
+        # when the process exits; only the creator owns it
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return cls(shm, owner=False)
+
+    def close(self):
+        """Detach; the creating process also frees the block (forked children don't)."""
+        if self._shm is None:
+            return
+        self._buf = None
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedTranspositionTable":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def clear(self):
+        """Empty every slot."""
+        self._buf[:] = bytes(len(self._buf))
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """
+        Look a key up.
+
+        Args:
+            key: table_key()
+
+        Returns:
+            TTEntry, or None if the key is not stored
+        """
+        self.probes += 1
+        buf = self._buf
+        offset = (key % self._buckets) * BUCKET_SLOTS * _SLOT.size
+        for _ in range(BUCKET_SLOTS):
+            check, data, info = _SLOT.unpack_from(buf, offset)
+            if check ^ data ^ info == key:
+                self.hits += 1
+                return self._decode(data, info)
+            offset += _SLOT.size
+        return None
+
+    def store(self, key: int, value: float, move: int = NO_MOVE, depth: int = 0,
+              flags: int = 0) -> bool:
+        """
+        Write an entry (see the module docstring for the replacement policy).
+
+        Args:
+            key: table_key()
+            value: Value of the state
+            move: Best move index (NO_MOVE if none)
+            depth: Work the entry saves (clamped to MAX_DEPTH)
+            flags: Caller-defined bits
+
+        Returns:
+            True if the entry was written
+        """
+        depth = max(0, min(depth, MAX_DEPTH))
+        data = _BITS.unpack(_VALUE.pack(value))[0]
+        info = (move & 0xFFFF) | (depth << 16) | ((flags & 0xFFFFFFFF) << 32)
+        slot = self._choose_slot(key, depth)
+        if slot is None:
+            return False
+        _SLOT.pack_into(self._buf, slot, key ^ data ^ info, data, info)
+        self.stores += 1
+        return True
+
+    def claim(self, key: int) -> bool:
+        """
+        Mark a key as taken if no process did yet (visited index).
+
+        Two processes racing on the same key may both succeed, and a claim
+        can be evicted later; callers must accept an occasional duplicate.
+
+        Args:
+            key: table_key() (usually of kind KIND_VISITED)
+
+        Returns:
+            True if this call took the key, False if it was already stored
+        """
+        if self.probe(key) is not None:
+            return False
+        self.claims += 1
+        return self.store(key, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """This process's counters and the table size."""
+        return {"slots": self.slots, "probes": self.probes, "hits": self.hits,
+                "stores": self.stores, "replacements": self.replacements,
+                "claims": self.claims}
+
+    def _choose_slot(self, key: int, depth: int) -> Optional[int]:
+        """Byte offset of the slot an entry of `key` goes to (None = keep the old entry)."""
+        buf = self._buf
+        start = (key % self._buckets) * BUCKET_SLOTS * _SLOT.size
+        empty = None
+        victim = None
+        victim_depth = MAX_DEPTH + 1
+        offset = start
+        for _ in range(BUCKET_SLOTS):
+            check, data, info = _SLOT.unpack_from(buf, offset)
+            if check ^ data ^ info == key:
+                return offset if depth >= (info >> 16) & 0xFFFF else None
+            if not (check or data or info):
+                if empty is None:
+                    empty = offset
+            elif (info >> 16) & 0xFFFF < victim_depth:
+                victim = offset
+                victim_depth = (info >> 16) & 0xFFFF
+            offset += _SLOT.size
+        if empty is not None:
+            return empty
+        self.replacements += 1
+        return victim
+
+    @staticmethod
+    def _decode(data: int, info: int) -> TTEntry:
+        move = info & 0xFFFF
+        return TTEntry(
+            value=_VALUE.unpack(_BITS.pack(data))[0],
+            move=NO_MOVE if move == 0xFFFF else move,
+            depth=(info >> 16) & 0xFFFF,
+            flags=info >> 32
+        )
@@ -0,0 +1,171 @@
+"""
+Startup Benchmark - Cold-Start Budget for battleOptimizer.handler
+
+A cold Lambda container pays for every import before the first request runs.
+This script measures that cost in fresh interpreters:
+- Import time per module (python -X importtime), median over several runs
+- Cold first request: import battleOptimizer + one handler call, per algorithm
+
+It exits with status 1 when a cold first request exceeds its budget, so it
+can guard the budget in CI:
+
+    python utils/startupBenchmark.py --runs 5 --budget-ms 200
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import json
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+# Function root (where battleOptimizer.py lives)
+FUNCTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold first request budget in milliseconds (import + handler call)
+COLD_START_BUDGET_MS = 200.0
+
+# Small request used to time the first handler call
+BENCHMARK_EVENT_BODY = {
+    "playerTeam": [{
+        "name": "pikachu",
+        "types": ["electric"],
+        "base_stats": {"hp": 35, "attack": 55, "defense": 40, "special": 50, "speed": 90},
+        "moves": ["thunderbolt", "quick-attack"]
+    }],
+    "bossTrainer": "giovanni"
+}
+
+# Runs in the child interpreter: times the import and the first request
+_FIRST_REQUEST_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import battleOptimizer
+imported = time.perf_counter()
+response = battleOptimizer.handler({"httpMethod": "POST", "body": sys.argv[1]}, None)
+done = time.perf_counter()
+print(json.dumps({
+    "importMs": (imported - start) * 1000,
+    "requestMs": (done - imported) * 1000,
+    "statusCode": response["statusCode"]
+}))
+"""
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter in the function root (no result cache on disk)."""
+    env = dict(os.environ, RESULT_CACHE_DIR="")
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=FUNCTION_ROOT, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True
+    )
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse python -X importtime output.
+
+    Args:
+        output: stderr of the interpreter
+
+    Returns:
+        Dictionary module -> (self_ms, cumulative_ms)
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return times
+
+
+def measure_imports(module: str = "battleOptimizer", runs: int = 5) -> Dict[str, Tuple[float, float]]:
+    """
+    Median import time of every module loaded by importing a module.
+
+    Args:
+        module: Module to import
+        runs: Fresh interpreters to start
+
+    Returns:
+        Dictionary module -> (median self_ms, median cumulative_ms)
+    """
+    samples: Dict[str, List[Tuple[float, float]]] = {}
+    for _ in range(runs):
+        result = _run_python(["-X", "importtime", "-c", f"import {module}"])
+        for name, times in parse_importtime(result.stderr).items():
+            samples.setdefault(name, []).append(times)
+
+    return {
+        name: (statistics.median(t[0] for t in values), statistics.median(t[1] for t in values))
+        for name, values in samples.items()
+    }
+
+
+def measure_first_request(algorithm: str = "greedy", runs: int = 5) -> Dict[str, float]:
+    """
+    Median cold first request (fresh interpreter each run).
+
+    Args:
+        algorithm: Algorithm requested
+        runs: Fresh interpreters to start
+
+    Returns:
+        Dictionary with importMs, requestMs and totalMs medians
+    """
+    body = json.dumps(dict(BENCHMARK_EVENT_BODY, algorithm=algorithm))
+    samples = []
+    for _ in range(runs):
+        result = _run_python(["-c", _FIRST_REQUEST_SCRIPT, body])
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        if sample["statusCode"] != 200:
+            raise RuntimeError(f"Benchmark request failed for {algorithm}: {result.stdout}")
+        samples.append(sample)
+
+    import_ms = statistics.median(s["importMs"] for s in samples)
+    request_ms = statistics.median(s["requestMs"] for s in samples)
+    total_ms = statistics.median(s["importMs"] + s["requestMs"] for s in samples)
+    return {"importMs": import_ms, "requestMs": request_ms, "totalMs": total_ms}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: print the report, check the budget."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure battleOptimizer cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list (default 15)")
+    parser.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS,
+                        help=f"cold first request budget (default {COLD_START_BUDGET_MS:.0f})")
+    parser.add_argument("--algorithms", nargs="+", default=["greedy", "dp", "dijkstra"],
+                        help="algorithms to time a first request for")
+    args = parser.parse_args(argv)
+
+    imports = measure_imports(runs=args.runs)
+    print(f"Import time per module (median of {args.runs} runs, ms)")
+    print(f"{'self':>8} {'cumulative':>11}  module")
+    slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_ms, cumulative_ms) in slowest[:args.top]:
+        print(f"{self_ms:8.2f} {cumulative_ms:11.2f}  {name}")
+
+    over_budget = False
+    print(f"\nCold first request (median of {args.runs} runs, budget {args.budget_ms:.0f}ms)")
+    for algorithm in args.algorithms:
+        timing = measure_first_request(algorithm, runs=args.runs)
+        status = "OK" if timing["totalMs"] <= args.budget_ms else "OVER BUDGET"
+        over_budget = over_budget or status != "OK"
+        print(f"  {algorithm:<9} import {timing['importMs']:7.2f}  request {timing['requestMs']:8.2f}"
+              f"  total {timing['totalMs']:8.2f}  {status}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,215 @@
+"""
+State-Space Estimator - Bounded Probe of the Exact Search for "auto"
+
+Callers used to pick greedy, dp or dijkstra blindly, with fixed limits.
+The reachable state count is hard to predict from the teams (an analytic
+count of distinct damage sums misses by orders of magnitude both ways),
+so "auto" measures it instead:
+
+1. Probe: the exact Dijkstra search itself runs step-wise for at most
+   PROBE_SHARE of the time budget. Most battles finish right there, and
+   the probe's answer is the exact answer (the same search as an explicit
+   "dijkstra" request with the same max_states).
+2. Fallback: otherwise the probe has measured what one state expansion
+   costs on this battle. The time left buys an abstract search ("hits"
+   abstraction, max_states sized from the measured cost), and greedy
+   answers if even that does not fit.
+
+Every step is held to the budget: the probe stops at its share, the
+abstract search is given the budget's deadline, and greedy costs a few
+milliseconds. Only the probe's own answer is reported as exact.
+
+turns_to_win_lower_bound() (used by the portfolio optimizer) bounds the
+answer from below without any search.
+
+Author: Josh C.
+Date: December 2025
+CS_311 Extra Credit Project
+"""
+
+import sys
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from models.battleState import BattleState
+from models.pokemon import Pokemon
+from utils.damageCalculator import DamageCalculator
+
+# Share of the time budget the exact search may use before auto falls back
+PROBE_SHARE = 0.5
+
+# Expansions between two deadline checks of the probe (~15 ms on the boss battles)
+PROBE_STEP_SIZE = 25
+
+# An abstract search affording fewer states than this is not worth
+# running (greedy answers instead)
+MIN_ABSTRACT_STATES = 250
+
+
+class SearchProbe:
+    """
+    Measured start of the exact search.
+
+    Attributes:
+        started: time.perf_counter() value the probe (and the budget) started at
+        expansions: State expansions the probe ran
+        elapsed_ms: Time the probe took
+        finished: Whether the exact search ran to its end
+        complete: Whether it also covered every reachable state (not cut
+                  short by max_states) - its answer is then exact
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.expansions = 0
+        self.elapsed_ms = 0.0
+        self.finished = False
+        self.complete = False
+
+    @property
+    def ms_per_expansion(self) -> Optional[float]:
+        """Measured cost of one state expansion (None before any)."""
+        return self.elapsed_ms / self.expansions if self.expansions else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Probe summary for API responses."""
+        cost = self.ms_per_expansion
+        return {
+            "expansions": self.expansions,
+            "probeMs": round(self.elapsed_ms, 1),
+            "finished": self.finished,
+            "complete": self.complete,
+            "msPerExpansion": round(cost, 4) if cost is not None else None
+        }
+
+
+def probe_exact_search(
+    optimizer,
+    initial_state: BattleState,
+    time_budget_ms: float,
+    deadline: Optional[float] = None
+) -> Tuple[Any, SearchProbe]:
+    """
+    Run an exact search for at most PROBE_SHARE of a time budget.
+
+    The search runs step-wise (see utils/resumableSearch.py), so a probe that
+    finishes gives exactly what optimizer.optimize() would.
+
+    Args:
+        optimizer: Exact search (DijkstraBattleOptimizer) to probe
+        initial_state: Starting battle state
+        time_budget_ms: Time budget of the whole "auto" request
+        deadline: Optional time.perf_counter() value the caller must stop
+                  at (the probe stops at whichever comes first)
+
+    Returns:
+        Tuple of (optimizer result, or None if the probe ran out of time;
+        SearchProbe)
+    """
+    probe = SearchProbe(time.perf_counter())
+    stop_at = probe.started + PROBE_SHARE * time_budget_ms / 1000
+    if deadline is not None:
+        stop_at = min(stop_at, deadline)
+
+    search = optimizer.start(initial_state)
+    while not search.done and time.perf_counter() < stop_at:
+        search.step(PROBE_STEP_SIZE)
+    probe.expansions = search.expansions
+    probe.elapsed_ms = (time.perf_counter() - probe.started) * 1000
+    probe.finished = search.done
+    if not search.done:
+        search.close()
+        return None, probe
+    probe.complete = optimizer.search_complete
+    return search.result, probe
+
+
+def select_algorithm(probe: SearchProbe, time_budget_ms: float, max_states: int) -> Dict[str, Any]:
+    """
+    What answers an "auto" request after its probe.
+
+    Order of preference:
+    1. The probe's own answer, if the exact search finished and covered
+       every state (exact)
+    2. dijkstra with the "hits" abstraction, max_states sized from the
+       measured cost per expansion and the time left (approximate)
+    3. greedy (approximate, constant cost)
+
+    Args:
+        probe: Result of probe_exact_search
+        time_budget_ms: Time budget of the whole request
+        max_states: The request's state limit (the abstract search never
+                    gets more)
+
+    Returns:
+        Dictionary with algorithm, options (optimize_battle keyword
+        arguments), exact (bool - the search that answers finished) and
+        reason
+    """
+    if probe.complete:
+        return {
+            "algorithm": "dijkstra",
+            "options": {"max_states": max_states},
+            "exact": True,
+            "reason": f"exact search finished in {probe.expansions} expansions "
+                      f"({probe.elapsed_ms:.0f}ms of the {time_budget_ms:.0f}ms budget)"
+        }
+
+    if probe.finished:
+        cause = f"exact search needs more than {max_states} states"
+    else:
+        cause = f"exact search unfinished after {probe.expansions} expansions"
+    remaining_ms = time_budget_ms - probe.elapsed_ms
+    cost = probe.ms_per_expansion
+    affordable = min(max_states, int(remaining_ms / cost)) if cost else 0
+    if affordable >= MIN_ABSTRACT_STATES:
+        return {
+            "algorithm": "dijkstra",
+            "options": {"max_states": affordable, "abstraction": "hits"},
+            "exact": False,
+            "reason": f"{cause}: abstract search of {affordable} states in the {remaining_ms:.0f}ms left"
+        }
+    return greedy_selection(f"{cause}: no abstract search fits ({affordable} states affordable)")
+
+
+def greedy_selection(reason: str) -> Dict[str, Any]:
+    """Selection of the greedy fallback (see select_algorithm)."""
+    return {"algorithm": "greedy", "options": {}, "exact": False, "reason": reason}
+
+
+def _damage(attacker: Pokemon, defender: Pokemon, move) -> int:
+    """Deterministic damage with the same settings as BattleState."""
+    return DamageCalculator.calculate_damage(attacker, defender, move,
+                                             is_critical=False, random_roll=236)
+
+
+def turns_to_win_lower_bound(player_team: List[Pokemon], opponent_team: List[Pokemon]) -> Optional[int]:
+    """
+    Fewest turns any winning plan can take.
+
+    Each opponent Pokemon needs at least ceil(HP / best hit any player
+    Pokemon deals to it) player attacks, one per turn (switches after a
+    faint are free).
+
+    Args:
+        player_team: Player's team (full HP)
+        opponent_team: Opponent's team (full HP)
+
+    Returns:
+        Lower bound on turns to win, or None if some opponent Pokemon can't
+        be damaged at all (no win is possible)
+    """
+    total = 0
+    for opponent in opponent_team:
+        best_hit = max((_damage(player, opponent, move)
+                        for player in player_team for move in player.moves), default=0)
+        if best_hit <= 0:
+            return None
+        total += -(-opponent.max_hp // best_hit)
+    return total
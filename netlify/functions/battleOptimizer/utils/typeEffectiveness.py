@@ -27,8 +27,10 @@ import sys
 import os
 from typing import Optional
 
-# Add parent directory to path to import dataStructures
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path to import dataStructures (once)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from dataStructures.hash_table import HashTable
 